@@ -4,7 +4,20 @@ import hashlib
 import psycopg2
 from datetime import datetime
 
+# Same channel as db/postgres_client.py INGESTION_JOBS_CHANNEL
+INGESTION_JOBS_CHANNEL = "affordabot_ingestion_jobs"
+
+
 class RawScrapePipeline:
+    def __init__(self, enqueue_ingestion: bool = False):
+        # Queue each saved scrape for ingestion (migration 012) so ingest workers
+        # embed it while the crawl is still running
+        self.enqueue_ingestion = enqueue_ingestion
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(enqueue_ingestion=crawler.settings.getbool("INGESTION_QUEUE_ENABLED", False))
+
     def open_spider(self, spider):
         db_url = os.environ.get("DATABASE_URL")
         # Handle Railway internal vs external URL if needed, but standard URL usually works for psycopg2
@@ -53,9 +66,22 @@ class RawScrapePipeline:
                     """
                     INSERT INTO raw_scrapes (source_id, content_hash, content_type, data, url)
                     VALUES (%s, %s, %s, %s, %s)
+                    RETURNING id
                     """,
                     (source_id, content_hash, "application/json", data_json, url)
                 )
+                scrape_id = cur.fetchone()[0]
+
+                if self.enqueue_ingestion:
+                    # Same transaction: the job and NOTIFY only appear once the scrape is committed
+                    cur.execute(
+                        """
+                        INSERT INTO ingestion_jobs (scrape_id) VALUES (%s)
+                        ON CONFLICT (scrape_id) WHERE status IN ('queued', 'leased') DO NOTHING
+                        """,
+                        (scrape_id,)
+                    )
+                    cur.execute("SELECT pg_notify(%s, '')", (INGESTION_JOBS_CHANNEL,))
                 
                 # Update source last_scraped_at
                 cur.execute(
@@ -63,7 +63,19 @@ class RetrieverTool(BaseTool):
                 ToolParameter(
                     name="filters",
                     type="object",
-                    description="Optional filters (e.g., {'jurisdiction': 'San Jose'}).",
+                    description=(
+                        "Optional filters: jurisdiction, source_id, document_id, content_type, "
+                        "created_after, created_before (e.g., {'jurisdiction': 'San Jose'})."
+                    ),
+                    required=False,
+                ),
+                ToolParameter(
+                    name="mode",
+                    type="string",
+                    description=(
+                        "Search mode: 'hybrid' (default; keywords + meaning), 'lexical' for exact "
+                        "bill numbers or code sections, 'vector' for meaning only."
+                    ),
                     required=False,
                 ),
             ],
@@ -74,6 +86,7 @@ class RetrieverTool(BaseTool):
         query: str,
         k: int = 5,
         filters: Optional[dict] = None,
+        mode: Optional[str] = None,
     ) -> ToolResult:
         """
         Searches the knowledge base for relevant documents.
@@ -82,6 +95,7 @@ class RetrieverTool(BaseTool):
             query: The search query.
             k: Number of documents to retrieve.
             filters: Optional filter criteria.
+            mode: hybrid | lexical | vector (backend default when omitted).
 
         Returns:
             A ToolResult containing retrieved documents and evidence.
@@ -95,6 +109,7 @@ class RetrieverTool(BaseTool):
                     query=query,
                     k=k,
                     filters=filters or {},
+                    mode=mode,
                 )
             else:
                 # Mock mode for testing
@@ -123,6 +138,12 @@ class RetrieverTool(BaseTool):
                     url = doc.url
                     content = doc.content
                     title = getattr(doc, "title", f"Document {i+1}")
+                elif hasattr(doc, "chunk_id"):
+                    # RetrievedChunk from the vector backend
+                    meta = doc.metadata or {}
+                    url = meta.get("url") or (doc.source if doc.source.startswith("http") else "")
+                    content = doc.content
+                    title = meta.get("title") or meta.get("bill_number") or f"Document {i+1}"
                 elif isinstance(doc, dict):
                     url = doc.get("url", "")
                     content = doc.get("content", "")
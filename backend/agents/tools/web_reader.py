@@ -10,6 +10,8 @@ Feature-Key: affordabot-dmzy.6
 import logging
 from typing import Any
 
+from services.extraction import html_to_text_async
+
 logger = logging.getLogger(__name__)
 
 
@@ -118,10 +120,8 @@ class WebReaderTool:
                 if TRAFILATURA_AVAILABLE:
                     content = trafilatura.extract(html, include_links=True)
                 else:
-                    # Very basic extraction
-                    import re
-                    content = re.sub(r'<[^>]+>', ' ', html)
-                    content = ' '.join(content.split())
+                    # lxml extraction without boilerplate; large pages go to a worker process
+                    content = await html_to_text_async(html)
                 
                 return content or "", metadata
                 
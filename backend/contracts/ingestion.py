@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator, ConfigDict
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from uuid import UUID
 import json
 
@@ -26,3 +26,19 @@ class RawScrape(BaseModel):
             except json.JSONDecodeError:
                 return v
         return v
+
+
+class IngestionBatchResult(BaseModel):
+    """Summary of IngestionService.process_raw_scrapes."""
+    requested: int = 0
+    processed: List[str] = Field(default_factory=list)
+    # scrape_id -> reason; skipped scrapes (not found, no text) are left unprocessed
+    skipped: Dict[str, str] = Field(default_factory=dict)
+    # scrape_id -> error; also written to raw_scrapes.error_message
+    failed: Dict[str, str] = Field(default_factory=dict)
+    chunks: int = 0
+    # Incremental mode: chunks written vs. left untouched, and stale chunks removed
+    embedded: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    duration_ms: int = 0
@@ -21,6 +21,21 @@ class BlobStorage(ABC):
         """
         pass
 
+    async def upload_file(self, path: str, file_path: str, content_type: str = "application/octet-stream") -> str:
+        """
+        Upload a local file. Backends should override to stream instead of reading it whole.
+        """
+        with open(file_path, "rb") as f:
+            return await self.upload(path, f.read(), content_type)
+
+    async def download_file(self, path: str, file_path: str) -> None:
+        """
+        Download content to a local file. Backends should override to stream.
+        """
+        data = await self.download(path)
+        with open(file_path, "wb") as f:
+            f.write(data)
+
     @abstractmethod
     async def get_url(self, path: str, expiry_seconds: int = 3600) -> str:
         """
@@ -0,0 +1,85 @@
+"""
+In-process TTL + LRU cache for PostgresDB identity lookups.
+
+Keys are tuples whose first element is a namespace ("jurisdiction", "source",
+"system_prompt", ...) so writers can drop a single entry or a whole namespace.
+Cross-process invalidation is wired up in PostgresDB via LISTEN/NOTIFY.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+MISSING = object()
+
+
+class IdentityCache:
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls) -> "IdentityCache":
+        """DB_CACHE_SIZE / DB_CACHE_TTL (seconds); either set to 0 disables caching."""
+        return cls(
+            maxsize=int(os.getenv("DB_CACHE_SIZE", "1024")),
+            ttl=float(os.getenv("DB_CACHE_TTL", "300")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Tuple[Hashable, ...]) -> Any:
+        """Return the cached value, or MISSING (None is a valid cached value)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.misses += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Tuple[Hashable, ...], value: Any):
+        if not self.enabled:
+            return
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, namespace: str, key: Optional[Hashable] = None):
+        """Drop (namespace, key), or every entry in the namespace when key is None."""
+        if key is not None:
+            self._entries.pop((namespace, key), None)
+            return
+        for cached_key in [k for k in self._entries if k[0] == namespace]:
+            del self._entries[cached_key]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
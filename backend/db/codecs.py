@@ -0,0 +1,121 @@
+"""
+asyncpg type codecs registered on every pooled connection.
+
+- json/jsonb: orjson (stdlib json fallback), so callers pass and receive dicts/lists.
+- vector/halfvec: pgvector binary wire format backed by NumPy float32 arrays,
+  so embeddings are never rendered to or parsed from "[0.1, 0.2, ...]" text.
+"""
+
+import json
+import logging
+import struct
+from typing import Any
+
+import numpy as np
+
+# Optional imports - gracefully handle missing dependencies
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger("postgres_db")
+
+JSONB_VERSION = b"\x01"
+_VECTOR_HEADER = struct.Struct(">HH")  # dim, unused
+
+
+def json_dumps(value: Any) -> bytes:
+    """
+    Serialize a Python value to JSON bytes.
+
+    A str is a JSON string value like any other; pass dicts/lists, not json.dumps() output.
+    Bytes are taken as already-serialized JSON.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            value,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
+    return json.dumps(value, default=str).encode("utf-8")
+
+
+def json_loads(data: bytes) -> Any:
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def encode_jsonb(value: Any) -> bytes:
+    return JSONB_VERSION + json_dumps(value)
+
+
+def decode_jsonb(data: bytes) -> Any:
+    return json_loads(data[1:])
+
+
+def _to_array(value: Any, dtype: str) -> np.ndarray:
+    if isinstance(value, str):
+        # Legacy text form: "[0.1, 0.2, ...]"
+        value = json.loads(value)
+    arr = np.asarray(value, dtype=dtype)
+    if arr.ndim != 1:
+        raise ValueError(f"expected a 1-d embedding, got shape {arr.shape}")
+    return arr
+
+
+def encode_vector(value: Any) -> bytes:
+    arr = _to_array(value, ">f4")
+    return _VECTOR_HEADER.pack(arr.shape[0], 0) + arr.tobytes()
+
+
+def decode_vector(data: bytes) -> np.ndarray:
+    dim, _ = _VECTOR_HEADER.unpack_from(data)
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=_VECTOR_HEADER.size).astype(np.float32)
+
+
+def encode_halfvec(value: Any) -> bytes:
+    arr = _to_array(value, ">f2")
+    return _VECTOR_HEADER.pack(arr.shape[0], 0) + arr.tobytes()
+
+
+def decode_halfvec(data: bytes) -> np.ndarray:
+    dim, _ = _VECTOR_HEADER.unpack_from(data)
+    return np.frombuffer(data, dtype=">f2", count=dim, offset=_VECTOR_HEADER.size).astype(np.float32)
+
+
+async def register_codecs(conn) -> bool:
+    """
+    Register JSON and pgvector codecs on a connection (asyncpg pool `init` hook).
+
+    Returns:
+        True if the vector codec was registered (pgvector extension present).
+    """
+    await conn.set_type_codec(
+        "jsonb", schema="pg_catalog", encoder=encode_jsonb, decoder=decode_jsonb, format="binary"
+    )
+    await conn.set_type_codec(
+        "json", schema="pg_catalog", encoder=json_dumps, decoder=json_loads, format="binary"
+    )
+
+    try:
+        await conn.set_type_codec(
+            "vector", schema="public", encoder=encode_vector, decoder=decode_vector, format="binary"
+        )
+    except ValueError as e:
+        # "unknown type: public.vector" -> extension not installed in this database
+        logger.warning(f"pgvector codec not registered: {e}")
+        return False
+
+    try:
+        # halfvec ships with pgvector >= 0.7
+        await conn.set_type_codec(
+            "halfvec", schema="public", encoder=encode_halfvec, decoder=decode_halfvec, format="binary"
+        )
+    except ValueError:
+        pass
+    return True
@@ -0,0 +1,121 @@
+"""
+Opaque keyset cursors over (created_at, id), column projection and NDJSON
+encoding for list queries.
+
+List queries order by `created_at DESC, id DESC` and continue with
+`(created_at, id) < ($cursor_ts, $cursor_id)`, which stays an index range
+scan at any depth instead of scanning and discarding OFFSET rows.
+
+Tables whose created_at is nullable (legislation) page on
+COALESCE(created_at, '-infinity'), so undated rows come last and still get a cursor.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+from db.codecs import json_dumps
+
+
+# asyncpg sends datetime.min as timestamptz '-infinity' (the sort key of NULL created_at)
+NULL_CREATED_AT = datetime.min
+
+
+def sort_key(alias: str, nullable: bool = False) -> str:
+    return f"COALESCE({alias}.created_at, '-infinity')" if nullable else f"{alias}.created_at"
+
+
+def encode_cursor(created_at: Optional[datetime], row_id: Any) -> str:
+    raw = f"{created_at.isoformat() if created_at is not None else '-infinity'}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Tuple[Optional[datetime], Optional[UUID]]:
+    """
+    Decode a cursor into (created_at, id); (None, None) when no cursor is given.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    if not cursor:
+        return None, None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|", 1)
+        if created_at == "-infinity":
+            return NULL_CREATED_AT, UUID(row_id)
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def next_cursor(rows: list, limit: int) -> Optional[str]:
+    """Cursor for the page after `rows`, or None when this was the last page."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(last["created_at"], last["id"])
+
+
+def parse_fields(fields: Optional[str], allowed: Mapping[str, str], default: Sequence[str]) -> List[str]:
+    """
+    Map a comma-separated `fields` parameter to whitelisted SELECT expressions.
+
+    `id` and `created_at` are always selected so every row can produce a cursor.
+
+    Raises:
+        ValueError: If a requested field is not in `allowed`.
+    """
+    names = [f.strip() for f in fields.split(",") if f.strip()] if fields else list(default)
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(allowed)})")
+    for required in ("created_at", "id"):
+        if required not in names:
+            names.insert(0, required)
+    return [allowed[name] for name in names]
+
+
+def keyset_query(
+    select: Sequence[str],
+    from_sql: str,
+    alias: str,
+    filters: Sequence[str] = (),
+    args: Sequence[Any] = (),
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    nullable: bool = False,
+) -> Tuple[str, List[Any]]:
+    """
+    Build a newest-first keyset page over `alias`.(created_at, id).
+
+    `filters` use $1..$n for `args`; the cursor and limit parameters are appended after them.
+    Pass nullable=True when created_at may be NULL (see sort_key).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    args = list(args)
+    where = list(filters)
+    key = sort_key(alias, nullable)
+    cursor_ts, cursor_id = decode_cursor(cursor)
+    if cursor_ts is not None:
+        args += [cursor_ts, cursor_id]
+        where.append(f"({key}, {alias}.id) < (${len(args) - 1}, ${len(args)})")
+
+    sql = f"SELECT {', '.join(select)} FROM {from_sql}"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {key} DESC, {alias}.id DESC"
+    if limit is not None:
+        args.append(limit)
+        sql += f" LIMIT ${len(args)}"
+    return sql, args
+
+
+async def ndjson_lines(rows: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode rows as newline-delimited JSON, one line per row as it arrives."""
+    async for row in rows:
+        yield json_dumps(row) + b"\n"
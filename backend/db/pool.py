@@ -0,0 +1,109 @@
+"""
+asyncpg pool configuration and the connection class used by PostgresDB.
+"""
+
+import os
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict
+
+import asyncpg
+from asyncpg.exceptions import (
+    FeatureNotSupportedError,
+    InvalidCachedStatementError,
+    InvalidSQLStatementNameError,
+)
+from asyncpg.prepared_stmt import PreparedStatement
+
+from db.statements import STATEMENTS
+
+logger = logging.getLogger("postgres_db")
+
+POOL_MODE_SESSION = "session"
+POOL_MODE_TRANSACTION = "transaction"
+
+# Raised when a prepared statement no longer matches the schema (e.g. after a migration)
+STALE_STATEMENT_ERRORS = (InvalidCachedStatementError, FeatureNotSupportedError, InvalidSQLStatementNameError)
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+@dataclass
+class PoolConfig:
+    """
+    Pool sizing and statement-cache settings for asyncpg.create_pool.
+
+    transaction_pooler: set when DATABASE_URL points at a transaction-mode pooler
+    (PgBouncer / Railway pooler). Server-side prepared statements do not survive
+    across transactions there, so the statement cache and the named statement
+    registry are disabled and queries run as unnamed statements.
+    """
+    min_size: int = 2
+    max_size: int = 10
+    command_timeout: float = 60.0
+    max_inactive_connection_lifetime: float = 300.0
+    statement_cache_size: int = 100
+    transaction_pooler: bool = False
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """Read DB_POOL_* settings; unset variables keep the defaults above."""
+        defaults = cls()
+        mode = os.getenv("DB_POOL_MODE", POOL_MODE_SESSION).strip().lower()
+        if mode not in (POOL_MODE_SESSION, POOL_MODE_TRANSACTION):
+            logger.warning(f"Unknown DB_POOL_MODE '{mode}', defaulting to '{POOL_MODE_SESSION}'")
+            mode = POOL_MODE_SESSION
+
+        return cls(
+            min_size=_env_int("DB_POOL_MIN_SIZE", defaults.min_size),
+            max_size=_env_int("DB_POOL_MAX_SIZE", defaults.max_size),
+            command_timeout=_env_float("DB_COMMAND_TIMEOUT", defaults.command_timeout),
+            max_inactive_connection_lifetime=_env_float(
+                "DB_POOL_MAX_INACTIVE_LIFETIME", defaults.max_inactive_connection_lifetime
+            ),
+            statement_cache_size=_env_int("DB_STATEMENT_CACHE_SIZE", defaults.statement_cache_size),
+            transaction_pooler=mode == POOL_MODE_TRANSACTION,
+        )
+
+    def pool_kwargs(self) -> Dict[str, Any]:
+        """Keyword arguments for asyncpg.create_pool."""
+        return {
+            "min_size": min(self.min_size, self.max_size),
+            "max_size": self.max_size,
+            "command_timeout": self.command_timeout,
+            "max_inactive_connection_lifetime": self.max_inactive_connection_lifetime,
+            "statement_cache_size": 0 if self.transaction_pooler else self.statement_cache_size,
+            "connection_class": PreparedConnection,
+        }
+
+
+class PreparedConnection(asyncpg.Connection):
+    """asyncpg connection that keeps the statements in db/statements.py prepared."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._named_statements: Dict[str, PreparedStatement] = {}
+
+    async def prepare_registry(self):
+        """Prepare every registered statement (called from the pool init hook)."""
+        for name in STATEMENTS:
+            try:
+                await self.named_statement(name)
+            except asyncpg.PostgresError as e:
+                # e.g. optional table missing in this database; retried lazily on first use
+                logger.warning(f"Could not prepare statement '{name}': {e}")
+
+    async def named_statement(self, name: str, refresh: bool = False) -> PreparedStatement:
+        stmt = None if refresh else self._named_statements.get(name)
+        if stmt is None:
+            stmt = await self.prepare(STATEMENTS[name])
+            self._named_statements[name] = stmt
+        return stmt
@@ -1,15 +1,40 @@
 import os
-import logging
 import json
+import logging
 import asyncpg
-from typing import Optional, List, Dict, Any
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, AsyncIterator, Tuple
 from datetime import datetime
 from urllib.parse import quote
+from uuid import UUID
+
+from db.cache import IdentityCache, MISSING
+from db.codecs import register_codecs
+from db.pool import PoolConfig, STALE_STATEMENT_ERRORS
+from db.statements import (
+    STATEMENTS,
+    ANALYSIS_HISTORY_FIELDS,
+    LEGISLATION_FIELDS,
+    SCRAPE_DEFAULT_FIELDS,
+    SCRAPE_FIELDS,
+    SOURCE_DEFAULT_FIELDS,
+    SOURCE_FIELDS,
+)
+from db.pagination import decode_cursor, keyset_query, parse_fields
 
 logger = logging.getLogger("postgres_db")
 
+# jurisdiction_stats row holding totals across all jurisdictions (migration 009)
+GLOBAL_STATS_ID = UUID(int=0)
+
+# NOTIFY channel used to drop IdentityCache entries in every process sharing the database
+CACHE_INVALIDATION_CHANNEL = "affordabot_cache_invalidate"
+
+# NOTIFY channel that wakes idle ingest workers when jobs are enqueued (payload unused)
+INGESTION_JOBS_CHANNEL = "affordabot_ingestion_jobs"
+
 class PostgresDB:
-    def __init__(self, database_url: Optional[str] = None):
+    def __init__(self, database_url: Optional[str] = None, pool_config: Optional[PoolConfig] = None):
         self.database_url = database_url or os.getenv("DATABASE_URL_PUBLIC") or os.getenv("DATABASE_URL")
         # Handle transaction pooler url compatibility if needed (asyncpg usually needs strict formatting)
         # But generic postgres:// should work.
@@ -17,6 +42,17 @@ class PostgresDB:
             logger.warning("DATABASE_URL not set. Database operations will fail.")
         
         self.pool: Optional[asyncpg.Pool] = None
+        self.pool_config = pool_config or PoolConfig.from_env()
+        self._waiters = 0
+        self.cache = IdentityCache.from_env()
+        self._listen_conn: Optional[asyncpg.Connection] = None
+        self._jobs_listen_conn: Optional[asyncpg.Connection] = None
+
+    async def _init_connection(self, conn: asyncpg.Connection):
+        """Per-connection setup: codecs, then the named statement registry (db/statements.py)."""
+        await register_codecs(conn)
+        if not self.pool_config.transaction_pooler:
+            await conn.prepare_registry()
 
     async def connect(self):
         """Explicitly connect/create pool. Helpers will auto-connect if needed."""
@@ -29,53 +65,180 @@ class PostgresDB:
                 # Railway internal network and TCP Proxy don't support SSL upgrade
                 # Only use SSL for true external connections (External DBs, etc.)
                 use_ssl = 'railway.internal' not in self.database_url and 'proxy.rlwy.net' not in self.database_url
-                
+                pool_kwargs = self.pool_config.pool_kwargs()
+                ssl_kwargs = {'ssl': 'require'} if use_ssl else {}
+
+                self.pool = await asyncpg.create_pool(
+                    self.database_url, init=self._init_connection, **ssl_kwargs, **pool_kwargs
+                )
                 if use_ssl:
-                    self.pool = await asyncpg.create_pool(self.database_url, ssl='require')
                     logger.info("Connected to DB with SSL")
                 else:
-                    self.pool = await asyncpg.create_pool(self.database_url)
                     logger.info("Connected to DB without SSL (Railway internal network)")
+                if self.pool_config.transaction_pooler:
+                    logger.info("Transaction pooler mode: statement cache and named statements disabled")
             except Exception as e:
                 logger.error(f"Failed to connect to DB: {e}")
                 raise
 
+            await self._start_cache_listener(**ssl_kwargs)
+
     async def close(self):
+        if self._jobs_listen_conn:
+            await self._jobs_listen_conn.close()
+            self._jobs_listen_conn = None
+        if self._listen_conn:
+            await self._listen_conn.close()
+            self._listen_conn = None
         if self.pool:
             await self.pool.close()
 
+    async def _start_cache_listener(self, **connect_kwargs):
+        """
+        LISTEN for invalidations from other processes on a dedicated connection.
+
+        Skipped behind a transaction pooler (LISTEN needs a session); entries then
+        only expire by TTL there.
+        """
+        if self.pool_config.transaction_pooler or not self.cache.enabled:
+            return
+        try:
+            self._listen_conn = await asyncpg.connect(self.database_url, **connect_kwargs)
+            await self._listen_conn.add_listener(CACHE_INVALIDATION_CHANNEL, self._on_cache_notification)
+            self._listen_conn.add_termination_listener(self._on_listener_terminated)
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener unavailable, relying on TTL: {e}")
+            self._listen_conn = None
+
+    def _on_cache_notification(self, conn, pid, channel, payload):
+        try:
+            message = json.loads(payload)
+            self.cache.invalidate(message["ns"], message.get("key"))
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed cache invalidation: {payload!r}")
+
+    def _on_listener_terminated(self, conn):
+        # Invalidations may be missed from here on; start clean and fall back to TTL
+        logger.warning("Cache invalidation listener disconnected; clearing identity cache")
+        self.cache.clear()
+        self._listen_conn = None
+
+    async def _invalidate(self, namespace: str, key: Optional[str] = None, conn: Optional[asyncpg.Connection] = None):
+        """
+        Drop cache entries here and NOTIFY other processes.
+
+        Pass `conn` when inside a transaction so the notification is only delivered on commit.
+        """
+        self.cache.invalidate(namespace, key)
+        payload = json.dumps({"ns": namespace, "key": key})
+        try:
+            if conn is not None:
+                await conn.execute("SELECT pg_notify($1, $2)", CACHE_INVALIDATION_CHANNEL, payload)
+            else:
+                await self._execute("SELECT pg_notify($1, $2)", CACHE_INVALIDATION_CHANNEL, payload)
+        except Exception as e:
+            logger.warning(f"Failed to publish cache invalidation for {namespace}: {e}")
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Identity cache hit/miss counters and whether cross-process invalidation is active."""
+        return {**self.cache.stats(), "listening": self._listen_conn is not None}
+
     def is_connected(self) -> bool:
         return self.pool is not None and not self.pool._closed
 
-    async def _execute(self, query: str, *args) -> str:
+    def pool_stats(self) -> Dict[str, Any]:
+        """Pool saturation snapshot: connections acquired/idle and callers waiting to acquire."""
+        if not self.pool:
+            return {"connected": False, "waiters": self._waiters}
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        return {
+            "connected": self.is_connected(),
+            "mode": "transaction" if self.pool_config.transaction_pooler else "session",
+            "min_size": self.pool.get_min_size(),
+            "max_size": self.pool.get_max_size(),
+            "size": size,
+            "acquired": size - idle,
+            "idle": idle,
+            "waiters": self._waiters,
+        }
+
+    @asynccontextmanager
+    async def _acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """Acquire a pooled connection, tracking callers blocked on the pool."""
         if not self.pool:
             await self.connect()
-        async with self.pool.acquire() as conn:
+        self._waiters += 1
+        try:
+            conn = await self.pool.acquire()
+        finally:
+            self._waiters -= 1
+        try:
+            yield conn
+        finally:
+            await self.pool.release(conn)
+
+    async def _execute(self, query: str, *args) -> str:
+        async with self._acquire() as conn:
             return await conn.execute(query, *args)
 
     async def _fetchrow(self, query: str, *args) -> Optional[asyncpg.Record]:
-        if not self.pool:
-            await self.connect()
-        async with self.pool.acquire() as conn:
+        async with self._acquire() as conn:
             return await conn.fetchrow(query, *args)
     
     async def _fetch(self, query: str, *args) -> List[asyncpg.Record]:
-        if not self.pool:
-            await self.connect()
-        async with self.pool.acquire() as conn:
+        async with self._acquire() as conn:
             return await conn.fetch(query, *args)
 
+    async def stream(self, query: str, *args, prefetch: int = 500) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield rows from a server-side cursor, fetching `prefetch` rows per round-trip.
+
+        Holds one pooled connection (in the read-only transaction cursors require)
+        until the iterator is exhausted or closed, so exports never materialize the full result.
+        """
+        async with self._acquire() as conn:
+            async with conn.transaction(readonly=True):
+                async for record in conn.cursor(query, *args, prefetch=prefetch):
+                    yield dict(record)
+
+    async def _fetch_named(self, name: str, *args) -> List[asyncpg.Record]:
+        """Run a statement from the db/statements.py registry."""
+        async with self._acquire() as conn:
+            if self.pool_config.transaction_pooler:
+                return await conn.fetch(STATEMENTS[name], *args)
+            stmt = await conn.named_statement(name)
+            try:
+                return await stmt.fetch(*args)
+            except STALE_STATEMENT_ERRORS:
+                # Schema changed under the prepared plan; re-prepare once
+                stmt = await conn.named_statement(name, refresh=True)
+                return await stmt.fetch(*args)
+
+    async def _fetchrow_named(self, name: str, *args) -> Optional[asyncpg.Record]:
+        rows = await self._fetch_named(name, *args)
+        return rows[0] if rows else None
+
     async def get_jurisdiction_by_name(self, name: str) -> Optional[Dict[str, Any]]:
         """Get jurisdiction config by name."""
+        cached = self.cache.get(("jurisdiction", name))
+        if cached is not MISSING:
+            return dict(cached)
         try:
-            row = await self._fetchrow("SELECT * FROM jurisdictions WHERE name = $1", name)
-            return dict(row) if row else None
+            row = await self._fetchrow_named("jurisdiction_by_name", name)
+            if not row:
+                return None
+            self.cache.set(("jurisdiction", name), dict(row))
+            return dict(row)
         except Exception as e:
             logger.error(f"Error in get_jurisdiction_by_name: {e}")
             return None
 
     async def get_or_create_jurisdiction(self, name: str, type: str) -> Optional[str]:
         """Get jurisdiction ID, creating if it doesn't exist."""
+        cached = self.cache.get(("jurisdiction_id", name))
+        if cached is not MISSING:
+            return cached
         try:
             normalized_type = (type or "").strip().lower()
             if normalized_type == "municipality":
@@ -86,62 +249,31 @@ class PostgresDB:
                 )
                 normalized_type = "city"
 
-            # Check if exists
-            row = await self._fetchrow("SELECT id FROM jurisdictions WHERE name = $1", name)
-            if row:
-                return str(row['id'])
-            
-            # Create new
-            row = await self._fetchrow(
-                "INSERT INTO jurisdictions (name, type) VALUES ($1, $2) RETURNING id",
-                name, normalized_type
-            )
-            return str(row['id']) if row else None
+            # Single-statement select-or-insert (UNIQUE(name), migration 006)
+            row = await self._fetchrow_named("upsert_jurisdiction", name, normalized_type)
+            if not row:
+                # Lost an insert race to a transaction that committed mid-statement
+                row = await self._fetchrow_named("jurisdiction_id_by_name", name)
+            if not row:
+                return None
+            self.cache.set(("jurisdiction_id", name), str(row['id']))
+            return str(row['id'])
         except Exception as e:
             logger.error(f"Error in get_or_create_jurisdiction: {e}")
             return None
 
     async def store_legislation(self, jurisdiction_id: str, bill_data: Dict[str, Any]) -> Optional[str]:
-        """Store legislation in database."""
+        """Store legislation in database (atomic upsert on jurisdiction_id + bill_number)."""
         try:
-            # Check existing
-            row = await self._fetchrow(
-                "SELECT id FROM legislation WHERE jurisdiction_id = $1 AND bill_number = $2",
-                jurisdiction_id, bill_data["bill_number"]
-            )
-            
-            if row:
-                # Update
-                update_query = """
-                    UPDATE legislation 
-                    SET title = $1, text_content = $2, status = $3, updated_at = $4
-                    WHERE id = $5
-                    RETURNING id
-                """
-                await self._execute(
-                    update_query,
-                    bill_data["title"], bill_data["text"], bill_data["status"], datetime.now(),
-                    row['id']
-                )
-                return str(row['id'])
-            
-            # Insert
-            insert_query = """
-                INSERT INTO legislation 
-                (jurisdiction_id, bill_number, title, text_content, introduced_date, status, raw_html, analysis_status)
-                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                RETURNING id
-            """
-            row = await self._fetchrow(
-                insert_query,
-                jurisdiction_id, 
+            row = await self._fetchrow_named(
+                "upsert_legislation",
+                jurisdiction_id,
                 bill_data["bill_number"],
                 bill_data["title"],
                 bill_data["text"],
                 bill_data.get("introduced_date"),
                 bill_data["status"],
                 bill_data.get("raw_html"),
-                "pending"
             )
             return str(row['id']) if row else None
 
@@ -149,17 +281,45 @@ class PostgresDB:
             logger.error(f"Error in store_legislation: {e}")
             return None
 
+    async def store_legislation_many(self, jurisdiction_id: str, bills: List[Dict[str, Any]]) -> Dict[str, str]:
+        """
+        Store a whole scrape result in one statement.
+
+        Args:
+            jurisdiction_id: Jurisdiction the bills belong to.
+            bills: bill_data dicts as accepted by store_legislation.
+
+        Returns:
+            Mapping of bill_number -> legislation ID (empty on failure).
+        """
+        if not bills:
+            return {}
+        try:
+            # ON CONFLICT cannot touch the same row twice in one statement: last one wins
+            by_number = {bill["bill_number"]: bill for bill in bills}
+            rows = await self._fetch_named(
+                "upsert_legislation_many",
+                jurisdiction_id,
+                list(by_number.keys()),
+                [b["title"] for b in by_number.values()],
+                [b.get("text") for b in by_number.values()],
+                [b.get("introduced_date") for b in by_number.values()],
+                [b.get("status") for b in by_number.values()],
+                [b.get("raw_html") for b in by_number.values()],
+            )
+            return {row['bill_number']: str(row['id']) for row in rows}
+        except Exception as e:
+            logger.error(f"Error in store_legislation_many: {e}")
+            return {}
+
     async def create_legislation(self, jurisdiction_id: str, bill_data: Dict[str, Any]) -> Optional[str]:
         """Alias for store_legislation."""
         return await self.store_legislation(jurisdiction_id, bill_data)
 
     async def store_impacts(self, legislation_id: str, impacts: List[Dict[str, Any]]) -> bool:
         """Store impact analysis results."""
-        if not self.pool:
-            await self.connect()
-
         try:
-            async with self.pool.acquire() as conn:
+            async with self._acquire() as conn:
                 async with conn.transaction():
                     # Delete existing
                     await conn.execute("DELETE FROM impacts WHERE legislation_id = $1", legislation_id)
@@ -173,14 +333,13 @@ class PostgresDB:
                             VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
                         """
                         for impact in impacts:
-                            evidence = json.dumps(impact.get("evidence", []))
                             await conn.execute(
                                 insert_sql,
                                 legislation_id,
                                 impact["impact_number"],
                                 impact.get("relevant_clause"),
                                 impact["impact_description"],
-                                evidence,
+                                impact.get("evidence", []),
                                 impact["chain_of_causality"],
                                 impact.get("confidence_score", impact.get("confidence_factor", 0.0)),
                                 impact["p10"],
@@ -209,7 +368,7 @@ class PostgresDB:
                 VALUES ($1, $2, $3, NOW())
                 RETURNING id
                 """,
-                bill_id, jurisdiction, json.dumps(models)
+                bill_id, jurisdiction, models
             )
             return str(row['id']) if row else None
         except Exception as e:
@@ -225,7 +384,7 @@ class PostgresDB:
                 SET status = 'completed', result = $1, completed_at = NOW()
                 WHERE id = $2
                 """,
-                json.dumps(result), run_id
+                result, run_id
             )
             return True
         except Exception as e:
@@ -248,47 +407,93 @@ class PostgresDB:
             logger.error(f"Error failing pipeline run: {e}")
             return False
 
-    async def get_or_create_source(self, jurisdiction_id: str, name: str, type: str, url: str = None) -> Optional[str]:
-        """Get source ID, creating if it doesn't exist."""
+    async def get_or_create_source(self, jurisdiction_id: Optional[str], name: str, type: str, url: str = None) -> Optional[str]:
+        """Get source ID, creating if it doesn't exist. jurisdiction_id is None for generic web sources."""
         try:
+            jurisdiction_uuid = UUID(str(jurisdiction_id)) if jurisdiction_id else None
+
             # Railway schema requires sources.url NOT NULL. When upstream doesn't provide one,
             # synthesize a stable placeholder so ingestion can proceed.
             if not url:
                 safe_name = quote(name or "unknown", safe="")
-                url = f"unknown://{jurisdiction_id}/{type}/{safe_name}"
+                url = f"unknown://{jurisdiction_id or 'web'}/{type}/{safe_name}"
 
-            # Check by URL if provided (stronger match), otherwise Name
-            if url:
-                row = await self._fetchrow("SELECT id FROM sources WHERE url = $1", url)
-                if row:
-                    return str(row['id'])
+            cache_key = ("source", jurisdiction_id, name, url)
+            cached = self.cache.get(cache_key)
+            if cached is not MISSING:
+                return cached
 
-            row = await self._fetchrow(
-                "SELECT id FROM sources WHERE jurisdiction_id = $1 AND name = $2",
-                jurisdiction_id, name
-            )
-            if row:
-                return str(row['id'])
-                
-            row = await self._fetchrow(
-                "INSERT INTO sources (jurisdiction_id, name, type, url) VALUES ($1, $2, $3, $4) RETURNING id",
-                jurisdiction_id, name, type, url
-            )
-            return str(row['id']) if row else None
+            # Match by URL (stronger), then by name, else insert -- one statement (UNIQUE(url), migration 006)
+            row = await self._fetchrow_named("upsert_source", jurisdiction_uuid, name, type, url)
+            if not row:
+                return None
+            self.cache.set(cache_key, str(row['id']))
+            return str(row['id'])
         except Exception as e:
             logger.error(f"Error in get_or_create_source: {e}")
             return None
 
-    async def get_sources(self, jurisdiction_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """List sources, optionally filtered by jurisdiction."""
-        if jurisdiction_id:
-            query = "SELECT * FROM sources WHERE jurisdiction_id = $1"
-            rows = await self._fetch(query, jurisdiction_id)
-        else:
-            query = "SELECT * FROM sources"
-            rows = await self._fetch(query)
+    def _sources_query(
+        self, jurisdiction_id: Optional[UUID], limit: Optional[int], cursor: Optional[str], fields: Optional[str]
+    ):
+        filters, args = ([], []) if not jurisdiction_id else (["s.jurisdiction_id = $1"], [jurisdiction_id])
+        return keyset_query(
+            parse_fields(fields, SOURCE_FIELDS, SOURCE_DEFAULT_FIELDS),
+            "sources s", "s", filters, args, cursor=cursor, limit=limit,
+        )
+
+    async def get_sources(
+        self,
+        jurisdiction_id: Optional[UUID] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        List sources newest first, optionally filtered by jurisdiction.
+
+        Raises:
+            ValueError: On an invalid cursor or unknown field.
+        """
+        sql, args = self._sources_query(jurisdiction_id, limit, cursor, fields)
+        rows = await self._fetch(sql, *args)
         return [dict(row) for row in rows]
 
+    def stream_sources(
+        self, jurisdiction_id: Optional[UUID] = None, cursor: Optional[str] = None, fields: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Every source after `cursor`, streamed from a server-side cursor."""
+        sql, args = self._sources_query(jurisdiction_id, None, cursor, fields)
+        return self.stream(sql, *args)
+
+    def _scrapes_query(self, limit: Optional[int], cursor: Optional[str], fields: Optional[str]):
+        # LEFT JOINs to unique keys are removed by the planner when no joined column is selected
+        return keyset_query(
+            parse_fields(fields, SCRAPE_FIELDS, SCRAPE_DEFAULT_FIELDS),
+            "raw_scrapes rs"
+            " LEFT JOIN sources s ON rs.source_id = s.id"
+            " LEFT JOIN jurisdictions j ON s.jurisdiction_id = j.id",
+            "rs", cursor=cursor, limit=limit,
+        )
+
+    async def list_scrapes(
+        self, limit: int = 50, cursor: Optional[str] = None, fields: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Recent raw scrapes, newest first, with their jurisdiction.
+
+        Raises:
+            ValueError: On an invalid cursor or unknown field.
+        """
+        sql, args = self._scrapes_query(limit, cursor, fields)
+        rows = await self._fetch(sql, *args)
+        return [dict(row) for row in rows]
+
+    def stream_scrapes(self, cursor: Optional[str] = None, fields: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Every raw scrape after `cursor`, streamed from a server-side cursor."""
+        sql, args = self._scrapes_query(None, cursor, fields)
+        return self.stream(sql, *args)
+
     async def get_source(self, source_id: str) -> Optional[Dict[str, Any]]:
         """Get a single source by ID."""
         query = "SELECT * FROM sources WHERE id = $1"
@@ -301,6 +506,7 @@ class PostgresDB:
         placeholders = ", ".join([f"${i+1}" for i in range(len(data))])
         query = f"INSERT INTO sources ({columns}) VALUES ({placeholders}) RETURNING *"
         row = await self._fetchrow(query, *data.values())
+        await self._invalidate("source")
         return dict(row)
 
     async def update_source(self, source_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -308,12 +514,31 @@ class PostgresDB:
         set_clause = ", ".join([f"{k} = ${i+2}" for i, k in enumerate(data.keys())])
         query = f"UPDATE sources SET {set_clause} WHERE id = $1 RETURNING *"
         row = await self._fetchrow(query, source_id, *data.values())
+        await self._invalidate("source")
         return dict(row) if row else {}
 
+    async def record_harvest(self, source_id: str, harvest: Dict[str, Any]) -> bool:
+        """Store the harvester's change-detection state (validators, hashes) in sources.metadata."""
+        try:
+            await self._execute(
+                """
+                UPDATE sources
+                SET metadata = COALESCE(metadata, '{}'::jsonb) || jsonb_build_object('harvest', $2::jsonb),
+                    last_scraped_at = now()
+                WHERE id = $1
+                """,
+                UUID(str(source_id)), harvest,
+            )
+            return True
+        except Exception as e:
+            logger.error(f"Error recording harvest for source {source_id}: {e}")
+            return False
+
     async def delete_source(self, source_id: str) -> None:
         """Delete a source."""
         query = "DELETE FROM sources WHERE id = $1"
         await self._execute(query, source_id)
+        await self._invalidate("source")
 
     # Admin Task Methods
     async def create_admin_task(self, task_id: str, task_type: str, jurisdiction: str, status: str = "queued", config: Dict = None) -> bool:
@@ -323,7 +548,7 @@ class PostgresDB:
                 INSERT INTO admin_tasks (id, task_type, jurisdiction, status, config, created_at)
                 VALUES ($1, $2, $3, $4, $5, $6)
                 """,
-                task_id, task_type, jurisdiction, status, json.dumps(config) if config else None, datetime.now()
+                task_id, task_type, jurisdiction, status, config, datetime.now()
             )
             return True
         except Exception as e:
@@ -332,20 +557,10 @@ class PostgresDB:
 
     async def update_admin_task(self, task_id: str, status: str, result: Dict = None, error: str = None) -> bool:
         try:
-            fields = ["status = $1", "completed_at = $2"]
-            args = [status, datetime.now()]
-            
-            if result:
-                fields.append("result = $" + str(len(args) + 1))
-                args.append(json.dumps(result))
-            if error:
-                fields.append("error_message = $" + str(len(args) + 1))
-                args.append(error)
-            
-            args.append(task_id) # Last arg is ID
-            
-            query = f"UPDATE admin_tasks SET {', '.join(fields)} WHERE id = ${len(args)}"
-            await self._execute(query, *args)
+            # NULL result/error keep the stored value (COALESCE in the statement)
+            await self._fetch_named(
+                "update_admin_task", status, datetime.now(), result or None, error or None, task_id
+            )
             return True
         except Exception as e:
             logger.error(f"Error updating admin task: {e}")
@@ -385,8 +600,8 @@ class PostgresDB:
                 SELECT rs.id, rs.source_id, rs.url, rs.data, rs.metadata, rs.content_hash, rs.storage_uri, rs.document_id
                 FROM raw_scrapes rs
                 JOIN sources s ON rs.source_id = s.id
-                WHERE s.jurisdiction_id = (SELECT id::text FROM jurisdictions WHERE name = $1)
-                AND (rs.metadata->>'bill_number')::text = $2
+                WHERE s.jurisdiction_id = (SELECT id FROM jurisdictions WHERE name = $1)
+                AND rs.metadata->>'bill_number' = $2  -- idx_raw_scrapes_bill_number (migration 007)
                 ORDER BY rs.created_at DESC
                 LIMIT 1
             """
@@ -398,6 +613,38 @@ class PostgresDB:
             print(f"❌ Error getting latest scrape: {e}")
             return None
 
+    async def get_jurisdiction_stats(self, jurisdiction_id: Optional[UUID] = None) -> Dict[str, Any]:
+        """
+        Counters for one jurisdiction, or totals across all of them when jurisdiction_id is None.
+
+        Reads the jurisdiction_stats view (rolled-up counters plus pending trigger deltas);
+        missing rows mean zero counts.
+        """
+        try:
+            row = await self._fetchrow_named("jurisdiction_stats", jurisdiction_id or GLOBAL_STATS_ID)
+            return dict(row) if row else {}
+        except Exception as e:
+            logger.error(f"Error fetching jurisdiction stats: {e}")
+            return {}
+
+    async def rollup_jurisdiction_stats(self) -> int:
+        """Fold pending counter deltas into jurisdiction_stats_rollup (migration 009); returns how many."""
+        try:
+            row = await self._fetchrow("SELECT rollup_jurisdiction_stats() AS folded")
+            return row["folded"] if row else 0
+        except Exception as e:
+            logger.error(f"Error rolling up jurisdiction stats: {e}")
+            return 0
+
+    async def refresh_jurisdiction_stats(self) -> bool:
+        """Recount jurisdiction_stats from the base tables (repairs drift from re-assigned sources)."""
+        try:
+            await self._execute("SELECT refresh_jurisdiction_stats()")
+            return True
+        except Exception as e:
+            logger.error(f"Error refreshing jurisdiction stats: {e}")
+            return False
+
     async def get_vector_stats(self, document_id: str) -> Dict[str, Any]:
         """Get stats for a user-facing document (chunk count)."""
         try:
@@ -410,6 +657,228 @@ class PostgresDB:
             print(f"❌ Error getting vector stats: {e}")
             return {"chunk_count": 0}
 
+    async def get_cached_embeddings(
+        self, model: str, dimensions: int, content_hashes: List[bytes]
+    ) -> Dict[bytes, Any]:
+        """Look up cached embeddings by content hash; returns {hash: embedding} for hits only."""
+        if not content_hashes:
+            return {}
+        try:
+            rows = await self._fetch_named("embedding_cache_lookup", model, dimensions, content_hashes)
+            return {bytes(row["content_hash"]): row["embedding"] for row in rows}
+        except Exception as e:
+            logger.error(f"Error reading embedding cache: {e}")
+            return {}
+
+    async def store_cached_embeddings(
+        self, model: str, dimensions: int, entries: List[Tuple[bytes, Any]]
+    ) -> bool:
+        """Insert (content_hash, embedding) pairs; existing entries are left untouched."""
+        if not entries:
+            return True
+        try:
+            async with self._acquire() as conn:
+                await conn.executemany(
+                    STATEMENTS["embedding_cache_store"],
+                    [(model, dimensions, content_hash, embedding) for content_hash, embedding in entries],
+                )
+            return True
+        except Exception as e:
+            logger.error(f"Error writing embedding cache: {e}")
+            return False
+
+    async def prune_embedding_cache(self, max_age_days: float) -> int:
+        """Delete cache entries not used for max_age_days; returns the number removed."""
+        try:
+            status = await self._execute(
+                "DELETE FROM embedding_cache WHERE last_used_at < now() - make_interval(secs => $1)",
+                max_age_days * 86400,
+            )
+            return int(status.split()[-1])
+        except Exception as e:
+            logger.error(f"Error pruning embedding cache: {e}")
+            return 0
+
+    # Ingestion queue (migration 012, services/ingestion_worker.py)
+    async def enqueue_ingestion_jobs(self, scrape_ids: List[str], priority: int = 0, max_attempts: int = 5) -> int:
+        """Queue scrapes for ingestion; scrapes that already have a live job are skipped. Returns jobs added."""
+        if not scrape_ids:
+            return 0
+        try:
+            status = await self._execute(
+                """
+                INSERT INTO ingestion_jobs (scrape_id, priority, max_attempts)
+                SELECT DISTINCT s.id, $2::smallint, $3::integer FROM unnest($1::uuid[]) AS s(id)
+                ON CONFLICT (scrape_id) WHERE status IN ('queued', 'leased') DO NOTHING
+                """,
+                [str(scrape_id) for scrape_id in scrape_ids], priority, max_attempts,
+            )
+            added = int(status.split()[-1])
+            if added:
+                await self._notify_ingestion_jobs()
+            return added
+        except Exception as e:
+            logger.error(f"Error enqueueing ingestion jobs: {e}")
+            return 0
+
+    async def enqueue_unprocessed_scrapes(self, source_ids: Optional[List[str]] = None) -> int:
+        """Queue every never-processed scrape (optionally only from source_ids). Returns jobs added."""
+        try:
+            status = await self._execute(
+                """
+                INSERT INTO ingestion_jobs (scrape_id)
+                SELECT id FROM raw_scrapes
+                WHERE processed IS NULL AND ($1::uuid[] IS NULL OR source_id = ANY($1::uuid[]))
+                ON CONFLICT (scrape_id) WHERE status IN ('queued', 'leased') DO NOTHING
+                """,
+                [str(source_id) for source_id in source_ids] if source_ids is not None else None,
+            )
+            added = int(status.split()[-1])
+            if added:
+                await self._notify_ingestion_jobs()
+            return added
+        except Exception as e:
+            logger.error(f"Error enqueueing unprocessed scrapes: {e}")
+            return 0
+
+    async def _notify_ingestion_jobs(self):
+        try:
+            await self._execute("SELECT pg_notify($1, '')", INGESTION_JOBS_CHANNEL)
+        except Exception as e:
+            logger.warning(f"Failed to notify ingest workers: {e}")
+
+    async def listen_ingestion_jobs(self, callback) -> bool:
+        """
+        Call callback() whenever jobs are enqueued, from any process (dedicated LISTEN connection).
+
+        Returns False behind a transaction pooler or when the listener cannot connect;
+        workers then rely on polling.
+        """
+        if self.pool_config.transaction_pooler or not self.database_url:
+            return False
+        try:
+            if not self._jobs_listen_conn:
+                use_ssl = 'railway.internal' not in self.database_url and 'proxy.rlwy.net' not in self.database_url
+                self._jobs_listen_conn = await asyncpg.connect(self.database_url, **({'ssl': 'require'} if use_ssl else {}))
+            await self._jobs_listen_conn.add_listener(INGESTION_JOBS_CHANNEL, lambda *_: callback())
+            return True
+        except Exception as e:
+            logger.warning(f"Ingestion job listener unavailable, polling instead: {e}")
+            return False
+
+    async def lease_ingestion_jobs(self, worker_id: str, limit: int, lease_seconds: float) -> List[Dict[str, Any]]:
+        """Lease up to limit ready jobs (SKIP LOCKED); expired leases are reaped first."""
+        try:
+            await self._fetch_named("ingestion_jobs_reap")
+            rows = await self._fetch_named("ingestion_jobs_lease", worker_id, limit, lease_seconds)
+            return [dict(row) for row in rows]
+        except Exception as e:
+            logger.error(f"Error leasing ingestion jobs: {e}")
+            return []
+
+    async def complete_ingestion_jobs(self, job_ids: List[int], worker_id: str) -> int:
+        """Mark leased jobs done; jobs whose lease this worker lost are left alone."""
+        if not job_ids:
+            return 0
+        try:
+            return len(await self._fetch_named("ingestion_jobs_complete", job_ids, worker_id))
+        except Exception as e:
+            logger.error(f"Error completing ingestion jobs: {e}")
+            return 0
+
+    async def fail_ingestion_jobs(
+        self, errors: Dict[int, str], worker_id: str, retry_base_seconds: float = 30, retry_max_seconds: float = 3600
+    ) -> Dict[int, str]:
+        """Requeue failed jobs with exponential backoff (or mark them dead); returns {job_id: new status}."""
+        if not errors:
+            return {}
+        try:
+            rows = await self._fetch_named(
+                "ingestion_jobs_fail",
+                list(errors.keys()), [error[:2000] for error in errors.values()],
+                worker_id, retry_base_seconds, retry_max_seconds,
+            )
+            return {row["id"]: row["status"] for row in rows}
+        except Exception as e:
+            logger.error(f"Error failing ingestion jobs: {e}")
+            return {}
+
+    async def extend_ingestion_leases(self, job_ids: List[int], worker_id: str, lease_seconds: float) -> int:
+        """Heartbeat: push out lease expiry for jobs still being processed."""
+        if not job_ids:
+            return 0
+        try:
+            return len(await self._fetch_named("ingestion_jobs_extend", job_ids, worker_id, lease_seconds))
+        except Exception as e:
+            logger.error(f"Error extending ingestion leases: {e}")
+            return 0
+
+    async def requeue_dead_ingestion_jobs(self, job_ids: Optional[List[int]] = None) -> int:
+        """Give dead jobs (all, or job_ids) a fresh set of attempts."""
+        try:
+            status = await self._execute(
+                """
+                UPDATE ingestion_jobs
+                SET status = 'queued', attempts = 0, available_at = now(), finished_at = NULL, updated_at = now()
+                WHERE id IN (
+                      -- Latest dead job per scrape; the live-scrape unique index allows only one
+                      SELECT DISTINCT ON (scrape_id) id FROM ingestion_jobs
+                      WHERE status = 'dead' AND ($1::bigint[] IS NULL OR id = ANY($1::bigint[]))
+                      ORDER BY scrape_id, id DESC
+                  )
+                  AND NOT EXISTS (
+                      SELECT 1 FROM ingestion_jobs live
+                      WHERE live.scrape_id = ingestion_jobs.scrape_id AND live.status IN ('queued', 'leased')
+                  )
+                """,
+                job_ids,
+            )
+            return int(status.split()[-1])
+        except Exception as e:
+            logger.error(f"Error requeueing dead ingestion jobs: {e}")
+            return 0
+
+    async def get_ingestion_queue_status(self, recent_failures: int = 20) -> Dict[str, Any]:
+        """Queue depth by status, backlog age, active workers and the latest dead jobs."""
+        try:
+            counts = await self._fetchrow(
+                """
+                SELECT
+                    count(*) FILTER (WHERE status = 'queued') AS queued,
+                    count(*) FILTER (WHERE status = 'queued' AND available_at <= now()) AS ready,
+                    count(*) FILTER (WHERE status = 'queued' AND attempts > 0) AS retrying,
+                    count(*) FILTER (WHERE status = 'leased') AS leased,
+                    count(*) FILTER (WHERE status = 'dead') AS dead,
+                    count(*) FILTER (WHERE status = 'done' AND finished_at > now() - interval '1 hour') AS done_last_hour,
+                    EXTRACT(EPOCH FROM now() - min(created_at) FILTER (WHERE status = 'queued')) AS oldest_queued_seconds
+                FROM ingestion_jobs
+                WHERE status <> 'done' OR finished_at > now() - interval '1 hour'
+                """
+            )
+            workers = await self._fetch(
+                """
+                SELECT leased_by AS worker_id, count(*) AS jobs, max(lease_expires_at) AS lease_expires_at
+                FROM ingestion_jobs WHERE status = 'leased'
+                GROUP BY leased_by ORDER BY leased_by
+                """
+            )
+            dead = await self._fetch(
+                """
+                SELECT id, scrape_id, attempts, last_error, finished_at
+                FROM ingestion_jobs WHERE status = 'dead'
+                ORDER BY finished_at DESC LIMIT $1
+                """,
+                recent_failures,
+            )
+            return {
+                **(dict(counts) if counts else {}),
+                "workers": [dict(row) for row in workers],
+                "recent_failures": [dict(row) for row in dead],
+            }
+        except Exception as e:
+            logger.error(f"Error fetching ingestion queue status: {e}")
+            return {}
+
     # RAG Support (Raw Scrapes) - needed for RAG Port but defining now for daily_scrape port
     async def create_raw_scrape(self, scrape_record: Dict[str, Any]) -> Optional[str]:
         try:
@@ -423,9 +892,9 @@ class PostgresDB:
                 scrape_record["source_id"],
                 scrape_record["content_hash"],
                 scrape_record["content_type"],
-                json.dumps(scrape_record["data"]),
+                scrape_record["data"],
                 scrape_record["url"],
-                json.dumps(scrape_record["metadata"]),
+                scrape_record["metadata"],
                 scrape_record.get("storage_uri"),
                 scrape_record.get("document_id")
             )
@@ -437,7 +906,7 @@ class PostgresDB:
     async def get_admin_task(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get admin task by ID."""
         try:
-            row = await self._fetchrow("SELECT * FROM admin_tasks WHERE id = $1", task_id)
+            row = await self._fetchrow_named("admin_task_by_id", task_id)
             return dict(row) if row else None
         except Exception as e:
             logger.error(f"Error fetching admin task: {e}")
@@ -474,11 +943,13 @@ class PostgresDB:
     # System Prompt Methods
     async def get_system_prompt(self, prompt_type: str) -> Optional[Dict[str, Any]]:
         """Get active system prompt for type."""
+        cached = self.cache.get(("system_prompt", prompt_type))
+        if cached is not MISSING:
+            return dict(cached) if cached else None
         try:
-            row = await self._fetchrow(
-                "SELECT * FROM system_prompts WHERE prompt_type = $1 AND is_active = true",
-                prompt_type
-            )
+            row = await self._fetchrow_named("active_system_prompt", prompt_type)
+            # "No active prompt" is cached too: callers fall back to defaults on every call
+            self.cache.set(("system_prompt", prompt_type), dict(row) if row else None)
             return dict(row) if row else None
         except Exception as e:
             logger.error(f"Error fetching system prompt: {e}")
@@ -494,7 +965,7 @@ class PostgresDB:
             )
             next_version = (ver_row['version'] + 1) if ver_row else 1
             
-            async with self.pool.acquire() as conn:
+            async with self._acquire() as conn:
                 async with conn.transaction():
                     # Deactivate current
                     await conn.execute(
@@ -511,36 +982,54 @@ class PostgresDB:
                         """,
                         prompt_type, next_version, system_prompt, description or f"Version {next_version}", user_id
                     )
+                    await self._invalidate("system_prompt", prompt_type, conn=conn)
+            # A concurrent reader may have re-cached the old row before commit
+            self.cache.invalidate("system_prompt", prompt_type)
             return next_version
         except Exception as e:
             logger.error(f"Error updating system prompt: {e}")
             return None
 
     # Analysis History Methods
-    async def get_analysis_history(self, jurisdiction: str = None, bill_id: str = None, step: str = None, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get analysis history with filters."""
+    async def get_analysis_history(
+        self,
+        jurisdiction: str = None,
+        bill_id: str = None,
+        step: str = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get analysis history with filters, newest first.
+
+        Pass `cursor` (db/pagination.py) to continue after a previous page and `fields`
+        (comma-separated) to skip the `result` payload in list views.
+
+        Raises:
+            ValueError: On an invalid cursor or unknown field.
+        """
+        cursor_ts, cursor_id = decode_cursor(cursor)
+        projected = None
+        if fields:
+            filters, args = [], []
+            for column, value in (("jurisdiction", jurisdiction), ("bill_id", bill_id), ("step", step)):
+                if value:
+                    args.append(value)
+                    filters.append(f"ah.{column} = ${len(args)}")
+            projected = keyset_query(
+                parse_fields(fields, ANALYSIS_HISTORY_FIELDS, ()),
+                "analysis_history ah", "ah", filters, args, cursor=cursor, limit=limit,
+            )
         try:
-            query = "SELECT * FROM analysis_history"
-            conditions = []
-            params = []
-            
-            if jurisdiction:
-                conditions.append(f"jurisdiction = ${len(params)+1}")
-                params.append(jurisdiction)
-            if bill_id:
-                conditions.append(f"bill_id = ${len(params)+1}")
-                params.append(bill_id)
-            if step:
-                conditions.append(f"step = ${len(params)+1}")
-                params.append(step)
-                
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-                
-            query += f" ORDER BY created_at DESC LIMIT ${len(params)+1}"
-            params.append(limit)
-            
-            rows = await self._fetch(query, *params)
+            if projected:
+                rows = await self._fetch(projected[0], *projected[1])
+            else:
+                # Unset filters are passed as NULL so every combination shares one prepared plan
+                rows = await self._fetch_named(
+                    "analysis_history", jurisdiction or None, bill_id or None, step or None, limit,
+                    cursor_ts, cursor_id,
+                )
             return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error fetching analysis history: {e}")
@@ -581,98 +1070,55 @@ class PostgresDB:
             logger.error(f"Error creating template review: {e}")
             return None
 
-    async def get_legislation_by_jurisdiction(self, jurisdiction_name: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get recent legislation for a jurisdiction with impacts."""
-        try:
-            # Get jurisdiction ID
-            jur_row = await self._fetchrow("SELECT id FROM jurisdictions WHERE name = $1", jurisdiction_name)
-            if not jur_row:
-                return []
-            jurisdiction_id = jur_row['id']
+    def _legislation_query(
+        self, jurisdiction_name: str, limit: Optional[int], cursor: Optional[str], fields: Optional[str]
+    ):
+        return keyset_query(
+            parse_fields(fields, LEGISLATION_FIELDS, tuple(LEGISLATION_FIELDS)),
+            "legislation l JOIN jurisdictions j ON l.jurisdiction_id = j.id",
+            "l", ["j.name = $1"], [jurisdiction_name], cursor=cursor, limit=limit, nullable=True,
+        )
 
-            # Get legislation
-            legislation_rows = await self._fetch(
-                """
-                SELECT * FROM legislation
-                WHERE jurisdiction_id = $1
-                ORDER BY created_at DESC
-                LIMIT $2
-                """,
-                jurisdiction_id, limit
-            )
-
-            results = []
-            for leg in legislation_rows:
-                leg_dict = dict(leg)
-                # Fetch impacts
-                impact_rows = await self._fetch(
-                    "SELECT * FROM impacts WHERE legislation_id = $1 ORDER BY impact_number",
-                    leg['id']
-                )
+    async def get_legislation_by_jurisdiction(
+        self, jurisdiction_name: str, limit: int = 10, cursor: Optional[str] = None, fields: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get recent legislation for a jurisdiction with impacts, newest first.
 
-                impacts = []
-                for imp in impact_rows:
-                    imp_dict = dict(imp)
-                    # Parse evidence if it's a string (JSON)
-                    if isinstance(imp_dict.get('evidence'), str):
-                        try:
-                            imp_dict['evidence'] = json.loads(imp_dict['evidence'])
-                        except json.JSONDecodeError:
-                            pass
-                    impacts.append(imp_dict)
+        One round-trip regardless of page size: impacts are aggregated per bill
+        in a lateral subquery. Pass `cursor` (see db/pagination.py) to continue
+        after the last row of a previous page, and `fields` (comma-separated, e.g.
+        "bill_number,title,status") to fetch only summary columns.
 
-                leg_dict['impacts'] = impacts
-                results.append(leg_dict)
-
-            return results
+        Raises:
+            ValueError: On a malformed cursor or an unknown field.
+        """
+        projected = self._legislation_query(jurisdiction_name, limit, cursor, fields) if fields else None
+        cursor_ts, cursor_id = decode_cursor(cursor)
+        try:
+            if projected:
+                rows = await self._fetch(projected[0], *projected[1])
+            else:
+                rows = await self._fetch_named(
+                    "legislation_with_impacts_by_jurisdiction", jurisdiction_name, cursor_ts, cursor_id, limit
+                )
+            return [dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error in get_legislation_by_jurisdiction: {e}")
             return []
 
+    def stream_legislation(
+        self, jurisdiction_name: str, cursor: Optional[str] = None, fields: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Every bill for a jurisdiction after `cursor`, streamed from a server-side cursor."""
+        sql, args = self._legislation_query(jurisdiction_name, None, cursor, fields)
+        return self.stream(sql, *args)
+
     async def get_bill(self, jurisdiction_name: str, bill_number: str) -> Optional[Dict[str, Any]]:
-        """Get specific bill with impacts."""
+        """Get specific bill with impacts (single round-trip)."""
         try:
-            # Get jurisdiction ID
-            jur_row = await self._fetchrow("SELECT id, name, type FROM jurisdictions WHERE name = $1", jurisdiction_name)
-            if not jur_row:
-                return None
-            jurisdiction_id = jur_row['id']
-
-            # Get legislation
-            leg_row = await self._fetchrow(
-                """
-                SELECT * FROM legislation
-                WHERE jurisdiction_id = $1 AND bill_number = $2
-                """,
-                jurisdiction_id, bill_number
-            )
-
-            if not leg_row:
-                return None
-
-            leg_dict = dict(leg_row)
-            leg_dict['jurisdiction'] = jur_row['name']
-
-            # Fetch impacts
-            impact_rows = await self._fetch(
-                "SELECT * FROM impacts WHERE legislation_id = $1 ORDER BY impact_number",
-                leg_dict['id']
-            )
-
-            impacts = []
-            for imp in impact_rows:
-                imp_dict = dict(imp)
-                # Parse evidence if it's a string (JSON)
-                if isinstance(imp_dict.get('evidence'), str):
-                    try:
-                        imp_dict['evidence'] = json.loads(imp_dict['evidence'])
-                    except json.JSONDecodeError:
-                        pass
-                impacts.append(imp_dict)
-
-            leg_dict['impacts'] = impacts
-            return leg_dict
-
+            row = await self._fetchrow_named("bill_with_impacts", jurisdiction_name, bill_number)
+            return dict(row) if row else None
         except Exception as e:
             logger.error(f"Error in get_bill: {e}")
             return None
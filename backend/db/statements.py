@@ -0,0 +1,255 @@
+"""
+Named statements for hot PostgresDB queries.
+
+Each entry is prepared once per pooled connection (see db/pool.py) instead of
+being re-parsed per call. Keep the SQL static: filters that used to be built
+with f-strings are expressed with NULL-able parameters so one plan covers
+every combination.
+"""
+
+STATEMENTS = {
+    "jurisdiction_by_name": "SELECT * FROM jurisdictions WHERE name = $1",
+    "jurisdiction_id_by_name": "SELECT id FROM jurisdictions WHERE name = $1",
+    # Select-or-insert in one round-trip; the insert only runs when no row matched.
+    # ON CONFLICT covers concurrent creators (unique keys from migration 006).
+    "upsert_jurisdiction": """
+        WITH existing AS (
+            SELECT id FROM jurisdictions WHERE name = $1
+        ), inserted AS (
+            INSERT INTO jurisdictions (name, type)
+            SELECT $1::text, $2::text WHERE NOT EXISTS (SELECT 1 FROM existing)
+            ON CONFLICT (name) DO NOTHING
+            RETURNING id
+        )
+        SELECT id FROM existing UNION ALL SELECT id FROM inserted
+        LIMIT 1
+    """,
+    "upsert_source": """
+        WITH existing AS (
+            (SELECT id FROM sources WHERE url = $4)
+            UNION ALL
+            (SELECT id FROM sources WHERE jurisdiction_id = $1 AND name = $2)
+            LIMIT 1
+        ), inserted AS (
+            INSERT INTO sources (jurisdiction_id, name, type, url)
+            SELECT $1::uuid, $2::text, $3::text, $4::text WHERE NOT EXISTS (SELECT 1 FROM existing)
+            ON CONFLICT (url) DO UPDATE SET url = EXCLUDED.url
+            RETURNING id
+        )
+        SELECT id FROM existing UNION ALL SELECT id FROM inserted
+        LIMIT 1
+    """,
+    "upsert_legislation": """
+        INSERT INTO legislation
+        (jurisdiction_id, bill_number, title, text_content, introduced_date, status, raw_html, analysis_status)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, 'pending')
+        ON CONFLICT (jurisdiction_id, bill_number) DO UPDATE SET
+            title = EXCLUDED.title,
+            text_content = EXCLUDED.text_content,
+            status = EXCLUDED.status,
+            updated_at = NOW()
+        RETURNING id
+    """,
+    "upsert_legislation_many": """
+        INSERT INTO legislation
+        (jurisdiction_id, bill_number, title, text_content, introduced_date, status, raw_html, analysis_status)
+        SELECT $1::uuid, b.bill_number, b.title, b.text_content, b.introduced_date, b.status, b.raw_html, 'pending'
+        FROM unnest($2::text[], $3::text[], $4::text[], $5::date[], $6::text[], $7::text[])
+            AS b(bill_number, title, text_content, introduced_date, status, raw_html)
+        ON CONFLICT (jurisdiction_id, bill_number) DO UPDATE SET
+            title = EXCLUDED.title,
+            text_content = EXCLUDED.text_content,
+            status = EXCLUDED.status,
+            updated_at = NOW()
+        RETURNING id, bill_number
+    """,
+    # Counters maintained by triggers (migration 009); the nil uuid row holds the totals
+    "jurisdiction_stats": "SELECT * FROM jurisdiction_stats WHERE jurisdiction_id = $1",
+    # Embedding cache (migration 010): return hits and refresh last_used_at at most daily,
+    # so a hot cache does not rewrite every row it serves
+    "embedding_cache_lookup": """
+        WITH hits AS (
+            SELECT content_hash, embedding, last_used_at
+            FROM embedding_cache
+            WHERE model = $1 AND dimensions = $2 AND content_hash = ANY($3::bytea[])
+        ), touched AS (
+            UPDATE embedding_cache e SET last_used_at = now()
+            FROM hits h
+            WHERE e.model = $1 AND e.dimensions = $2 AND e.content_hash = h.content_hash
+              AND h.last_used_at < now() - interval '1 day'
+        )
+        SELECT content_hash, embedding FROM hits
+    """,
+    "embedding_cache_store": """
+        INSERT INTO embedding_cache (model, dimensions, content_hash, embedding)
+        VALUES ($1, $2, $3, $4)
+        ON CONFLICT (model, dimensions, content_hash) DO NOTHING
+    """,
+    "active_system_prompt": "SELECT * FROM system_prompts WHERE prompt_type = $1 AND is_active = true",
+    # Ingestion queue (migration 012). Leasing walks idx_ingestion_jobs_ready and skips rows
+    # other workers hold, so concurrent workers never wait on or duplicate each other.
+    "ingestion_jobs_lease": """
+        UPDATE ingestion_jobs j
+        SET status = 'leased',
+            attempts = j.attempts + 1,
+            leased_by = $1,
+            lease_expires_at = now() + make_interval(secs => $3),
+            updated_at = now()
+        FROM (
+            SELECT id FROM ingestion_jobs
+            WHERE status = 'queued' AND available_at <= now()
+            ORDER BY priority DESC, available_at, id
+            LIMIT $2
+            FOR UPDATE SKIP LOCKED
+        ) next
+        WHERE j.id = next.id
+        RETURNING j.id, j.scrape_id, j.attempts, j.max_attempts, j.created_at
+    """,
+    # Leases of dead workers go back to the queue (or to dead once attempts are used up)
+    "ingestion_jobs_reap": """
+        UPDATE ingestion_jobs j
+        SET status = CASE WHEN j.attempts >= j.max_attempts THEN 'dead' ELSE 'queued' END,
+            finished_at = CASE WHEN j.attempts >= j.max_attempts THEN now() END,
+            last_error = 'lease expired (worker ' || COALESCE(j.leased_by, '?') || ')',
+            leased_by = NULL,
+            lease_expires_at = NULL,
+            available_at = now(),
+            updated_at = now()
+        FROM (
+            SELECT id FROM ingestion_jobs
+            WHERE status = 'leased' AND lease_expires_at < now()
+            FOR UPDATE SKIP LOCKED
+        ) expired
+        WHERE j.id = expired.id
+        RETURNING j.id
+    """,
+    # Lease-holder checks (leased_by) stop a worker whose lease expired from clobbering
+    # the job's new owner
+    "ingestion_jobs_complete": """
+        UPDATE ingestion_jobs
+        SET status = 'done', finished_at = now(), updated_at = now(),
+            leased_by = NULL, lease_expires_at = NULL, last_error = NULL
+        WHERE id = ANY($1::bigint[]) AND status = 'leased' AND leased_by = $2
+        RETURNING id
+    """,
+    # Retry after base * 2^(attempts-1) seconds (capped, +-25% jitter), or dead when out of attempts
+    "ingestion_jobs_fail": """
+        UPDATE ingestion_jobs j
+        SET status = CASE WHEN j.attempts >= j.max_attempts THEN 'dead' ELSE 'queued' END,
+            finished_at = CASE WHEN j.attempts >= j.max_attempts THEN now() END,
+            available_at = now() + make_interval(
+                secs => LEAST($4::float8 * power(2, j.attempts - 1), $5::float8) * (0.75 + random() / 2)
+            ),
+            last_error = f.error,
+            leased_by = NULL,
+            lease_expires_at = NULL,
+            updated_at = now()
+        FROM unnest($1::bigint[], $2::text[]) AS f(id, error)
+        WHERE j.id = f.id AND j.status = 'leased' AND j.leased_by = $3
+        RETURNING j.id, j.status
+    """,
+    "ingestion_jobs_extend": """
+        UPDATE ingestion_jobs
+        SET lease_expires_at = now() + make_interval(secs => $3), updated_at = now()
+        WHERE id = ANY($1::bigint[]) AND status = 'leased' AND leased_by = $2
+        RETURNING id
+    """,
+    "admin_task_by_id": "SELECT * FROM admin_tasks WHERE id = $1",
+    "update_admin_task": """
+        UPDATE admin_tasks
+        SET status = $1,
+            completed_at = $2,
+            result = COALESCE($3, result),
+            error_message = COALESCE($4, error_message)
+        WHERE id = $5
+        RETURNING id
+    """,
+    # Impacts are aggregated per bill so the read path is one round-trip for any page size
+    "legislation_with_impacts_by_jurisdiction": """
+        SELECT l.*, COALESCE(i.impacts, '[]'::jsonb) AS impacts
+        FROM jurisdictions j
+        JOIN legislation l ON l.jurisdiction_id = j.id
+        LEFT JOIN LATERAL (
+            SELECT jsonb_agg(to_jsonb(imp) ORDER BY imp.impact_number) AS impacts
+            FROM impacts imp
+            WHERE imp.legislation_id = l.id
+        ) i ON true
+        WHERE j.name = $1
+          -- created_at is nullable: undated bills sort last (db/pagination.py)
+          AND ($2::timestamptz IS NULL OR (COALESCE(l.created_at, '-infinity'), l.id) < ($2, $3::uuid))
+        ORDER BY COALESCE(l.created_at, '-infinity') DESC, l.id DESC
+        LIMIT $4
+    """,
+    "bill_with_impacts": """
+        SELECT l.*, j.name AS jurisdiction, COALESCE(i.impacts, '[]'::jsonb) AS impacts
+        FROM jurisdictions j
+        JOIN legislation l ON l.jurisdiction_id = j.id AND l.bill_number = $2
+        LEFT JOIN LATERAL (
+            SELECT jsonb_agg(to_jsonb(imp) ORDER BY imp.impact_number) AS impacts
+            FROM impacts imp
+            WHERE imp.legislation_id = l.id
+        ) i ON true
+        WHERE j.name = $1
+    """,
+    "analysis_history": """
+        SELECT * FROM analysis_history
+        WHERE ($1::text IS NULL OR jurisdiction = $1)
+          AND ($2::text IS NULL OR bill_id = $2)
+          AND ($3::text IS NULL OR step = $3)
+          AND ($5::timestamptz IS NULL OR (created_at, id) < ($5, $6::uuid))
+        ORDER BY created_at DESC, id DESC
+        LIMIT $4
+    """,
+}
+
+# Columns list endpoints may project (`fields=`), as name -> SELECT expression.
+# Defaults keep heavy columns (raw_html, text_content, data, result) out of list views.
+SCRAPE_FIELDS = {
+    "id": "rs.id",
+    "created_at": "rs.created_at",
+    "url": "rs.url",
+    "metadata": "rs.metadata",
+    "source_id": "rs.source_id",
+    "content_type": "rs.content_type",
+    "content_hash": "rs.content_hash",
+    "processed": "rs.processed",
+    "storage_uri": "rs.storage_uri",
+    "document_id": "rs.document_id",
+    "error_message": "rs.error_message",
+    "data": "rs.data",
+    "jurisdiction_id": "s.jurisdiction_id",
+    "jurisdiction_name": "j.name AS jurisdiction_name",
+}
+SCRAPE_DEFAULT_FIELDS = ("id", "url", "created_at", "metadata", "jurisdiction_id", "jurisdiction_name")
+
+SOURCE_FIELDS = {
+    name: f"s.{name}"
+    for name in (
+        "id", "created_at", "updated_at", "jurisdiction_id", "name", "url", "type", "status",
+        "last_scraped_at", "source_method", "handler", "metadata", "scrape_url",
+    )
+}
+SOURCE_DEFAULT_FIELDS = tuple(SOURCE_FIELDS)
+
+LEGISLATION_FIELDS = {
+    **{
+        name: f"l.{name}"
+        for name in (
+            "id", "created_at", "updated_at", "jurisdiction_id", "bill_number", "title", "description",
+            "file_number", "introduced_date", "status", "analysis_status", "text_content", "raw_html",
+        )
+    },
+    "impacts": """COALESCE((
+        SELECT jsonb_agg(to_jsonb(imp) ORDER BY imp.impact_number)
+        FROM impacts imp WHERE imp.legislation_id = l.id
+    ), '[]'::jsonb) AS impacts""",
+}
+
+ANALYSIS_HISTORY_FIELDS = {
+    name: f"ah.{name}"
+    for name in (
+        "id", "created_at", "jurisdiction", "bill_id", "step", "model_provider", "model_name",
+        "prompt_version", "result", "confidence_score", "latency_ms", "tokens_used", "cost_usd",
+        "status", "error_message", "task_id",
+    )
+}
@@ -1,9 +1,10 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from services.notifications.email import EmailNotificationService
 from db.postgres_client import PostgresDB
-from typing import Dict, Any
+from db.pagination import decode_cursor, ndjson_lines, next_cursor
+from typing import Dict, Any, Literal, Optional
 import os
 import logging
 import sentry_sdk
@@ -197,11 +198,16 @@ async def process_jurisdiction(jurisdiction: str, scraper_class, jur_type: str):
             return {"jurisdiction": jurisdiction, "status": "no bills"}
         
         # 2. Get or create jurisdiction in DB
-        _ = await db.get_or_create_jurisdiction(
+        jurisdiction_id = await db.get_or_create_jurisdiction(
             name=scraper.jurisdiction_name,
             type=jur_type
         )
         
+        # 3. Store the whole scrape result in one statement
+        if jurisdiction_id:
+            stored = await db.store_legislation_many(jurisdiction_id, [bill.model_dump() for bill in bills])
+            logger.info(f"{jurisdiction}: Stored {len(stored)} bills")
+        
         processed = 0
         
         errors = []
@@ -277,9 +283,18 @@ async def scrape_and_analyze(jurisdiction: str) -> Dict[str, Any]:
     return result
 
 @app.get("/legislation/{jurisdiction}")
-async def get_legislation(jurisdiction: str, limit: int = 10):
+async def get_legislation(
+    jurisdiction: str,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json",
+):
     """
     Get stored legislation for a jurisdiction with impacts.
+    Pass the returned `next_cursor` as `cursor` to fetch the next page.
+    `fields` (e.g. "bill_number,title,status") limits the columns returned;
+    format=ndjson streams every bill after `cursor` as newline-delimited JSON.
     """
     if jurisdiction not in SCRAPERS:
         raise HTTPException(status_code=404, detail=f"Jurisdiction '{jurisdiction}' not supported")
@@ -287,15 +302,26 @@ async def get_legislation(jurisdiction: str, limit: int = 10):
     scraper_class, _ = SCRAPERS[jurisdiction]
     scraper = scraper_class()
     
-    legislation = await db.get_legislation_by_jurisdiction(
-        jurisdiction_name=scraper.jurisdiction_name,
-        limit=limit
-    )
+    try:
+        decode_cursor(cursor)
+        if format == "ndjson":
+            rows = db.stream_legislation(scraper.jurisdiction_name, cursor=cursor, fields=fields)
+            return StreamingResponse(ndjson_lines(rows), media_type="application/x-ndjson")
+
+        legislation = await db.get_legislation_by_jurisdiction(
+            jurisdiction_name=scraper.jurisdiction_name,
+            limit=limit,
+            cursor=cursor,
+            fields=fields
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "jurisdiction": jurisdiction,
         "count": len(legislation),
-        "legislation": legislation
+        "legislation": legislation,
+        "next_cursor": next_cursor(legislation, limit)
     }
 
 @app.get("/legislation/{jurisdiction}/{bill_number}")
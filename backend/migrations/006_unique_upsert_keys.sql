@@ -0,0 +1,78 @@
+-- Migration: 006_unique_upsert_keys.sql
+-- Unique keys backing the INSERT ... ON CONFLICT upserts in PostgresDB
+-- (get_or_create_jurisdiction, get_or_create_source, store_legislation[_many]).
+-- Existing duplicates are merged into the oldest row before each constraint is added.
+
+-- 1. jurisdictions(name)
+WITH ranked AS (
+    SELECT id, first_value(id) OVER (PARTITION BY name ORDER BY created_at, id) AS keep_id
+    FROM jurisdictions
+), dupes AS (
+    SELECT id, keep_id FROM ranked WHERE id <> keep_id
+), moved_sources AS (
+    -- sources.jurisdiction_id is text before 008 and uuid after it (this file is re-applied):
+    -- compare as text, and let the assignment cast uuid to whichever type the column has
+    UPDATE sources s SET jurisdiction_id = d.keep_id
+    FROM dupes d WHERE s.jurisdiction_id::text = d.id::text
+)
+UPDATE legislation l SET jurisdiction_id = d.keep_id
+FROM dupes d WHERE l.jurisdiction_id = d.id;
+
+DELETE FROM jurisdictions j
+USING (
+    SELECT id, first_value(id) OVER (PARTITION BY name ORDER BY created_at, id) AS keep_id
+    FROM jurisdictions
+) ranked
+WHERE j.id = ranked.id AND ranked.id <> ranked.keep_id;
+
+DO $$ BEGIN
+    ALTER TABLE jurisdictions ADD CONSTRAINT jurisdictions_name_key UNIQUE (name);
+EXCEPTION
+    WHEN duplicate_object OR duplicate_table THEN null;
+END $$;
+
+-- 2. legislation(jurisdiction_id, bill_number): keep the most recently updated row
+WITH ranked AS (
+    SELECT id, first_value(id) OVER (
+        PARTITION BY jurisdiction_id, bill_number ORDER BY updated_at DESC NULLS LAST, id
+    ) AS keep_id
+    FROM legislation
+)
+DELETE FROM impacts i USING ranked r
+WHERE i.legislation_id = r.id AND r.id <> r.keep_id;
+
+DELETE FROM legislation l
+USING (
+    SELECT id, first_value(id) OVER (
+        PARTITION BY jurisdiction_id, bill_number ORDER BY updated_at DESC NULLS LAST, id
+    ) AS keep_id
+    FROM legislation
+) ranked
+WHERE l.id = ranked.id AND ranked.id <> ranked.keep_id;
+
+DO $$ BEGIN
+    ALTER TABLE legislation ADD CONSTRAINT legislation_jurisdiction_id_bill_number_key UNIQUE (jurisdiction_id, bill_number);
+EXCEPTION
+    WHEN duplicate_object OR duplicate_table THEN null;
+END $$;
+
+-- 3. sources(url)
+WITH ranked AS (
+    SELECT id, first_value(id) OVER (PARTITION BY url ORDER BY created_at, id) AS keep_id
+    FROM sources
+)
+UPDATE raw_scrapes rs SET source_id = r.keep_id
+FROM ranked r WHERE rs.source_id = r.id AND r.id <> r.keep_id;
+
+DELETE FROM sources s
+USING (
+    SELECT id, first_value(id) OVER (PARTITION BY url ORDER BY created_at, id) AS keep_id
+    FROM sources
+) ranked
+WHERE s.id = ranked.id AND ranked.id <> ranked.keep_id;
+
+DO $$ BEGIN
+    ALTER TABLE sources ADD CONSTRAINT sources_url_key UNIQUE (url);
+EXCEPTION
+    WHEN duplicate_object OR duplicate_table THEN null;
+END $$;
@@ -0,0 +1,61 @@
+-- Migration: 007_hot_path_indexes.sql
+-- Indexes for the hot lookup paths in PostgresDB, run_rag_spiders and the admin router.
+-- Verify with: python scripts/db-commands/explain_hot_queries.py (flags sequential scans).
+--
+-- legislation(jurisdiction_id, bill_number) is already backed by the unique
+-- constraint legislation_jurisdiction_id_bill_number_key from migration 006.
+
+-- 1. raw_scrapes: unprocessed work per source (run_rag_spiders: source_id = $1 AND processed IS NULL).
+-- Partial, so the index only holds the pending backlog and stays small as scrapes are processed.
+CREATE INDEX IF NOT EXISTS idx_raw_scrapes_unprocessed
+    ON raw_scrapes (source_id)
+    WHERE processed IS NULL;
+
+-- Failed scrapes (processed = false) waiting for a retry
+CREATE INDEX IF NOT EXISTS idx_raw_scrapes_failed
+    ON raw_scrapes (source_id)
+    WHERE processed = false;
+
+-- Latest scrape per source (admin jurisdiction status, /admin/scrapes joins)
+CREATE INDEX IF NOT EXISTS idx_raw_scrapes_source_created
+    ON raw_scrapes (source_id, created_at DESC);
+
+-- 2. raw_scrapes: get_latest_scrape_for_bill (metadata->>'bill_number' = $2 ORDER BY created_at DESC LIMIT 1)
+CREATE INDEX IF NOT EXISTS idx_raw_scrapes_bill_number
+    ON raw_scrapes ((metadata->>'bill_number'), created_at DESC);
+
+-- 3. legislation: keyset pages per jurisdiction. created_at is nullable, so pages are keyed
+-- on COALESCE(created_at, '-infinity') (db/pagination.py, legislation_with_impacts_by_jurisdiction)
+CREATE INDEX IF NOT EXISTS idx_legislation_jurisdiction_created_key
+    ON legislation (jurisdiction_id, COALESCE(created_at, '-infinity'::timestamptz) DESC, id DESC);
+
+-- Replaced by the expression index above (a no-op once dropped)
+DROP INDEX IF EXISTS idx_legislation_jurisdiction_created;
+
+-- 4. impacts: per-bill aggregation ordered by impact_number (LATERAL jsonb_agg in get_bill)
+CREATE INDEX IF NOT EXISTS idx_impacts_legislation_number
+    ON impacts (legislation_id, impact_number);
+
+-- 5. pipeline_runs: latest run per bill (glass box)
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_bill_started
+    ON pipeline_runs (bill_id, started_at DESC);
+
+-- 6. sources: per-jurisdiction listing and get_or_create_source
+CREATE INDEX IF NOT EXISTS idx_sources_jurisdiction_url
+    ON sources (jurisdiction_id, url);
+
+-- 7. analysis_history: newest-first listing, optionally per bill (get_analysis_history)
+CREATE INDEX IF NOT EXISTS idx_analysis_history_created
+    ON analysis_history (created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_analysis_history_bill_created
+    ON analysis_history (bill_id, created_at DESC);
+
+-- 8. system_prompts: active prompt per type (get_system_prompt)
+CREATE INDEX IF NOT EXISTS idx_system_prompts_active
+    ON system_prompts (prompt_type)
+    WHERE is_active = true;
+
+-- 9. document_chunks: chunk counts / deletes per document
+CREATE INDEX IF NOT EXISTS idx_document_chunks_document_id
+    ON document_chunks (document_id);
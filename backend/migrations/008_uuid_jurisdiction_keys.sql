@@ -0,0 +1,43 @@
+-- Migration: 008_uuid_jurisdiction_keys.sql
+-- sources.jurisdiction_id was text while jurisdictions.id is uuid, so every join and
+-- filter needed a cast (s.jurisdiction_id::text = $1, j.id::text) that no index could serve.
+-- Convert it to uuid with a foreign key. Sources that do not belong to a jurisdiction
+-- (generic web search results, previously jurisdiction_id = 'web') get NULL.
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_name = 'sources' AND column_name = 'jurisdiction_id' AND data_type <> 'uuid'
+    ) THEN
+        ALTER TABLE sources ALTER COLUMN jurisdiction_id DROP NOT NULL;
+
+        -- Values that hold a jurisdiction name instead of its id
+        UPDATE sources s SET jurisdiction_id = j.id::text
+        FROM jurisdictions j
+        WHERE s.jurisdiction_id !~* '^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
+          AND lower(s.jurisdiction_id) = lower(j.name);
+
+        -- Non-jurisdiction markers ('web', '') and ids of jurisdictions that no longer exist
+        UPDATE sources s SET jurisdiction_id = NULL
+        WHERE s.jurisdiction_id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM jurisdictions j WHERE j.id::text = lower(s.jurisdiction_id));
+
+        ALTER TABLE sources ALTER COLUMN jurisdiction_id TYPE uuid USING jurisdiction_id::uuid;
+    END IF;
+END $$;
+
+DO $$ BEGIN
+    ALTER TABLE sources
+        ADD CONSTRAINT sources_jurisdiction_id_fkey FOREIGN KEY (jurisdiction_id) REFERENCES jurisdictions(id);
+EXCEPTION
+    WHEN duplicate_object THEN null;
+END $$;
+
+-- /admin/scrapes lists the newest scrapes across all sources
+CREATE INDEX IF NOT EXISTS idx_raw_scrapes_created
+    ON raw_scrapes (created_at DESC);
+
+-- glass box looks up runs by bill_id or jurisdiction name (bill_id is indexed in 007)
+CREATE INDEX IF NOT EXISTS idx_pipeline_runs_jurisdiction_started
+    ON pipeline_runs (jurisdiction, started_at DESC);
@@ -0,0 +1,335 @@
+-- Migration: 009_jurisdiction_stats.sql
+-- Summary counters for /admin/stats and /admin/jurisdiction/{id}/dashboard, so admin
+-- page loads read one row instead of COUNT(*)-scanning raw_scrapes and document_chunks.
+--
+-- One row per jurisdiction plus a totals row keyed by the nil uuid
+-- (00000000-0000-0000-0000-000000000000), which also counts rows that have no
+-- jurisdiction (generic web sources, document_chunks).
+--
+-- Counters are maintained by statement-level triggers using transition tables, so a
+-- COPY of 100k chunks costs one ledger insert rather than 100k. Triggers only append
+-- their deltas to jurisdiction_stats_deltas, which writers never update, so concurrent
+-- ingest workers do not serialize on the shared totals row. jurisdiction_stats is a view
+-- summing jurisdiction_stats_rollup and the pending deltas, so reads stay exact;
+-- rollup_jurisdiction_stats() (scripts/cron/rollup_jurisdiction_stats.py) folds the
+-- ledger into the rollup table to keep it short.
+--
+-- Deleted scrapes do not move last_scrape_at back, and sources re-assigned to another
+-- jurisdiction are not re-attributed; refresh_jurisdiction_stats() (POST /admin/stats/refresh)
+-- recounts exactly. TRUNCATE fires no transition-table triggers: per-table TRUNCATE
+-- triggers zero the affected counter instead.
+--
+-- Re-applied on every deploy (seed_schema.py): everything below is idempotent, and the
+-- initial recount only runs while the rollup table is empty.
+
+-- Databases that applied the earlier version of this file keep their counters in a
+-- jurisdiction_stats table; it becomes the rollup table
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class WHERE relname = 'jurisdiction_stats' AND relkind = 'r') THEN
+        ALTER TABLE jurisdiction_stats RENAME TO jurisdiction_stats_rollup;
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS jurisdiction_stats_rollup (
+    jurisdiction_id uuid PRIMARY KEY,
+    jurisdiction_count bigint NOT NULL DEFAULT 0,
+    source_count bigint NOT NULL DEFAULT 0,
+    raw_scrape_count bigint NOT NULL DEFAULT 0,
+    legislation_count bigint NOT NULL DEFAULT 0,
+    chunk_count bigint NOT NULL DEFAULT 0,
+    last_scrape_at timestamptz,
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS jurisdiction_stats_deltas (
+    id bigserial PRIMARY KEY,
+    jurisdiction_id uuid NOT NULL,
+    jurisdiction_count bigint NOT NULL DEFAULT 0,
+    source_count bigint NOT NULL DEFAULT 0,
+    raw_scrape_count bigint NOT NULL DEFAULT 0,
+    legislation_count bigint NOT NULL DEFAULT 0,
+    chunk_count bigint NOT NULL DEFAULT 0,
+    last_scrape_at timestamptz,
+    recorded_at timestamptz NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_jurisdiction_stats_deltas_jurisdiction
+    ON jurisdiction_stats_deltas (jurisdiction_id);
+
+-- One row per jurisdiction, as read by routers/admin.py and db/statements.py
+CREATE OR REPLACE VIEW jurisdiction_stats AS
+SELECT jurisdiction_id,
+       sum(jurisdiction_count)::bigint AS jurisdiction_count,
+       sum(source_count)::bigint AS source_count,
+       sum(raw_scrape_count)::bigint AS raw_scrape_count,
+       sum(legislation_count)::bigint AS legislation_count,
+       sum(chunk_count)::bigint AS chunk_count,
+       max(last_scrape_at) AS last_scrape_at,
+       max(updated_at) AS updated_at
+FROM (
+    SELECT jurisdiction_id, jurisdiction_count, source_count, raw_scrape_count,
+           legislation_count, chunk_count, last_scrape_at, updated_at
+    FROM jurisdiction_stats_rollup
+    UNION ALL
+    SELECT jurisdiction_id, jurisdiction_count, source_count, raw_scrape_count,
+           legislation_count, chunk_count, last_scrape_at, recorded_at
+    FROM jurisdiction_stats_deltas
+) s
+GROUP BY jurisdiction_id;
+
+-- Append per-jurisdiction deltas (NULL jurisdiction ids only count towards the totals row)
+CREATE OR REPLACE FUNCTION jurisdiction_stats_add(
+    p_counter text, p_jurisdiction_ids uuid[], p_deltas bigint[], p_last_scrape timestamptz[]
+) RETURNS void AS $$
+DECLARE
+    total bigint;
+BEGIN
+    SELECT COALESCE(sum(d), 0) INTO total FROM unnest(p_deltas) AS d;
+    IF total = 0 AND p_last_scrape IS NULL THEN
+        RETURN;
+    END IF;
+
+    EXECUTE format(
+        'INSERT INTO jurisdiction_stats_deltas (jurisdiction_id, %1$I, last_scrape_at)
+         SELECT d.jid, sum(d.delta), max(d.last_scrape)
+         FROM (
+             SELECT * FROM unnest($1, $2, $3) AS u(jid, delta, last_scrape) WHERE u.jid IS NOT NULL
+             UNION ALL
+             SELECT ''00000000-0000-0000-0000-000000000000''::uuid, u.delta, u.last_scrape
+             FROM unnest($1, $2, $3) AS u(jid, delta, last_scrape)
+         ) d
+         GROUP BY d.jid',
+        p_counter
+    )
+    USING p_jurisdiction_ids, p_deltas,
+          COALESCE(p_last_scrape, array_fill(NULL::timestamptz, ARRAY[cardinality(p_jurisdiction_ids)]));
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION jurisdiction_stats_jurisdictions() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM jurisdiction_stats_add('jurisdiction_count', ARRAY[NULL::uuid], ARRAY[(SELECT count(*) FROM new_rows)], NULL);
+    ELSE
+        PERFORM jurisdiction_stats_add('jurisdiction_count', ARRAY[NULL::uuid], ARRAY[-(SELECT count(*) FROM old_rows)], NULL);
+        DELETE FROM jurisdiction_stats_rollup js USING old_rows o WHERE js.jurisdiction_id = o.id;
+        DELETE FROM jurisdiction_stats_deltas jd USING old_rows o WHERE jd.jurisdiction_id = o.id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION jurisdiction_stats_sources() RETURNS trigger AS $$
+DECLARE
+    ids uuid[];
+    deltas bigint[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(jurisdiction_id), array_agg(n) INTO ids, deltas
+        FROM (SELECT jurisdiction_id, count(*) AS n FROM new_rows GROUP BY jurisdiction_id) g;
+    ELSE
+        SELECT array_agg(jurisdiction_id), array_agg(-n) INTO ids, deltas
+        FROM (SELECT jurisdiction_id, count(*) AS n FROM old_rows GROUP BY jurisdiction_id) g;
+    END IF;
+    IF ids IS NOT NULL THEN
+        PERFORM jurisdiction_stats_add('source_count', ids, deltas, NULL);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION jurisdiction_stats_raw_scrapes() RETURNS trigger AS $$
+DECLARE
+    ids uuid[];
+    deltas bigint[];
+    latest timestamptz[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(jurisdiction_id), array_agg(n), array_agg(last_scrape) INTO ids, deltas, latest
+        FROM (
+            SELECT s.jurisdiction_id, count(*) AS n, max(r.created_at) AS last_scrape
+            FROM new_rows r LEFT JOIN sources s ON s.id = r.source_id
+            GROUP BY s.jurisdiction_id
+        ) g;
+    ELSE
+        SELECT array_agg(jurisdiction_id), array_agg(-n) INTO ids, deltas
+        FROM (
+            SELECT s.jurisdiction_id, count(*) AS n
+            FROM old_rows r LEFT JOIN sources s ON s.id = r.source_id
+            GROUP BY s.jurisdiction_id
+        ) g;
+    END IF;
+    IF ids IS NOT NULL THEN
+        PERFORM jurisdiction_stats_add('raw_scrape_count', ids, deltas, latest);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION jurisdiction_stats_legislation() RETURNS trigger AS $$
+DECLARE
+    ids uuid[];
+    deltas bigint[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(jurisdiction_id), array_agg(n) INTO ids, deltas
+        FROM (SELECT jurisdiction_id, count(*) AS n FROM new_rows GROUP BY jurisdiction_id) g;
+    ELSE
+        SELECT array_agg(jurisdiction_id), array_agg(-n) INTO ids, deltas
+        FROM (SELECT jurisdiction_id, count(*) AS n FROM old_rows GROUP BY jurisdiction_id) g;
+    END IF;
+    IF ids IS NOT NULL THEN
+        PERFORM jurisdiction_stats_add('legislation_count', ids, deltas, NULL);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- document_chunks carry no jurisdiction; totals row only
+CREATE OR REPLACE FUNCTION jurisdiction_stats_document_chunks() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM jurisdiction_stats_add('chunk_count', ARRAY[NULL::uuid], ARRAY[(SELECT count(*) FROM new_rows)], NULL);
+    ELSE
+        PERFORM jurisdiction_stats_add('chunk_count', ARRAY[NULL::uuid], ARRAY[-(SELECT count(*) FROM old_rows)], NULL);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables need one trigger per event
+DO $$
+DECLARE
+    t text;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['jurisdictions', 'sources', 'raw_scrapes', 'legislation', 'document_chunks'] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_stats_ins', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_stats_del', t);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION %I()',
+            t || '_stats_ins', t, 'jurisdiction_stats_' || t
+        );
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION %I()',
+            t || '_stats_del', t, 'jurisdiction_stats_' || t
+        );
+    END LOOP;
+END $$;
+
+-- TRUNCATE: cancel the counter's current value for every row (TG_ARGV[0] = counter)
+CREATE OR REPLACE FUNCTION jurisdiction_stats_truncate() RETURNS trigger AS $$
+BEGIN
+    EXECUTE format(
+        'INSERT INTO jurisdiction_stats_deltas (jurisdiction_id, %1$I)
+         SELECT jurisdiction_id, -%1$I FROM jurisdiction_stats WHERE %1$I <> 0',
+        TG_ARGV[0]
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    t text;
+    counters CONSTANT jsonb := '{
+        "jurisdictions": "jurisdiction_count", "sources": "source_count",
+        "raw_scrapes": "raw_scrape_count", "legislation": "legislation_count",
+        "document_chunks": "chunk_count"
+    }';
+BEGIN
+    FOR t IN SELECT jsonb_object_keys(counters) LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', t || '_stats_trunc', t);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER TRUNCATE ON %I FOR EACH STATEMENT EXECUTE FUNCTION jurisdiction_stats_truncate(%L)',
+            t || '_stats_trunc', t, counters ->> t
+        );
+    END LOOP;
+END $$;
+
+-- Fold the ledger into jurisdiction_stats_rollup; returns the number of deltas folded.
+-- Only the rollup writes the rollup table, and concurrent rollups skip rather than queue.
+CREATE OR REPLACE FUNCTION rollup_jurisdiction_stats() RETURNS bigint AS $$
+DECLARE
+    folded bigint;
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('rollup_jurisdiction_stats')) THEN
+        RETURN 0;
+    END IF;
+
+    WITH moved AS (
+        DELETE FROM jurisdiction_stats_deltas RETURNING *
+    ), summed AS (
+        SELECT jurisdiction_id,
+               sum(jurisdiction_count) AS jurisdiction_count, sum(source_count) AS source_count,
+               sum(raw_scrape_count) AS raw_scrape_count, sum(legislation_count) AS legislation_count,
+               sum(chunk_count) AS chunk_count, max(last_scrape_at) AS last_scrape_at
+        FROM moved
+        GROUP BY jurisdiction_id
+    ), upserted AS (
+        INSERT INTO jurisdiction_stats_rollup AS js
+            (jurisdiction_id, jurisdiction_count, source_count, raw_scrape_count,
+             legislation_count, chunk_count, last_scrape_at)
+        SELECT * FROM summed
+        ON CONFLICT (jurisdiction_id) DO UPDATE SET
+            jurisdiction_count = js.jurisdiction_count + EXCLUDED.jurisdiction_count,
+            source_count = js.source_count + EXCLUDED.source_count,
+            raw_scrape_count = js.raw_scrape_count + EXCLUDED.raw_scrape_count,
+            legislation_count = js.legislation_count + EXCLUDED.legislation_count,
+            chunk_count = js.chunk_count + EXCLUDED.chunk_count,
+            last_scrape_at = GREATEST(js.last_scrape_at, EXCLUDED.last_scrape_at),
+            updated_at = now()
+        RETURNING 1
+    )
+    SELECT count(*) INTO folded FROM moved;
+    RETURN folded;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Exact recount (initial backfill and POST /admin/stats/refresh)
+CREATE OR REPLACE FUNCTION refresh_jurisdiction_stats() RETURNS void AS $$
+BEGIN
+    -- Hold off trigger deltas while recounting (writers wait for the recount)
+    LOCK TABLE jurisdiction_stats_deltas IN EXCLUSIVE MODE;
+    LOCK TABLE jurisdiction_stats_rollup IN EXCLUSIVE MODE;
+    DELETE FROM jurisdiction_stats_deltas;
+    DELETE FROM jurisdiction_stats_rollup;
+
+    INSERT INTO jurisdiction_stats_rollup
+        (jurisdiction_id, source_count, raw_scrape_count, legislation_count, last_scrape_at)
+    SELECT j.id,
+           COALESCE(s.n, 0),
+           COALESCE(r.n, 0),
+           COALESCE(l.n, 0),
+           r.last_scrape
+    FROM jurisdictions j
+    LEFT JOIN (SELECT jurisdiction_id, count(*) AS n FROM sources GROUP BY jurisdiction_id) s
+        ON s.jurisdiction_id = j.id
+    LEFT JOIN (
+        SELECT src.jurisdiction_id, count(*) AS n, max(rs.created_at) AS last_scrape
+        FROM raw_scrapes rs JOIN sources src ON src.id = rs.source_id
+        GROUP BY src.jurisdiction_id
+    ) r ON r.jurisdiction_id = j.id
+    LEFT JOIN (SELECT jurisdiction_id, count(*) AS n FROM legislation GROUP BY jurisdiction_id) l
+        ON l.jurisdiction_id = j.id;
+
+    INSERT INTO jurisdiction_stats_rollup
+        (jurisdiction_id, jurisdiction_count, source_count, raw_scrape_count, legislation_count, chunk_count, last_scrape_at)
+    SELECT '00000000-0000-0000-0000-000000000000'::uuid,
+           (SELECT count(*) FROM jurisdictions),
+           (SELECT count(*) FROM sources),
+           (SELECT count(*) FROM raw_scrapes),
+           (SELECT count(*) FROM legislation),
+           (SELECT count(*) FROM document_chunks),
+           (SELECT max(created_at) FROM raw_scrapes);
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM jurisdiction_stats_rollup) THEN
+        PERFORM refresh_jurisdiction_stats();
+    END IF;
+END $$;
@@ -0,0 +1,22 @@
+-- Migration: 010_embedding_cache.sql
+-- Content-addressed embedding cache, so re-scraped pages with unchanged chunks are not
+-- re-embedded. Keyed by (model, dimensions, sha256 of normalized chunk text); the
+-- embedding column is dimensionless so the 1536-dim and 4096-dim configurations share
+-- one table. Used by services/embedding_cache.py through PostgresDB.
+--
+-- Eviction: last_used_at is refreshed (at most daily) on hits, and
+-- PostgresDB.prune_embedding_cache() deletes entries unused for EMBEDDING_CACHE_MAX_AGE_DAYS.
+
+CREATE TABLE IF NOT EXISTS embedding_cache (
+    model text NOT NULL,
+    dimensions integer NOT NULL,
+    content_hash bytea NOT NULL,
+    embedding vector NOT NULL,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    last_used_at timestamptz NOT NULL DEFAULT now(),
+    PRIMARY KEY (model, dimensions, content_hash)
+);
+
+-- prune_embedding_cache: DELETE ... WHERE last_used_at < cutoff
+CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used
+    ON embedding_cache (last_used_at);
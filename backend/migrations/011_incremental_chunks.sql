@@ -0,0 +1,19 @@
+-- Migration: 011_incremental_chunks.sql
+-- Incremental re-ingestion (IngestionService(incremental=True)) keys documents by bill
+-- number or source URL and diffs each re-scrape against the stored chunk hashes, so
+-- only new chunks are embedded and stale ones are deleted.
+--
+-- content_hash is sha256 of the normalized chunk text (services/embedding_cache.py),
+-- the same key the embedding cache uses. Rows written before this migration have NULL
+-- hashes and are replaced on their document's next incremental ingest.
+
+ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS content_hash bytea;
+
+-- The vector backend factory writes to "documents" in some environments (same layout)
+DO $$
+BEGIN
+    IF to_regclass('public.documents') IS NOT NULL THEN
+        ALTER TABLE documents ADD COLUMN IF NOT EXISTS content_hash bytea;
+        CREATE INDEX IF NOT EXISTS idx_documents_document_id ON documents (document_id);
+    END IF;
+END $$;
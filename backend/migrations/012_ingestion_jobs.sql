@@ -0,0 +1,48 @@
+-- Migration: 012_ingestion_jobs.sql
+-- Durable ingestion work queue. Any number of ingest workers (scripts/ingest_worker.py)
+-- lease batches with FOR UPDATE SKIP LOCKED, so they never block on or double-process
+-- each other's jobs; scaling embedding throughput is a matter of starting more workers.
+--
+-- Life cycle: queued -> leased -> done
+--                         \-> queued (retry after exponential backoff) -> ... -> dead
+-- A lease whose worker died (lease_expires_at passed) is returned to the queue by the
+-- next worker. attempts counts leases, so a job that keeps crashing workers goes dead
+-- after max_attempts as well. Enqueued by PostgresDB.enqueue_ingestion_jobs.
+
+CREATE TABLE IF NOT EXISTS ingestion_jobs (
+    id bigint GENERATED ALWAYS AS IDENTITY PRIMARY KEY,
+    scrape_id uuid NOT NULL REFERENCES raw_scrapes(id) ON DELETE CASCADE,
+    status text NOT NULL DEFAULT 'queued'
+        CHECK (status IN ('queued', 'leased', 'done', 'dead')),
+    priority smallint NOT NULL DEFAULT 0,
+    attempts integer NOT NULL DEFAULT 0,
+    max_attempts integer NOT NULL DEFAULT 5,
+    available_at timestamptz NOT NULL DEFAULT now(),
+    leased_by text,
+    lease_expires_at timestamptz,
+    last_error text,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    updated_at timestamptz NOT NULL DEFAULT now(),
+    finished_at timestamptz
+);
+
+-- At most one live job per scrape (re-enqueueing a queued/leased scrape is a no-op)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_ingestion_jobs_live_scrape
+    ON ingestion_jobs (scrape_id) WHERE status IN ('queued', 'leased');
+
+-- Lease order: ingestion_jobs_lease walks this index and skips locked rows
+CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_ready
+    ON ingestion_jobs (priority DESC, available_at, id) WHERE status = 'queued';
+
+-- Expired-lease reaping
+CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_lease_expiry
+    ON ingestion_jobs (lease_expires_at) WHERE status = 'leased';
+
+-- Status API: recent failures
+CREATE INDEX IF NOT EXISTS idx_ingestion_jobs_dead
+    ON ingestion_jobs (finished_at DESC) WHERE status = 'dead';
+
+-- Backfill: scrapes never ingested become queued jobs
+INSERT INTO ingestion_jobs (scrape_id)
+SELECT id FROM raw_scrapes WHERE processed IS NULL
+ON CONFLICT (scrape_id) WHERE status IN ('queued', 'leased') DO NOTHING;
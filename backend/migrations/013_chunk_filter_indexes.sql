@@ -0,0 +1,33 @@
+-- Migration: 013_chunk_filter_indexes.sql
+-- Indexes behind the metadata filters of LocalPgVectorBackend.query (services/retrieval/filters.py).
+-- Selective filters (a document, a source, a small jurisdiction) are answered by an exact
+-- scan over the rows these indexes find; broad ones by the ANN index plus a post-filter.
+--
+-- jurisdiction filters resolve to source ids, so they use the source_id index.
+
+-- source_id / jurisdiction
+CREATE INDEX IF NOT EXISTS idx_document_chunks_source_id
+    ON document_chunks ((metadata->>'source_id'));
+
+-- content_type
+CREATE INDEX IF NOT EXISTS idx_document_chunks_content_type
+    ON document_chunks ((metadata->>'content_type'));
+
+-- created_after / created_before
+CREATE INDEX IF NOT EXISTS idx_document_chunks_created_at
+    ON document_chunks (created_at);
+
+-- Any other key: metadata @> '{"key": value}'
+CREATE INDEX IF NOT EXISTS idx_document_chunks_metadata
+    ON document_chunks USING gin (metadata jsonb_path_ops);
+
+-- The vector backend factory writes to "documents" in some environments (same layout)
+DO $$
+BEGIN
+    IF to_regclass('public.documents') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_documents_source_id ON documents ((metadata->>'source_id'));
+        CREATE INDEX IF NOT EXISTS idx_documents_content_type ON documents ((metadata->>'content_type'));
+        CREATE INDEX IF NOT EXISTS idx_documents_created_at ON documents (created_at);
+        CREATE INDEX IF NOT EXISTS idx_documents_metadata ON documents USING gin (metadata jsonb_path_ops);
+    END IF;
+END $$;
@@ -0,0 +1,27 @@
+-- Migration: 014_chunk_fulltext.sql
+-- Full-text side of hybrid retrieval (LocalPgVectorBackend.query(mode="hybrid"|"lexical")).
+-- Bill numbers ("AB 1234"), code sections ("§ 26-3401") and ordinance titles are matched
+-- lexically and fused with the vector ranking by reciprocal rank fusion.
+--
+-- The column is generated, so ingestion needs no changes. Adding a STORED generated
+-- column rewrites the table once; run it in a maintenance window on large tables.
+-- Keep the text search configuration in sync with LEXICAL_CONFIG in
+-- services/retrieval/local_pgvector.py, or the GIN index will not be used.
+
+ALTER TABLE document_chunks
+    ADD COLUMN IF NOT EXISTS content_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_document_chunks_content_tsv
+    ON document_chunks USING gin (content_tsv);
+
+-- The vector backend factory writes to "documents" in some environments (same layout)
+DO $$
+BEGIN
+    IF to_regclass('public.documents') IS NOT NULL THEN
+        ALTER TABLE documents
+            ADD COLUMN IF NOT EXISTS content_tsv tsvector
+            GENERATED ALWAYS AS (to_tsvector('english', coalesce(content, ''))) STORED;
+        CREATE INDEX IF NOT EXISTS idx_documents_content_tsv ON documents USING gin (content_tsv);
+    END IF;
+END $$;
@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, Request, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Depends, Request, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Literal
+from uuid import UUID
 from pydantic import BaseModel
 from services.glass_box import GlassBoxService, AgentStep, PipelineStep
+from db.pagination import ndjson_lines, next_cursor
+from services.provider_gateway import gateway_stats
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -72,6 +76,49 @@ async def list_jurisdictions(request: Request):
         raise HTTPException(status_code=500, detail=f"Failed to fetch jurisdictions: {str(e)}")
 
 
+# Jurisdiction plus its trigger-maintained counters (migration 009) in one round-trip
+JURISDICTION_WITH_STATS = """
+    SELECT j.id, j.name, j.type,
+           COALESCE(js.source_count, 0) AS source_count,
+           COALESCE(js.raw_scrape_count, 0) AS raw_scrape_count,
+           COALESCE(js.legislation_count, 0) AS legislation_count,
+           js.last_scrape_at
+    FROM jurisdictions j
+    LEFT JOIN jurisdiction_stats js ON js.jurisdiction_id = j.id
+"""
+
+
+async def _find_jurisdiction(db, jurisdiction_id: str):
+    """
+    Resolve a jurisdiction by UUID or slug, with its dashboard counters.
+
+    UUIDs go to the primary key; anything else is matched by name:
+    1. Exact name match (case-insensitive)
+    2. Name contains the search term (for slugs like 'california' → 'State of California')
+    """
+    try:
+        return await db._fetchrow(
+            JURISDICTION_WITH_STATS + "WHERE j.id = $1",
+            UUID(jurisdiction_id)
+        )
+    except ValueError:
+        pass
+
+    # Normalize the input: convert slug-style to match partial names
+    # e.g., 'san-jose' matches 'San Jose'
+    search_term = jurisdiction_id.replace('-', ' ')
+    return await db._fetchrow(
+        JURISDICTION_WITH_STATS + """
+        WHERE LOWER(j.name) = LOWER($1)
+           OR LOWER(j.name) = LOWER($2)
+           OR LOWER(j.name) LIKE '%' || LOWER($2) || '%'
+        LIMIT 1
+        """,
+        jurisdiction_id,
+        search_term
+    )
+
+
 @router.get("/jurisdictions/{jurisdiction_id}")
 async def get_jurisdiction(jurisdiction_id: str, request: Request):
     """Get jurisdiction detail by ID or slug."""
@@ -80,63 +127,18 @@ async def get_jurisdiction(jurisdiction_id: str, request: Request):
         raise HTTPException(status_code=503, detail="Database not available")
     
     try:
-        # Normalize the input: convert slug-style to match partial names
-        # e.g., 'california' matches 'State of California', 'san-jose' matches 'San Jose'
-        search_term = jurisdiction_id.replace('-', ' ')
-        
-        # Try multiple matching strategies:
-        # 1. Exact match by UUID id
-        # 2. Exact name match (case-insensitive)
-        # 3. Name contains the search term (for slugs like 'california' → 'State of California')
-        row = await db._fetchrow(
-            """
-            SELECT id, name, type FROM jurisdictions 
-            WHERE id::text = $1 
-               OR LOWER(name) = LOWER($1)
-               OR LOWER(name) = LOWER($2)
-               OR LOWER(name) LIKE '%' || LOWER($2) || '%'
-            LIMIT 1
-            """,
-            jurisdiction_id,
-            search_term
-        )
+        row = await _find_jurisdiction(db, jurisdiction_id)
         
         if not row:
             raise HTTPException(status_code=404, detail=f"Jurisdiction '{jurisdiction_id}' not found")
         
-        # Get related counts - use string UUID for compatibility
-        jur_id_str = str(row["id"])
-        
-        # Use try/except for counts to gracefully handle any schema issues
-        try:
-            # raw_scrapes doesn't have jurisdiction_id directly - join via sources
-            bill_result = await db._fetchrow(
-                """
-                SELECT COUNT(*) as count FROM raw_scrapes rs
-                JOIN sources s ON rs.source_id = s.id
-                WHERE s.jurisdiction_id::text = $1
-                """,
-                jur_id_str
-            )
-            bill_count = bill_result["count"] if bill_result else 0
-        except Exception:
-            bill_count = 0
-            
-        try:
-            source_result = await db._fetchrow(
-                "SELECT COUNT(*) as count FROM sources WHERE jurisdiction_id::text = $1",
-                jur_id_str
-            )
-            source_count = source_result["count"] if source_result else 0
-        except Exception:
-            source_count = 0
-        
+        # Counts come from jurisdiction_stats (bill_count has always counted raw scrapes)
         return {
-            "id": jur_id_str,
+            "id": str(row["id"]),
             "name": row["name"],
             "type": row["type"],
-            "bill_count": bill_count,
-            "source_count": source_count
+            "bill_count": row["raw_scrape_count"],
+            "source_count": row["source_count"]
         }
     except HTTPException:
         raise
@@ -152,69 +154,24 @@ async def get_jurisdiction_dashboard(jurisdiction_id: str, request: Request):
         raise HTTPException(status_code=503, detail="Database not available")
     
     try:
-        # Normalize the input: convert slug-style to match partial names
-        search_term = jurisdiction_id.replace('-', ' ')
-        
         # Find the jurisdiction
-        row = await db._fetchrow(
-            """
-            SELECT id, name, type FROM jurisdictions 
-            WHERE id::text = $1 
-               OR LOWER(name) = LOWER($1)
-               OR LOWER(name) = LOWER($2)
-               OR LOWER(name) LIKE '%' || LOWER($2) || '%'
-            LIMIT 1
-            """,
-            jurisdiction_id,
-            search_term
-        )
+        row = await _find_jurisdiction(db, jurisdiction_id)
         
         if not row:
             raise HTTPException(status_code=404, detail=f"Jurisdiction '{jurisdiction_id}' not found")
         
-        jur_id_str = str(row["id"])
         jurisdiction_name = row["name"]
         
-        # Get raw scrapes count
-        try:
-            raw_result = await db._fetchrow(
-                """
-                SELECT COUNT(*) as count FROM raw_scrapes rs
-                JOIN sources s ON rs.source_id = s.id
-                WHERE s.jurisdiction_id::text = $1
-                """,
-                jur_id_str
-            )
-            total_raw_scrapes = raw_result["count"] if raw_result else 0
-        except Exception:
-            total_raw_scrapes = 0
+        # Counters come from jurisdiction_stats, read with the lookup above
+        total_raw_scrapes = row["raw_scrape_count"]
         
-        # Get processed scrapes (legislation count)
-        try:
-            processed_result = await db._fetchrow(
-                "SELECT COUNT(*) as count FROM legislation WHERE jurisdiction_id::text = $1",
-                jur_id_str
-            )
-            processed_scrapes = processed_result["count"] if processed_result else 0
-        except Exception:
-            processed_scrapes = 0
+        # Processed scrapes (legislation count)
+        processed_scrapes = row["legislation_count"]
         
         # Get total bills (same as legislation for now)
         total_bills = processed_scrapes
         
-        # Get last scrape timestamp
-        try:
-            last_scrape_result = await db._fetchrow(
-                """
-                SELECT MAX(rs.created_at) as last_scrape FROM raw_scrapes rs
-                JOIN sources s ON rs.source_id = s.id
-                WHERE s.jurisdiction_id::text = $1
-                """,
-                jur_id_str
-            )
-            last_scrape = str(last_scrape_result["last_scrape"]) if last_scrape_result and last_scrape_result["last_scrape"] else None
-        except Exception:
-            last_scrape = None
+        last_scrape = str(row["last_scrape_at"]) if row["last_scrape_at"] else None
         
         # Determine pipeline status based on data
         if total_raw_scrapes > 0 and last_scrape:
@@ -321,37 +278,55 @@ async def update_prompt(prompt: PromptUpdate, request: Request):
 # SCRAPES ENDPOINTS
 # ============================================================================
 
+def _scrape_summary(row: dict) -> dict:
+    """API shape for a raw_scrapes row (created_at is exposed as scraped_at)."""
+    item = dict(row)
+    item["id"] = str(item["id"])
+    created_at = item.pop("created_at", None)
+    item["scraped_at"] = str(created_at) if created_at else None
+    if "jurisdiction_id" in item:
+        item["jurisdiction_id"] = str(item["jurisdiction_id"]) if item["jurisdiction_id"] else None
+    return item
+
+
+async def _stream_scrape_summaries(rows):
+    async for row in rows:
+        yield _scrape_summary(row)
+
+
 @router.get("/scrapes")
-async def list_scrapes(request: Request, limit: int = 50):
-    """List recent scrapes."""
+async def list_scrapes(
+    request: Request,
+    response: Response,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json",
+):
+    """
+    List recent scrapes, newest first.
+
+    - cursor: value of the X-Next-Cursor header from the previous page
+    - fields: comma-separated columns (default: id,url,created_at,metadata,jurisdiction_id,jurisdiction_name);
+      `data` is only sent when asked for
+    - format=ndjson: stream every scrape after `cursor` as newline-delimited JSON (limit ignored)
+    """
     db = get_db(request)
     if not db:
         raise HTTPException(status_code=503, detail="Database not available")
     
     try:
-        # raw_scrapes has: id, source_id, content_hash, content_type, data, url, metadata, storage_uri, document_id, created_at
-        rows = await db._fetch(
-            """
-            SELECT rs.id, rs.url, rs.created_at, rs.metadata, s.jurisdiction_id, j.name as jurisdiction_name
-            FROM raw_scrapes rs
-            LEFT JOIN sources s ON rs.source_id = s.id
-            LEFT JOIN jurisdictions j ON s.jurisdiction_id = j.id::text
-            ORDER BY rs.created_at DESC
-            LIMIT $1
-            """,
-            limit
-        )
-        return [
-            {
-                "id": str(row["id"]),
-                "url": row["url"],
-                "scraped_at": str(row["created_at"]) if row.get("created_at") else None,
-                "jurisdiction_id": str(row["jurisdiction_id"]) if row.get("jurisdiction_id") else None,
-                "jurisdiction_name": row["jurisdiction_name"],
-                "metadata": row["metadata"]
-            }
-            for row in rows
-        ]
+        if format == "ndjson":
+            rows = db.stream_scrapes(cursor=cursor, fields=fields)
+            return StreamingResponse(ndjson_lines(_stream_scrape_summaries(rows)), media_type="application/x-ndjson")
+
+        rows = await db.list_scrapes(limit=limit, cursor=cursor, fields=fields)
+        cursor_value = next_cursor(rows, limit)
+        if cursor_value:
+            response.headers["X-Next-Cursor"] = cursor_value
+        return [_scrape_summary(row) for row in rows]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch scrapes: {str(e)}")
 
@@ -368,22 +343,98 @@ async def get_dashboard_stats(request: Request):
         raise HTTPException(status_code=503, detail="Database not available")
     
     try:
-        # Get counts from various tables
-        jurisdiction_count = await db._fetchrow("SELECT COUNT(*) as count FROM jurisdictions")
-        scrape_count = await db._fetchrow("SELECT COUNT(*) as count FROM raw_scrapes")
-        source_count = await db._fetchrow("SELECT COUNT(*) as count FROM sources")
-        chunk_count = await db._fetchrow("SELECT COUNT(*) as count FROM document_chunks")
+        # Totals row of jurisdiction_stats instead of four COUNT(*) scans
+        totals = await db.get_jurisdiction_stats()
         
         return {
-            "jurisdictions": jurisdiction_count["count"] if jurisdiction_count else 0,
-            "scrapes": scrape_count["count"] if scrape_count else 0,
-            "sources": source_count["count"] if source_count else 0,
-            "chunks": chunk_count["count"] if chunk_count else 0
+            "jurisdictions": totals.get("jurisdiction_count", 0),
+            "scrapes": totals.get("raw_scrape_count", 0),
+            "sources": totals.get("source_count", 0),
+            "chunks": totals.get("chunk_count", 0)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch stats: {str(e)}")
 
 
+@router.post("/stats/refresh")
+async def refresh_dashboard_stats(request: Request):
+    """Recount jurisdiction_stats from the base tables (full scans; use sparingly)."""
+    db = get_db(request)
+    if not db:
+        raise HTTPException(status_code=503, detail="Database not available")
+    
+    if not await db.refresh_jurisdiction_stats():
+        raise HTTPException(status_code=500, detail="Failed to refresh stats")
+    return {"status": "refreshed"}
+
+
+@router.get("/db/pool")
+async def get_db_pool_stats(request: Request):
+    """Connection pool saturation (acquired, idle, waiters) for sizing under load."""
+    db = get_db(request)
+    if not db:
+        raise HTTPException(status_code=503, detail="Database not available")
+    return db.pool_stats()
+
+
+@router.get("/providers")
+async def get_provider_gateway_stats():
+    """Per-provider concurrency limit, queue depth, throttles and retries of the provider gateways."""
+    return gateway_stats()
+
+
+@router.get("/db/cache")
+async def get_db_cache_stats(request: Request):
+    """Identity cache (jurisdictions, sources, system prompts) hit/miss counters."""
+    db = get_db(request)
+    if not db:
+        raise HTTPException(status_code=503, detail="Database not available")
+    return db.cache_stats()
+
+
+@router.get("/db/vector-index")
+async def get_vector_index_status(request: Request, table: Literal["documents", "document_chunks"] = "documents"):
+    """ANN indexes on the chunk table's embedding column (build/rebuild with scripts/db-commands/vector_index.py)."""
+    from services.retrieval.index_manager import VectorIndexManager
+
+    db = get_db(request)
+    if not db:
+        raise HTTPException(status_code=503, detail="Database not available")
+    try:
+        return await VectorIndexManager(db, table_name=table).status()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to inspect vector index: {e}")
+
+
+# ============================================================================
+# INGESTION QUEUE ENDPOINTS
+# ============================================================================
+
+class RequeueRequest(BaseModel):
+    job_ids: Optional[List[int]] = None  # None requeues every dead job
+
+
+@router.get("/ingestion/queue")
+async def get_ingestion_queue(request: Request, recent_failures: int = 20):
+    """Ingestion job queue depth, lag, active workers and recent failures."""
+    db = get_db(request)
+    if not db:
+        raise HTTPException(status_code=503, detail="Database not available")
+    status = await db.get_ingestion_queue_status(recent_failures=min(max(recent_failures, 0), 200))
+    if not status:
+        raise HTTPException(status_code=500, detail="Failed to fetch ingestion queue status")
+    return status
+
+
+@router.post("/ingestion/queue/requeue")
+async def requeue_dead_ingestion_jobs(body: RequeueRequest, request: Request):
+    """Give dead ingestion jobs a fresh set of attempts."""
+    db = get_db(request)
+    if not db:
+        raise HTTPException(status_code=503, detail="Database not available")
+    return {"requeued": await db.requeue_dead_ingestion_jobs(body.job_ids)}
+
+
 # ============================================================================
 # GLASS BOX ENDPOINTS (existing)
 # ============================================================================
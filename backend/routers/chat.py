@@ -9,7 +9,7 @@ import json
 import logging
 from typing import Any, AsyncGenerator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
@@ -31,7 +31,17 @@ class ChatMessage(BaseModel):
     data: dict
 
 
-async def get_policy_agent():
+def get_retrieval_backend(request: Request):
+    """Process-wide vector backend; its query-embedding cache must outlive single requests."""
+    backend = getattr(request.app.state, "retrieval", None)
+    db = getattr(request.app.state, "db", None)
+    if backend is None and db is not None:
+        from services.ingestion_factory import create_retrieval_backend
+        backend = request.app.state.retrieval = create_retrieval_backend(db)
+    return backend
+
+
+async def get_policy_agent(request: Request):
     """Dependency to get PolicyAgent instance."""
     # Import here to avoid circular imports
     try:
@@ -50,7 +60,7 @@ async def get_policy_agent():
         registry = ToolRegistry()
         registry.register(ZaiSearchTool(llm_client))
         registry.register(ScraperTool())
-        registry.register(RetrieverTool())
+        registry.register(RetrieverTool(retrieval_backend=get_retrieval_backend(request)))
         
         # Initialize context manager
         context_dir = Path("/tmp/affordabot_context")
@@ -1,9 +1,12 @@
 """API Router for Sources."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Literal, Optional
+from uuid import UUID
 from services.source_service import SourceService, SourceCreate, SourceUpdate
 from db.postgres_client import PostgresDB
+from db.pagination import ndjson_lines, next_cursor
 
 router = APIRouter(prefix="/sources", tags=["sources"])
 
@@ -16,10 +19,32 @@ def get_source_service(db: PostgresDB = Depends(get_db)) -> SourceService:
 
 @router.get("/", response_model=List[dict])
 async def list_sources(
-    jurisdiction_id: Optional[str] = None,
+    response: Response,
+    jurisdiction_id: Optional[UUID] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    format: Literal["json", "ndjson"] = "json",
     service: SourceService = Depends(get_source_service)
 ):
-    return await service.get_sources(jurisdiction_id)
+    """
+    List sources newest first. With `limit`, the next page's cursor is returned in
+    the X-Next-Cursor header; `fields` is a comma-separated column list and
+    format=ndjson streams every matching source.
+    """
+    try:
+        if format == "ndjson":
+            rows = service.stream_sources(jurisdiction_id, cursor=cursor, fields=fields)
+            return StreamingResponse(ndjson_lines(rows), media_type="application/x-ndjson")
+
+        sources = await service.get_sources(jurisdiction_id, limit=limit, cursor=cursor, fields=fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if limit:
+        cursor_value = next_cursor(sources, limit)
+        if cursor_value:
+            response.headers["X-Next-Cursor"] = cursor_value
+    return sources
 
 @router.post("/", response_model=dict)
 async def create_source(
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+HTML Extraction Benchmark
+Compares the legacy two-regex clean_html against services.extraction modes (fast,
+trafilatura when installed, and fast across a process pool): throughput and output size.
+
+Point --corpus at a directory of saved pages; files are grouped by their first-level
+subdirectory (e.g. san_jose/, municode/, openstates/). Without --corpus, synthetic
+Legistar, Municode and Open States pages are generated. Needs no database.
+
+Usage:
+    python scripts/benchmarks/bench_html_extraction.py [--corpus pages/] [--pages 200] [--workers 4]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from services.extraction import TRAFILATURA_AVAILABLE, html_to_text  # noqa: E402
+
+WORDS = (
+    "housing fee ordinance council resolution section amended parcel unit affordable "
+    "zoning permit density bonus inclusionary developer rental market rate exemption"
+).split()
+
+
+def legacy_clean_html(html: str) -> str:
+    """The pre-extraction IngestionService._clean_html."""
+    text = re.sub(r'<[^>]+>', ' ', html)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(8, 25))).capitalize() + "."
+
+
+def _chrome(rng: random.Random) -> str:
+    """Scripts, styles and navigation that real pages carry around the content."""
+    script = "var a=" + "".join(rng.choices("abcdef0123456789", k=2000)) + ";"
+    nav = "".join(f'<li><a href="/p{i}">Menu item {i}</a></li>' for i in range(80))
+    return f"<script>{script}</script><style>.c{{color:red}}{'.x{margin:0}' * 200}</style><nav><ul>{nav}</ul></nav>"
+
+
+def legistar_page(rng: random.Random) -> str:
+    rows = "".join(
+        f"<tr><td>{rng.randint(1, 12)}.{rng.randint(1, 9)}</td><td>25-{rng.randint(1000, 9999)}</td>"
+        f"<td>{_sentence(rng)}</td><td>Approved</td></tr>"
+        for _ in range(rng.randint(40, 200))
+    )
+    text = "".join(f"<p>{_sentence(rng)} {_sentence(rng)}</p>" for _ in range(rng.randint(20, 200)))
+    return (
+        f"<html><head>{_chrome(rng)}</head><body><form id='aspnetForm'>{_chrome(rng)}"
+        f"<table class='rgMasterTable'><tr><th>Item</th><th>File</th><th>Title</th><th>Action</th></tr>{rows}</table>"
+        f"<div class='legislation-text'>{text}</div><footer>City of San Jose</footer></form></body></html>"
+    )
+
+
+def municode_page(rng: random.Random) -> str:
+    sections = "".join(
+        f"<div class='chunk'><h3>Sec. 20.{rng.randint(10, 99)}.{rng.randint(10, 990):03d}. Definitions.</h3>"
+        + "".join(f"<p>({chr(97 + i)}) {_sentence(rng)} {_sentence(rng)}</p>" for i in range(rng.randint(2, 10)))
+        + "</div>"
+        for _ in range(rng.randint(20, 120))
+    )
+    return f"<html><head>{_chrome(rng)}</head><body>{_chrome(rng)}<main>{sections}</main></body></html>"
+
+
+def openstates_page(rng: random.Random) -> str:
+    actions = "".join(f"<li>2025-0{rng.randint(1, 9)}-1{rng.randint(0, 9)} {_sentence(rng)}</li>" for _ in range(30))
+    text = "".join(f"<p>SECTION {i}. {_sentence(rng)} {_sentence(rng)}</p>" for i in range(1, rng.randint(10, 80)))
+    return f"<html><head>{_chrome(rng)}</head><body>{_chrome(rng)}<article><h1>AB {rng.randint(1, 3000)}</h1><ul>{actions}</ul>{text}</article></body></html>"
+
+
+def synthetic_corpus(pages: int, seed: int = 11) -> dict:
+    rng = random.Random(seed)
+    generators = {"san_jose": legistar_page, "municode": municode_page, "openstates": openstates_page}
+    return {name: [gen(rng) for _ in range(pages)] for name, gen in generators.items()}
+
+
+def load_corpus(path: str) -> dict:
+    corpus = defaultdict(list)
+    for dirpath, _, files in os.walk(path):
+        rel = os.path.relpath(dirpath, path)
+        group = rel.split(os.sep)[0] if rel != "." else "corpus"
+        for name in files:
+            if name.endswith((".html", ".htm")):
+                with open(os.path.join(dirpath, name), encoding="utf-8", errors="replace") as f:
+                    corpus[group].append(f.read())
+    return dict(corpus)
+
+
+def measure(label: str, group: str, pages: list, fn) -> None:
+    size = sum(len(page.encode()) for page in pages)
+    start = time.perf_counter()
+    outputs = fn(pages)
+    elapsed = time.perf_counter() - start
+    out_chars = sum(len(text) for text in outputs)
+    in_chars = sum(len(page) for page in pages)
+    print(
+        f"{group:<12} | {label:<14} | {size / (1 << 20) / elapsed:8.1f} | "
+        f"{out_chars / 1024:10.0f} | {out_chars / max(in_chars, 1):6.1%}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of saved .html pages (subdirectory = source)")
+    parser.add_argument("--pages", type=int, default=100, help="Synthetic pages per source")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.pages)
+    if not corpus:
+        print(f"❌ No .html files under {args.corpus}")
+        sys.exit(1)
+    for group, pages in corpus.items():
+        print(f"📄 {group}: {len(pages)} pages, {sum(len(p) for p in pages) / (1 << 20):.1f} MB")
+
+    modes = [
+        ("legacy regex", lambda pages: [legacy_clean_html(p) for p in pages]),
+        ("regex", lambda pages: [html_to_text(p, "regex") for p in pages]),
+        ("fast", lambda pages: [html_to_text(p, "fast") for p in pages]),
+    ]
+    if TRAFILATURA_AVAILABLE:
+        modes.append(("trafilatura", lambda pages: [html_to_text(p, "trafilatura") for p in pages]))
+    else:
+        print("⚠️  trafilatura not installed; skipping trafilatura mode")
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        # Warm the workers so process start-up is not measured
+        list(pool.map(html_to_text, ["<p>warm</p>"] * args.workers))
+        modes.append((f"fast x{args.workers} proc", lambda pages: list(pool.map(html_to_text, pages, chunksize=4))))
+
+        print(f"{'source':<12} | {'mode':<14} | {'MB/s':>8} | {'out (KB)':>10} | {'ratio':>6}")
+        print("-" * 64)
+        for group, pages in corpus.items():
+            for label, fn in modes:
+                measure(label, group, pages, fn)
+
+
+if __name__ == "__main__":
+    main()
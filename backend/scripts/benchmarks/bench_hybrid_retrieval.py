@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Hybrid Retrieval Benchmark
+Recall@k and latency of vector, lexical and hybrid (RRF) retrieval on bill lookups.
+
+The labelled set is built from the chunk table itself: for sampled bill numbers
+(chunk metadata.bill_number) each query template ("What does AB 1234 change?") must
+return a chunk of that bill. A JSON-lines file of {"query": ..., "bill_number": ...}
+can be passed instead with --labels.
+
+Query embeddings come from the environment-configured embedding service
+(OPENROUTER_API_KEY; the mock embedder makes vector recall meaningless).
+Needs DATABASE_URL with migrations 013/014 applied.
+
+Usage:
+    railway run python scripts/benchmarks/bench_hybrid_retrieval.py [--bills 50] [--k 5] [--table documents]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from db.postgres_client import PostgresDB  # noqa: E402
+from services.retrieval.local_pgvector import SEARCH_MODES, LocalPgVectorBackend  # noqa: E402
+
+TEMPLATES = [
+    "What does {bill} change?",
+    "{bill}",
+    "housing impact of {bill}",
+]
+
+
+async def labelled_set(db: PostgresDB, table: str, bills: int, labels_path: str = None) -> list[dict]:
+    if labels_path:
+        with open(labels_path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    rows = await db._fetch(
+        f"""
+        SELECT DISTINCT metadata->>'bill_number' AS bill_number
+        FROM {table} WHERE metadata ? 'bill_number'
+        ORDER BY 1 LIMIT $1
+        """,
+        bills,
+    )
+    return [
+        {"query": template.format(bill=row["bill_number"]), "bill_number": row["bill_number"]}
+        for row in rows
+        for template in TEMPLATES
+    ]
+
+
+async def run(table: str, bills: int, k: int, labels_path: str):
+    from services.ingestion_factory import create_ingestion_service
+
+    db = PostgresDB()
+    await db.connect()
+    try:
+        ingestion_service, _ = create_ingestion_service(db)
+        embedder = ingestion_service.embedding_service
+        backend = LocalPgVectorBackend(table_name=table, postgres_client=db)
+
+        cases = await labelled_set(db, table, bills, labels_path)
+        if not cases:
+            print("❌ No chunks with metadata.bill_number to label; pass --labels")
+            return
+        embeddings = await embedder.embed_documents([case["query"] for case in cases])
+        print(f"{len(cases)} labelled queries, k={k}, table={table}\n")
+
+        print(f"{'mode':>8} | {'recall@k':>8} | {'MRR':>6} | {'p50 ms':>7} | {'p95 ms':>7}")
+        print("-" * 48)
+        for mode in SEARCH_MODES:
+            hits, reciprocal_ranks, latencies = 0, [], []
+            for case, embedding in zip(cases, embeddings):
+                started = time.perf_counter()
+                results = await backend.query(embedding, k=k, text=case["query"], mode=mode)
+                latencies.append((time.perf_counter() - started) * 1000)
+                ranks = [
+                    rank for rank, chunk in enumerate(results, start=1)
+                    if chunk.metadata.get("bill_number") == case["bill_number"]
+                ]
+                hits += bool(ranks)
+                reciprocal_ranks.append(1 / ranks[0] if ranks else 0.0)
+            latencies.sort()
+            print(
+                f"{mode:>8} | {hits / len(cases):8.3f} | {statistics.mean(reciprocal_ranks):6.3f} | "
+                f"{latencies[len(latencies) // 2]:7.1f} | {latencies[int(len(latencies) * 0.95)]:7.1f}"
+            )
+    finally:
+        await db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--table", default="documents")
+    parser.add_argument("--bills", type=int, default=50, help="Bill numbers sampled for the labelled set")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--labels", help="JSON-lines labelled set ({query, bill_number} per line)")
+    args = parser.parse_args()
+
+    if not (os.getenv("DATABASE_URL") or os.getenv("DATABASE_URL_PUBLIC")):
+        print("❌ DATABASE_URL missing. Run with `railway run`")
+        sys.exit(1)
+
+    asyncio.run(run(args.table, args.bills, args.k, args.labels))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Quantized Vector Index Benchmark
+Index size, build time, recall@k and latency of full-precision, halfvec and binary
+HNSW indexes (optionally over a Matryoshka prefix), each searched through
+LocalPgVectorBackend with and without exact re-ranking.
+
+Runs on a scratch copy of the chunk table (--source, default documents), or on
+random vectors with --synthetic; the scratch table is dropped afterwards.
+Ground truth is an exact full-precision scan. Random vectors are the worst case
+for quantization; real embeddings (especially Matryoshka-trained ones) lose less.
+
+Usage:
+    railway run python scripts/benchmarks/bench_quantized_index.py --rows 100000 \\
+        --configs none:1536 halfvec:1536 halfvec:768 binary:1536
+    railway run python scripts/benchmarks/bench_quantized_index.py --synthetic --dims 1024 --rows 50000
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from db.postgres_client import PostgresDB  # noqa: E402
+from services.retrieval.index_manager import QUANTIZATIONS, IndexSpec, VectorIndexManager  # noqa: E402
+from services.retrieval.local_pgvector import LocalPgVectorBackend  # noqa: E402
+
+BENCH_TABLE = "bench_quantized_chunks"
+
+
+async def load_table(db: PostgresDB, source: str, rows: int, synthetic: bool, dims: int) -> int:
+    """Create the scratch table; returns its vector width."""
+    await db._execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+    if synthetic:
+        await db._execute(
+            f"""
+            CREATE TABLE {BENCH_TABLE} AS
+            SELECT gen_random_uuid() AS id, 'chunk ' || g AS content, '{{}}'::jsonb AS metadata,
+                   NULL::uuid AS document_id, now() AS created_at,
+                   (SELECT array_agg(random() - 0.5 + 0 * g) FROM generate_series(1, {int(dims)}))::vector({int(dims)}) AS embedding
+            FROM generate_series(1, {int(rows)}) g
+            """
+        )
+    else:
+        await db._execute(
+            f"""
+            CREATE TABLE {BENCH_TABLE} AS
+            SELECT id, content, metadata, document_id, created_at, embedding
+            FROM {source} WHERE embedding IS NOT NULL LIMIT {int(rows)}
+            """
+        )
+        # CREATE TABLE AS keeps the column type; pin the width so it can be indexed
+        width = await db._fetch(f"SELECT vector_dims(embedding) AS dims FROM {BENCH_TABLE} LIMIT 1")
+        if not width:
+            raise SystemExit(f"❌ No embeddings in {source}")
+        dims = width[0]["dims"]
+        await db._execute(f"ALTER TABLE {BENCH_TABLE} ALTER COLUMN embedding TYPE vector({dims})")
+    await db._execute(f"ALTER TABLE {BENCH_TABLE} ADD PRIMARY KEY (id)")
+    await db._execute(f"ANALYZE {BENCH_TABLE}")
+    return dims
+
+
+async def ground_truth(db: PostgresDB, queries: list, k: int) -> list[set]:
+    truth = []
+    async with db._acquire() as conn:
+        for embedding in queries:
+            async with conn.transaction():
+                await conn.execute("SET LOCAL enable_indexscan = off")
+                rows = await conn.fetch(f"SELECT id FROM {BENCH_TABLE} ORDER BY embedding <=> $1 LIMIT $2", embedding, k)
+            truth.append({str(row["id"]) for row in rows})
+    return truth
+
+
+async def measure(backend: LocalPgVectorBackend, queries: list, truth: list, k: int) -> tuple[float, float]:
+    recalls, latencies = [], []
+    for embedding, expected in zip(queries, truth):
+        started = time.perf_counter()
+        results = await backend.query(embedding, k=k)
+        latencies.append((time.perf_counter() - started) * 1000)
+        recalls.append(len({chunk.chunk_id for chunk in results} & expected) / max(len(expected), 1))
+    latencies.sort()
+    return statistics.mean(recalls), latencies[len(latencies) // 2]
+
+
+async def run(args):
+    db = PostgresDB()
+    await db.connect()
+    try:
+        dims = await load_table(db, args.source, args.rows, args.synthetic, args.dims)
+        samples = await db._fetch(f"SELECT embedding FROM {BENCH_TABLE} ORDER BY random() LIMIT $1", args.queries)
+        queries = [row["embedding"] for row in samples]
+        truth = await ground_truth(db, queries, args.k)
+        manager = VectorIndexManager(db, table_name=BENCH_TABLE)
+        print(f"{args.rows} rows x {dims} dims, {len(queries)} queries, k={args.k}\n")
+
+        print(f"{'index':>16} | {'size MB':>8} | {'build s':>8} | {'recall':>6} | {'p50 ms':>6} | {'reranked recall':>15} | {'p50 ms':>6}")
+        print("-" * 84)
+        for config in args.configs:
+            quantization, _, width = config.partition(":")
+            width = int(width) if width else dims
+            if width > dims or width > QUANTIZATIONS[quantization]:
+                print(f"{config:>16} | skipped (pgvector indexes at most {QUANTIZATIONS[quantization]} dims as {quantization})")
+                continue
+            spec = IndexSpec(
+                quantization=quantization, dimensions=width if quantization != "none" or width < dims else None,
+                m=args.m, ef_construction=args.ef_construction,
+            )
+            started = time.monotonic()
+            name = await manager.create(spec, maintenance_work_mem=args.work_mem)
+            build_s = time.monotonic() - started
+            size = next(index["size_bytes"] for index in (await manager.status())["indexes"] if index["name"] == name)
+
+            def backend(rerank_factor):
+                return LocalPgVectorBackend(
+                    table_name=BENCH_TABLE, postgres_client=db, quantization=quantization,
+                    dimensions=spec.dimensions, rerank_factor=rerank_factor, ef_search=args.ef_search,
+                )
+
+            recall, p50 = await measure(backend(1), queries, truth, args.k)
+            if spec.dimensions or quantization != "none":
+                reranked, reranked_p50 = await measure(backend(None), queries, truth, args.k)
+                reranked_col = f"{reranked:15.3f} | {reranked_p50:6.1f}"
+            else:
+                reranked_col = f"{'-':>15} | {'-':>6}"
+            print(f"{config:>16} | {size / 2**20:8.1f} | {build_s:8.1f} | {recall:6.3f} | {p50:6.1f} | {reranked_col}")
+            await manager.drop(name)
+    finally:
+        await db._execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+        await db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default="documents", help="Chunk table to copy embeddings from")
+    parser.add_argument("--synthetic", action="store_true", help="Random vectors instead of --source")
+    parser.add_argument("--dims", type=int, default=1536, help="Synthetic vector width")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument(
+        "--configs", nargs="+", default=["none", "halfvec", "halfvec:512", "binary"],
+        help="quantization[:dimensions] per index (dimensions < width = Matryoshka prefix)",
+    )
+    parser.add_argument("--m", type=int, default=16)
+    parser.add_argument("--ef-construction", type=int, default=64)
+    parser.add_argument("--ef-search", type=int, default=None)
+    parser.add_argument("--work-mem", default="1GB")
+    args = parser.parse_args()
+
+    if not (os.getenv("DATABASE_URL") or os.getenv("DATABASE_URL_PUBLIC")):
+        print("❌ DATABASE_URL missing. Run with `railway run`")
+        sys.exit(1)
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
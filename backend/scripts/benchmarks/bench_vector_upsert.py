@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Vector Upsert Benchmark
+Compares the legacy per-row INSERT loop against LocalPgVectorBackend.bulk_upsert
+(COPY into staging + merge) at 1k, 10k and 100k chunks.
+
+Writes to a scratch table that is dropped afterwards; needs DATABASE_URL with pgvector.
+
+Usage:
+    railway run python scripts/benchmarks/bench_vector_upsert.py [--sizes 1000 10000] [--dims 1536]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from uuid import uuid4
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from db.postgres_client import PostgresDB  # noqa: E402
+from services.retrieval.local_pgvector import LocalPgVectorBackend  # noqa: E402
+
+BENCH_TABLE = "bench_document_chunks"
+
+
+def make_chunks(n: int, dims: int) -> list[dict]:
+    document_id = str(uuid4())
+    return [
+        {
+            "id": str(uuid4()),
+            "content": f"Benchmark chunk {i} " + "lorem ipsum " * 60,
+            "embedding": [random.random() for _ in range(dims)],
+            "metadata": {"source_id": "bench", "chunk": i},
+            "document_id": document_id,
+        }
+        for i in range(n)
+    ]
+
+
+async def legacy_loop_upsert(db: PostgresDB, chunks: list[dict]) -> int:
+    """The pre-COPY implementation: one INSERT round-trip per chunk."""
+    query = f"""
+    INSERT INTO {BENCH_TABLE}
+    (id, content, embedding, metadata, document_id)
+    VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (id) DO UPDATE SET
+        content = EXCLUDED.content,
+        embedding = EXCLUDED.embedding,
+        metadata = EXCLUDED.metadata;
+    """
+    for chunk in chunks:
+        await db._execute(
+            query,
+            chunk['id'],
+            chunk['content'],
+            chunk['embedding'],
+            chunk['metadata'],
+            chunk['document_id'],
+        )
+    return len(chunks)
+
+
+async def reset_table(db: PostgresDB, dims: int):
+    await db._execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+    await db._execute(
+        f"""
+        CREATE TABLE {BENCH_TABLE} (
+            id uuid PRIMARY KEY,
+            document_id uuid,
+            content text NOT NULL,
+            embedding vector({dims}),
+            metadata jsonb DEFAULT '{{}}'::jsonb
+        )
+        """
+    )
+
+
+async def run(sizes: list[int], dims: int, batch_size: int, skip_legacy_above: int):
+    db = PostgresDB()
+    await db.connect()
+    backend = LocalPgVectorBackend(table_name=BENCH_TABLE, postgres_client=db, upsert_batch_size=batch_size)
+
+    print(f"{'rows':>8} | {'legacy loop (s)':>16} | {'bulk COPY (s)':>14} | {'speedup':>8}")
+    print("-" * 56)
+    try:
+        for n in sizes:
+            chunks = make_chunks(n, dims)
+
+            legacy_s = None
+            if n <= skip_legacy_above:
+                await reset_table(db, dims)
+                start = time.perf_counter()
+                await legacy_loop_upsert(db, chunks)
+                legacy_s = time.perf_counter() - start
+
+            await reset_table(db, dims)
+            start = time.perf_counter()
+            written = await backend.bulk_upsert(chunks)
+            bulk_s = time.perf_counter() - start
+            assert written == n, f"expected {n} rows written, got {written}"
+
+            legacy_col = f"{legacy_s:16.2f}" if legacy_s is not None else f"{'skipped':>16}"
+            speedup = f"{legacy_s / bulk_s:7.1f}x" if legacy_s is not None else f"{'-':>8}"
+            print(f"{n:>8} | {legacy_col} | {bulk_s:14.2f} | {speedup}")
+    finally:
+        await db._execute(f"DROP TABLE IF EXISTS {BENCH_TABLE}")
+        await db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--dims", type=int, default=1536)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--skip-legacy-above", type=int, default=100_000,
+        help="Skip the per-row loop for sizes above this (it takes minutes at 100k over a remote link)",
+    )
+    args = parser.parse_args()
+
+    if not (os.getenv("DATABASE_URL") or os.getenv("DATABASE_URL_PUBLIC")):
+        print("❌ DATABASE_URL missing. Run with `railway run`")
+        sys.exit(1)
+
+    asyncio.run(run(args.sizes, args.dims, args.batch_size, args.skip_legacy_above))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Jurisdiction Stats Rollup Cron
+Folds the insert-only counter ledger (jurisdiction_stats_deltas, migration 009) into
+jurisdiction_stats_rollup so the jurisdiction_stats view stays cheap to read.
+Reads are exact without it; this only bounds the ledger.
+"""
+
+import sys
+import os
+import logging
+import asyncio
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from db.postgres_client import PostgresDB
+
+# Logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("stats_rollup")
+
+async def main():
+    db = PostgresDB()
+    await db.connect()
+    try:
+        folded = await db.rollup_jurisdiction_stats()
+        logger.info(f"📊 Folded {folded} counter deltas into jurisdiction_stats_rollup")
+    finally:
+        await db.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -12,6 +12,8 @@ import asyncio
 from datetime import datetime
 from uuid import uuid4
 
+import asyncpg
+
 # Add backend to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 
@@ -56,36 +58,26 @@ async def main():
             for item in discovered_items:
                 results["found"] += 1
                 
-                # Check duplication (PostgresDB doesn't have convenient chained query builder yet for exact logic)
-                # But get_or_create_source handles it IF we pass URL.
-                # Currently get_or_create_source uses name/type.
-                # Let's check manually.
-                
-                existing = await db._fetchrow("SELECT id FROM sources WHERE jurisdiction_id = $1 AND url = $2", jur['id'], item['url'])
-                
+                # sources.url is UNIQUE (migration 006): a URL already known under any jurisdiction is not new
+                existing = await db._fetchrow("SELECT id FROM sources WHERE url = $1", item['url'])
+
                 if not existing:
-                    # Create Source
-                    await db.get_or_create_source(
-                        jurisdiction_id=str(jur['id']),
-                        name=item['title'],
-                        type='web',
-                        url=item['url'] # Assuming we updated get_or_create_source to take URL or we do raw insert here?
-                        # PostgresDB in postgres_client.py needs to be checked.
-                        # Assuming raw insert for safety.
-                    )
-                    # Or use raw insert to be sure about metadata
-                    await db.create_source({
-                        'jurisdiction_id': str(jur['id']),
-                        'name': item['title'],
-                        'type': 'web',
-                        'url': item['url'],
-                        'scrape_url': item['url'],
-                        'metadata': {
-                            'category': item['category'], 
-                            'snippet': item['snippet'],
-                            'discovered_at': datetime.now().isoformat()
-                        }
-                    })
+                    try:
+                        await db.create_source({
+                            'jurisdiction_id': str(jur['id']),
+                            'name': item['title'],
+                            'type': 'web',
+                            'url': item['url'],
+                            'scrape_url': item['url'],
+                            'metadata': {
+                                'category': item['category'],
+                                'snippet': item['snippet'],
+                                'discovered_at': datetime.now().isoformat()
+                            }
+                        })
+                    except asyncpg.UniqueViolationError:
+                        # Inserted concurrently (another discovery run or the ingest worker)
+                        continue
                     results["new"] += 1
                     logger.info(f"   + Added: {item['title']}")
         
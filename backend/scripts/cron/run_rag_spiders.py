@@ -9,6 +9,7 @@ import sys
 import os
 import logging
 import asyncio
+import time
 from uuid import uuid4
 from scrapy.crawler import CrawlerProcess
 from scrapy import signals
@@ -68,6 +69,10 @@ class RAGSpiderRunner:
             settings = get_project_settings()
             settings.set('TELNETCONSOLE_ENABLED', False)
             settings.set('LOG_LEVEL', 'INFO')
+            # Streaming: RawScrapePipeline queues each saved item and an ingest thread embeds
+            # it while the crawl runs, so the job takes ~max(crawl, ingest) instead of the sum
+            streaming = os.environ.get("INGEST_STREAMING", "true").lower() == "true"
+            settings.set('INGESTION_QUEUE_ENABLED', streaming)
             
             process = CrawlerProcess(settings)
             
@@ -104,82 +109,66 @@ class RAGSpiderRunner:
                 else:
                     logger.error(f"Failed to get Source ID for {source_name}")
 
+            from db.postgres_client import PostgresDB
+            from services.extraction import shutdown_extraction_pool
+            from services.ingestion_factory import create_ingestion_service
+            from services.ingestion_worker import IngestionWorker, IngestionWorkerThread, worker_env
+
+            # Scrapes left unprocessed by earlier runs are queued first
+            enqueued = loop.run_until_complete(self.db.enqueue_unprocessed_scrapes(source_ids))
+            logger.info(f"📥 Enqueued {enqueued} earlier scrapes for ingestion")
+
+            ingest_thread = None
+            if streaming:
+                try:
+                    ingest_thread = IngestionWorkerThread(PostgresDB, create_ingestion_service, **worker_env()).start()
+                    logger.info("🍽️  Streaming ingestion started")
+                except Exception as e:
+                    logger.error(f"Streaming ingestion unavailable, ingesting after the crawl: {e}")
+
             # 3. Run (Blocks)
             logger.info("🏃 Running spiders...")
+            started = time.monotonic()
             process.start()
+            crawl_done = time.monotonic()
             
-            # 4. Trigger Ingestion
-            logger.info("🍽️  Starting Ingestion...")
-            
-            # Import Ingestion Service components
-            from services.ingestion_service import IngestionService
-            from services.storage import S3Storage
-            from services.vector_backend_factory import create_vector_backend
-            from llm_common.embeddings.openai import OpenAIEmbeddingService
-            # Inline Mock Embedding Service (llm-common export missing/mismatched)
-            class MockEmbeddingService:
-                async def embed_query(self, text: str) -> list[float]:
-                    return [0.1] * 1536
-                async def embed_documents(self, texts: list[str]) -> list[list[float]]:
-                    return [[0.1] * 1536 for _ in texts]
-
-            # Setup Services
-            if os.environ.get("OPENAI_API_KEY") or os.environ.get("OPENROUTER_API_KEY"):
-                embedding_service = OpenAIEmbeddingService(
-                    base_url="https://openrouter.ai/api/v1",
-                    api_key=os.environ.get("OPENROUTER_API_KEY"),
-                    model="qwen/qwen3-embedding-8b",
-                    dimensions=4096 # Keep qwen as 4096 if that's the intent, but mock must be 1536 if DB is 1536. 
-                    # WARNING: If DB is 1536, conditional logic here is risky if Qwen is 4096. 
-                    # Assuming Qwen usage expects 4096 DB columns. 
-                    # But Verify Pipeline failing on 1536 implies DB is 1536.
-                    # Local env probably using default PGVector (1536).
-                )
-            else:
-                logger.warning("Using Mock Embedding Service (1536 dims)")
-                embedding_service = MockEmbeddingService()
-            
-            # Create embedding function for vector backend
-            async def embed_fn(text: str) -> list[float]:
-                return await embedding_service.embed_query(text)
-            
-            # Create vector backend
-            vector_backend = create_vector_backend(
-                postgres_client=self.db, # Factory needs update or direct instantiation
-                embedding_fn=embed_fn
-            )
-            # WORKAROUND: Factory might still require supabase_client if not updated.
-            # Assuming custom_pgvector_backend for now.
-            # Let's check factory later. For now assume it works or we use direct.
-            
-            storage_backend = S3Storage()  # Uses MINIO_* env vars
-            
-            ingestion_service = IngestionService(
-                postgres_client=self.db,
-                vector_backend=vector_backend,
-                embedding_service=embedding_service,
-                storage_backend=storage_backend
-            )
-            
-            # Fetch unprocessed scrapes for these sources
-            total_ingested = 0
-            
-            # We can't query "IN" easily with simple helper, loop for now
-            for sid in source_ids:
-                # Fetch unprocessed
-                unprocessed_rows = loop.run_until_complete(
-                    self.db._fetch("SELECT id FROM raw_scrapes WHERE source_id = $1 AND processed IS NULL", sid)
-                )
-                
-                for row in unprocessed_rows:
-                    try:
-                        # Run async ingestion
-                        chunks = loop.run_until_complete(ingestion_service.process_raw_scrape(str(row['id'])))
-                        total_ingested += chunks
-                    except Exception as e:
-                        logger.error(f"Failed to ingest scrape {row['id']}: {e}")
-                            
-            logger.info(f"🍽️  Ingestion Complete. Created {total_ingested} chunks.")
+            # 4. Finish Ingestion
+            # Catches items the pipeline could not queue (e.g. streaming disabled)
+            enqueued = loop.run_until_complete(self.db.enqueue_unprocessed_scrapes(source_ids))
+            logger.info(f"🍽️  Finishing Ingestion ({enqueued} scrapes queued after the crawl)...")
+
+            stats, cache_stats = None, None
+            if ingest_thread:
+                try:
+                    stats = ingest_thread.finish()
+                    cache_stats = ingest_thread.cache_stats
+                except Exception as e:
+                    logger.error(f"Streaming ingestion failed, draining the queue here: {e}")
+            if stats is None:
+                # Drain the ready queue; failed scrapes are retried with backoff by the
+                # ingest worker or the next run instead of being lost
+                ingestion_service, embedding_cache = create_ingestion_service(self.db)
+                worker = IngestionWorker.from_env(self.db, ingestion_service)
+                stats = loop.run_until_complete(worker.run(drain=True))
+                if embedding_cache:
+                    pruned = loop.run_until_complete(embedding_cache.prune())
+                    cache_stats = {**embedding_cache.stats(), "pruned": pruned}
+            shutdown_extraction_pool()
+
+            finished = time.monotonic()
+            worker_stats = stats.as_dict()
+            # Per-stage latency: crawl, ingestion still running after the crawl, and queue/batch times
+            timings = {
+                "streaming": ingest_thread is not None,
+                "crawl_s": round(crawl_done - started, 1),
+                "ingest_tail_s": round(finished - crawl_done, 1),
+                "total_s": round(finished - started, 1),
+                **{key: worker_stats[key] for key in ("avg_queue_wait_s", "max_queue_wait_s", "avg_batch_s", "max_batch_s")},
+            }
+            logger.info(f"🍽️  Ingestion Complete. Created {stats.chunks} chunks ({worker_stats}).")
+            logger.info(f"⏱️  Stage timings: {timings}")
+            if cache_stats:
+                logger.info(f"🧠 Embedding cache: {cache_stats}")
             
             # 5. Log Success
             total_items = sum(self.results.values())
@@ -189,7 +178,7 @@ class RAGSpiderRunner:
                 self.db.update_admin_task(
                     task_id=task_id,
                     status='completed',
-                    result=self.results
+                    result={**self.results, "timings": timings}
                 )
             )
                 
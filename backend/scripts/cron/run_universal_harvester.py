@@ -1,21 +1,30 @@
 #!/usr/bin/env python3
 """
 Universal Harvester Cron
-Uses Z.ai GLM-4.6 to "read" generic web pages (configured in sources) 
+Uses Z.ai GLM-4.6 to "read" generic web pages (configured in sources)
 and ingest them into the vector database.
+
+Sources are harvested concurrently (HARVEST_CONCURRENCY). A conditional GET
+(ETag / Last-Modified) and a hash of the page body skip the LLM read for pages
+unchanged since the last harvest; that state lives in sources.metadata.harvest.
 """
 
 import sys
 import os
 import logging
 import asyncio
+import hashlib
+import time
 import httpx
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
 from uuid import uuid4
 
 # Add backend to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 
 from db.postgres_client import PostgresDB
+from services.provider_gateway import get_gateway
 
 # Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -27,15 +36,19 @@ ZAI_BASE_URL = "https://api.z.ai/api/coding/paas/v4/chat/completions"
 MODEL = "glm-4.7"
 
 class UniversalHarvester:
-    def __init__(self):
+    def __init__(self, concurrency: Optional[int] = None):
         self.db = PostgresDB()
+        self.concurrency = max(1, concurrency or int(os.environ.get("HARVEST_CONCURRENCY", "4")))
+        # Z.ai calls share the adaptive concurrency/rate limits of every other Z.ai caller
+        self.gateway = get_gateway("zai")
+        self.ingestion_service = None
         if not ZAI_API_KEY:
             logger.warning("⚠️ ZAI_API_KEY not set. Harvester will fail.")
 
     async def run(self):
         task_id = str(uuid4())
         logger.info(f"🚀 Starting Universal Harvester (Task {task_id})")
-        
+
         # 1. Log Start
         if self.db:
             await self.db.create_admin_task(
@@ -50,24 +63,38 @@ class UniversalHarvester:
             # Look for sources with type='web'
             # PostgresDB helper needed here or raw query
             sources = await self.db._fetch("SELECT * FROM sources WHERE type = $1", 'web')
-            
+
             logger.info(f"found {len(sources)} web sources to harvest")
-            
-            results = {"processed": 0, "failed": 0, "chunks": 0}
-            
-            async with httpx.AsyncClient(timeout=120.0) as client:
-                for source in sources:
-                    try:
-                        # Convert Record to dict
-                        source_dict = dict(source)
-                        await self._process_source(client, source_dict, task_id)
-                        results["processed"] += 1
-                    except Exception as e:
-                        logger.error(f"Failed source {source.get('name')}: {e}")
-                        results["failed"] += 1
-
-            # 3. Log Completion
-            logger.info(f"🏁 Complete. {results}")
+
+            # 3. Shared services: one embedding client, vector backend and storage connection for every source
+            from services.extraction import shutdown_extraction_pool
+            from services.ingestion_factory import create_ingestion_service
+            self.ingestion_service, embedding_cache = create_ingestion_service(self.db)
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def harvest(client, source):
+                async with semaphore:
+                    return await self._harvest_source(client, dict(source), task_id)
+
+            async with httpx.AsyncClient(timeout=120.0, follow_redirects=True) as client:
+                outcomes = await asyncio.gather(*[harvest(client, source) for source in sources])
+            shutdown_extraction_pool()
+
+            results: Dict[str, Any] = {
+                "processed": sum(1 for o in outcomes if o["status"] == "harvested"),
+                "unchanged": sum(1 for o in outcomes if o["status"] == "unchanged"),
+                "failed": sum(1 for o in outcomes if o["status"] == "failed"),
+                "chunks": sum(o.get("chunks", 0) for o in outcomes),
+                # Per-source latency by stage (fetch = change check, read = Z.ai, ingest = chunk + embed)
+                "sources": outcomes,
+            }
+            if embedding_cache:
+                results["embedding_cache"] = embedding_cache.stats()
+
+            # 4. Log Completion
+            summary = {key: value for key, value in results.items() if key != "sources"}
+            logger.info(f"🏁 Complete. {summary}")
             await self.db.update_admin_task(
                 task_id=task_id,
                 status='completed',
@@ -84,122 +111,140 @@ class UniversalHarvester:
                 )
             sys.exit(1)
 
-    async def _process_source(self, client, source, task_id):
+    async def _harvest_source(self, client, source, task_id) -> Dict[str, Any]:
+        """Harvest one source; never raises. Returns its status, chunk count and stage latencies."""
+        outcome: Dict[str, Any] = {"source_id": str(source.get("id")), "name": source.get("name")}
+        started = time.monotonic()
+        try:
+            outcome.update(await self._process_source(client, source, task_id))
+        except Exception as e:
+            logger.error(f"Failed source {source.get('name')}: {e}")
+            outcome.update(status="failed", error=str(e)[:500])
+        outcome["total_ms"] = int((time.monotonic() - started) * 1000)
+        return outcome
+
+    async def _process_source(self, client, source, task_id) -> Dict[str, Any]:
         url = source.get('scrape_url') or source.get('url') # Handle both schema variations if any
         if not url:
-            return
+            return {"status": "skipped", "reason": "no url"}
+
+        timings: Dict[str, int] = {}
+        previous = _harvest_state(source)
+
+        # 1. Change check: skip the LLM read when the page is unchanged since the last harvest
+        started = time.monotonic()
+        page = await self._check_page(client, url, previous)
+        timings["fetch_ms"] = int((time.monotonic() - started) * 1000)
+        if page.get("unchanged"):
+            await self.db.record_harvest(source['id'], {**previous, **page["validators"], "checked_at": _now()})
+            logger.info(f"⏭️  Unchanged since last harvest: {url}")
+            return {"status": "unchanged", "chunks": 0, **timings}
 
         logger.info(f"📖 Reading: {url}")
-        
-        # 1. Call Z.ai to Read & Clean
+
+        # 2. Call Z.ai to Read & Clean
+        started = time.monotonic()
+        markdown_content = await self.gateway.call(self._read, client, url)
+        timings["read_ms"] = int((time.monotonic() - started) * 1000)
+
+        # 3. Save to Raw Scrapes
+        content_hash = hashlib.sha256(markdown_content.encode("utf-8")).hexdigest()
+
+        scrape_record = {
+            "source_id": str(source['id']), # Ensure UUID is string
+            "content_hash": content_hash,
+            "content_type": "text/markdown",
+            "data": {"content": markdown_content},
+            "url": url,
+            "metadata": {"harvester": "zai-glm-4.7", "task_id": task_id}
+        }
+
+        scrape_id = await self.db.create_raw_scrape(scrape_record)
+        if not scrape_id:
+             raise Exception("Failed to insert raw scrape record")
+
+        # 4. Trigger Ingestion
+        started = time.monotonic()
+        chunks = await self.ingestion_service.process_raw_scrape(scrape_id)
+        timings["ingest_ms"] = int((time.monotonic() - started) * 1000)
+        logger.info(f"✅ Ingested {url} -> {chunks} chunks")
+
+        # Validators are stored only after a successful ingest, so a failed source is re-read next run
+        await self.db.record_harvest(source['id'], {
+            **page.get("validators", {}),
+            "page_hash": page.get("page_hash"),
+            "content_hash": content_hash,
+            "harvested_at": _now(),
+            "checked_at": _now(),
+        })
+        return {"status": "harvested", "chunks": chunks, **timings}
+
+    async def _check_page(self, client, url: str, previous: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Conditional GET of the page. Returns unchanged=True on 304 or an identical body hash;
+        otherwise the new validators and body hash. Fetch errors never block the read.
+        """
+        headers = {}
+        if previous.get("etag"):
+            headers["If-None-Match"] = previous["etag"]
+        if previous.get("last_modified"):
+            headers["If-Modified-Since"] = previous["last_modified"]
+        try:
+            response = await client.get(url, headers=headers, timeout=30.0)
+        except Exception as e:
+            logger.info(f"Change check failed for {url}, reading anyway: {e}")
+            return {}
+
+        validators = {key: value for key, value in (
+            ("etag", response.headers.get("etag")),
+            ("last_modified", response.headers.get("last-modified")),
+        ) if isinstance(value, str)}
+        if response.status_code == 304:
+            return {"unchanged": True, "validators": validators}
+        if response.status_code != 200:
+            return {}
+        page_hash = hashlib.sha256(response.content).hexdigest()
+        return {"unchanged": page_hash == previous.get("page_hash"), "validators": validators, "page_hash": page_hash}
+
+    async def _read(self, client, url: str) -> str:
         payload = {
             "model": MODEL,
             "messages": [
                 {
-                    "role": "user", 
+                    "role": "user",
                     "content": f"Read the content of {url}. Extract the full text content in clean Markdown format. Ignore navigation, footers, and ads. If it's a list of rules/requirements, preserve the list structure."
                 }
             ],
             "tools": [{"type": "web_search", "web_search": {"enable": True, "search_result": True}}]
         }
-        
+
         response = await client.post(ZAI_BASE_URL, json=payload, headers={
             "Authorization": f"Bearer {ZAI_API_KEY}",
             "Content-Type": "application/json"
         })
-        
+
         if response.status_code != 200:
-            raise Exception(f"Z.ai Error {response.status_code}: {response.text}")
-            
+            # Carries the response so the gateway sees 429s and Retry-After
+            raise httpx.HTTPStatusError(
+                f"Z.ai Error {response.status_code}: {response.text}", request=response.request, response=response
+            )
+
         data = response.json()
         if "error" in data:
             raise Exception(f"Z.ai API Error: {data['error']}")
-            
-        markdown_content = data["choices"][0]["message"]["content"]
-        
-        # 2. Save to Raw Scrapes
-        import hashlib
-        
-        content_hash = hashlib.sha256(markdown_content.encode("utf-8")).hexdigest()
-        
-        scrape_record = {
-            "source_id": str(source['id']), # Ensure UUID is string
-            "content_hash": content_hash,
-            "content_type": "text/markdown",
-            "data": {"content": markdown_content},
-            "url": url,
-            "metadata": {"harvester": "zai-glm-4.7", "task_id": task_id}
-        }
-        
-        scrape_id = await self.db.create_raw_scrape(scrape_record)
-        if not scrape_id:
-             raise Exception("Failed to insert raw scrape record")
-        
-        # 3. Trigger Ingestion
-        # Import here to avoid circular imports at top level if any
-        from services.ingestion_service import IngestionService
-        from services.storage import S3Storage
-        # from services.vector_backend_factory import create_vector_backend 
-        # Factory might depend on SC, let's look at direct backend creation for PG
-        from llm_common.embeddings.openai import OpenAIEmbeddingService
-        from llm_common.embeddings.mock import MockEmbeddingService
-        from llm_common.retrieval.pgvector_backend import PgVectorBackend
-        
-        # Setup Services
-        if os.environ.get("OPENAI_API_KEY") or os.environ.get("OPENROUTER_API_KEY"):
-            embedding_service = OpenAIEmbeddingService(
-                base_url="https://openrouter.ai/api/v1",
-                api_key=os.environ.get("OPENROUTER_API_KEY"),
-                model="qwen/qwen3-embedding-8b",
-                dimensions=4096
-            )
-        else:
-            embedding_service = MockEmbeddingService()
-        
-        # Create vector backend (Directly use PgVectorBackend with our connection string)
-        # Note: llm-common PgVectorBackend typically needs a connection string or pool.
-        # Our internal PostgresDB uses asyncpg directly. 
-        # Check if we can reuse the pool or if we need to pass the dsn.
-        
-        vector_backend = PgVectorBackend(
-            connection_string=self.db.database_url,
-            table_name="documents"
-        )
-        
-        # Note: S3Storage uses env vars, no DB dep
-        storage_backend = S3Storage()  
-        
-        # IngestionService typically takes supabase_client for updates.
-        # We need to UPDATE IngestionService to accept PostgresDB or generic Database Interface.
-        # For now, IngestionService is still tightly coupled to Supabase Client?
-        # Let's check IngestionService again. It calls self.supabase.table(...).
-        
-        # CRITICAL: IngestionService needs to be refactored OR we mock the client.
-        # The prompt plan said "Update Universal Harvester".
-        # But IngestionService IS the logic.
-        # If IngestionService uses Supabase, we are still blocked.
-        # I must refactor IngestionService to accept `db_client` which can be `PostgresDB`.
-        
-        # STOPGAP: For this file, I will just call IngestionService.
-        # But I need to pass it something compatible.
-        # If I pass `self.db` (PostgresDB) to `supabase_client` arg, it will crash on `.table()`.
-        # So I MUST refactor IngestionService first?
-        # Or I can implement a "SupabaseAdapter" wrapper around PostgresDB?
-        # Refactoring IngestionService is the cleaner V4 way.
-        
-        # Let's assumes we will refactor IngestionService next.
-        # Pass `self.db` as a new arg `postgres_client` or generic `db_client`.
-        
-        ingestion_service = IngestionService(
-             supabase_client=None, # Deprecated
-             postgres_client=self.db, # NEW
-             vector_backend=vector_backend,
-             embedding_service=embedding_service,
-             storage_backend=storage_backend
-        )
-        
-        chunks = await ingestion_service.process_raw_scrape(scrape_id)
-        logger.info(f"✅ Ingested {url} -> {chunks} chunks")
+
+        return data["choices"][0]["message"]["content"]
+
+
+def _harvest_state(source: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = source.get("metadata")
+    state = metadata.get("harvest") if isinstance(metadata, dict) else None
+    return state if isinstance(state, dict) else {}
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
 
 if __name__ == "__main__":
     runner = UniversalHarvester()
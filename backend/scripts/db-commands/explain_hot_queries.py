@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+EXPLAIN the hot PostgresDB queries and flag sequential scans.
+
+Seeds synthetic jurisdictions, sources, scrapes, bills, impacts and pipeline runs
+inside a transaction, ANALYZEs, runs EXPLAIN (FORMAT JSON) for every query below
+and rolls everything back. By default `enable_seqscan` is turned off so a Seq Scan
+in the plan means no usable index exists (independent of how much data is seeded);
+pass --planner-defaults to see what the planner picks at the seeded volume.
+
+Intended for a local database with migrations applied (see migrations/007_hot_path_indexes.sql).
+
+Usage:
+    DATABASE_URL=postgresql://localhost/affordabot python scripts/db-commands/explain_hot_queries.py [--rows 20000]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Dict, List
+
+import asyncpg
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from db.codecs import register_codecs  # noqa: E402
+from db.statements import STATEMENTS  # noqa: E402
+
+SEED_SQL = """
+INSERT INTO jurisdictions (name, type)
+SELECT 'Explain City ' || g, 'city' FROM generate_series(1, 200) g;
+
+INSERT INTO sources (jurisdiction_id, name, type, url)
+SELECT j.id, 'Source ' || g || ' ' || j.name, 'web', 'https://explain.test/' || j.id || '/' || g
+FROM jurisdictions j, generate_series(1, 5) g
+WHERE j.name LIKE 'Explain City %';
+
+INSERT INTO raw_scrapes (source_id, content_hash, content_type, data, metadata, processed, created_at)
+SELECT s.id, md5(g::text || s.id::text), 'text/html', '{}'::jsonb,
+       jsonb_build_object('bill_number', 'EXP-' || (g % 500)),
+       CASE WHEN g % 10 = 0 THEN NULL WHEN g % 17 = 0 THEN false ELSE true END,
+       now() - (g || ' minutes')::interval
+FROM (SELECT id FROM sources WHERE url LIKE 'https://explain.test/%') s,
+     generate_series(1, GREATEST($1::int / 1000, 1)) g;
+
+INSERT INTO legislation (jurisdiction_id, bill_number, title, status, created_at)
+SELECT j.id, 'EXP-' || g, 'Explain bill ' || g, 'introduced', now() - (g || ' hours')::interval
+FROM jurisdictions j, generate_series(1, GREATEST($1::int / 200, 1)) g
+WHERE j.name LIKE 'Explain City %';
+
+INSERT INTO impacts (legislation_id, impact_number, description)
+SELECT l.id, g, 'Explain impact ' || g
+FROM legislation l, generate_series(1, 3) g
+WHERE l.bill_number LIKE 'EXP-%';
+
+INSERT INTO pipeline_runs (bill_id, jurisdiction, status, started_at)
+SELECT 'EXP-' || (g % 500), 'Explain City ' || (g % 200 + 1), 'completed', now() - (g || ' minutes')::interval
+FROM generate_series(1, $1::int) g;
+"""
+
+SAMPLE_SQL = """
+SELECT j.id AS jurisdiction_id, j.name AS jurisdiction,
+       (SELECT id FROM sources WHERE jurisdiction_id = j.id LIMIT 1) AS source_id,
+       (SELECT id FROM raw_scrapes LIMIT 1) AS scrape_id
+FROM jurisdictions j WHERE j.name = 'Explain City 1'
+"""
+
+# PostgresDB method (or caller) -> (sql, params built from the seeded sample row)
+HOT_QUERIES = {
+    "get_jurisdiction_by_name": (STATEMENTS["jurisdiction_by_name"], lambda s: [s["jurisdiction"]]),
+    "get_or_create_jurisdiction": (STATEMENTS["upsert_jurisdiction"], lambda s: [s["jurisdiction"], "city"]),
+    "get_or_create_source": (
+        STATEMENTS["upsert_source"],
+        lambda s: [s["jurisdiction_id"], "Source 1", "web", "https://explain.test/none"],
+    ),
+    "get_sources": ("SELECT * FROM sources WHERE jurisdiction_id = $1", lambda s: [s["jurisdiction_id"]]),
+    "get_legislation_by_jurisdiction": (
+        STATEMENTS["legislation_with_impacts_by_jurisdiction"],
+        lambda s: [s["jurisdiction"], None, None, 10],
+    ),
+    "get_bill": (STATEMENTS["bill_with_impacts"], lambda s: [s["jurisdiction"], "EXP-1"]),
+    "get_latest_scrape_for_bill": (
+        """
+        SELECT rs.id FROM raw_scrapes rs
+        JOIN sources s ON rs.source_id = s.id
+        WHERE s.jurisdiction_id = (SELECT id FROM jurisdictions WHERE name = $1)
+        AND rs.metadata->>'bill_number' = $2
+        ORDER BY rs.created_at DESC
+        LIMIT 1
+        """,
+        lambda s: [s["jurisdiction"], "EXP-1"],
+    ),
+    "get_vector_stats": (
+        "SELECT count(*) as chunk_count FROM document_chunks WHERE document_id = $1",
+        lambda s: [s["scrape_id"]],
+    ),
+    "get_system_prompt": (STATEMENTS["active_system_prompt"], lambda s: ["generation"]),
+    "get_admin_task": (STATEMENTS["admin_task_by_id"], lambda s: [s["scrape_id"]]),
+    "get_analysis_history": (STATEMENTS["analysis_history"], lambda s: [None, "EXP-1", None, 50, None, None]),
+    "run_rag_spiders.unprocessed": (
+        "SELECT id FROM raw_scrapes WHERE source_id = $1 AND processed IS NULL",
+        lambda s: [s["source_id"]],
+    ),
+    "admin.jurisdiction_dashboard": (
+        """
+        SELECT j.id, j.name, js.raw_scrape_count, js.legislation_count, js.last_scrape_at
+        FROM jurisdictions j
+        LEFT JOIN jurisdiction_stats js ON js.jurisdiction_id = j.id
+        WHERE j.id = $1
+        """,
+        lambda s: [s["jurisdiction_id"]],
+    ),
+    "get_jurisdiction_stats": (STATEMENTS["jurisdiction_stats"], lambda s: [s["jurisdiction_id"]]),
+    "admin.list_scrapes": (
+        """
+        SELECT rs.id, rs.url, rs.created_at, s.jurisdiction_id, j.name
+        FROM raw_scrapes rs
+        LEFT JOIN sources s ON rs.source_id = s.id
+        LEFT JOIN jurisdictions j ON s.jurisdiction_id = j.id
+        ORDER BY rs.created_at DESC
+        LIMIT 50
+        """,
+        lambda s: [],
+    ),
+    "get_cached_embeddings": (
+        STATEMENTS["embedding_cache_lookup"],
+        lambda s: ["qwen/qwen3-embedding-8b", 4096, [bytes(32)]],
+    ),
+    "glass_box.latest_run": (
+        "SELECT * FROM pipeline_runs WHERE bill_id = $1 OR jurisdiction = $1 "
+        "ORDER BY started_at DESC LIMIT 1",
+        lambda s: ["EXP-1"],
+    ),
+}
+
+
+def find_seq_scans(plan: Dict[str, Any]) -> List[str]:
+    """Relations read with a Seq Scan anywhere in the plan tree."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan":
+        found.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        found.extend(find_seq_scans(child))
+    return found
+
+
+async def explain_all(database_url: str, rows: int, planner_defaults: bool, verbose: bool) -> int:
+    conn = await asyncpg.connect(database_url)
+    await register_codecs(conn)
+    flagged = 0
+    tx = conn.transaction()
+    await tx.start()
+    try:
+        print(f"🌱 Seeding ~{rows} rows per table (rolled back afterwards)...")
+        # asyncpg only binds parameters for single statements
+        for statement in filter(str.strip, SEED_SQL.split(";")):
+            if "$1" in statement:
+                await conn.execute(statement, rows)
+            else:
+                await conn.execute(statement)
+        await conn.execute(
+            "ANALYZE jurisdictions, sources, raw_scrapes, legislation, impacts, pipeline_runs, "
+            "jurisdiction_stats_rollup, jurisdiction_stats_deltas"
+        )
+        sample = dict(await conn.fetchrow(SAMPLE_SQL))
+
+        if not planner_defaults:
+            await conn.execute("SET LOCAL enable_seqscan = off")
+
+        for name, (sql, params) in HOT_QUERIES.items():
+            try:
+                # Savepoint per query: a failed EXPLAIN (e.g. a table from a later migration
+                # is missing) must not abort the seeded transaction for the queries after it
+                async with conn.transaction():
+                    raw = await conn.fetchval(f"EXPLAIN (FORMAT JSON) {sql}", *params(sample))
+            except asyncpg.PostgresError as e:
+                print(f"⚠️  {name}: EXPLAIN failed: {e}")
+                continue
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            seq_scans = find_seq_scans(plan)
+            if seq_scans:
+                flagged += 1
+                print(f"❌ {name}: Seq Scan on {', '.join(sorted(set(seq_scans)))} (cost {plan['Total Cost']})")
+            else:
+                print(f"✅ {name}: index only (cost {plan['Total Cost']})")
+            if verbose:
+                print(json.dumps(plan, indent=2))
+    finally:
+        await tx.rollback()
+        await conn.close()
+
+    print(f"\n{flagged} of {len(HOT_QUERIES)} queries use sequential scans")
+    return flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000, help="Approximate seeded rows for the largest tables")
+    parser.add_argument("--planner-defaults", action="store_true", help="Keep enable_seqscan on")
+    parser.add_argument("--verbose", action="store_true", help="Print full JSON plans")
+    args = parser.parse_args()
+
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        print("❌ DATABASE_URL is not set.")
+        sys.exit(1)
+
+    flagged = asyncio.run(explain_all(database_url, args.rows, args.planner_defaults, args.verbose))
+    sys.exit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
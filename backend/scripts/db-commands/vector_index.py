@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Manage the ANN index of the vector chunk table (services/retrieval/index_manager.py).
+
+    status   ANN indexes on the embedding column, their size and validity
+    create   build the index concurrently (ingestion keeps writing)
+    rebuild  build a replacement next to the current index, then swap it in
+    drop     drop an index concurrently
+    tune     recall@k and latency of the index against exact search, per ef_search/probes
+
+Build parameters default to VECTOR_INDEX_* (see RAILWAY_ENV.md). Rebuild an IVFFlat
+index after the table grows ~10x: its lists are clustered from the rows present at build time.
+
+Usage:
+    DATABASE_URL=... python scripts/db-commands/vector_index.py status
+    DATABASE_URL=... python scripts/db-commands/vector_index.py rebuild --method hnsw --m 16 --ef-construction 128 --work-mem 4GB
+    DATABASE_URL=... python scripts/db-commands/vector_index.py rebuild --quantization halfvec --dimensions 1024
+    DATABASE_URL=... python scripts/db-commands/vector_index.py tune --ef-search 40,100,200 --queries 50 --k 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
+
+from db.postgres_client import PostgresDB  # noqa: E402
+from services.retrieval.index_manager import METRICS, IndexSpec, VectorIndexManager, query_settings  # noqa: E402
+
+
+async def tune(db: PostgresDB, table: str, metric: str, k: int, queries: int, ef_search: list, probes: list):
+    """Use stored embeddings as queries; exact neighbours come from a scan with index scans disabled."""
+    operator = METRICS[metric][0]
+    sql = f"SELECT id FROM {table} ORDER BY embedding {operator} $1 LIMIT $2"
+    samples = await db._fetch(f"SELECT embedding FROM {table} TABLESAMPLE SYSTEM (1) LIMIT $1", queries)
+    if not samples:
+        print("❌ No embeddings to sample")
+        return
+
+    async with db._acquire() as conn:
+        exact = []
+        for sample in samples:
+            async with conn.transaction():
+                await conn.execute("SET LOCAL enable_indexscan = off")
+                exact.append({row["id"] for row in await conn.fetch(sql, sample["embedding"], k)})
+
+        knobs = [("ef_search", value) for value in ef_search] + [("probes", value) for value in probes]
+        for name, value in knobs or [("server default", None)]:
+            latencies, recalls = [], []
+            for sample, truth in zip(samples, exact):
+                async with conn.transaction():
+                    for statement in query_settings(k, **({name: value} if value else {})):
+                        await conn.execute(statement)
+                    started = time.perf_counter()
+                    rows = await conn.fetch(sql, sample["embedding"], k)
+                    latencies.append((time.perf_counter() - started) * 1000)
+                recalls.append(len({row["id"] for row in rows} & truth) / max(len(truth), 1))
+            latencies.sort()
+            print(
+                f"{name}={value}: recall@{k} {statistics.mean(recalls):.3f}  "
+                f"p50 {latencies[len(latencies) // 2]:.1f} ms  p95 {latencies[int(len(latencies) * 0.95)]:.1f} ms"
+            )
+
+
+async def run(args) -> int:
+    db = PostgresDB()
+    await db.connect()
+    try:
+        manager = VectorIndexManager(db, table_name=args.table, build_timeout=args.build_timeout)
+        if args.command == "status":
+            print(json.dumps(await manager.status(), indent=2, default=str))
+        elif args.command in ("create", "rebuild"):
+            spec = IndexSpec.from_env(
+                method=args.method, metric=args.metric, m=args.m, ef_construction=args.ef_construction, lists=args.lists,
+                quantization=args.quantization, dimensions=args.dimensions,
+            )
+            build = manager.create if args.command == "create" else manager.rebuild
+            started = time.monotonic()
+            name = await build(spec, maintenance_work_mem=args.work_mem, parallel_workers=args.parallel_workers)
+            print(f"✅ {name} ready in {time.monotonic() - started:.1f}s")
+        elif args.command == "drop":
+            await manager.drop(args.name)
+        elif args.command == "tune":
+            await tune(
+                db, args.table, IndexSpec.from_env(metric=args.metric).metric, args.k, args.queries,
+                [int(v) for v in args.ef_search.split(",") if v], [int(v) for v in args.probes.split(",") if v],
+            )
+        return 0
+    finally:
+        await db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["status", "create", "rebuild", "drop", "tune"])
+    parser.add_argument("--table", default="documents", help="Chunk table (the vector backend factory writes 'documents')")
+    parser.add_argument("--method", choices=["hnsw", "ivfflat"])
+    parser.add_argument("--metric", choices=sorted(METRICS), help="Must match VECTOR_INDEX_METRIC used by queries")
+    parser.add_argument("--m", type=int)
+    parser.add_argument("--ef-construction", type=int)
+    parser.add_argument("--lists", type=int, help="IVFFlat lists (default: rows/1000, sqrt(rows) past 1M rows)")
+    parser.add_argument("--quantization", choices=["none", "halfvec", "binary"], help="Index storage (VECTOR_QUANTIZATION)")
+    parser.add_argument("--dimensions", type=int, help="Indexed Matryoshka prefix (VECTOR_DIMENSIONS)")
+    parser.add_argument("--work-mem", help="maintenance_work_mem for the build, e.g. 4GB")
+    parser.add_argument("--parallel-workers", type=int, help="max_parallel_maintenance_workers for the build")
+    parser.add_argument(
+        "--build-timeout", type=float, help="Seconds before a build/drop is cancelled (VECTOR_INDEX_BUILD_TIMEOUT, default 24h)"
+    )
+    parser.add_argument("--name", help="Index to drop")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--ef-search", default="", help="Comma-separated hnsw.ef_search values to compare")
+    parser.add_argument("--probes", default="", help="Comma-separated ivfflat.probes values to compare")
+    args = parser.parse_args()
+
+    if not os.getenv("DATABASE_URL"):
+        print("❌ DATABASE_URL is not set.")
+        sys.exit(1)
+    if args.command == "drop" and not args.name:
+        parser.error("drop requires --name")
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
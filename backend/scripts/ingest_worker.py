@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Ingest Worker
+Long-running consumer of the ingestion_jobs queue (see services/ingestion_worker.py).
+Run one or more instances (Railway service replicas) next to the scrape crons;
+they share the queue through SKIP LOCKED leases.
+
+Usage:
+    python scripts/ingest_worker.py            # run until SIGTERM/SIGINT
+    python scripts/ingest_worker.py --drain    # exit once no jobs are ready
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import logging
+import signal
+
+# Add backend to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger("ingest_worker")
+
+
+async def run(drain: bool = False) -> int:
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(os.path.dirname(__file__), '../.env'))
+
+    from db.postgres_client import PostgresDB
+    from services.extraction import shutdown_extraction_pool
+    from services.ingestion_factory import create_ingestion_service
+    from services.ingestion_worker import IngestionWorker
+
+    db = PostgresDB()
+    await db.connect()
+    try:
+        ingestion_service, embedding_cache = create_ingestion_service(db)
+        worker = IngestionWorker.from_env(db, ingestion_service)
+
+        # Finish the batches in flight on shutdown; their leases would otherwise expire and be re-run
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, worker.stop)
+
+        stats = await worker.run(drain=drain, listen=True)
+        logger.info(f"🏁 Ingest worker finished: {stats.as_dict()}")
+        if embedding_cache:
+            logger.info(f"🧠 Embedding cache: {embedding_cache.stats()}")
+        return 0
+    finally:
+        shutdown_extraction_pool()
+        await db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Consume the ingestion job queue")
+    parser.add_argument("--drain", action="store_true", help="Exit once no jobs are ready")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(drain=args.drain)))
+
+
+if __name__ == "__main__":
+    main()
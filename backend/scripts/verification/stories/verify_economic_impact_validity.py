@@ -145,8 +145,7 @@ async def _async_run_story() -> tuple[bool, str]:
     source_id = source_rows[0]['id']
     
     # Create Raw Scrape
-    import json
-    data_json = json.dumps({"content": bill_content})
+    data_json = {"content": bill_content}
     await db._execute("""
         INSERT INTO raw_scrapes (id, source_id, url, content_hash, content_type, data, processed)
         VALUES ($1, $2, $3, $4, $5, $6, $7)
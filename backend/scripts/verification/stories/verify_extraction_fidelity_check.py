@@ -2,7 +2,6 @@
 import asyncio
 import sys
 import uuid
-import json
 from pathlib import Path
 
 # Add backend root to path
@@ -76,7 +75,7 @@ async def _async_run_story() -> tuple[bool, str]:
         source_rows = await db._fetch("SELECT id FROM sources WHERE jurisdiction_id = $1 LIMIT 1", JURISDICTION_ID)
     source_id = source_rows[0]['id']
     
-    data_json = json.dumps({"content": html_content})
+    data_json = {"content": html_content}
     await db._execute("""
         INSERT INTO raw_scrapes (id, source_id, url, content_hash, content_type, data, processed)
         VALUES ($1, $2, $3, $4, $5, $6, $7)
@@ -111,10 +111,9 @@ async def main():
     source_id = rows[0]['id']
 
     # Insert Raw Scrape
-    import json
     test_html = "<html><body><h1>San Jose ADU Bill</h1><p>This bill allows more ADUs in residential zones to lower cost of living.</p></body></html>"
-    # Wrap in JSON structure as column is likely JSONB and expects valid JSON
-    test_data = json.dumps({"content": test_html})
+    # data is JSONB; the connection codec serializes the dict
+    test_data = {"content": test_html}
     
     await db._execute("""
         INSERT INTO raw_scrapes (id, source_id, url, content_hash, content_type, data, processed)
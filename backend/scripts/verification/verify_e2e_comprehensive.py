@@ -171,7 +171,7 @@ async def main():
     # Create source
     await db.get_or_create_jurisdiction(jurisdiction, "city")
     source_id = await db.get_or_create_source(
-        jurisdiction_id="web",
+        jurisdiction_id=None,
         name="San Jose Audit Source",
         type="general",
         url=scrape_url
@@ -179,7 +179,7 @@ async def main():
     
     # Insert raw scrape
     scrape_id = str(uuid.uuid4())
-    scrape_data = json.dumps({"content": bill_text})
+    scrape_data = {"content": bill_text}
     
     await db._execute("""
         INSERT INTO raw_scrapes (id, source_id, url, content_hash, content_type, data, processed)
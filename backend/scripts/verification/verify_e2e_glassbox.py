@@ -217,7 +217,7 @@ async def main():
     await db.get_or_create_jurisdiction(jurisdiction, "municipality")
     
     source_id = await db.get_or_create_source(
-        jurisdiction_id="web", # generic
+        jurisdiction_id=None, # generic
         name="San Jose Audit Source",
         type="general",
         url="http://sanjose.example.com/audit"
@@ -231,7 +231,7 @@ async def main():
     
     # Insert raw scrape manually (simulating harvester)
     scrape_id = str(uuid.uuid4())
-    scrape_data = json.dumps({"content": audit_text})
+    scrape_data = {"content": audit_text}
     
     await db._execute("""
         INSERT INTO raw_scrapes (id, source_id, url, content_hash, content_type, data, processed)
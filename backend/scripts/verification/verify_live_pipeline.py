@@ -106,7 +106,6 @@ async def run_live_verification():
         # Seed Raw Scrape (Step 0 Prerequisite)
         print("   -> Seeding Mock Ingestion Source...")
         import hashlib
-        import json
         
         content_hash = hashlib.sha256(bill_data["text"].encode("utf-8")).hexdigest()
         mock_doc_id = str(uuid4())
@@ -131,7 +130,7 @@ async def run_live_verification():
         mock_embedding = [0.1] * 4096
         await db._execute(
              "INSERT INTO document_chunks (id, document_id, content, embedding, metadata) VALUES ($1, $2, $3, $4, $5)",
-             str(uuid4()), mock_doc_id, "Mock chunk content", str(mock_embedding), json.dumps({"source": "mock"})
+             str(uuid4()), mock_doc_id, "Mock chunk content", str(mock_embedding), {"source": "mock"}
         )
         print(f"✅ Seeded Mock Vectors for {mock_doc_id}")
 
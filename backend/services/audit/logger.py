@@ -98,21 +98,17 @@ class AuditLogger:
                     duration_ms = EXCLUDED.duration_ms,
                     model_config = EXCLUDED.model_config
             """
-            
-            # Serialize JSON fields
-            input_json = json.dumps(step['input_context'], default=str)
-            output_json = json.dumps(step['output_result'], default=str)
-            model_json = json.dumps(step['model_info'], default=str)
-            
+
+            # JSONB fields are encoded by the connection codec (db/codecs.py)
             await self.db._execute(
                 query, 
                 self.run_id, 
                 step['step_number'], 
                 step['step_name'], 
                 step['status'], 
-                input_json, 
-                output_json, 
-                model_json, 
+                step['input_context'],
+                step['output_result'],
+                step['model_info'],
                 step['duration_ms']
             )
         except Exception as e:
@@ -13,6 +13,8 @@ from llm_common.core import LLMConfig
 from llm_common.providers import ZaiClient
 from llm_common.core.models import LLMMessage, MessageRole
 
+from services.provider_gateway import gate_llm
+
 logger = logging.getLogger(__name__)
 
 
@@ -54,16 +56,16 @@ class AutoDiscoveryService:
         
         # Initialize LLM client for query generation
         if llm_client:
-            self.llm_client = llm_client
+            self.llm_client = gate_llm(llm_client)
         else:
             # Auto-initialize with Z.ai if available
             zai_key = os.environ.get("ZAI_API_KEY")
             if zai_key:
-                self.llm_client = ZaiClient(LLMConfig(
+                self.llm_client = gate_llm(ZaiClient(LLMConfig(
                     api_key=zai_key,
                     provider="zai",
                     default_model="glm-4.7"
-                ))
+                )))
             else:
                 self.llm_client = None
                 logger.warning("No LLM client configured - falling back to static templates")
@@ -0,0 +1,27 @@
+"""
+Pluggable chunkers for ingestion.
+
+- CharacterChunker: fixed character windows (IngestionService default).
+- StructuredChunker: streaming, token-bounded packing that respects ordinance
+  sections, Legistar agenda items and Markdown headings.
+"""
+
+import os
+
+from .base import Chunk as Chunk, Chunker as Chunker, TextSource as TextSource
+from .character import CharacterChunker as CharacterChunker
+from .structure import STRATEGIES as STRATEGIES, detect_strategy as detect_strategy
+from .structured import StructuredChunker as StructuredChunker
+from .tokens import TokenCounter as TokenCounter
+
+
+def chunker_from_env() -> Chunker:
+    """CHUNK_STRATEGY (auto|legislation|agenda|markdown|plain|character), CHUNK_MAX_TOKENS, CHUNK_OVERLAP_TOKENS."""
+    strategy = os.getenv("CHUNK_STRATEGY", "auto")
+    if strategy == "character":
+        return CharacterChunker()
+    return StructuredChunker(
+        strategy=strategy,
+        max_tokens=int(os.getenv("CHUNK_MAX_TOKENS", "512")),
+        overlap_tokens=int(os.getenv("CHUNK_OVERLAP_TOKENS", "64")),
+    )
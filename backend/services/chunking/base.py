@@ -0,0 +1,55 @@
+"""Chunk type and the interface every chunker implements."""
+
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, Optional, Union
+
+# A whole document, or an iterable of consecutive text pieces (e.g. file reads)
+TextSource = Union[str, Iterable[str]]
+
+
+@dataclass
+class Chunk:
+    text: str
+    index: int
+    # Offsets into the source text; text is the source span with whitespace normalized
+    char_start: int
+    char_end: int
+    tokens: Optional[int] = None
+    # Heading of the section the chunk starts in, and that heading's offset
+    section: Optional[str] = None
+    section_start: Optional[int] = None
+    # 1-based page span for paginated sources (PDFs)
+    page_start: Optional[int] = None
+    page_end: Optional[int] = None
+
+    def metadata(self) -> Dict[str, Any]:
+        """Fields stored alongside the chunk in the vector table."""
+        meta: Dict[str, Any] = {
+            "chunk_index": self.index,
+            "char_start": self.char_start,
+            "char_end": self.char_end,
+        }
+        if self.tokens is not None:
+            meta["tokens"] = self.tokens
+        if self.section is not None:
+            meta["section"] = self.section
+            meta["section_start"] = self.section_start
+        if self.page_start is not None:
+            meta["page_start"] = self.page_start
+            meta["page_end"] = self.page_end
+        return meta
+
+
+class Chunker(ABC):
+    """Splits document text into chunks. Implementations must be picklable (process pools)."""
+
+    name: str = "base"
+
+    @abstractmethod
+    def chunk(self, source: TextSource) -> Iterator[Chunk]:
+        ...
+
+    def split(self, source: TextSource) -> list[str]:
+        return [chunk.text for chunk in self.chunk(source)]
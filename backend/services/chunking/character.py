@@ -0,0 +1,54 @@
+"""Fixed-size character windows (the original IngestionService splitter)."""
+
+from __future__ import annotations
+from typing import Iterator
+
+from services.chunking.base import Chunk, Chunker, TextSource
+
+
+class CharacterChunker(Chunker):
+    """
+    Overlapping windows of at most chunk_size characters, ending at the last space.
+
+    Not structure- or token-aware; kept as the IngestionService default so existing
+    chunk_size/chunk_overlap settings keep their meaning.
+    """
+
+    name = "character"
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = max(0, chunk_overlap)
+
+    def chunk(self, source: TextSource) -> Iterator[Chunk]:
+        text = source if isinstance(source, str) else "".join(source)
+        index = 0
+        start = 0
+        while start < len(text):
+            end = min(start + self.chunk_size, len(text))
+
+            # If this is not the last chunk, try to find a natural break
+            if end < len(text):
+                last_space = text.rfind(' ', start, end)
+                if last_space > start:
+                    end = last_space
+
+            window = text[start:end]
+            stripped = window.strip()
+            if stripped:
+                lead = len(window) - len(window.lstrip())
+                yield Chunk(
+                    text=stripped,
+                    index=index,
+                    char_start=start + lead,
+                    char_end=start + lead + len(stripped),
+                )
+                index += 1
+
+            if end >= len(text):
+                break
+            # Step back by the overlap from where this window actually ended, so a
+            # word break never skips text
+            start = max(end - self.chunk_overlap, start + 1)
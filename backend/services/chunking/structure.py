@@ -0,0 +1,68 @@
+"""
+Section heading patterns for structure-aware chunking.
+
+A heading is only recognized at the start of a text unit (after a paragraph
+break, a line break or a sentence end), so cross-references such as
+"as defined in § 26-3401" inside a sentence do not open a new section.
+"""
+
+from __future__ import annotations
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# Ordinances and municipal code: "SECTION 1.", "Sec. 20.10.040", "§ 26-3401", "ARTICLE IV", "Chapter 5.08"
+LEGISLATION_HEADING = (
+    r"(?:SECTION|Section|SEC\.|Sec\.)[ \t]*\d+[A-Za-z]?(?:[.-]\d+[A-Za-z]?)*\b"
+    r"|§{1,2}[ \t]*\d+[A-Za-z]?(?:[.-]\d+[A-Za-z]?)*"
+    r"|(?:ARTICLE|CHAPTER|TITLE|PART|Article|Chapter|Title|Part)[ \t]+[0-9IVXLC]+[A-Za-z]?(?:[.-]\d+)*\b"
+)
+
+# Legistar agendas/minutes: "3.1 25-1234 Approval of ...", "Item 4", "A. 1", "CONSENT CALENDAR"
+AGENDA_HEADING = (
+    r"(?:Item|ITEM)[ \t]+\d+[A-Za-z]?(?:\.\d+)*"
+    r"|\d{1,2}\.\d{1,2}(?:\.\d{1,2})?(?=\s)"
+    r"|[A-Z]\.[ \t]?\d{1,2}(?=\s)"
+    r"|\d{2}-\d{3,5}(?=\s)"
+    r"|[A-Z][A-Z&/,'-]+(?:[ \t]+[A-Z&/,'-]+){1,6}(?=\s*$|\s+[A-Z][a-z])"
+)
+
+MARKDOWN_HEADING = r"#{1,6}[ \t]+\S"
+
+
+@dataclass(frozen=True)
+class Strategy:
+    name: str
+    heading: Optional[re.Pattern]
+
+    def is_heading(self, unit: str) -> bool:
+        return bool(self.heading and self.heading.match(unit))
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    "plain": Strategy("plain", None),
+    "legislation": Strategy("legislation", re.compile(LEGISLATION_HEADING)),
+    "agenda": Strategy("agenda", re.compile(AGENDA_HEADING, re.MULTILINE)),
+    "markdown": Strategy("markdown", re.compile(MARKDOWN_HEADING)),
+}
+
+# Headings counted at unit starts when auto-detecting (paragraph/line start or after a sentence end)
+_DETECT = {
+    name: re.compile(rf"(?:^|(?<=[.!?:;])[ \t]+)(?:{strategy.heading.pattern})", re.MULTILINE)
+    for name, strategy in STRATEGIES.items()
+    if strategy.heading is not None
+}
+
+
+def detect_strategy(sample: str, min_headings: int = 3) -> Strategy:
+    """Pick the strategy whose headings occur most often in sample (plain when none recur)."""
+    counts = {name: len(pattern.findall(sample)) for name, pattern in _DETECT.items()}
+    best = max(counts, key=counts.get)
+    return STRATEGIES[best] if counts[best] >= min_headings else STRATEGIES["plain"]
+
+
+def get_strategy(name: str) -> Strategy:
+    try:
+        return STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown chunking strategy '{name}'. Allowed: auto, {', '.join(STRATEGIES)}") from None
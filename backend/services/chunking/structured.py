@@ -0,0 +1,222 @@
+"""Streaming, token-aware, structure-aware chunker."""
+
+from __future__ import annotations
+import itertools
+import re
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from services.chunking.base import Chunk, Chunker, TextSource
+from services.chunking.structure import Strategy, detect_strategy, get_strategy
+from services.chunking.tokens import TokenCounter
+
+# Text pieces are cut from str sources at this size, and auto-detection samples this much
+PIECE_CHARS = 64 * 1024
+
+# Sentence ends that are not abbreviations common in legal text ("Sec. 5", "No. 2024-1", "U.S.")
+_NOT_ABBREVIATION = "".join(
+    rf"(?<!\b{abbr}\.)" for abbr in ("Sec", "Secs", "No", "Nos", "Art", "Ch", "St", "Mr", "Ms", "Dr", "vs", "Inc", "Co")
+) + r"(?<!\b[A-Z]\.)(?<!\be\.g\.)(?<!\bi\.e\.)"
+
+_WHITESPACE = re.compile(r"\s+")
+
+# (start, end, text, tokens, section, section_start)
+_Unit = Tuple[int, int, str, int, Optional[str], Optional[int]]
+
+
+class StructuredChunker(Chunker):
+    """
+    Packs text units (paragraphs, sentences) into chunks of at most max_tokens.
+
+    Section headings of the chosen strategy start a new chunk, so a chunk never
+    spans two ordinance sections or agenda items unless the earlier section is
+    shorter than min_tokens. Consecutive chunks within a section share up to
+    overlap_tokens of trailing units.
+
+    Input is consumed incrementally: memory is bounded by max_unit_chars plus one
+    chunk, independent of document size.
+    """
+
+    name = "structured"
+
+    def __init__(
+        self,
+        strategy: str = "auto",
+        max_tokens: int = 512,
+        overlap_tokens: int = 64,
+        min_tokens: int = 64,
+        counter: Optional[TokenCounter] = None,
+        max_unit_chars: int = 8192,
+    ):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        self.strategy = strategy if strategy == "auto" else get_strategy(strategy).name
+        self.max_tokens = max_tokens
+        self.overlap_tokens = min(max(0, overlap_tokens), max_tokens // 2)
+        self.min_tokens = min(max(0, min_tokens), max_tokens)
+        self.counter = counter or TokenCounter()
+        self.max_unit_chars = max_unit_chars
+
+    def chunk(self, source: TextSource) -> Iterator[Chunk]:
+        pieces = iter(_pieces(source))
+        if self.strategy == "auto":
+            sample: List[str] = []
+            sampled = 0
+            for piece in pieces:
+                sample.append(piece)
+                sampled += len(piece)
+                if sampled >= PIECE_CHARS:
+                    break
+            strategy = detect_strategy("".join(sample))
+            pieces = itertools.chain(sample, pieces)
+        else:
+            strategy = get_strategy(self.strategy)
+        return self._pack(self._units(pieces, strategy), strategy)
+
+    # -- segmentation -----------------------------------------------------------------
+
+    def _boundary(self, strategy: Strategy) -> re.Pattern:
+        """Paragraph breaks, sentence ends, and line breaks that precede a heading."""
+        # The cheap punctuation lookbehind comes first so the abbreviation checks only run at sentence ends
+        parts = [r"\n[ \t]*\n\s*", rf"(?<=[.!?;:]){_NOT_ABBREVIATION}\s+(?=[A-Z0-9§\"'(\[])"]
+        if strategy.heading is not None:
+            parts.append(rf"\n\s*(?=(?:{strategy.heading.pattern}))")
+        return re.compile("|".join(parts), re.MULTILINE)
+
+    def _units(self, pieces: Iterable[str], strategy: Strategy) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, unit text) with a bounded look-ahead buffer."""
+        boundary = self._boundary(strategy)
+        buffer = ""
+        base = 0
+        # Boundaries this close to the end of the buffer may still grow with the next piece
+        holdback = 256
+        for piece in itertools.chain(pieces, [None]):
+            final = piece is None
+            if not final:
+                buffer += piece
+                if len(buffer) < self.max_unit_chars + holdback:
+                    continue
+            consumed = 0
+            for match in boundary.finditer(buffer):
+                if not final and match.end() > len(buffer) - holdback:
+                    break
+                yield from _strip_unit(base + consumed, buffer[consumed:match.start()])
+                consumed = match.end()
+            if final:
+                yield from _strip_unit(base + consumed, buffer[consumed:])
+                return
+            if consumed == 0:
+                # No boundary in a full buffer: cut at the last space so memory stays bounded
+                cut = buffer.rfind(" ", 0, self.max_unit_chars)
+                consumed = cut if cut > 0 else self.max_unit_chars
+                yield from _strip_unit(base, buffer[:consumed])
+            buffer = buffer[consumed:]
+            base += consumed
+
+    # -- packing ----------------------------------------------------------------------
+
+    def _pack(self, units: Iterator[Tuple[int, int, str]], strategy: Strategy) -> Iterator[Chunk]:
+        current: List[_Unit] = []
+        tokens = 0
+        index = 0
+        section: Optional[str] = None
+        section_start: Optional[int] = None
+
+        for start, end, text in units:
+            heading = strategy.is_heading(text)
+            if heading:
+                if current and tokens >= self.min_tokens:
+                    yield self._emit(current, index)
+                    index += 1
+                    current, tokens = [], 0
+                section, section_start = _section_title(text), start
+
+            count = self.counter.count(text)
+            if count > self.max_tokens:
+                # A single unit over budget: flush, then split it at word boundaries
+                if current:
+                    yield self._emit(current, index)
+                    index += 1
+                    current, tokens = [], 0
+                for piece in self._split_long(start, text, count, section, section_start):
+                    yield self._emit([piece], index)
+                    index += 1
+                continue
+
+            if current and tokens + count > self.max_tokens:
+                yield self._emit(current, index)
+                index += 1
+                current = self._overlap(current, section_start)
+                tokens = sum(unit[3] for unit in current)
+                # The carried overlap must still leave room for this unit
+                while current and tokens + count > self.max_tokens:
+                    tokens -= current.pop(0)[3]
+            current.append((start, end, text, count, section, section_start))
+            tokens += count
+
+        if current:
+            yield self._emit(current, index)
+
+    def _overlap(self, units: List[_Unit], section_start: Optional[int]) -> List[_Unit]:
+        """Trailing units (same section) totalling at most overlap_tokens."""
+        carried: List[_Unit] = []
+        total = 0
+        for unit in reversed(units):
+            if unit[5] != section_start or total + unit[3] > self.overlap_tokens:
+                break
+            carried.append(unit)
+            total += unit[3]
+        return carried[::-1]
+
+    def _split_long(
+        self, start: int, text: str, count: int, section: Optional[str], section_start: Optional[int]
+    ) -> Iterator[_Unit]:
+        chars_per_token = len(text) / count
+        offset = 0
+        while offset < len(text):
+            size = max(1, int(self.max_tokens * chars_per_token * 0.9))
+            while True:
+                end = min(offset + size, len(text))
+                if end < len(text):
+                    space = text.rfind(" ", offset, end)
+                    if space > offset:
+                        end = space
+                piece = text[offset:end].strip()
+                piece_tokens = self.counter.count(piece)
+                if piece_tokens <= self.max_tokens or size == 1:
+                    break
+                size = max(1, int(size * self.max_tokens / piece_tokens * 0.9))
+            if piece:
+                lead = len(text[offset:end]) - len(text[offset:end].lstrip())
+                piece_start = start + offset + lead
+                yield (piece_start, piece_start + len(piece), piece, piece_tokens, section, section_start)
+            offset = end
+
+    @staticmethod
+    def _emit(units: List[_Unit], index: int) -> Chunk:
+        first, last = units[0], units[-1]
+        return Chunk(
+            text=" ".join(unit[2] for unit in units),
+            index=index,
+            char_start=first[0],
+            char_end=last[1],
+            tokens=sum(unit[3] for unit in units),
+            section=first[4],
+            section_start=first[5],
+        )
+
+
+def _pieces(source: TextSource) -> Iterable[str]:
+    if isinstance(source, str):
+        return (source[i:i + PIECE_CHARS] for i in range(0, len(source), PIECE_CHARS))
+    return source
+
+
+def _strip_unit(offset: int, raw: str) -> Iterator[Tuple[int, int, str]]:
+    text = raw.strip()
+    if text:
+        start = offset + len(raw) - len(raw.lstrip())
+        yield start, start + len(text), _WHITESPACE.sub(" ", text)
+
+
+def _section_title(unit: str, limit: int = 120) -> str:
+    return unit if len(unit) <= limit else unit[:limit].rsplit(" ", 1)[0] + "…"
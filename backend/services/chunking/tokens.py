@@ -0,0 +1,56 @@
+"""Token counting for chunk budgets."""
+
+from __future__ import annotations
+import logging
+from typing import Optional
+
+# Optional imports - gracefully handle missing dependencies
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+class TokenCounter:
+    """
+    Counts tokens with a tiktoken encoding, else estimates ~4 chars/token.
+
+    cl100k_base is a close proxy for the OpenAI-compatible embedding models we use;
+    budgets should leave headroom for tokenizer differences. Pass encoding=None to
+    always estimate (no tiktoken download, e.g. offline workers and tests).
+    """
+
+    def __init__(self, encoding: Optional[str] = "cl100k_base"):
+        self.encoding_name = encoding
+        self._encoding = None
+        self._loaded = False
+
+    @property
+    def exact(self) -> bool:
+        return self._load() is not None
+
+    def _load(self):
+        if not self._loaded:
+            self._loaded = True
+            if TIKTOKEN_AVAILABLE and self.encoding_name:
+                try:
+                    self._encoding = tiktoken.get_encoding(self.encoding_name)
+                except Exception as e:
+                    # First use downloads the BPE file; estimate rather than fail ingestion
+                    logger.warning(f"tiktoken encoding {self.encoding_name} unavailable, estimating tokens: {e}")
+        return self._encoding
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        encoding = self._load()
+        if encoding is not None:
+            return len(encoding.encode_ordinary(text))
+        return max(1, (len(text) + 3) // 4)
+
+    def __getstate__(self):
+        # Encodings are re-loaded lazily in worker processes
+        return {"encoding_name": self.encoding_name, "_encoding": None, "_loaded": False}
@@ -5,6 +5,8 @@ from openai import AsyncOpenAI
 # from typing import List, Optional (Unused)
 from pydantic import BaseModel, Field
 
+from services.provider_gateway import get_gateway
+
 logger = logging.getLogger(__name__)
 
 class DiscoveryResponse(BaseModel):
@@ -28,6 +30,7 @@ class AutoDiscoveryService:
                 )
             )
             self.model = "glm-4.7"
+            self.gateway = get_gateway("zai")
         elif os.getenv("OPENROUTER_API_KEY"):
             self.client = instructor.from_openai(
                 AsyncOpenAI(
@@ -36,6 +39,7 @@ class AutoDiscoveryService:
                 )
             )
             self.model = "x-ai/grok-4.1-fast:free" # Default fast model
+            self.gateway = get_gateway("openrouter")
         else:
             logger.warning("AutoDiscoveryService: No LLM API keys found. Discovery will fail.")
 
@@ -68,7 +72,8 @@ class AutoDiscoveryService:
         """
 
         try:
-            return await self.client.chat.completions.create(
+            return await self.gateway.call(
+                self.client.chat.completions.create,
                 model=self.model,
                 response_model=DiscoveryResponse,
                 messages=[
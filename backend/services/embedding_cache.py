@@ -0,0 +1,133 @@
+"""
+Content-addressed embedding cache.
+
+Chunks are keyed by (embedding model, dimensions, sha256 of the normalized chunk
+text). Lookups go through an in-process TTL + LRU layer (db/cache.py), then the
+embedding_cache table (migration 010); only the remaining misses are sent to the
+embedding provider, and results are spliced back in input order.
+"""
+
+from __future__ import annotations
+import hashlib
+import os
+import re
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, List
+
+import numpy as np
+
+from db.cache import IdentityCache, MISSING
+
+EmbedFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def content_hash(text: str) -> bytes:
+    """sha256 of the chunk text after Unicode (NFC) and whitespace normalization."""
+    normalized = _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).digest()
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        db: Any,
+        model: str,
+        dimensions: int,
+        memory_size: int = 2048,
+        memory_ttl: float = 3600.0,
+        max_age_days: float = 90.0,
+    ):
+        self.db = db
+        self.model = model
+        self.dimensions = dimensions
+        self.max_age_days = max_age_days
+        # float32 arrays: 16KB per 4096-dim entry instead of ~100KB as a list of floats
+        self.memory = IdentityCache(maxsize=memory_size, ttl=memory_ttl)
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.provider_calls = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls, db: Any, model: str, dimensions: int) -> "EmbeddingCache":
+        """EMBEDDING_CACHE_SIZE / EMBEDDING_CACHE_TTL (seconds) / EMBEDDING_CACHE_MAX_AGE_DAYS."""
+        return cls(
+            db,
+            model,
+            dimensions,
+            memory_size=int(os.getenv("EMBEDDING_CACHE_SIZE", "2048")),
+            memory_ttl=float(os.getenv("EMBEDDING_CACHE_TTL", "3600")),
+            max_age_days=float(os.getenv("EMBEDDING_CACHE_MAX_AGE_DAYS", "90")),
+        )
+
+    async def embed_documents(self, texts: List[str], embed_fn: EmbedFn) -> List[List[float]]:
+        """
+        Embed texts, sending only cache misses to embed_fn.
+
+        Duplicate texts within the call are embedded once. Provider results with the
+        wrong dimensionality are returned but not cached.
+        """
+        hashes = [content_hash(text) for text in texts]
+        found: Dict[bytes, np.ndarray] = {}
+        pending: List[bytes] = []
+        for key in dict.fromkeys(hashes):
+            cached = self.memory.get(("embedding", key))
+            if cached is MISSING:
+                pending.append(key)
+            else:
+                found[key] = cached
+        self.memory_hits += len(found)
+
+        if pending and self.db:
+            stored = await self.db.get_cached_embeddings(self.model, self.dimensions, pending)
+            for key, embedding in stored.items():
+                found[key] = np.asarray(embedding, dtype=np.float32)
+                self.memory.set(("embedding", key), found[key])
+            self.db_hits += len(stored)
+            pending = [key for key in pending if key not in stored]
+
+        if pending:
+            first_text = {}
+            for key, text in zip(hashes, texts):
+                first_text.setdefault(key, text)
+            vectors = await embed_fn([first_text[key] for key in pending])
+            if len(vectors) != len(pending):
+                raise ValueError(f"expected {len(pending)} embeddings, got {len(vectors)}")
+            self.provider_calls += 1
+            self.misses += len(pending)
+
+            new_entries = []
+            for key, vector in zip(pending, vectors):
+                found[key] = np.asarray(vector, dtype=np.float32)
+                if found[key].shape != (self.dimensions,):
+                    self.rejected += 1
+                    continue
+                self.memory.set(("embedding", key), found[key])
+                new_entries.append((key, found[key]))
+            if self.db and new_entries:
+                await self.db.store_cached_embeddings(self.model, self.dimensions, new_entries)
+
+        return [found[key].tolist() for key in hashes]
+
+    async def prune(self) -> int:
+        """Drop table entries unused for max_age_days (0 keeps everything)."""
+        if not self.db or self.max_age_days <= 0:
+            return 0
+        return await self.db.prune_embedding_cache(self.max_age_days)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.db_hits + self.misses
+        return {
+            "model": self.model,
+            "dimensions": self.dimensions,
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "provider_calls": self.provider_calls,
+            "rejected": self.rejected,
+            "hit_rate": round((self.memory_hits + self.db_hits) / lookups, 4) if lookups else 0.0,
+            "memory": self.memory.stats(),
+        }
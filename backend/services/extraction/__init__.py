@@ -0,0 +1,23 @@
+"""Text extraction from scraped documents."""
+
+from services.extraction.common import extraction_pool, normalize_text, shutdown_extraction_pool
+from services.extraction.html import (
+    LXML_AVAILABLE,
+    MODES,
+    TRAFILATURA_AVAILABLE,
+    html_to_text,
+    html_to_text_async,
+    regex_text,
+)
+
+__all__ = [
+    "LXML_AVAILABLE",
+    "MODES",
+    "TRAFILATURA_AVAILABLE",
+    "extraction_pool",
+    "html_to_text",
+    "html_to_text_async",
+    "normalize_text",
+    "regex_text",
+    "shutdown_extraction_pool",
+]
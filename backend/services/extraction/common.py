@@ -0,0 +1,42 @@
+"""Helpers shared by the HTML and PDF extractors."""
+
+from __future__ import annotations
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+_SPACES = re.compile(r"[ \t\f\v\xa0]+")
+_LINE_SPACES = re.compile(r" ?\n ?")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of spaces, trim lines, and keep at most one blank line between paragraphs."""
+    text = _SPACES.sub(" ", text.replace("\r\n", "\n").replace("\r", "\n"))
+    text = _LINE_SPACES.sub("\n", text)
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def extraction_pool() -> ProcessPoolExecutor:
+    """
+    Shared process pool for CPU-bound extraction (EXTRACT_WORKERS, default cpu count).
+
+    Workers are spawned rather than forked so they are safe to start from a
+    process that already runs an event loop and threads.
+    """
+    global _pool
+    if _pool is None:
+        workers = int(os.environ.get("EXTRACT_WORKERS", "0")) or os.cpu_count() or 1
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_extraction_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,228 @@
+"""
+HTML to plain text for ingestion and the web reader.
+
+Modes:
+- "fast": lxml parse, drops scripts/styles/navigation/forms controls, keeps
+  paragraph and line structure, renders data tables as "cell | cell" rows.
+- "trafilatura": main-content extraction (boilerplate removal) with tables;
+  falls back to "fast" when trafilatura is missing or finds nothing.
+- "regex": the original tag-stripping regex (also the fallback without lxml).
+
+Output keeps paragraph breaks ("\\n\\n") and line breaks so structure-aware
+chunkers can see section and agenda headings.
+"""
+
+from __future__ import annotations
+import asyncio
+import html as html_lib
+import logging
+import re
+from concurrent.futures import Executor
+from typing import List, Optional
+
+from services.extraction.common import extraction_pool, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Optional imports - gracefully handle missing dependencies
+try:
+    import lxml.html
+    from lxml import etree
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    import trafilatura
+    TRAFILATURA_AVAILABLE = True
+except ImportError:
+    TRAFILATURA_AVAILABLE = False
+
+MODES = ("fast", "trafilatura", "regex")
+
+# Documents smaller than this are extracted inline; pickling to a worker costs more
+OFFLOAD_CHARS = 256 * 1024
+
+# Subtrees that never hold document content
+DROP_TAGS = frozenset({
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object", "embed",
+    "head", "nav", "footer", "aside", "button", "select", "option", "input", "textarea", "label",
+})
+DROP_ROLES = frozenset({"navigation", "banner", "contentinfo", "search", "menu", "menubar"})
+
+# Block elements: paragraph break before and after
+PARAGRAPH_TAGS = frozenset({
+    "p", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article", "main", "header",
+    "blockquote", "pre", "ul", "ol", "dl", "table", "figure", "hr", "address",
+})
+# Line-level elements: line break before and after
+LINE_TAGS = frozenset({"div", "li", "dt", "dd", "tr", "td", "th", "caption", "br", "form", "fieldset", "center"})
+
+_SPACES = re.compile(r"\s+")
+_TAG = re.compile(r"<[^>]+>")
+_NON_CONTENT = re.compile(r"<(script|style|noscript|template)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+_BREAKS = ("\n", "\n\n")
+
+
+def html_to_text(html: str, mode: str = "fast") -> str:
+    """Extract readable text from an HTML document or fragment."""
+    if mode not in MODES:
+        raise ValueError(f"Unknown HTML extraction mode '{mode}'. Allowed: {', '.join(MODES)}")
+    if not html or not html.strip():
+        return ""
+    if "<" not in html:
+        # Plain text stored in an HTML field: keep its line structure
+        return normalize_text(html)
+
+    if mode == "trafilatura" and TRAFILATURA_AVAILABLE:
+        try:
+            text = trafilatura.extract(html, include_tables=True, include_comments=False, favor_recall=True)
+            if text:
+                return normalize_text(text)
+        except Exception as e:
+            logger.warning(f"trafilatura extraction failed, using fast parser: {e}")
+
+    if mode != "regex" and LXML_AVAILABLE:
+        try:
+            return _lxml_text(html)
+        except (etree.ParserError, ValueError) as e:
+            logger.warning(f"lxml could not parse document, using regex extraction: {e}")
+    return regex_text(html)
+
+
+def regex_text(html: str) -> str:
+    """Tag-stripping fallback; drops script/style bodies and comments first."""
+    text = _TAG.sub(" ", _NON_CONTENT.sub(" ", html))
+    return _SPACES.sub(" ", html_lib.unescape(text)).strip()
+
+
+async def html_to_text_async(html: str, mode: str = "fast", executor: Optional[Executor] = None) -> str:
+    """html_to_text off the event loop for large documents (default: the shared process pool)."""
+    if not html or len(html) < OFFLOAD_CHARS:
+        return html_to_text(html, mode)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or extraction_pool(), html_to_text, html, mode)
+
+
+# -- lxml walker ------------------------------------------------------------------------
+
+
+def _lxml_text(html: str) -> str:
+    # huge_tree lifts libxml2's nesting-depth and text-node limits, which otherwise
+    # silently truncate deeply nested or multi-megabyte pages (parsers are not shareable across threads)
+    parser = lxml.html.HTMLParser(huge_tree=True, remove_comments=True, remove_pis=True)
+    # _walk already collapses whitespace, so no normalization pass over the output
+    return "".join(_walk(lxml.html.document_fromstring(html, parser=parser))).strip()
+
+
+def _walk(root) -> List[str]:
+    """Text pieces and break markers for root's content (not its tail)."""
+    out: List[str] = []
+    _inline(out, root.text)
+    # Explicit stack instead of recursion: deeply nested pages exceed the recursion limit
+    stack: list = [(child, False) for child in reversed(root)]
+    while stack:
+        el, closing = stack.pop()
+        if closing:
+            _break(out, el.tag)
+            _inline(out, el.tail)
+            continue
+        tag = el.tag if isinstance(el.tag, str) else None
+        if tag is None or _dropped(el, tag):
+            # Comments, processing instructions and non-content subtrees keep only their tail
+            _inline(out, el.tail)
+            continue
+        if tag == "table" and _is_data_table(el):
+            _block(out, tag, "\n".join(_table_rows(el)))
+            _inline(out, el.tail)
+            continue
+        if tag == "pre":
+            _block(out, tag, el.text_content().strip("\n"))
+            _inline(out, el.tail)
+            continue
+        _break(out, tag)
+        _inline(out, el.text)
+        stack.append((el, True))
+        stack.extend((child, False) for child in reversed(el))
+    return out
+
+
+def _dropped(el, tag: str) -> bool:
+    if tag in DROP_TAGS:
+        return True
+    role = el.get("role")
+    if role and role.lower() in DROP_ROLES:
+        return True
+    return el.get("aria-hidden") == "true" or el.get("hidden") is not None
+
+
+def _break(out: List[str], tag: str):
+    brk = "\n\n" if tag in PARAGRAPH_TAGS else "\n" if tag in LINE_TAGS else None
+    if brk is None:
+        return
+    if out and out[-1] not in _BREAKS:
+        # No trailing space before a line break
+        last = out[-1].rstrip(" ")
+        if last:
+            out[-1] = last
+        else:
+            out.pop()
+    # Adjacent breaks merge into the stronger one (</li><li> is one line break)
+    if out and out[-1] in _BREAKS:
+        if len(brk) > len(out[-1]):
+            out[-1] = brk
+    elif out:
+        out.append(brk)
+
+
+def _inline(out: List[str], text: Optional[str]):
+    """Append text with whitespace collapsed (str.split is several times faster than re.sub)."""
+    if not text:
+        return
+    # A space is only kept between two pieces of text on the same line
+    spaced = bool(out) and out[-1] not in _BREAKS and not out[-1].endswith(" ")
+    words = text.split()
+    if not words:
+        if spaced:
+            out.append(" ")
+        return
+    collapsed = " ".join(words)
+    if spaced and text[0].isspace():
+        collapsed = " " + collapsed
+    if text[-1].isspace():
+        collapsed += " "
+    out.append(collapsed)
+
+
+def _block(out: List[str], tag: str, text: str):
+    """Pre-formatted text (table rows, <pre>) as its own paragraph."""
+    if text:
+        _break(out, tag)
+        out.append(text)
+        _break(out, tag)
+
+
+def _is_data_table(table) -> bool:
+    """Tables without nested tables or block content are data; others are page layout."""
+    for el in table.iterdescendants():
+        if el.tag in ("table", "p", "div", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6"):
+            return False
+    return True
+
+
+def _table_rows(table) -> List[str]:
+    rows = []
+    for tr in table.iter("tr"):
+        cells = [_cell_text(cell) for cell in tr if cell.tag in ("td", "th")]
+        if any(cells):
+            rows.append(" | ".join(cells))
+    caption = table.find("caption")
+    if caption is not None:
+        title = _cell_text(caption)
+        if title:
+            rows.insert(0, title)
+    return rows
+
+
+def _cell_text(cell) -> str:
+    return " ".join("".join(_walk(cell)).split())
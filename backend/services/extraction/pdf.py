@@ -0,0 +1,163 @@
+"""
+PDF text extraction for agenda packets, staff reports and Legistar attachments.
+
+PDFs are spooled to a local file (from blob storage, base64 scrape data or the
+source URL) and never held in memory whole. Workers open the file by path and
+extract a range of pages each, so only the paths cross the process boundary and
+a 500-page packet is spread over the pool instead of one worker. At most
+max_in_flight page ranges are outstanding at a time.
+"""
+
+from __future__ import annotations
+import asyncio
+import base64
+import bisect
+import logging
+import re
+from collections import deque
+from concurrent.futures import Executor
+from typing import Iterator, List, Optional
+
+from services.chunking import Chunk, Chunker
+from services.extraction.common import extraction_pool, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Optional imports - gracefully handle missing dependencies
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PYPDF_AVAILABLE = False
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+PDF_CONTENT_TYPE = "application/pdf"
+
+# Refuse downloads above this size (bytes); the largest agenda packets are ~150 MB
+MAX_PDF_BYTES = 512 * 1024 * 1024
+
+# Running headers/footers repeated on every page of a packet
+_PAGE_FOOTER = re.compile(r"^[ \t]*(?:Page[ \t]+\d+[ \t]+of[ \t]+\d+|-[ \t]*\d+[ \t]*-)[ \t]*$", re.IGNORECASE | re.MULTILINE)
+
+# Separator between pages in the text handed to the chunker
+PAGE_BREAK = "\n\n"
+
+
+def is_pdf(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.split(";")[0].strip().lower() == PDF_CONTENT_TYPE
+
+
+def page_count(path: str) -> int:
+    return len(_open(path).pages)
+
+
+def extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) (0-based). Module-level so it can run in a process pool."""
+    reader = _open(path)
+    texts = []
+    for number in range(start, min(stop, len(reader.pages))):
+        try:
+            text = reader.pages[number].extract_text() or ""
+        except Exception as e:
+            # One malformed page (broken font or content stream) should not lose the packet
+            logger.warning(f"Could not extract page {number + 1} of {path}: {e}")
+            text = ""
+        texts.append(normalize_text(_PAGE_FOOTER.sub("", text)))
+    return texts
+
+
+async def extract_pdf_pages(
+    path: str,
+    executor: Optional[Executor] = None,
+    pages_per_task: int = 8,
+    max_in_flight: int = 8,
+) -> List[str]:
+    """
+    Text of every page, extracted in parallel page ranges.
+
+    Args:
+        path: Local PDF file
+        executor: Pool for the CPU-bound parsing (default: the shared process pool)
+        pages_per_task: Pages per worker task
+        max_in_flight: Page ranges submitted but not yet collected
+
+    Returns:
+        One string per page, in page order ("" for pages without a text layer)
+    """
+    if not PYPDF_AVAILABLE:
+        raise RuntimeError("pypdf is not installed; cannot extract PDF text")
+    executor = executor or extraction_pool()
+    loop = asyncio.get_running_loop()
+    total = await loop.run_in_executor(executor, page_count, path)
+
+    pages: List[str] = []
+    in_flight: deque = deque()
+    for start in range(0, total, pages_per_task):
+        if len(in_flight) >= max_in_flight:
+            pages.extend(await in_flight.popleft())
+        in_flight.append(loop.run_in_executor(executor, extract_page_range, path, start, start + pages_per_task))
+    while in_flight:
+        pages.extend(await in_flight.popleft())
+    return pages
+
+
+def chunk_pages(pages: List[str], chunker: Chunker) -> List[Chunk]:
+    """Chunk page texts as one document, recording the 1-based page span of each chunk."""
+    starts: List[int] = []
+
+    def stream() -> Iterator[str]:
+        offset = 0
+        for number, text in enumerate(pages):
+            if number:
+                yield PAGE_BREAK
+                offset += len(PAGE_BREAK)
+            starts.append(offset)
+            yield text
+            offset += len(text)
+
+    chunks = []
+    # Page offsets are recorded as the chunker pulls each page, before it emits chunks from it
+    for chunk in chunker.chunk(stream()):
+        chunk.page_start = bisect.bisect_right(starts, chunk.char_start)
+        chunk.page_end = bisect.bisect_right(starts, max(chunk.char_end - 1, chunk.char_start))
+        chunks.append(chunk)
+    return chunks
+
+
+async def spool_pdf(url: str, path: str, client: Optional["httpx.AsyncClient"] = None, max_bytes: int = MAX_PDF_BYTES):
+    """Stream a PDF download to path without buffering it in memory."""
+    if not HTTPX_AVAILABLE:
+        raise RuntimeError("httpx is not installed; cannot download PDF")
+    owns_client = client is None
+    client = client or httpx.AsyncClient(timeout=120.0, follow_redirects=True)
+    try:
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            written = 0
+            with open(path, "wb") as f:
+                async for block in response.aiter_bytes(1 << 20):
+                    written += len(block)
+                    if written > max_bytes:
+                        raise ValueError(f"PDF at {url} exceeds {max_bytes} bytes")
+                    f.write(block)
+    finally:
+        if owns_client:
+            await client.aclose()
+
+
+def write_base64_pdf(encoded: str, path: str):
+    with open(path, "wb") as f:
+        f.write(base64.b64decode(encoded))
+
+
+def _open(path: str) -> "PdfReader":
+    reader = PdfReader(path)
+    if reader.is_encrypted:
+        # Most "encrypted" government PDFs only restrict printing/copying (empty user password)
+        reader.decrypt("")
+    return reader
@@ -5,6 +5,7 @@ from openai import AsyncOpenAI
 from pydantic import BaseModel
 from backend.contracts.extraction import ExtractorClient
 from backend.clients.web_reader_client import WebReaderClient
+from backend.services.provider_gateway import get_gateway
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -19,6 +20,7 @@ class ZaiExtractor(ExtractorClient):
         
         self.web_reader = WebReaderClient(api_key=self.api_key)
         self.model = model
+        self.gateway = get_gateway("zai")
 
         # Initialize instructor client
         if self.api_key:
@@ -48,7 +50,8 @@ class ZaiExtractor(ExtractorClient):
         
         # 2. Extract structured data
         # Note: Instructor patches the client, so we use response_model
-        return await self.client.chat.completions.create(
+        return await self.gateway.call(
+            self.client.chat.completions.create,
             model=self.model,
             response_model=schema,
             messages=[
@@ -1,7 +1,8 @@
 import logging
 import json
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+from uuid import UUID
 from pydantic import BaseModel
 
 logger = logging.getLogger(__name__)
@@ -26,6 +27,19 @@ class PipelineStep(BaseModel):
     duration_ms: Optional[int] = None
     created_at: Any = None
 
+def _run_lookup(identifier: str) -> Tuple[str, Any]:
+    """
+    WHERE clause and typed parameter for finding a pipeline run.
+
+    A UUID matches pipeline_runs.id directly; anything else is a bill_id or jurisdiction
+    name. Keeping the two apart avoids `id::text = $1`, which no index can serve.
+    """
+    try:
+        return "id = $1", UUID(identifier)
+    except ValueError:
+        return "bill_id = $1 OR jurisdiction = $1", identifier
+
+
 class GlassBoxService:
     """
     Service to retrieve agent execution traces ('Glass Box' observability).
@@ -43,16 +57,17 @@ class GlassBoxService:
             return []
             
         try:
-            query = """
+            where, param = _run_lookup(run_id)
+            query = f"""
                 SELECT * FROM pipeline_steps 
                 WHERE run_id = (
                     SELECT id FROM pipeline_runs 
-                    WHERE bill_id = $1 OR id::text = $1 OR jurisdiction = $1
+                    WHERE {where}
                     ORDER BY started_at DESC LIMIT 1
                 )
                 ORDER BY step_number ASC
             """
-            rows = await self.db._fetch(query, run_id)
+            rows = await self.db._fetch(query, param)
             
             steps = []
             for r in rows:
@@ -62,9 +77,9 @@ class GlassBoxService:
                     step_number=r['step_number'],
                     step_name=r['step_name'],
                     status=r['status'],
-                    input_context=json.loads(r['input_context']) if isinstance(r['input_context'], str) else r['input_context'],
-                    output_result=json.loads(r['output_result']) if isinstance(r['output_result'], str) else r['output_result'],
-                    model_info=json.loads(r['model_config']) if isinstance(r['model_config'], str) else r['model_config'],
+                    input_context=r['input_context'],
+                    output_result=r['output_result'],
+                    model_info=r['model_config'],
                     duration_ms=r['duration_ms'],
                     created_at=r['created_at']
                 ))
@@ -82,12 +97,13 @@ class GlassBoxService:
         # 1. Try DB first (pipeline_runs)
         if self.db:
             try:
-                # We search by bill_id (which is used as query_id in UI) or jurisdiction
-                query = "SELECT * FROM pipeline_runs WHERE bill_id = $1 OR id::text = $1 OR jurisdiction = $1 ORDER BY started_at DESC LIMIT 1"
-                run = await self.db._fetchrow(query, query_id)
+                # We search by run id, bill_id (which is used as query_id in UI) or jurisdiction
+                where, param = _run_lookup(query_id)
+                query = f"SELECT * FROM pipeline_runs WHERE {where} ORDER BY started_at DESC LIMIT 1"
+                run = await self.db._fetchrow(query, param)
                 
                 if run and run['result']:
-                    data = json.loads(run['result']) if isinstance(run['result'], str) else run['result']
+                    data = run['result']
                     # Map pipeline steps (research, generate, review) to AgentStep
                     
                     # Note: Using started_at as base timestamp
@@ -0,0 +1,118 @@
+"""Factories for the IngestionService (RAG cron jobs, ingest worker) and the retrieval backend (chat)."""
+
+import logging
+import os
+from typing import TYPE_CHECKING, Any, Optional, Tuple
+
+if TYPE_CHECKING:
+    from services.embedding_cache import EmbeddingCache
+    from services.ingestion_service import IngestionService
+
+logger = logging.getLogger(__name__)
+
+
+class MockEmbeddingService:
+    """Inline mock embedding service (llm-common export missing/mismatched)."""
+
+    async def embed_query(self, text: str) -> list[float]:
+        return [0.1] * 1536
+
+    async def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [[0.1] * 1536 for _ in texts]
+
+
+def create_embedding_service() -> Tuple[Any, str, int]:
+    """
+    Environment-configured embedding service (OpenRouter, gated), or the mock without API keys.
+
+    Returns:
+        (embedding_service, model, dimensions)
+    """
+    from services.provider_gateway import gate_embeddings
+    from llm_common.embeddings.openai import OpenAIEmbeddingService
+
+    if os.environ.get("OPENAI_API_KEY") or os.environ.get("OPENROUTER_API_KEY"):
+        embedding_model, embedding_dimensions = "qwen/qwen3-embedding-8b", 4096
+        embedding_service = gate_embeddings(OpenAIEmbeddingService(
+            base_url="https://openrouter.ai/api/v1",
+            api_key=os.environ.get("OPENROUTER_API_KEY"),
+            model=embedding_model,
+            dimensions=embedding_dimensions,
+        ), "openrouter")
+    else:
+        logger.warning("Using Mock Embedding Service (1536 dims)")
+        embedding_model, embedding_dimensions = "mock", 1536
+        embedding_service = MockEmbeddingService()
+    return embedding_service, embedding_model, embedding_dimensions
+
+
+def create_retrieval_backend(db):
+    """
+    Vector backend whose retrieve()/retrieve_many() embed queries themselves.
+
+    Build it once per process: its query-embedding cache is what lets repeated
+    chat and agent queries skip the embedding round-trip.
+    """
+    from services.vector_backend_factory import create_vector_backend
+
+    embedding_service, embedding_model, _ = create_embedding_service()
+    return create_vector_backend(
+        postgres_client=db,
+        embedding_fn=embedding_service.embed_query,
+        embed_many_fn=embedding_service.embed_documents,
+        embedding_model=embedding_model,
+    )
+
+
+def create_ingestion_service(db) -> Tuple["IngestionService", Optional["EmbeddingCache"]]:
+    """
+    Build the environment-configured IngestionService.
+
+    Args:
+        db: Connected PostgresDB instance
+
+    Returns:
+        (ingestion_service, embedding_cache); the cache is None with the mock embedder
+    """
+    from services.ingestion_service import IngestionService
+    from services.embedding_cache import EmbeddingCache
+    from services.chunking import chunker_from_env
+    from services.extraction import extraction_pool
+    from services.storage import S3Storage
+    from services.vector_backend_factory import create_vector_backend
+
+    embedding_service, embedding_model, embedding_dimensions = create_embedding_service()
+    if isinstance(embedding_service, MockEmbeddingService):
+        embedding_cache = None
+    else:
+        # Unchanged chunks from re-scraped pages reuse their stored embeddings
+        embedding_cache = EmbeddingCache.from_env(db, embedding_model, embedding_dimensions)
+
+    # Create embedding function for vector backend
+    async def embed_fn(text: str) -> list[float]:
+        return await embedding_service.embed_query(text)
+
+    vector_backend = create_vector_backend(
+        postgres_client=db,
+        embedding_fn=embed_fn,
+        embed_many_fn=embedding_service.embed_documents,
+        embedding_model=embedding_model,
+    )
+
+    storage_backend = S3Storage()  # Uses MINIO_* env vars
+
+    ingestion_service = IngestionService(
+        postgres_client=db,
+        vector_backend=vector_backend,
+        embedding_service=embedding_service,
+        storage_backend=storage_backend,
+        embedding_cache=embedding_cache,
+        # Re-scraped meetings/code pages only re-embed the chunks that changed
+        incremental=os.environ.get("INGEST_INCREMENTAL", "true").lower() == "true",
+        # Section/agenda-item aware, token-bounded chunks (CHUNK_* env vars)
+        chunker=chunker_from_env(),
+        # fast (lxml) | trafilatura | regex; multi-MB Legistar pages parse in worker processes
+        html_mode=os.environ.get("HTML_EXTRACT_MODE", "fast"),
+        executor=extraction_pool(),
+    )
+    return ingestion_service, embedding_cache
@@ -1,9 +1,14 @@
 """Ingestion service to process raw scrapes into embedded document chunks."""
 
 from __future__ import annotations
-import re
-from typing import List, Dict, Any
-from uuid import uuid4, UUID
+import asyncio
+import os
+import tempfile
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Tuple
+from uuid import uuid4, uuid5, UUID
 from pydantic import ValidationError
 
 # LLM Common v0.4.0+ interfaces
@@ -12,9 +17,99 @@ from llm_common.embeddings import EmbeddingService
 from llm_common import WebSearchResult
 # Use absolute import pattern relative to backend root (which is in path)
 from contracts.storage import BlobStorage
-from contracts.ingestion import RawScrape
+from contracts.ingestion import RawScrape, IngestionBatchResult
+from services.chunking import CharacterChunker, Chunk, Chunker
+from services.embedding_cache import EmbeddingCache, content_hash
+from services.extraction import MODES as HTML_MODES, html_to_text
+from services.extraction.pdf import (
+    chunk_pages,
+    extract_pdf_pages,
+    is_pdf,
+    spool_pdf,
+    write_base64_pdf,
+)
+from services.provider_gateway import gate_embeddings
 from typing import Optional
 
+# Namespace for stable document ids in incremental mode (uuid5 of the document key)
+DOCUMENT_NAMESPACE = UUID("5b0f7a8e-3c1d-4f2a-9e6b-7d4c2a1f0e93")
+
+
+def clean_html(html: str, mode: str = "fast") -> str:
+    """Convert HTML to text, dropping non-content nodes (see services.extraction)."""
+    return html_to_text(html, mode)
+
+
+def extract_text(data: Dict[str, Any], html_mode: str = "fast") -> str:
+    """Extract text from scraped data."""
+    if not data:
+        return ""
+    if isinstance(data, str):
+        return clean_html(data, html_mode)
+
+    if isinstance(data, dict):
+        # Prioritize common text fields
+        for field in ['text', 'content', 'body', 'raw_html_snippet', 'description']:
+            if field in data and data.get(field) and isinstance(data[field], str):
+                cleaned_text = clean_html(data[field], html_mode)
+                if cleaned_text:
+                    return cleaned_text
+
+        # Fallback: concatenate all string values, but only if they are not just whitespace
+        texts = [str(v).strip() for v in data.values() if isinstance(v, str)]
+        non_empty_texts = [t for t in texts if t and t.strip()]
+        if non_empty_texts:
+            return ' '.join(non_empty_texts)
+
+    # If data is not a dict or no text was found, return empty string
+    return ""
+
+
+def chunk_text(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """Chunk text into overlapping character windows."""
+    return CharacterChunker(chunk_size, chunk_overlap).split(text)
+
+
+def document_key(scrape: RawScrape) -> str:
+    """Identity of a scraped document across re-scrapes: bill number within its source, else URL."""
+    data = scrape.data if isinstance(scrape.data, dict) else {}
+    bill_number = (scrape.metadata or {}).get("bill_number") or data.get("bill_number")
+    if bill_number:
+        return f"bill:{scrape.source_id}:{bill_number}"
+    return f"url:{scrape.url}"
+
+
+def document_uuid(scrape: RawScrape) -> str:
+    return str(uuid5(DOCUMENT_NAMESPACE, document_key(scrape)))
+
+
+def chunk_uuids(document_id: str, hashes: List[bytes]) -> List[str]:
+    """Chunk ids from content hash + occurrence, so unchanged chunks keep their row."""
+    seen: Dict[bytes, int] = {}
+    ids = []
+    for chunk_hash in hashes:
+        occurrence = seen.get(chunk_hash, 0)
+        seen[chunk_hash] = occurrence + 1
+        ids.append(str(uuid5(UUID(document_id), f"{chunk_hash.hex()}:{occurrence}")))
+    return ids
+
+
+@dataclass
+class _DocumentPlan:
+    scrape: RawScrape
+    chunks: List[Chunk]
+    document_id: str
+    chunk_ids: List[str]
+    hashes: List[bytes]
+    embed: List[int] = field(default_factory=list)  # indices of chunks to embed and write
+    superseded: List[str] = field(default_factory=list)  # earlier scrapes of the same document
+
+
+def prepare_chunks(data: Dict[str, Any], chunker: Chunker, html_mode: str = "fast") -> List[Chunk]:
+    """Extract + chunk in one call (module-level so it can run in a process pool)."""
+    return list(chunker.chunk(extract_text(data, html_mode)))
+
+
 class IngestionService:
     """
     Process raw scrapes into chunked, embedded documents.
@@ -35,13 +130,30 @@ class IngestionService:
         storage_backend: Optional["BlobStorage"] = None,
         chunk_size: int = 1000,
         chunk_overlap: int = 200,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        incremental: bool = False,
+        chunker: Optional[Chunker] = None,
+        html_mode: str = "fast",
+        executor: Optional[Executor] = None,
     ):
         self.pg = postgres_client
         self.vector_backend = vector_backend
-        self.embedding_service = embedding_service
+        # Calls share the provider's adaptive concurrency/rate limits with every other caller
+        self.embedding_service = gate_embeddings(embedding_service)
         self.storage_backend = storage_backend
+        self.embedding_cache = embedding_cache
+        # Re-scrapes update one stable document per bill/URL instead of adding a new copy
+        self.incremental = incremental
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        # chunk_size/chunk_overlap configure the default character chunker only
+        self.chunker = chunker or CharacterChunker(chunk_size, chunk_overlap)
+        if html_mode not in HTML_MODES:
+            raise ValueError(f"Unknown html_mode '{html_mode}'. Allowed: {', '.join(HTML_MODES)}")
+        self.html_mode = html_mode
+        # Where extraction + chunking run (None: the loop's thread pool); a process pool
+        # keeps multi-megabyte pages from holding the GIL the event loop needs
+        self.executor = executor
     
     async def process_raw_scrape(self, scrape_id: str) -> int:
         """
@@ -53,6 +165,10 @@ class IngestionService:
         Returns:
             Number of chunks created
         """
+        if self.incremental:
+            # The diff against stored chunks lives in the batch path
+            return (await self.process_raw_scrapes([scrape_id])).embedded
+
         # 1. Fetch and validate raw scrape from Postgres
         row = await self.pg._fetchrow("SELECT * FROM raw_scrapes WHERE id = $1", scrape_id)
         if not row:
@@ -75,8 +191,13 @@ class IngestionService:
             )
             return 0
 
-        # 2. Extract text from data
-        text = self._extract_text(scrape.data)
+        if is_pdf(scrape.content_type):
+            # Page-parallel extraction lives in the batch path
+            return (await self.process_raw_scrapes([scrape_id])).chunks
+
+        # 2. Extract text from data (off the event loop: large pages take seconds to parse)
+        loop = asyncio.get_running_loop()
+        text = await loop.run_in_executor(self.executor, extract_text, scrape.data, self.html_mode)
         
         if not text:
             print(f"⚠️ No text extracted for scrape {scrape_id}")
@@ -84,34 +205,13 @@ class IngestionService:
 
         # 2.5 Upload to Blob Storage (New)
         if self.storage_backend and scrape.data:
-             try:
-                 # Construct path: jurisdiction/YYYY/MM/scrape_id.html
-                 from datetime import datetime
-                 now = datetime.now()
-                 ext = ".html" # Default
-                 if scrape.content_type == 'application/pdf':
-                     ext = ".pdf"
-                 
-                 source_identifier = str(scrape.source_id)
-                 path = f"{source_identifier}/{now.year}/{now.month}/{scrape_id}{ext}"
-                 
-                 # Get content as bytes
-                 if isinstance(scrape.data, dict) and 'content' in scrape.data:
-                     content_bytes = str(scrape.data['content']).encode('utf-8')
-                 else:
-                     content_bytes = str(scrape.data).encode('utf-8')
-                     
-                 uri = await self.storage_backend.upload(path, content_bytes)
-                 
-                 # Update raw_scrape with storage URI
-                 await self.pg._execute("UPDATE raw_scrapes SET storage_uri = $1 WHERE id = $2", uri, scrape_id)
-                 
-             except Exception as e:
-                 print(f"⚠️ Storage upload failed for scrape {scrape.id}: {e}")
-                 # Non-blocking, continue ingestion
+            uri = await self._upload_to_storage(scrape)
+            if uri:
+                # Update raw_scrape with storage URI
+                await self.pg._execute("UPDATE raw_scrapes SET storage_uri = $1 WHERE id = $2", uri, scrape_id)
 
         # 3. Chunk text
-        chunks = self._chunk_text(text)
+        chunks = list(self.chunker.chunk(text))
         if not chunks:
              print(f"⚠️ Chunks empty for scrape {scrape_id}. Text len: {len(text)}")
              return 0
@@ -120,126 +220,419 @@ class IngestionService:
         
         # 4. Generate embeddings
         try:
-            embeddings = await self.embedding_service.embed_documents(chunks)
+            embeddings = await self._embed_documents([chunk.text for chunk in chunks])
         except Exception as e:
             print(f"❌ Embedding failed: {e}")
             return 0
         
         # 5. Create RetrievedChunk objects
         document_id = str(uuid4())
+        doc_chunks = self._build_chunk_records(scrape, chunks, embeddings, document_id)
+        
+        # 6. Store in vector backend
+        try:
+            await self.vector_backend.upsert(doc_chunks)
+            
+            # 7. Mark scrape as processed
+            await self.pg._execute(
+                "UPDATE raw_scrapes SET processed = $1, document_id = $2, error_message = NULL WHERE id = $3",
+                True, document_id, scrape_id
+            )
+        except Exception as e:
+            await self.pg._execute(
+                "UPDATE raw_scrapes SET processed = false, error_message = $1 WHERE id = $2",
+                f"Vector Upsert Failed: {e}", scrape_id
+            )
+            raise e
+        
+        return len(doc_chunks)
+    
+    async def process_raw_scrapes(
+        self,
+        scrape_ids: List[str],
+        concurrency: int = 4,
+        embed_batch_size: int = 128,
+        executor: Optional[Executor] = None,
+    ) -> IngestionBatchResult:
+        """
+        Process many raw scrapes as one batch.
+
+        Rows are fetched with a single query, extraction and chunking run in
+        `executor` (default: the loop's thread pool; pass a ProcessPoolExecutor to
+        use more cores), chunks from all scrapes are embedded together in batches of
+        `embed_batch_size` with at most `concurrency` embedding calls in flight, and
+        all chunks are written with one vector upsert. A failure in one scrape
+        (validation, extraction, its embedding batch) does not fail the others.
+
+        With incremental=True each scrape updates the document for its bill number
+        or URL: only chunks whose hash is not already stored are embedded, and stale
+        chunks are deleted in the same transaction as the new ones are written.
+
+        Args:
+            scrape_ids: IDs of raw_scrapes to process
+            concurrency: Max concurrent embedding calls / storage uploads
+            embed_batch_size: Chunks per embedding call
+            executor: Executor for extraction + chunking (default: the service's executor)
+
+        Returns:
+            IngestionBatchResult with per-scrape outcome
+        """
+        started = time.monotonic()
+        result = IngestionBatchResult(requested=len(scrape_ids))
+        unique_ids = list(dict.fromkeys(str(scrape_id) for scrape_id in scrape_ids))
+        if not unique_ids:
+            return result
+
+        # 1. Fetch and validate all rows in one round trip
+        rows = await self.pg._fetch("SELECT * FROM raw_scrapes WHERE id = ANY($1::uuid[])", unique_ids)
+        rows_by_id = {str(row["id"]): row for row in rows}
+        scrapes: List[RawScrape] = []
+        for scrape_id in unique_ids:
+            row = rows_by_id.get(scrape_id)
+            if row is None:
+                result.skipped[scrape_id] = "not found"
+                continue
+            try:
+                scrapes.append(RawScrape.model_validate(dict(row)))
+            except ValidationError as e:
+                print(f"❌ Pydantic validation failed for scrape {scrape_id}: {e}")
+                result.failed[scrape_id] = str(e)
+
+        # 2-3. Extract + chunk off the event loop (PDF pages in parallel, see _prepare_pdf)
+        loop = asyncio.get_running_loop()
+        executor = executor or self.executor
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        pdf_uploads: List[Tuple[str, str]] = []
+
+        async def prepare(scrape: RawScrape) -> List[Chunk]:
+            if is_pdf(scrape.content_type):
+                async with semaphore:
+                    return await self._prepare_pdf(scrape, executor, pdf_uploads)
+            return await loop.run_in_executor(executor, prepare_chunks, scrape.data, self.chunker, self.html_mode)
+
+        prepared = await asyncio.gather(*[prepare(scrape) for scrape in scrapes], return_exceptions=True)
+        documents: List[Tuple[RawScrape, List[str]]] = []
+        for scrape, chunks in zip(scrapes, prepared):
+            if isinstance(chunks, BaseException):
+                result.failed[str(scrape.id)] = f"Extraction failed: {chunks}"
+            elif not chunks:
+                result.skipped[str(scrape.id)] = "no text extracted"
+            else:
+                documents.append((scrape, chunks))
+
+        # 2.5 Blob storage uploads (non-blocking for ingestion, like the single path);
+        # PDFs were uploaded from their spooled file while being prepared
+        if self.storage_backend:
+            await self._upload_batch(
+                [scrape for scrape, _ in documents if scrape.data and not is_pdf(scrape.content_type)],
+                semaphore,
+                uploaded=pdf_uploads,
+            )
+
+        # 3.5 Assign document/chunk ids; in incremental mode only changed chunks are embedded
+        try:
+            plans = await self._plan_documents(documents)
+        except Exception as e:
+            print(f"❌ Reading stored chunk hashes failed: {e}")
+            for scrape, _ in documents:
+                result.failed[str(scrape.id)] = f"Chunk diff failed: {e}"
+            plans = []
+
+        # 4. Embed chunks from all documents in shared batches
+        flat = [(index, plan.chunks[i].text) for index, plan in enumerate(plans) for i in plan.embed]
+        embeddings: List[Any] = [None] * len(flat)
+        starts = list(range(0, len(flat), max(1, embed_batch_size)))
+
+        async def embed_batch(start: int):
+            batch = flat[start:start + embed_batch_size]
+            async with semaphore:
+                vectors = await self._embed_documents([text for _, text in batch])
+            if len(vectors) != len(batch):
+                raise ValueError(f"expected {len(batch)} embeddings, got {len(vectors)}")
+            embeddings[start:start + len(batch)] = vectors
+
+        outcomes = await asyncio.gather(*[embed_batch(start) for start in starts], return_exceptions=True)
+        embed_errors: Dict[int, str] = {}
+        for start, outcome in zip(starts, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"❌ Embedding failed: {outcome}")
+                for index, _ in flat[start:start + embed_batch_size]:
+                    embed_errors[index] = f"Embedding failed: {outcome}"
+
+        # 5. Create RetrievedChunk records for every fully embedded document
+        records: List[Dict[str, Any]] = []
+        completed: List[_DocumentPlan] = []
+        offset = 0
+        for index, plan in enumerate(plans):
+            vectors = embeddings[offset:offset + len(plan.embed)]
+            offset += len(plan.embed)
+            if index in embed_errors:
+                result.failed[str(plan.scrape.id)] = embed_errors[index]
+                continue
+            records.extend(self._build_chunk_records(
+                plan.scrape,
+                [plan.chunks[i] for i in plan.embed],
+                vectors,
+                plan.document_id,
+                chunk_ids=[plan.chunk_ids[i] for i in plan.embed],
+                hashes=[plan.hashes[i] for i in plan.embed],
+            ))
+            completed.append(plan)
+
+        # 6. Store in vector backend with one upsert (incremental: one sync that also drops stale chunks)
+        if completed:
+            try:
+                if self.incremental:
+                    synced = await self.vector_backend.sync_documents(
+                        records, {plan.document_id: plan.chunk_ids for plan in completed}
+                    )
+                    result.deleted = synced["deleted"]
+                elif await self.vector_backend.upsert(records) is False:
+                    raise RuntimeError("vector backend rejected the batch")
+            except Exception as e:
+                print(f"❌ Vector upsert failed for batch of {len(records)} chunks: {e}")
+                for plan in completed:
+                    result.failed[str(plan.scrape.id)] = f"Vector Upsert Failed: {e}"
+                completed = []
+
+        # 7. Mark outcomes in bulk (superseded scrapes of the same document share its id)
+        if completed:
+            marked = [
+                (scrape_id, plan.document_id)
+                for plan in completed
+                for scrape_id in [*plan.superseded, str(plan.scrape.id)]
+            ]
+            await self.pg._execute(
+                """
+                UPDATE raw_scrapes SET processed = true, document_id = u.document_id, error_message = NULL
+                FROM unnest($1::uuid[], $2::uuid[]) AS u(id, document_id)
+                WHERE raw_scrapes.id = u.id
+                """,
+                [scrape_id for scrape_id, _ in marked],
+                [document_id for _, document_id in marked],
+            )
+            result.processed = [scrape_id for scrape_id, _ in marked]
+            result.chunks = sum(len(plan.chunks) for plan in completed)
+            result.embedded = len(records)
+            result.unchanged = result.chunks - result.embedded
+
+        failed = [(scrape_id, error) for scrape_id, error in result.failed.items() if scrape_id in rows_by_id]
+        if failed:
+            await self.pg._execute(
+                """
+                UPDATE raw_scrapes SET processed = false, error_message = u.error_message
+                FROM unnest($1::uuid[], $2::text[]) AS u(id, error_message)
+                WHERE raw_scrapes.id = u.id
+                """,
+                [scrape_id for scrape_id, _ in failed],
+                [error for _, error in failed],
+            )
+
+        result.duration_ms = int((time.monotonic() - started) * 1000)
+        print(
+            f"✅ Batch ingested {len(result.processed)}/{result.requested} scrapes "
+            f"({result.chunks} chunks, {result.embedded} embedded, {result.deleted} deleted, "
+            f"{len(result.failed)} failed, {len(result.skipped)} skipped) "
+            f"in {result.duration_ms}ms"
+        )
+        return result
+
+    async def _plan_documents(self, documents: List[Tuple[RawScrape, List[str]]]) -> List[_DocumentPlan]:
+        """
+        Assign document and chunk ids and pick the chunks that need embedding.
+
+        Default mode mints fresh ids and embeds everything. Incremental mode derives
+        ids from the document key and chunk hashes, diffs them against the hashes
+        already stored for the document and embeds only the chunks that are new. When
+        several scrapes in the batch map to one document, the last one wins.
+        """
+        if not self.incremental:
+            return [
+                _DocumentPlan(
+                    scrape=scrape,
+                    chunks=chunks,
+                    document_id=str(uuid4()),
+                    chunk_ids=[str(uuid4()) for _ in chunks],
+                    hashes=[content_hash(chunk.text) for chunk in chunks],
+                    embed=list(range(len(chunks))),
+                )
+                for scrape, chunks in documents
+            ]
+
+        plans: Dict[str, _DocumentPlan] = {}
+        for scrape, chunks in documents:
+            document_id = document_uuid(scrape)
+            hashes = [content_hash(chunk.text) for chunk in chunks]
+            previous = plans.get(document_id)
+            plans[document_id] = _DocumentPlan(
+                scrape=scrape,
+                chunks=chunks,
+                document_id=document_id,
+                chunk_ids=chunk_uuids(document_id, hashes),
+                hashes=hashes,
+                superseded=[*previous.superseded, str(previous.scrape.id)] if previous else [],
+            )
+
+        stored = await self.vector_backend.chunk_hashes(list(plans))
+        for document_id, plan in plans.items():
+            existing = stored.get(document_id, {})
+            plan.embed = [
+                i for i, (chunk_id, chunk_hash) in enumerate(zip(plan.chunk_ids, plan.hashes))
+                if existing.get(chunk_id) != chunk_hash
+            ]
+        return list(plans.values())
+
+    async def _embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed via the cache when configured, so unchanged chunks skip the provider."""
+        if self.embedding_cache:
+            return await self.embedding_cache.embed_documents(texts, self.embedding_service.embed_documents)
+        return await self.embedding_service.embed_documents(texts)
+
+    async def _prepare_pdf(
+        self, scrape: RawScrape, executor: Optional[Executor], uploads: List[Tuple[str, str]]
+    ) -> List[Chunk]:
+        """
+        Chunk a PDF scrape with page-number metadata.
+
+        The file is spooled to a temp dir from blob storage (storage_uri), base64
+        `pdf_base64` scrape data, or the scrape URL (e.g. Legistar View.ashx), and
+        uploaded to blob storage when not stored yet. Pages are extracted in
+        parallel ranges in `executor` (default: the shared process pool).
+        """
+        data = scrape.data if isinstance(scrape.data, dict) else {}
+        with tempfile.TemporaryDirectory(prefix="ingest-pdf-") as tmp:
+            path = os.path.join(tmp, f"{scrape.id}.pdf")
+            if scrape.storage_uri and self.storage_backend:
+                await self.storage_backend.download_file(scrape.storage_uri, path)
+            elif data.get("pdf_base64"):
+                write_base64_pdf(data["pdf_base64"], path)
+            else:
+                await spool_pdf(scrape.url, path)
+
+            if self.storage_backend and not scrape.storage_uri:
+                uri = await self._upload_to_storage(scrape, file_path=path)
+                if uri:
+                    uploads.append((str(scrape.id), uri))
+
+            pages = await extract_pdf_pages(path, executor)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, chunk_pages, pages, self.chunker)
+
+    async def _upload_to_storage(self, scrape: RawScrape, file_path: Optional[str] = None) -> Optional[str]:
+        """Upload raw scrape content (or a spooled file) to blob storage; returns the URI or None on failure."""
+        try:
+            # Construct path: source_id/YYYY/MM/scrape_id.html
+            from datetime import datetime
+            now = datetime.now()
+            ext = ".html" # Default
+            if is_pdf(scrape.content_type):
+                ext = ".pdf"
+
+            source_identifier = str(scrape.source_id)
+            path = f"{source_identifier}/{now.year}/{now.month}/{scrape.id}{ext}"
+
+            if file_path:
+                return await self.storage_backend.upload_file(path, file_path, scrape.content_type)
+
+            # Get content as bytes
+            if isinstance(scrape.data, dict) and 'content' in scrape.data:
+                content_bytes = str(scrape.data['content']).encode('utf-8')
+            else:
+                content_bytes = str(scrape.data).encode('utf-8')
+
+            return await self.storage_backend.upload(path, content_bytes)
+        except Exception as e:
+            print(f"⚠️ Storage upload failed for scrape {scrape.id}: {e}")
+            # Non-blocking, continue ingestion
+            return None
+
+    async def _upload_batch(
+        self,
+        scrapes: List[RawScrape],
+        semaphore: asyncio.Semaphore,
+        uploaded: Optional[List[Tuple[str, str]]] = None,
+    ):
+        """Upload scrapes concurrently and record all storage URIs (plus already `uploaded` ones) in one UPDATE."""
+        async def upload(scrape: RawScrape) -> Optional[str]:
+            async with semaphore:
+                return await self._upload_to_storage(scrape)
+
+        uris = await asyncio.gather(*[upload(scrape) for scrape in scrapes])
+        uploaded = list(uploaded or []) + [(str(scrape.id), uri) for scrape, uri in zip(scrapes, uris) if uri]
+        if uploaded:
+            await self.pg._execute(
+                """
+                UPDATE raw_scrapes SET storage_uri = u.storage_uri
+                FROM unnest($1::uuid[], $2::text[]) AS u(id, storage_uri)
+                WHERE raw_scrapes.id = u.id
+                """,
+                [scrape_id for scrape_id, _ in uploaded],
+                [uri for _, uri in uploaded],
+            )
+
+    def _build_chunk_records(
+        self,
+        scrape: RawScrape,
+        chunks: List[Chunk],
+        embeddings: List[Any],
+        document_id: str,
+        chunk_ids: Optional[List[str]] = None,
+        hashes: Optional[List[bytes]] = None,
+    ) -> List[Dict[str, Any]]:
+        """RetrievedChunk dicts in the shape LocalPgVectorBackend.upsert expects."""
         doc_chunks = []
+        chunk_ids = chunk_ids or [str(uuid4()) for _ in chunks]
+        hashes = hashes or [content_hash(chunk.text) for chunk in chunks]
 
         # Scrape metadata is already validated by Pydantic, default_factory ensures it's a dict
         scrape_meta = scrape.metadata
-        
-        for i, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
+
+        for chunk, embedding, chunk_id, chunk_hash in zip(chunks, embeddings, chunk_ids, hashes):
             # Construct metadata
             metadata = {
                 "source_id": str(scrape.source_id),
                 "scrape_id": scrape.id,
                 "document_id": document_id,
                 "content_type": scrape.content_type,
-                **scrape_meta
+                **scrape_meta,
+                # Offsets and section heading from the chunker
+                **chunk.metadata(),
             }
-            
+
             doc_chunk = RetrievedChunk(
-                content=chunk_text,
+                content=chunk.text,
                 embedding=embedding,
                 metadata=metadata,
-                chunk_id=str(uuid4()), # Explicit chunk ID
+                chunk_id=chunk_id, # Explicit chunk ID
                 source=scrape.url,
                 score=1.0 # Default score (not relevant for storage)
             )
-            
+
             # Pydantic dump
             chunk_data = doc_chunk.model_dump()
-            
+
             # Inject generic fields that LocalPgVectorBackend expects
             # (RetrievedChunk defines 'chunk_id', but Postgres uses 'id')
             chunk_data['id'] = chunk_data['chunk_id']
             chunk_data['document_id'] = document_id
-            
+            chunk_data['content_hash'] = chunk_hash
+
             doc_chunks.append(chunk_data)
-        
-        # 6. Store in vector backend
-        try:
-            await self.vector_backend.upsert(doc_chunks)
-            
-            # 7. Mark scrape as processed
-            await self.pg._execute(
-                "UPDATE raw_scrapes SET processed = $1, document_id = $2, error_message = NULL WHERE id = $3",
-                True, document_id, scrape_id
-            )
-        except Exception as e:
-            await self.pg._execute(
-                "UPDATE raw_scrapes SET processed = false, error_message = $1 WHERE id = $2",
-                f"Vector Upsert Failed: {e}", scrape_id
-            )
-            raise e
-        
-        return len(doc_chunks)
-    
+        return doc_chunks
+
     def _extract_text(self, data: Dict[str, Any]) -> str:
         """Extract text from scraped data."""
-        if not data:
-            return ""
-        if isinstance(data, str):
-            return self._clean_html(data)
-        
-        if isinstance(data, dict):
-            # Prioritize common text fields
-            for field in ['text', 'content', 'body', 'raw_html_snippet', 'description']:
-                if field in data and data.get(field) and isinstance(data[field], str):
-                    cleaned_text = self._clean_html(data[field])
-                    if cleaned_text:
-                        return cleaned_text
-            
-            # Fallback: concatenate all string values, but only if they are not just whitespace
-            texts = [str(v).strip() for v in data.values() if isinstance(v, str)]
-            non_empty_texts = [t for t in texts if t and t.strip()]
-            if non_empty_texts:
-                return ' '.join(non_empty_texts)
-        
-        # If data is not a dict or no text was found, return empty string
-        return ""
-    
+        return extract_text(data, self.html_mode)
+
     def _clean_html(self, html: str) -> str:
-        """Clean HTML tags and normalize whitespace."""
-        # Simple regex clean - okay for now, ideally use BS4 or trafilatura
-        text = re.sub(r'<[^>]+>', ' ', html)
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
-    
+        """Convert HTML to text with the configured extraction mode."""
+        return clean_html(html, self.html_mode)
+
     def _chunk_text(self, text: str) -> List[str]:
-        """Chunk text into overlapping segments."""
-        if not text:
-            return []
-        if len(text) <= self.chunk_size:
-            return [text]
-        
-        chunks = []
-        start = 0
-        while start < len(text):
-            end = start + self.chunk_size
-            chunk = text[start:end]
-            
-            # If this is not the last chunk, try to find a natural break
-            if end < len(text):
-                # Find the last space to avoid splitting words
-                last_space = chunk.rfind(' ')
-                if last_space != -1:
-                    end = start + last_space
-            
-            chunks.append(text[start:end].strip())
-            
-            # Move start for the next chunk
-            start += self.chunk_size - self.chunk_overlap
-            
-            # If the next start is past the last chunk end, we're done
-            if start >= end:
-                break
-        
-        return [c for c in chunks if c]
+        """Chunk text with the configured chunker."""
+        return self.chunker.split(text)
+
     async def create_raw_scrape_from_search(self, result: 'WebSearchResult', source_id_uuid: UUID) -> str:
         """
         Creates a raw_scrape record from a WebSearchResult and returns its ID.
@@ -284,7 +677,7 @@ class IngestionService:
         try:
             # 1. Resolve Source ID
             source_id_uuid = await self.pg.get_or_create_source(
-                jurisdiction_id="web",
+                jurisdiction_id=None,  # generic web source, not tied to a jurisdiction
                 name=result.title or result.domain,
                 type="general",
                 url=result.url
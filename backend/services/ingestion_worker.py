@@ -0,0 +1,313 @@
+"""
+Ingestion queue worker.
+
+Leases batches of ingestion_jobs (migration 012) and runs them through
+IngestionService.process_raw_scrapes. Leases are held with a heartbeat while a
+batch runs; per-scrape failures are retried with exponential backoff and end up
+'dead' after max_attempts. Any number of workers, on any number of nodes, can
+share the queue.
+
+IngestionWorkerThread runs a worker beside a blocking crawl (Scrapy's reactor owns
+the main thread), so scrapes are embedded while the crawl is still running.
+"""
+
+from __future__ import annotations
+import asyncio
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from services.ingestion_service import IngestionService
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WorkerStats:
+    batches: int = 0
+    completed: int = 0
+    retried: int = 0
+    dead: int = 0
+    chunks: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    # Stage latency: enqueue -> lease (queue wait) and lease -> settled (batch)
+    leased: int = 0
+    queue_wait_total: float = 0.0
+    queue_wait_max: float = 0.0
+    batch_total: float = 0.0
+    batch_max: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "completed": self.completed,
+            "retried": self.retried,
+            "dead": self.dead,
+            "chunks": self.chunks,
+            "uptime_s": round(time.monotonic() - self.started_at, 1),
+            "avg_queue_wait_s": round(self.queue_wait_total / self.leased, 2) if self.leased else 0.0,
+            "max_queue_wait_s": round(self.queue_wait_max, 2),
+            "avg_batch_s": round(self.batch_total / self.batches, 2) if self.batches else 0.0,
+            "max_batch_s": round(self.batch_max, 2),
+        }
+
+
+def worker_env() -> Dict[str, Any]:
+    """IngestionWorker settings from the environment."""
+    return {
+        "worker_id": os.getenv("INGEST_WORKER_ID") or None,
+        "batch_size": int(os.getenv("INGEST_WORKER_BATCH_SIZE", "25")),
+        "concurrency": int(os.getenv("INGEST_WORKER_CONCURRENCY", "2")),
+        "lease_seconds": float(os.getenv("INGEST_LEASE_SECONDS", "600")),
+        "poll_interval": float(os.getenv("INGEST_POLL_INTERVAL", "5")),
+    }
+
+
+class IngestionWorker:
+    """
+    Pulls leased batches from the ingestion queue and processes them concurrently.
+
+    Args:
+        db: PostgresDB (queue statements)
+        ingestion_service: Service that ingests a batch of raw scrapes
+        worker_id: Lease owner name (default: host-pid-random)
+        batch_size: Jobs leased per batch (one process_raw_scrapes call)
+        concurrency: Batches in flight at once
+        lease_seconds: Lease length; extended every lease_seconds / 3 while a batch runs
+        poll_interval: Idle sleep between empty polls (jittered)
+        retry_base_seconds / retry_max_seconds: Backoff for failed scrapes
+    """
+
+    def __init__(
+        self,
+        db: Any,
+        ingestion_service: IngestionService,
+        worker_id: Optional[str] = None,
+        batch_size: int = 25,
+        concurrency: int = 2,
+        lease_seconds: float = 600,
+        poll_interval: float = 5,
+        retry_base_seconds: float = 30,
+        retry_max_seconds: float = 3600,
+    ):
+        self.db = db
+        self.ingestion_service = ingestion_service
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.stats = WorkerStats()
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        self._draining = False
+
+    @classmethod
+    def from_env(cls, db: Any, ingestion_service: IngestionService) -> "IngestionWorker":
+        """INGEST_WORKER_BATCH_SIZE, INGEST_WORKER_CONCURRENCY, INGEST_LEASE_SECONDS, INGEST_POLL_INTERVAL."""
+        return cls(db, ingestion_service, **worker_env())
+
+    def stop(self):
+        """Stop leasing; batches in flight finish (used by signal handlers)."""
+        self._stopping.set()
+        self._wakeup.set()
+
+    def drain(self):
+        """Keep going until no jobs are ready, then return from run() (producer finished)."""
+        self._draining = True
+        self._wakeup.set()
+
+    def wake(self):
+        """Jobs were enqueued: poll now instead of after the idle interval."""
+        self._wakeup.set()
+
+    async def run(self, drain: bool = False, listen: bool = False) -> WorkerStats:
+        """
+        Process batches until stop() is called, or with drain=True (or after drain())
+        until the queue has no ready jobs (cron-style runs). With listen=True the worker
+        wakes on enqueue notifications instead of waiting out poll_interval.
+        """
+        self._draining = self._draining or drain
+        if listen:
+            await self.db.listen_ingestion_jobs(self.wake)
+        print(f"👷 Ingest worker {self.worker_id} started (batch {self.batch_size} x {self.concurrency})")
+        in_flight: set = set()
+        try:
+            while not self._stopping.is_set():
+                if len(in_flight) >= self.concurrency:
+                    in_flight = await self._wait_any(in_flight)
+                    continue
+
+                jobs = await self.db.lease_ingestion_jobs(self.worker_id, self.batch_size, self.lease_seconds)
+                if jobs:
+                    in_flight.add(asyncio.create_task(self.process_batch(jobs)))
+                    continue
+
+                if in_flight:
+                    # Queue empty for now: wait for a running batch (its retries may become ready)
+                    in_flight = await self._wait_any(in_flight)
+                    continue
+                if self._draining:
+                    break
+                await self._idle()
+        finally:
+            if in_flight:
+                finished, _ = await asyncio.wait(in_flight)
+                self._log_failed_batches(finished)
+        print(f"👷 Ingest worker {self.worker_id} stopped: {self.stats.as_dict()}")
+        return self.stats
+
+    async def _wait_any(self, in_flight: set) -> set:
+        finished, pending = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        self._log_failed_batches(finished)
+        return pending
+
+    def _log_failed_batches(self, finished: set):
+        # process_batch only raises when settling failed: its jobs stay leased until the lease expires
+        for task in finished:
+            if not task.cancelled() and task.exception() is not None:
+                logger.error(f"Worker {self.worker_id} could not settle a batch: {task.exception()!r}", exc_info=task.exception())
+
+    async def process_batch(self, jobs: List[Dict[str, Any]]) -> None:
+        """Ingest one leased batch and settle every job (done, retry or dead)."""
+        job_ids = [job["id"] for job in jobs]
+        jobs_by_scrape = {str(job["scrape_id"]): job for job in jobs}
+        self._record_queue_wait(jobs)
+        started = time.monotonic()
+        heartbeat = asyncio.create_task(self._heartbeat(job_ids))
+        try:
+            result = await self.ingestion_service.process_raw_scrapes(list(jobs_by_scrape))
+        except Exception as e:
+            logger.error(f"Ingest batch of {len(jobs)} failed: {e}")
+            await self._settle([], {job["id"]: f"Batch failed: {e}" for job in jobs})
+            return
+        finally:
+            heartbeat.cancel()
+
+        elapsed = time.monotonic() - started
+        self.stats.batches += 1
+        self.stats.batch_total += elapsed
+        self.stats.batch_max = max(self.stats.batch_max, elapsed)
+        self.stats.chunks += result.chunks
+        errors = {jobs_by_scrape[scrape_id]["id"]: error for scrape_id, error in result.failed.items() if scrape_id in jobs_by_scrape}
+        # Skipped scrapes (not found, no text) will not improve on retry
+        done = [job["id"] for scrape_id, job in jobs_by_scrape.items() if job["id"] not in errors]
+        await self._settle(done, errors)
+
+    async def _settle(self, done: List[int], errors: Dict[int, str]):
+        self.stats.completed += await self.db.complete_ingestion_jobs(done, self.worker_id)
+        statuses = await self.db.fail_ingestion_jobs(errors, self.worker_id, self.retry_base_seconds, self.retry_max_seconds)
+        for job_id, status in statuses.items():
+            if status == "dead":
+                self.stats.dead += 1
+                print(f"💀 Ingestion job {job_id} is dead after max attempts: {errors.get(job_id)}")
+            else:
+                self.stats.retried += 1
+
+    def _record_queue_wait(self, jobs: List[Dict[str, Any]]):
+        now = datetime.now(timezone.utc)
+        for job in jobs:
+            created_at = job.get("created_at")
+            if created_at is None:
+                continue
+            wait = max(0.0, (now - created_at).total_seconds())
+            self.stats.leased += 1
+            self.stats.queue_wait_total += wait
+            self.stats.queue_wait_max = max(self.stats.queue_wait_max, wait)
+
+    async def _heartbeat(self, job_ids: List[int]):
+        interval = max(1.0, self.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                extended = await self.db.extend_ingestion_leases(job_ids, self.worker_id, self.lease_seconds)
+            except Exception as e:
+                # Transient DB errors: keep beating, the lease outlives a few missed extensions
+                logger.error(f"Worker {self.worker_id} failed to extend {len(job_ids)} leases: {e}")
+                continue
+            if extended < len(job_ids):
+                logger.warning(f"Worker {self.worker_id} lost {len(job_ids) - extended} of {len(job_ids)} leases")
+
+    async def _idle(self):
+        # Jitter keeps a fleet of idle workers from polling in lockstep
+        delay = self.poll_interval * random.uniform(0.5, 1.5)
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+
+class IngestionWorkerThread:
+    """
+    An IngestionWorker on its own thread, event loop and connection pool.
+
+    asyncpg pools belong to the loop that created them, so the thread builds its own
+    db (db_factory) and ingestion service (service_factory(db) -> (service, embedding_cache)).
+    Call finish() once the producer is done: the worker drains the ready jobs and the
+    thread exits.
+    """
+
+    def __init__(
+        self,
+        db_factory: Callable[[], Any],
+        service_factory: Callable[[Any], Tuple[IngestionService, Any]],
+        **worker_kwargs,
+    ):
+        self.db_factory = db_factory
+        self.service_factory = service_factory
+        self.worker_kwargs = worker_kwargs
+        self.worker: Optional[IngestionWorker] = None
+        self.cache_stats: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ingest-worker", daemon=True)
+
+    def start(self) -> "IngestionWorkerThread":
+        self._thread.start()
+        self._ready.wait()
+        if self.error:
+            raise RuntimeError(f"Ingest worker thread failed to start: {self.error}") from self.error
+        return self
+
+    def finish(self, timeout: Optional[float] = None) -> WorkerStats:
+        """Drain the ready jobs, wait for the thread and return the worker's stats."""
+        if self._loop and self.worker and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self.worker.drain)
+        self._thread.join(timeout)
+        if self.error:
+            raise RuntimeError(f"Ingest worker thread failed: {self.error}") from self.error
+        return self.worker.stats
+
+    def _run(self):
+        try:
+            asyncio.run(self._main())
+        except BaseException as e:
+            self.error = e
+        finally:
+            self._ready.set()
+
+    async def _main(self):
+        db = self.db_factory()
+        await db.connect()
+        try:
+            service, embedding_cache = self.service_factory(db)
+            self.worker = IngestionWorker(db, service, **self.worker_kwargs)
+            self._loop = asyncio.get_running_loop()
+            self._ready.set()
+            await self.worker.run(listen=True)
+            if embedding_cache:
+                pruned = await embedding_cache.prune()
+                self.cache_stats = {**embedding_cache.stats(), "pruned": pruned}
+        finally:
+            await db.close()
@@ -7,6 +7,7 @@ from typing import List, Dict, Any
 import re
 from pydantic import BaseModel, ValidationError
 from schemas.analysis import LegislationAnalysisResponse, ReviewCritique
+from services.provider_gateway import gate_llm
 from datetime import datetime
 
 class AnalysisPipeline:
@@ -36,11 +37,12 @@ class AnalysisPipeline:
             db_client: Database client
             fallback_client: Optional fallback/embedding provider (e.g. OpenRouter)
         """
-        self.llm = llm_client
+        # Provider calls go through shared adaptive concurrency/rate limits
+        self.llm = gate_llm(llm_client)
         self.search = search_client
         self.db = db_client
-        self.fallback_llm = fallback_client
-        self.research_agent = ResearchAgent(llm_client, search_client)
+        self.fallback_llm = gate_llm(fallback_client)
+        self.research_agent = ResearchAgent(self.llm, search_client)
     
     async def run(
         self,
@@ -0,0 +1,403 @@
+"""
+Adaptive concurrency and rate limiting for LLM, embedding and search providers.
+
+Every outbound provider call goes through a ProviderGateway, one per provider and
+call kind (e.g. "openrouter.embeddings", "zai.chat"), shared process-wide:
+
+- AIMD concurrency: the in-flight limit grows by one per window of successful
+  calls and is halved on 429/503, timeouts or (optionally) latency spikes, so
+  callers converge on the highest rate the provider sustains.
+- Token bucket: an optional requests-per-second ceiling with burst.
+- Retry-After: a throttled call pauses the whole gateway for the advertised
+  time instead of every caller retrying at once; other transient errors retry
+  with jittered exponential backoff.
+
+Settings come from PROVIDER_<NAME>_<SETTING> env vars (NAME is the gateway name
+upper-cased with "." as "_"), e.g. PROVIDER_ZAI_CHAT_MAX_CONCURRENCY=8.
+"""
+
+from __future__ import annotations
+import asyncio
+import email.utils
+import logging
+import os
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Optional imports - gracefully handle missing dependencies
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# Provider is overloaded or rate limiting us: back off concurrency
+THROTTLE_STATUSES = frozenset({429, 503})
+# Worth retrying after a delay
+RETRY_STATUSES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+_TRANSIENT_ERRORS: tuple = (asyncio.TimeoutError, TimeoutError, ConnectionError)
+if HTTPX_AVAILABLE:
+    _TRANSIENT_ERRORS += (httpx.TransportError,)
+
+
+@dataclass
+class GatewayConfig:
+    initial_concurrency: int = 4
+    min_concurrency: int = 1
+    max_concurrency: int = 16
+    # Requests per second (0 = no rate limit) and bucket size
+    rate: float = 0.0
+    burst: int = 0
+    max_retries: int = 3
+    retry_base_seconds: float = 1.0
+    retry_max_seconds: float = 30.0
+    # Retry-After longer than this is not waited for; the error is raised instead
+    max_retry_after_seconds: float = 120.0
+    # Latency above tolerance x running average counts as congestion (0 = disabled)
+    latency_tolerance: float = 0.0
+
+    @classmethod
+    def from_env(cls, name: str, **defaults) -> "GatewayConfig":
+        """Defaults overridden by PROVIDER_<NAME>_<FIELD> env vars."""
+        config = cls(**defaults)
+        prefix = "PROVIDER_" + name.upper().replace(".", "_").replace("-", "_") + "_"
+        for f in fields(cls):
+            raw = os.getenv(prefix + f.name.upper())
+            if raw:
+                setattr(config, f.name, type(getattr(config, f.name))(raw))
+        return config
+
+
+class TokenBucket:
+    """Reservation-based token bucket: callers queue in arrival order instead of polling."""
+
+    def __init__(self, rate: float, burst: int = 0):
+        self.rate = rate
+        self.capacity = float(max(1, burst or round(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self, cost: float = 1.0):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        # Tokens may go negative: the deficit is this caller's wait, later callers wait behind it
+        self._tokens -= min(cost, self.capacity)
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+class AIMDLimiter:
+    """Concurrency limit with additive increase / multiplicative decrease."""
+
+    def __init__(self, initial: int = 4, minimum: int = 1, maximum: int = 16,
+                 backoff: float = 0.5, latency_tolerance: float = 0.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.latency_avg: Optional[float] = None
+        self._samples = 0
+        self._last_decrease = float("-inf")
+        self._waiters: deque = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self):
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot just as we were cancelled: hand it on
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self, latency: float):
+        if (self.latency_tolerance and self._samples >= 20
+                and latency > self.latency_tolerance * self.latency_avg):
+            self.on_congestion()
+        else:
+            # +1 per window of `limit` successful calls
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._wake()
+        self._samples += 1
+        self.latency_avg = latency if self.latency_avg is None else 0.9 * self.latency_avg + 0.1 * latency
+
+    def on_congestion(self):
+        # Calls already in flight when the provider pushed back fail together; count them once
+        now = time.monotonic()
+        if now - self._last_decrease >= max(1.0, self.latency_avg or 0.0):
+            self.limit = max(self.minimum, self.limit * self.backoff)
+            self._last_decrease = now
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+
+class ProviderGateway:
+    """Runs provider calls under one provider's concurrency limit, rate limit and retry policy."""
+
+    def __init__(self, name: str, config: Optional[GatewayConfig] = None):
+        self.name = name
+        self.config = config or GatewayConfig()
+        self.limiter = AIMDLimiter(
+            self.config.initial_concurrency,
+            self.config.min_concurrency,
+            self.config.max_concurrency,
+            latency_tolerance=self.config.latency_tolerance,
+        )
+        self.bucket = TokenBucket(self.config.rate, self.config.burst) if self.config.rate > 0 else None
+        self._paused_until = 0.0
+        self.calls = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.throttled = 0
+        self.retries = 0
+        self.queued = 0
+        self.max_queued = 0
+        self._admitted = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def call(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await fn(*args, **kwargs) once a slot is free, retrying transient provider errors."""
+        self.calls += 1
+        attempt = 0
+        while True:
+            await self._admit()
+            started = time.monotonic()
+            try:
+                result = await fn(*args, **kwargs)
+            except asyncio.CancelledError:
+                self.limiter.release()
+                raise
+            except Exception as e:
+                self.limiter.release()
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    self.failed += 1
+                    raise
+                attempt += 1
+                self.retries += 1
+                logger.warning(f"{self.name}: retry {attempt}/{self.config.max_retries} in {delay:.1f}s after {type(e).__name__}: {e}")
+                await asyncio.sleep(delay)
+                continue
+            self.limiter.release()
+            self.limiter.on_success(time.monotonic() - started)
+            self.succeeded += 1
+            return result
+
+    async def _admit(self):
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        queued_at = time.monotonic()
+        try:
+            pause = self._paused_until - queued_at
+            if pause > 0:
+                # Spread resumption so paused callers do not hit the provider in the same instant
+                await asyncio.sleep(pause * random.uniform(1.0, 1.2))
+            if self.bucket:
+                await self.bucket.acquire()
+            await self.limiter.acquire()
+        finally:
+            self.queued -= 1
+        waited = time.monotonic() - queued_at
+        self._admitted += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+
+    def _on_error(self, error: Exception, attempt: int) -> Optional[float]:
+        """Adjust limits for error; return the retry delay, or None to give up."""
+        status = status_code(error)
+        throttled = status in THROTTLE_STATUSES or "ratelimit" in type(error).__name__.lower()
+        transient = throttled or status in RETRY_STATUSES or isinstance(error, _TRANSIENT_ERRORS)
+        if throttled or isinstance(error, _TRANSIENT_ERRORS):
+            self.limiter.on_congestion()
+        if throttled:
+            self.throttled += 1
+        if not transient or attempt >= self.config.max_retries:
+            return None
+
+        wait = retry_after(error) if throttled else None
+        if wait is not None:
+            if wait > self.config.max_retry_after_seconds:
+                return None
+            self._paused_until = max(self._paused_until, time.monotonic() + wait)
+            return 0.0
+        # Full jitter: waiting callers spread out instead of retrying in lockstep
+        return random.uniform(0, min(self.config.retry_max_seconds, self.config.retry_base_seconds * 2 ** attempt))
+
+    def stats(self) -> Dict[str, Any]:
+        admitted = self._admitted
+        return {
+            "name": self.name,
+            "limit": round(self.limiter.limit, 2),
+            "in_flight": self.limiter.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "calls": self.calls,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "avg_wait_ms": round(self._wait_total / admitted * 1000, 1) if admitted else 0.0,
+            "max_wait_ms": round(self._wait_max * 1000, 1),
+            "avg_latency_ms": round(self.limiter.latency_avg * 1000, 1) if self.limiter.latency_avg is not None else None,
+            "paused_s": round(max(0.0, self._paused_until - time.monotonic()), 1),
+        }
+
+
+# -- error inspection ----------------------------------------------------------------------
+
+
+def status_code(error: Exception) -> Optional[int]:
+    """HTTP status of an openai/httpx/llm-common error, if it carries one."""
+    for source in (error, getattr(error, "response", None)):
+        for attr in ("status_code", "status"):
+            code = getattr(source, attr, None)
+            if isinstance(code, int):
+                return code
+    return None
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Seconds from the Retry-After (or retry-after-ms) header of error's response."""
+    headers = getattr(getattr(error, "response", None), "headers", None) or getattr(error, "headers", None)
+    if not headers or not hasattr(headers, "get"):
+        return None
+    millis = headers.get("retry-after-ms")
+    if isinstance(millis, str):
+        try:
+            return max(0.0, float(millis) / 1000)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if not isinstance(value, str):
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+# -- registry and client wrappers -----------------------------------------------------------
+
+# Defaults per call kind; chat latency depends on output length, so spikes are not congestion
+KIND_DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "chat": {"initial_concurrency": 4, "max_concurrency": 16},
+    "embeddings": {"initial_concurrency": 4, "max_concurrency": 32, "latency_tolerance": 3.0},
+    "search": {"initial_concurrency": 2, "max_concurrency": 8, "latency_tolerance": 3.0},
+}
+
+_gateways: Dict[str, ProviderGateway] = {}
+
+
+def get_gateway(provider: str, kind: str = "chat") -> ProviderGateway:
+    """The process-wide gateway for provider calls of one kind."""
+    name = f"{provider}.{kind}"
+    gateway = _gateways.get(name)
+    if gateway is None:
+        gateway = _gateways[name] = ProviderGateway(name, GatewayConfig.from_env(name, **KIND_DEFAULTS.get(kind, {})))
+    return gateway
+
+
+def gateway_stats() -> List[Dict[str, Any]]:
+    return [gateway.stats() for gateway in _gateways.values()]
+
+
+def reset_gateways():
+    """Drop all gateways (tests, or after the event loop they ran on is closed)."""
+    _gateways.clear()
+
+
+def provider_name(client: Any) -> str:
+    """Best-effort provider of an LLM or embedding client (config.provider, base URL, class name)."""
+    config = getattr(client, "config", None)
+    for value in (getattr(client, "provider", None), getattr(config, "provider", None)):
+        if isinstance(value, str) and value:
+            return value.lower()
+    base_url = getattr(client, "base_url", None) or getattr(config, "base_url", None)
+    hints = [str(base_url)] if isinstance(base_url, str) else []
+    hints.append(type(client).__name__)
+    for hint in hints:
+        hint = hint.lower()
+        for key, name in (("openrouter", "openrouter"), ("z.ai", "zai"), ("zai", "zai"), ("openai", "openai")):
+            if key in hint:
+                return name
+    return "default"
+
+
+class GatedEmbeddingService:
+    """EmbeddingService whose calls go through a ProviderGateway."""
+
+    def __init__(self, service: Any, gateway: ProviderGateway):
+        self.service = service
+        self.gateway = gateway
+
+    async def embed_query(self, text: str) -> List[float]:
+        return await self.gateway.call(self.service.embed_query, text)
+
+    async def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return await self.gateway.call(self.service.embed_documents, texts)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.service, name)
+
+
+class GatedLLMClient:
+    """LLMClient whose completions go through a ProviderGateway; other attributes pass through."""
+
+    def __init__(self, client: Any, gateway: ProviderGateway):
+        self.client = client
+        self.gateway = gateway
+
+    async def chat_completion(self, *args, **kwargs) -> Any:
+        return await self.gateway.call(self.client.chat_completion, *args, **kwargs)
+
+    async def chat(self, *args, **kwargs) -> Any:
+        return await self.gateway.call(self.client.chat, *args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+
+def gate_embeddings(service: Any, provider: Optional[str] = None) -> Any:
+    """Wrap an embedding service in its provider's gateway (None and gated services pass through)."""
+    if service is None or isinstance(service, GatedEmbeddingService):
+        return service
+    return GatedEmbeddingService(service, get_gateway(provider or provider_name(service), "embeddings"))
+
+
+def gate_llm(client: Any, provider: Optional[str] = None) -> Any:
+    """Wrap an LLM client in its provider's gateway (None and gated clients pass through)."""
+    if client is None or isinstance(client, GatedLLMClient):
+        return client
+    return GatedLLMClient(client, get_gateway(provider or provider_name(client), "chat"))
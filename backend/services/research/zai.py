@@ -5,6 +5,8 @@ import logging
 from typing import List, Dict, Optional
 from pydantic import BaseModel
 
+from services.provider_gateway import get_gateway
+
 logger = logging.getLogger(__name__)
 
 class SearchResult(BaseModel):
@@ -26,6 +28,8 @@ class ZaiResearchService:
         # MCP Endpoint for Web Search
         self.mcp_url = "https://api.z.ai/api/mcp/web_search_prime/mcp"
         self.tool_name = "search" # Default, will try to discover
+        # Shared concurrency/rate limits for the MCP endpoint (429s back off every caller)
+        self.gateway = get_gateway("zai", "search")
         
         if not self.api_key:
             logger.warning("ZAI_API_KEY not set. Research service will be mocked.")
@@ -42,17 +46,20 @@ class ZaiResearchService:
             "params": params or {}
         }
         
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                self.mcp_url,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json=payload
-            )
-            response.raise_for_status()
-            return response.json()
+        async def post() -> Dict:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.post(
+                    self.mcp_url,
+                    headers={
+                        "Authorization": f"Bearer {self.api_key}",
+                        "Content-Type": "application/json"
+                    },
+                    json=payload
+                )
+                response.raise_for_status()
+                return response.json()
+
+        return await self.gateway.call(post)
 
     async def check_health(self) -> bool:
         """Check if Z.ai MCP is accessible by listing tools."""
@@ -173,13 +180,9 @@ class ZaiResearchService:
         queries = await self._generate_search_queries(bill_text, bill_number)
         logger.info(f"Generated {len(queries)} search queries for {bill_number}")
 
-        all_results = []
-        # Serial execution for now to avoid complexity with MCP rate limits/async client sharing
-        # In prod, we'd use a semaphore
-        for query in queries[:5]: # Limit to 5 for testing speed
-            res = await self._execute_search(query)
-            all_results.extend(res)
-            await asyncio.sleep(0.2)
+        # Concurrent; the gateway paces calls to what the MCP endpoint sustains
+        batches = await asyncio.gather(*[self._execute_search(query) for query in queries[:5]]) # Limit to 5 for testing speed
+        all_results = [result for batch in batches for result in batch]
 
         unique_results = {r.url: r for r in all_results if r.url}.values()
         logger.info(f"Found {len(unique_results)} unique sources")
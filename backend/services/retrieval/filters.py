@@ -0,0 +1,81 @@
+"""
+Metadata filters for vector queries, compiled to SQL predicates over the chunk table.
+
+Supported keys (values may be a scalar or a list, lists match any):
+
+    jurisdiction    jurisdiction name (case-insensitive) or id; matches chunks of that
+                    jurisdiction's sources
+    source_id       metadata->>'source_id'
+    document_id     document_id column
+    content_type    metadata->>'content_type'
+    created_after   created_at >= value (datetime, date or ISO string)
+    created_before  created_at < value
+
+Any other key is matched by jsonb containment (metadata @> {key: value}).
+Every predicate is backed by an index from migrations/013_chunk_filter_indexes.sql.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+RANGE_KEYS = {"created_after": ">=", "created_before": "<"}
+
+
+def _values(value: Any) -> List[Any]:
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def _timestamp(value: Any) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day, tzinfo=timezone.utc)
+    raise ValueError(f"Expected a datetime, date or ISO string, got {value!r}")
+
+
+def compile_filter(filter: Optional[Dict[str, Any]], first_param: int = 1) -> Tuple[str, List[Any]]:
+    """
+    Translate a filter dict into a WHERE fragment and its parameters.
+
+    Args:
+        filter: Filter dict (None or empty matches everything)
+        first_param: Number of the first $n placeholder to use
+
+    Returns:
+        (sql, params); sql is "TRUE" for an empty filter
+    """
+    predicates: List[str] = []
+    params: List[Any] = []
+
+    def param(value: Any) -> str:
+        params.append(value)
+        return f"${first_param + len(params) - 1}"
+
+    for key, value in (filter or {}).items():
+        if value is None:
+            continue
+        if key == "jurisdiction":
+            names = [str(v) for v in _values(value)]
+            placeholder = param(names)
+            # Chunks carry their source, not their jurisdiction; resolve through sources
+            predicates.append(
+                f"metadata->>'source_id' = ANY(ARRAY("
+                f"SELECT s.id::text FROM sources s JOIN jurisdictions j ON j.id = s.jurisdiction_id "
+                f"WHERE lower(j.name) = ANY(SELECT lower(n) FROM unnest({placeholder}::text[]) n) "
+                f"OR j.id::text = ANY({placeholder}::text[])))"
+            )
+        elif key in ("source_id", "content_type"):
+            predicates.append(f"metadata->>'{key}' = ANY({param([str(v) for v in _values(value)])}::text[])")
+        elif key == "document_id":
+            predicates.append(f"document_id = ANY({param([str(v) for v in _values(value)])}::uuid[])")
+        elif key in RANGE_KEYS:
+            predicates.append(f"created_at {RANGE_KEYS[key]} {param(_timestamp(value))}")
+        else:
+            values = _values(value)
+            # jsonb params go through the connection codec (db/codecs.py), so dicts pass as-is
+            alternatives = [f"metadata @> {param({key: v})}::jsonb" for v in values]
+            predicates.append(alternatives[0] if len(alternatives) == 1 else f"({' OR '.join(alternatives)})")
+
+    return (" AND ".join(predicates) or "TRUE"), params
@@ -0,0 +1,75 @@
+"""Rank fusion and lexical query helpers for hybrid (full-text + vector) retrieval."""
+
+import re
+from typing import Dict, List, Sequence, Tuple
+
+from llm_common.retrieval import RetrievedChunk
+
+# Cormack et al.'s constant: damps the weight of the very top ranks so neither list dominates
+RRF_K = 60
+
+# Identifiers that must match as a token sequence: "AB 1234", "SB-9", "Int 1234-2025", "§ 26-3401"
+IDENTIFIER = re.compile(r"(?:\b[A-Z][A-Za-z]{0,4}\.?[\s-]?|§\s*)\d[\d.-]*\d|\b[A-Z][A-Za-z]{0,4}\.?[\s-]?\d\b")
+
+
+def lexical_query_text(text: str) -> str:
+    """
+    websearch_to_tsquery input for `text`: identifiers become quoted phrases, so
+    "AB 1234" requires "ab" immediately followed by "1234" instead of either token anywhere.
+    """
+    text = text.replace('"', " ")
+    return IDENTIFIER.sub(lambda match: f'"{match.group(0).lstrip("§").strip()}"', text)
+
+
+# A quoted phrase or a bare word, either optionally negated with a leading "-"
+_CLAUSE = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+
+
+def lexical_tsquery(text: str, config: str, first_param: int = 1) -> Tuple[str, List[str]]:
+    """
+    tsquery expression matching any plain term of `text`, plus every phrase and negation.
+
+    Each clause goes through its own websearch_to_tsquery and the results are combined
+    with the tsquery operators, so "-tenant eviction" stays !tenant AND evict instead of
+    the negation turning into an alternative. Phrases (identifiers, see lexical_query_text)
+    and negations are required; plain terms are OR-ed.
+
+    Returns:
+        (sql_expression, params) with params numbered from $first_param
+    """
+    optional: List[str] = []
+    required: List[str] = []
+    for match in _CLAUSE.finditer(lexical_query_text(text)):
+        if match.group(2) is not None:
+            required.append(f'{match.group(1)}"{match.group(2)}"')
+        elif match.group(3):
+            required.append(match.group(0))
+        else:
+            optional.append(match.group(4))
+    if not optional and not required:
+        optional.append(text)
+
+    params = optional + required
+    clauses = [f"websearch_to_tsquery('{config}', ${first_param + i})" for i in range(len(params))]
+    any_term = " || ".join(clauses[:len(optional)])
+    parts = ([f"({any_term})"] if optional else []) + clauses[len(optional):]
+    return " && ".join(parts), params
+
+
+def reciprocal_rank_fusion(rankings: Sequence[List[RetrievedChunk]], k: int, rrf_k: int = RRF_K) -> List[RetrievedChunk]:
+    """
+    Fuse ranked lists by reciprocal rank: score = sum(1 / (rrf_k + rank)) over the lists a chunk appears in.
+
+    Scores of the input lists (cosine similarity, ts_rank) are not comparable, so only ranks are used.
+    Returns the top k chunks with score set to the fused score.
+    """
+    fused: Dict[str, float] = {}
+    chunks: Dict[str, RetrievedChunk] = {}
+    for ranking in rankings:
+        for rank, chunk in enumerate(ranking, start=1):
+            key = chunk.chunk_id or chunk.content
+            fused[key] = fused.get(key, 0.0) + 1.0 / (rrf_k + rank)
+            chunks.setdefault(key, chunk)
+
+    top = sorted(fused, key=fused.get, reverse=True)[:k]
+    return [chunks[key].model_copy(update={"score": fused[key]}) for key in top]
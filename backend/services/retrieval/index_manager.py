@@ -0,0 +1,334 @@
+"""
+ANN index lifecycle for the pgvector chunk tables.
+
+Builds, rebuilds and inspects HNSW / IVFFlat indexes on the embedding column.
+Builds use CREATE INDEX CONCURRENTLY so ingestion keeps writing while the graph
+(or the IVF lists) is built; a rebuild builds the replacement under a temporary
+name, drops the old index concurrently and renames the new one into place.
+
+The operator class must match the operator LocalPgVectorBackend.query orders by,
+otherwise the planner ignores the index and falls back to a sequential scan.
+
+Quantized indexes are expression indexes over the full-precision column: halfvec
+(16-bit floats, half the size) or binary_quantize (1 bit per dimension, hamming
+distance), optionally over a Matryoshka prefix (the leading `dimensions` values).
+The column keeps full precision, so queries re-rank the quantized candidates exactly.
+"""
+
+import logging
+import math
+import os
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Client-side timeout for index builds, drops and renames. asyncpg maps timeout=None to the
+# pool's command_timeout (60s), which would cancel a concurrent build and leave an INVALID index.
+DEFAULT_BUILD_TIMEOUT = 24 * 3600.0
+
+# metric -> (distance operator, operator class, similarity expression over the distance)
+METRICS = {
+    "cosine": ("<=>", "vector_cosine_ops", "1 - ({distance})"),
+    "l2": ("<->", "vector_l2_ops", "-({distance})"),
+    # <#> is the negative inner product
+    "ip": ("<#>", "vector_ip_ops", "-({distance})"),
+}
+METHODS = ("hnsw", "ivfflat")
+
+# Upper bound pgvector accepts for hnsw.ef_search
+MAX_EF_SEARCH = 1000
+
+# quantization -> widest vector pgvector can index in that storage type
+QUANTIZATIONS = {"none": 2000, "halfvec": 4000, "binary": 64000}
+
+
+def search_operator(metric: str, quantization: str = "none") -> str:
+    """Distance operator of the ANN search (binary codes are compared by hamming distance)."""
+    return "<~>" if quantization == "binary" else METRICS[metric][0]
+
+
+def search_expression(source: str, metric: str, quantization: str = "none", dimensions: Optional[int] = None) -> str:
+    """
+    The indexed expression over `source` (the column, or $1 for the query vector).
+
+    Index and query must build the identical expression, or the index is not used.
+    """
+    if quantization == "none" and not dimensions:
+        return source
+    expression = source
+    if dimensions:
+        # Matryoshka: leading dimensions; renormalized unless cosine (scale-invariant)
+        expression = f"subvector({expression}, 1, {int(dimensions)})"
+        if metric != "cosine":
+            expression = f"l2_normalize({expression})"
+    if quantization == "binary":
+        return f"binary_quantize({expression})::bit({int(dimensions)})"
+    storage = "halfvec" if quantization == "halfvec" else "vector"
+    return f"({expression})::{storage}({int(dimensions)})"
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    """Index method, distance metric and build parameters."""
+
+    method: str = "hnsw"
+    metric: str = "cosine"
+    m: int = 16  # HNSW: graph degree; higher = better recall, bigger index
+    ef_construction: int = 64  # HNSW: build-time candidate list; higher = better graph, slower build
+    lists: Optional[int] = None  # IVFFlat: number of clusters (None = derived from the row count)
+    quantization: str = "none"  # none | halfvec | binary
+    dimensions: Optional[int] = None  # Matryoshka prefix length (None = all; quantized indexes fill it in)
+
+    def __post_init__(self):
+        if self.method not in METHODS:
+            raise ValueError(f"Unknown index method {self.method!r}, expected one of {METHODS}")
+        if self.metric not in METRICS:
+            raise ValueError(f"Unknown distance metric {self.metric!r}, expected one of {tuple(METRICS)}")
+        if self.quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization {self.quantization!r}, expected one of {tuple(QUANTIZATIONS)}")
+
+    @classmethod
+    def from_env(cls, **overrides) -> "IndexSpec":
+        """
+        VECTOR_INDEX_METHOD / _METRIC / _M / _EF_CONSTRUCTION / _LISTS, VECTOR_QUANTIZATION and
+        VECTOR_DIMENSIONS (shared with the vector backend); explicit overrides win.
+        """
+        lists = os.environ.get("VECTOR_INDEX_LISTS")
+        dimensions = os.environ.get("VECTOR_DIMENSIONS")
+        values = {
+            "method": os.environ.get("VECTOR_INDEX_METHOD", cls.method).lower(),
+            "metric": os.environ.get("VECTOR_INDEX_METRIC", cls.metric).lower(),
+            "m": int(os.environ.get("VECTOR_INDEX_M", cls.m)),
+            "ef_construction": int(os.environ.get("VECTOR_INDEX_EF_CONSTRUCTION", cls.ef_construction)),
+            "lists": int(lists) if lists else None,
+            "quantization": os.environ.get("VECTOR_QUANTIZATION", cls.quantization).lower(),
+            "dimensions": int(dimensions) if dimensions else None,
+        }
+        values.update({key: value for key, value in overrides.items() if value is not None})
+        return cls(**values)
+
+    @property
+    def opclass(self) -> str:
+        if self.quantization == "binary":
+            return "bit_hamming_ops"
+        if self.quantization == "halfvec":
+            return METRICS[self.metric][1].replace("vector_", "halfvec_")
+        return METRICS[self.metric][1]
+
+    def key(self, column: str) -> str:
+        """Index key: the column, or the parenthesized quantization expression over it."""
+        expression = search_expression(column, self.metric, self.quantization, self.dimensions)
+        return column if expression == column else f"({expression})"
+
+    def with_clause(self) -> str:
+        if self.method == "hnsw":
+            return f"WITH (m = {int(self.m)}, ef_construction = {int(self.ef_construction)})"
+        return f"WITH (lists = {int(self.lists)})"
+
+
+def default_lists(rows: int) -> int:
+    """pgvector's IVFFlat guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond."""
+    if rows <= 1_000_000:
+        return max(rows // 1000, 1)
+    return int(math.sqrt(rows))
+
+
+class VectorIndexManager:
+    """
+    Create, rebuild, drop and inspect the ANN index of a chunk table.
+
+    Concurrent builds cannot run inside a transaction, so every statement runs
+    on its own pooled connection in autocommit mode.
+    """
+
+    def __init__(
+        self,
+        postgres_client: Any,
+        table_name: str = "document_chunks",
+        column: str = "embedding",
+        build_timeout: Optional[float] = None,
+    ):
+        self.db = postgres_client
+        self.table_name = table_name
+        self.column = column
+        # Seconds; VECTOR_INDEX_BUILD_TIMEOUT, default 24h
+        self.build_timeout = build_timeout or float(os.environ.get("VECTOR_INDEX_BUILD_TIMEOUT") or DEFAULT_BUILD_TIMEOUT)
+
+    def index_name(self, spec: IndexSpec) -> str:
+        name = f"idx_{self.table_name}_{self.column}_{spec.method}_{spec.metric}"
+        if spec.quantization != "none":
+            name += f"_{spec.quantization}"
+        return name + (f"_{spec.dimensions}" if spec.dimensions else "")
+
+    async def status(self) -> Dict[str, Any]:
+        """ANN indexes on the column (definition, size, validity) plus the table's estimated row count."""
+        rows = await self.db._fetch(
+            """
+            SELECT i.relname AS name, am.amname AS method, ix.indisvalid AS valid,
+                   pg_get_indexdef(ix.indexrelid) AS definition,
+                   pg_relation_size(ix.indexrelid) AS size_bytes
+            FROM pg_index ix
+            JOIN pg_class i ON i.oid = ix.indexrelid
+            JOIN pg_am am ON am.oid = i.relam
+            WHERE ix.indrelid = $1::regclass AND am.amname = ANY($2::text[])
+              AND (ix.indkey[0] = (SELECT attnum FROM pg_attribute WHERE attrelid = $1::regclass AND attname = $3)
+                   -- expression (quantized) indexes over the column
+                   OR (ix.indkey[0] = 0 AND pg_get_expr(ix.indexprs, ix.indrelid) LIKE '%' || $3 || '%'))
+            ORDER BY i.relname
+            """,
+            self.table_name,
+            list(METHODS),
+            self.column,
+        )
+        return {
+            "table": self.table_name,
+            "column": self.column,
+            "rows": await self._estimated_rows(),
+            "dimensions": await self._dimensions(),
+            "indexes": [dict(row) for row in rows],
+        }
+
+    async def create(
+        self,
+        spec: IndexSpec,
+        name: Optional[str] = None,
+        maintenance_work_mem: Optional[str] = None,
+        parallel_workers: Optional[int] = None,
+    ) -> str:
+        """
+        Build the index concurrently (no-op if an index of that name already exists).
+
+        Args:
+            spec: Method, metric and build parameters; IVFFlat lists default to default_lists(rows).
+            name: Index name (defaults to index_name(spec)).
+            maintenance_work_mem: e.g. "2GB"; HNSW builds are much faster when the graph fits in memory.
+            parallel_workers: max_parallel_maintenance_workers for the build.
+
+        Returns:
+            The index name.
+        """
+        column_dimensions = await self._check_dimensions(spec)
+        if spec.quantization != "none" and not spec.dimensions:
+            # Casts to halfvec(n) / bit(n) need the width; the backend must use the same value
+            spec = replace(spec, dimensions=column_dimensions)
+        if spec.method == "ivfflat" and not spec.lists:
+            # IVFFlat clusters the rows present at build time: build it after loading the table
+            spec = replace(spec, lists=default_lists(await self._estimated_rows()))
+        name = name or self.index_name(spec)
+
+        async with self.db._acquire() as conn:
+            # A failed concurrent build leaves an INVALID index behind that IF NOT EXISTS would keep
+            if await self._is_invalid(conn, name):
+                logger.warning(f"Dropping invalid index {name} left by an interrupted build")
+                await self._drop_concurrently(conn, name)
+            # No server-side statement_timeout either: the build can take hours on a large table
+            await conn.execute("SET statement_timeout = 0")
+            if maintenance_work_mem:
+                await conn.execute(f"SET maintenance_work_mem = '{maintenance_work_mem}'")
+            if parallel_workers is not None:
+                await conn.execute(f"SET max_parallel_maintenance_workers = {int(parallel_workers)}")
+            try:
+                await conn.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} "
+                    f"ON {self.table_name} USING {spec.method} ({spec.key(self.column)} {spec.opclass}) {spec.with_clause()}",
+                    timeout=self.build_timeout,
+                )
+            except BaseException:
+                # Cancelled or failed builds keep an INVALID index that still slows every write
+                if await self._is_invalid(conn, name):
+                    logger.warning(f"Build of {name} failed; dropping the invalid index")
+                    await self._drop_concurrently(conn, name)
+                raise
+            finally:
+                await conn.execute("RESET ALL")
+            if await self._is_invalid(conn, name):
+                await self._drop_concurrently(conn, name)
+                raise RuntimeError(f"Concurrent build of {name} finished with an invalid index; dropped it")
+        logger.info(f"Built {spec.method} index {name} on {self.table_name}.{self.column} ({spec.opclass})")
+        return name
+
+    async def rebuild(self, spec: IndexSpec, **build_options) -> str:
+        """
+        Replace the column's ANN indexes with one built from `spec`, without blocking writes.
+
+        The new index is built next to the old ones, which keep serving queries
+        until it is valid; then the old ones are dropped concurrently and the new one renamed.
+        create() raises instead of returning an invalid index, so a failed build never gets swapped in.
+        """
+        name = self.index_name(spec)
+        building = f"{name}_new"
+        await self.create(spec, name=building, **build_options)
+
+        existing = [index["name"] for index in (await self.status())["indexes"] if index["name"] != building]
+        for old in existing:
+            await self.drop(old)
+        # The rename waits for an exclusive lock behind running queries
+        async with self.db._acquire() as conn:
+            await conn.execute(f"ALTER INDEX {building} RENAME TO {name}", timeout=self.build_timeout)
+        return name
+
+    async def drop(self, name: str) -> None:
+        async with self.db._acquire() as conn:
+            await self._drop_concurrently(conn, name)
+        logger.info(f"Dropped index {name}")
+
+    async def _drop_concurrently(self, conn: Any, name: str) -> None:
+        # Waits for every transaction using the index, so it gets the build timeout too
+        await conn.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}", timeout=self.build_timeout)
+
+    async def _is_invalid(self, conn: Any, name: str) -> bool:
+        valid = await conn.fetchval(
+            "SELECT ix.indisvalid FROM pg_index ix JOIN pg_class i ON i.oid = ix.indexrelid WHERE i.relname = $1",
+            name,
+        )
+        return valid is False
+
+    async def _estimated_rows(self) -> int:
+        rows = await self.db._fetch("SELECT reltuples::bigint AS rows FROM pg_class WHERE oid = $1::regclass", self.table_name)
+        return max(int(rows[0]["rows"]), 0) if rows else 0
+
+    async def _dimensions(self) -> Optional[int]:
+        """Declared dimensions of the vector column (None for an unsized `vector`)."""
+        rows = await self.db._fetch(
+            "SELECT atttypmod FROM pg_attribute WHERE attrelid = $1::regclass AND attname = $2",
+            self.table_name,
+            self.column,
+        )
+        typmod = rows[0]["atttypmod"] if rows else -1
+        return typmod if typmod > 0 else None
+
+    async def _check_dimensions(self, spec: IndexSpec) -> Optional[int]:
+        """Validate the indexed width against pgvector's limit for the storage type; returns the column width."""
+        column_dimensions = await self._dimensions()
+        dimensions = spec.dimensions or column_dimensions
+        if dimensions is None:
+            raise ValueError(
+                f"{self.table_name}.{self.column} has no declared dimensions; "
+                f"ALTER it to vector(n) or set the index dimensions before building an ANN index"
+            )
+        if column_dimensions and dimensions > column_dimensions:
+            raise ValueError(f"Cannot index {dimensions} dimensions of a vector({column_dimensions}) column")
+        limit = QUANTIZATIONS[spec.quantization]
+        if dimensions > limit:
+            raise ValueError(
+                f"{self.table_name}.{self.column} indexed at {dimensions} dimensions; pgvector indexes at most "
+                f"{limit} dimensions as {'vector' if spec.quantization == 'none' else spec.quantization} "
+                f"(use halfvec/binary quantization or a Matryoshka prefix)"
+            )
+        return column_dimensions
+
+
+def query_settings(k: int, ef_search: Optional[int] = None, probes: Optional[int] = None) -> List[str]:
+    """
+    SET LOCAL statements for the per-query recall/latency knobs.
+
+    hnsw.ef_search bounds how many rows an HNSW scan can return, so it is raised to at least k
+    (capped at MAX_EF_SEARCH).
+    """
+    statements = []
+    if ef_search:
+        statements.append(f"SET LOCAL hnsw.ef_search = {min(max(int(ef_search), k), MAX_EF_SEARCH)}")
+    if probes:
+        statements.append(f"SET LOCAL ivfflat.probes = {int(probes)}")
+    return statements
@@ -1,127 +1,487 @@
-
+import asyncio
 from typing import List, Dict, Any, Optional
-import json
 from llm_common.retrieval import RetrievalBackend, RetrievedChunk
+from services.retrieval.filters import compile_filter
+from services.retrieval.fusion import lexical_tsquery, reciprocal_rank_fusion
+from services.retrieval.index_manager import (
+    MAX_EF_SEARCH,
+    METRICS,
+    QUANTIZATIONS,
+    query_settings,
+    search_expression,
+    search_operator,
+)
+from services.retrieval.query_embedder import QueryEmbedder
+
+# Columns written by upsert, in COPY order.
+UPSERT_COLUMNS = ("id", "content", "embedding", "metadata", "document_id", "content_hash")
+DEFAULT_UPSERT_BATCH_SIZE = 1000
+# Filters matching at most this many rows are answered exactly (pre-filter) instead of
+# post-filtering ANN candidates
+DEFAULT_PREFILTER_ROWS = 10000
+# ANN candidates fetched per requested result when post-filtering (grows x4 on a short page)
+POSTFILTER_OVERFETCH = 10
+SEARCH_MODES = ("vector", "lexical", "hybrid")
+# Each hybrid leg ranks this many results per requested one before fusion
+HYBRID_CANDIDATES = 4
+# Text search configuration of the generated content_tsv column (migrations/014_chunk_fulltext.sql)
+LEXICAL_CONFIG = "english"
+# Quantized/truncated ANN candidates fetched per result for exact re-ranking
+DEFAULT_RERANK_FACTORS = {"none": 4, "halfvec": 4, "binary": 10}
+
 
 class LocalPgVectorBackend(RetrievalBackend):
     """
     Local implementation of PgVectorBackend using our PostgresDB client.
     Used when llm-common generic backend is unavailable.
     """
-    
-    def __init__(self, table_name: str = "document_chunks", postgres_client: Any = None):
+
+    def __init__(
+        self,
+        table_name: str = "document_chunks",
+        postgres_client: Any = None,
+        upsert_batch_size: int = DEFAULT_UPSERT_BATCH_SIZE,
+        metric: str = "cosine",
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        prefilter_rows: int = DEFAULT_PREFILTER_ROWS,
+        search_mode: str = "vector",
+        embedder: Optional[QueryEmbedder] = None,
+        quantization: str = "none",
+        dimensions: Optional[int] = None,
+        rerank_factor: Optional[int] = None,
+    ):
+        if metric not in METRICS:
+            raise ValueError(f"Unknown distance metric {metric!r}, expected one of {tuple(METRICS)}")
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode {search_mode!r}, expected one of {SEARCH_MODES}")
+        if quantization not in QUANTIZATIONS:
+            raise ValueError(f"Unknown quantization {quantization!r}, expected one of {tuple(QUANTIZATIONS)}")
+        if quantization != "none" and not dimensions:
+            raise ValueError("Quantized search needs dimensions (the width the index was built with)")
         self.table_name = table_name
         self.db = postgres_client
-        
+        self.upsert_batch_size = upsert_batch_size
+        # Must match the operator class of the table's ANN index (services/retrieval/index_manager.py)
+        self.metric = metric
+        # Default recall/latency knobs; None keeps the server setting (hnsw.ef_search=40, ivfflat.probes=1)
+        self.ef_search = ef_search
+        self.probes = probes
+        self.prefilter_rows = prefilter_rows
+        # Mode used when the caller passes query text without choosing one
+        self.search_mode = search_mode
+        # Embeds retrieve() queries (cached); without one retrieve() is full-text only
+        self.embedder = embedder
+        # ANN search over the quantized / Matryoshka-truncated index expression
+        # (services/retrieval/index_manager.py), re-ranked on the full-precision column
+        self.quantization = quantization
+        self.dimensions = dimensions
+        self.rerank_factor = rerank_factor or DEFAULT_RERANK_FACTORS[quantization]
+
     async def upsert(self, chunks: List[Dict[str, Any]]) -> bool:
         """
         Upsert chunks into Postgres using pgvector.
+
+        Thin wrapper over bulk_upsert() that keeps the RetrievalBackend contract.
         """
         if not chunks:
             return True
-            
+
         if not self.db:
             print("❌ LocalPgVectorBackend: No DB client provided")
             return False
-            
-        # Prepare data for insertion
-        # Schema expected: id, document_id, chunk_index, chunk_content, embedding, metadata
-        # But 'document_chunks' table schema might differ from 'chunks' dict keys.
-        # Chunks dict keys from IngestionService: 
-        # id, content, embedding, metadata, document_id, chunk_id, source, score
-        
-        # We need to map to table columns.
-        # Let's assume standard schema for now or inspect table.
-        # Standard schema usually: id, content, embedding, metadata
-        
+
         try:
-            for chunk in chunks:
-                # Naive loop insert for verification (slow but functional)
-                # Production should use COPY or batch insert
-                
-                query = f"""
-                INSERT INTO {self.table_name} 
-                (id, content, embedding, metadata, document_id)
-                VALUES ($1, $2, $3, $4, $5)
-                ON CONFLICT (id) DO UPDATE SET
-                    content = EXCLUDED.content,
-                    embedding = EXCLUDED.embedding,
-                    metadata = EXCLUDED.metadata;
-                """
-                
-                # Check formatting of embedding (list of floats -> string for pgvector?)
-                # asyncpg handles list[float] for vector type usually if adapter set up,
-                # OR we format as string "[1.0, 2.0, ...]"
-                embedding_val = str(chunk['embedding'])
-                
-                from uuid import UUID
-                def json_serial(obj):
-                    if isinstance(obj, UUID):
-                        return str(obj)
-                    raise TypeError(f"Type {type(obj)} not serializable")
-                
-                await self.db._execute(
-                    query,
-                    chunk['id'],
-                    chunk['content'],
-                    embedding_val,
-                    json.dumps(chunk['metadata'], default=json_serial), # JSONB + UUID fix
-                    chunk.get('document_id')
-                )
-                
+            await self.bulk_upsert(chunks)
             return True
-            
         except Exception as e:
             print(f"❌ LocalPgVectorBackend upsert failed: {e}")
             import traceback
             traceback.print_exc()
             return False
 
-    async def query(self, embedding: List[float], k: int = 5, filter: Optional[Dict] = None) -> List[RetrievedChunk]:
+    async def bulk_upsert(self, chunks: List[Dict[str, Any]], batch_size: Optional[int] = None) -> int:
+        """
+        Bulk upsert chunks via COPY into a temp staging table + one merge per batch.
+
+        Chunk dicts come from IngestionService (id, content, embedding, metadata, document_id, content_hash).
+        All batches run in a single transaction, so a failure leaves the table untouched.
+
+        Args:
+            chunks: Chunk dicts to write.
+            batch_size: Rows per COPY/merge round-trip (defaults to upsert_batch_size).
+
+        Returns:
+            Number of rows inserted or updated.
+        """
+        if not chunks:
+            return 0
         if not self.db:
+            raise ValueError("LocalPgVectorBackend: No DB client provided")
+
+        async with self.db._acquire() as conn:
+            async with conn.transaction():
+                return await self._copy_merge(conn, self._to_records(chunks), batch_size or self.upsert_batch_size)
+
+    async def chunk_hashes(self, document_ids: List[str]) -> Dict[str, Dict[str, Optional[bytes]]]:
+        """Stored chunk ids and content hashes per document: {document_id: {chunk_id: hash}}."""
+        stored: Dict[str, Dict[str, Optional[bytes]]] = {str(document_id): {} for document_id in document_ids}
+        if not document_ids:
+            return stored
+        rows = await self.db._fetch(
+            f"SELECT document_id, id, content_hash FROM {self.table_name} WHERE document_id = ANY($1::uuid[])",
+            [str(document_id) for document_id in document_ids],
+        )
+        for row in rows:
+            content_hash = row["content_hash"]
+            stored[str(row["document_id"])][str(row["id"])] = bytes(content_hash) if content_hash else None
+        return stored
+
+    async def sync_documents(
+        self, chunks: List[Dict[str, Any]], keep_ids: Dict[str, List[str]], batch_size: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Make each document in keep_ids consist of exactly the listed chunk ids.
+
+        Rows of those documents not in keep_ids are deleted and `chunks` (the new
+        rows) are written, in one transaction; kept rows are not rewritten.
+
+        Returns:
+            {"deleted": n, "written": m}
+        """
+        if not self.db:
+            raise ValueError("LocalPgVectorBackend: No DB client provided")
+        if not keep_ids:
+            return {"deleted": 0, "written": 0}
+
+        async with self.db._acquire() as conn:
+            async with conn.transaction():
+                status = await conn.execute(
+                    f"""
+                    DELETE FROM {self.table_name}
+                    WHERE document_id = ANY($1::uuid[]) AND NOT (id = ANY($2::uuid[]))
+                    """,
+                    list(keep_ids),
+                    [chunk_id for ids in keep_ids.values() for chunk_id in ids],
+                )
+                written = 0
+                if chunks:
+                    written = await self._copy_merge(
+                        conn, self._to_records(chunks), batch_size or self.upsert_batch_size
+                    )
+        return {"deleted": int(status.split()[-1]), "written": written}
+
+    async def _copy_merge(self, conn: Any, records: List[tuple], batch_size: int) -> int:
+        """COPY records into a temp staging table and merge them, batch_size rows at a time."""
+        staging = f"_stage_{self.table_name}"
+        columns = ", ".join(UPSERT_COLUMNS)
+        # COPY uses the binary protocol; vector and jsonb go through the
+        # connection codecs registered by PostgresDB (db/codecs.py).
+        merge_sql = f"""
+            INSERT INTO {self.table_name} ({columns})
+            SELECT {columns}
+            FROM {staging}
+            ON CONFLICT (id) DO UPDATE SET
+                content = EXCLUDED.content,
+                embedding = EXCLUDED.embedding,
+                metadata = EXCLUDED.metadata,
+                content_hash = EXCLUDED.content_hash
+        """
+
+        await conn.execute(
+            f"""
+            CREATE TEMP TABLE IF NOT EXISTS {staging} (
+                id uuid, content text, embedding vector, metadata jsonb, document_id uuid, content_hash bytea
+            ) ON COMMIT DROP
+            """
+        )
+        written = 0
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            await conn.copy_records_to_table(staging, records=batch, columns=list(UPSERT_COLUMNS))
+            status = await conn.execute(merge_sql)
+            written += int(status.split()[-1])
+            await conn.execute(f"TRUNCATE {staging}")
+        return written
+
+    @staticmethod
+    def _to_records(chunks: List[Dict[str, Any]]) -> List[tuple]:
+        """Map chunk dicts to COPY tuples, keeping the last occurrence of each id."""
+        # ON CONFLICT cannot touch the same row twice in one statement
+        by_id: Dict[str, tuple] = {}
+        for chunk in chunks:
+            chunk_id = str(chunk['id'])
+            document_id = chunk.get('document_id')
+            by_id[chunk_id] = (
+                chunk_id,
+                chunk['content'],
+                chunk['embedding'],
+                chunk.get('metadata') or {},
+                str(document_id) if document_id else None,
+                chunk.get('content_hash'),
+            )
+        return list(by_id.values())
+
+    async def query(
+        self,
+        embedding: Optional[List[float]],
+        k: int = 5,
+        filter: Optional[Dict] = None,
+        ef_search: Optional[int] = None,
+        probes: Optional[int] = None,
+        text: Optional[str] = None,
+        mode: Optional[str] = None,
+    ) -> List[RetrievedChunk]:
+        """
+        Nearest chunks to `embedding` by the backend's distance metric, optionally fused with
+        a full-text ranking of `text`.
+
+        Filters (services/retrieval/filters.py) are pushed into SQL. A filter matching
+        at most prefilter_rows rows is answered by an exact scan over those rows; a broader
+        one post-filters an over-fetched ANN candidate set, so both keep their top-k recall.
+
+        Args:
+            filter: e.g. {"jurisdiction": "San Jose", "content_type": "application/pdf"}
+            ef_search: HNSW candidate list size for this query (higher = better recall, slower).
+            probes: IVFFlat lists scanned for this query (higher = better recall, slower).
+            text: Query text for the lexical ranking (bill numbers, code sections, titles).
+            mode: vector | lexical | hybrid (reciprocal rank fusion of both rankings, run
+                concurrently). Defaults to search_mode when text is given, else vector.
+        """
+        if not self.db:
+            return []
+        mode = mode or (self.search_mode if text else "vector")
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search mode {mode!r}, expected one of {SEARCH_MODES}")
+        # Run whichever leg has an input
+        if not text:
+            mode = "vector"
+        elif embedding is None:
+            mode = "lexical"
+        if mode == "vector" and embedding is None:
             return []
             
         try:
-            # Basic pgvector KNN query
-            # Expecting embedding as string "[0.1, ...]" for asyncpg to cast to vector
-            embedding_val = str(embedding)
-            
-            query_sql = f"""
-            SELECT id, content, metadata, embedding, document_id, 
-                   1 - (embedding <=> $1) as similarity
-            FROM {self.table_name}
-            ORDER BY embedding <=> $1
-            LIMIT $2
-            """
-            
-            rows = await self.db._fetch(query_sql, embedding_val, k)
-            
-            results = []
-            for row in rows:
-                # Map back to RetrievedChunk
-                meta = row.get('metadata')
-                if isinstance(meta, str):
-                    meta = json.loads(meta)
-                
-                chunk = RetrievedChunk(
-                    chunk_id=str(row['id']) if row.get('id') else None,
-                    content=row['content'],
-                    embedding=None, # Optimize: don't return embedding unless needed
-                    metadata=meta or {},
-                    score=float(row['similarity']) if row.get('similarity') else 0.0,
-                    document_id=row.get('document_id'),
-                    source=meta.get('url') or meta.get('source_id') or "unknown"
-                )
-                results.append(chunk)
-                
-            return results
+            if mode == "vector":
+                return await self._vector_query(embedding, k, filter, ef_search, probes)
+            if mode == "lexical":
+                return await self._lexical_query(text, k, filter)
+
+            depth = k * HYBRID_CANDIDATES
+            vector, lexical = await asyncio.gather(
+                self._vector_query(embedding, depth, filter, ef_search, probes),
+                self._lexical_query(text, depth, filter),
+                return_exceptions=True,
+            )
+            if isinstance(vector, BaseException):
+                raise vector
+            if isinstance(lexical, BaseException):
+                # e.g. content_tsv missing (migration 014 not applied): degrade to vector-only
+                print(f"⚠️ LocalPgVectorBackend lexical leg failed, using vector ranking: {lexical}")
+                return vector[:k]
+            return reciprocal_rank_fusion([vector, lexical], k)
             
         except Exception as e:
             print(f"❌ LocalPgVectorBackend query failed: {e}")
             return []
 
-    async def retrieve(self, query: str, k: int = 5, filter: Optional[Dict] = None) -> List[RetrievedChunk]:
+    async def _vector_query(
+        self, embedding: List[float], k: int, filter: Optional[Dict], ef_search: Optional[int], probes: Optional[int],
+    ) -> List[RetrievedChunk]:
+        ef_search = ef_search if ef_search is not None else self.ef_search
+        probes = probes if probes is not None else self.probes
+        # $1 embedding, $2 k, filter params from $3
+        where, params = compile_filter(filter, first_param=3)
+
+        if where == "TRUE" and self.reranked:
+            # hnsw.ef_search bounds how many candidates the index scan can produce
+            candidates = min(k * self.rerank_factor, MAX_EF_SEARCH)
+            rows = await self._fetch_with(
+                query_settings(candidates, ef_search=ef_search or candidates, probes=probes),
+                self._nearest_sql(), embedding, k, candidates,
+            )
+        elif where == "TRUE":
+            rows = await self._fetch_with(
+                query_settings(k, ef_search=ef_search, probes=probes),
+                self._nearest_sql(), embedding, k,
+            )
+        elif await self._matches_at_most(where, params, self.prefilter_rows):
+            rows = await self._fetch_with([], self._prefiltered_sql(where), embedding, k, *params)
+        else:
+            rows = await self._postfiltered(embedding, k, where, params, ef_search, probes)
+        return [self._to_chunk(row) for row in rows]
+
+    async def _lexical_query(self, text: str, k: int, filter: Optional[Dict]) -> List[RetrievedChunk]:
+        """
+        Full-text ranking over the generated content_tsv column (GIN index).
+
+        Terms are OR-ed (a natural-language question rarely has every word in one chunk)
+        and ranked by ts_rank_cd with length normalization, Postgres' nearest built-in to BM25;
+        identifiers such as "AB 1234" and negated terms stay required clauses (lexical_tsquery).
+        """
+        # $1 k, tsquery terms from $2, then filter params
+        tsquery, terms = lexical_tsquery(text, LEXICAL_CONFIG, first_param=2)
+        where, params = compile_filter(filter, first_param=2 + len(terms))
+        sql = f"""
+            SELECT id, content, metadata, document_id, ts_rank_cd(content_tsv, q, 1 | 32) AS similarity
+            FROM {self.table_name}, CAST({tsquery} AS tsquery) q
+            WHERE content_tsv @@ q AND {where}
+            ORDER BY similarity DESC
+            LIMIT $1
+        """
+        rows = await self.db._fetch(sql, k, *terms, *params)
+        return [self._to_chunk(row) for row in rows]
+
+    @staticmethod
+    def _to_chunk(row: Any) -> RetrievedChunk:
+        # Map back to RetrievedChunk
+        meta = row.get('metadata') or {}
+        return RetrievedChunk(
+            chunk_id=str(row['id']) if row.get('id') else None,
+            content=row['content'],
+            embedding=None, # Optimize: don't return embedding unless needed
+            metadata=meta,
+            score=float(row['similarity']) if row.get('similarity') else 0.0,
+            document_id=row.get('document_id'),
+            source=meta.get('url') or meta.get('source_id') or "unknown"
+        )
+
+    @property
+    def reranked(self) -> bool:
+        """True when the ANN search runs on an approximation of the stored vectors."""
+        return self.quantization != "none" or bool(self.dimensions)
+
+    def _distance(self) -> str:
+        # Exact distance on the full-precision column (ranking, re-ranking and similarity)
+        return f"embedding {METRICS[self.metric][0]} $1"
+
+    def _search_distance(self) -> str:
+        # The ORDER BY operator and expression must match the index for the ANN index to be used
+        if not self.reranked:
+            return self._distance()
+        column = search_expression("embedding", self.metric, self.quantization, self.dimensions)
+        query = search_expression("$1::vector", self.metric, self.quantization, self.dimensions)
+        return f"{column} {search_operator(self.metric, self.quantization)} {query}"
+
+    def _select(self, distance: str) -> str:
+        similarity = METRICS[self.metric][2].format(distance=distance)
+        return f"SELECT id, content, metadata, document_id, {similarity} AS similarity"
+
+    def _nearest_sql(self) -> str:
+        # pgvector KNN query (embedding encoded by the binary vector codec)
+        distance = self._distance()
+        if not self.reranked:
+            return f"{self._select(distance)} FROM {self.table_name} ORDER BY {distance} LIMIT $2"
+        # $3 candidates from the quantized index, re-ranked by exact distance
+        return f"""
+            WITH candidates AS MATERIALIZED (
+                SELECT id, content, metadata, document_id, embedding
+                FROM {self.table_name} ORDER BY {self._search_distance()} LIMIT $3
+            )
+            {self._select(distance)} FROM candidates ORDER BY {distance} LIMIT $2
+        """
+
+    def _prefiltered_sql(self, where: str) -> str:
+        # MATERIALIZED keeps the planner from walking the ANN index and filtering its
+        # output (which can return fewer than k rows); the filter runs on its own indexes
+        distance = self._distance()
+        return f"""
+            WITH candidates AS MATERIALIZED (
+                SELECT id, content, metadata, document_id, embedding FROM {self.table_name} WHERE {where}
+            )
+            {self._select(distance)} FROM candidates ORDER BY {distance} LIMIT $2
+        """
+
+    def _postfiltered_sql(self, where: str, limit_param: int) -> str:
+        distance = self._distance()
+        return f"""
+            WITH nearest AS MATERIALIZED (
+                SELECT id, content, metadata, document_id, created_at, embedding
+                FROM {self.table_name} ORDER BY {self._search_distance()} LIMIT ${limit_param}
+            )
+            {self._select(distance)} FROM nearest WHERE {where} ORDER BY {distance} LIMIT $2
+        """
+
+    async def _postfiltered(
+        self, embedding: List[float], k: int, where: str, params: List[Any],
+        ef_search: Optional[int], probes: Optional[int],
+    ) -> List[Any]:
+        """ANN candidates filtered in SQL; widens the candidate set, then falls back to exact, on a short page."""
+        sql = self._postfiltered_sql(where, limit_param=3 + len(params))
+        candidates = k * POSTFILTER_OVERFETCH
+        while True:
+            # hnsw.ef_search bounds how many candidates the index scan can produce
+            settings = query_settings(candidates, ef_search=ef_search or candidates, probes=probes)
+            rows = await self._fetch_with(settings, sql, embedding, k, *params, candidates)
+            if len(rows) >= k:
+                return rows
+            if candidates >= MAX_EF_SEARCH:
+                return await self._fetch_with([], self._prefiltered_sql(where), embedding, k, *params)
+            candidates = min(candidates * 4, MAX_EF_SEARCH)
+
+    async def _matches_at_most(self, where: str, params: List[Any], limit: int) -> bool:
+        """Bounded count of filter matches: reads at most limit + 1 rows through the filter indexes."""
+        rows = await self.db._fetch(
+            f"SELECT count(*) AS n FROM (SELECT 1 FROM {self.table_name} WHERE {where} LIMIT {int(limit) + 1}) matched",
+            *params,
+        )
+        return rows[0]["n"] <= limit
+
+    async def _fetch_with(self, settings: List[str], sql: str, *args) -> List[Any]:
+        if not settings:
+            return await self.db._fetch(sql, *args)
+        # SET LOCAL scopes the knobs to this transaction (safe behind a transaction pooler)
+        async with self.db._acquire() as conn:
+            async with conn.transaction():
+                for statement in settings:
+                    await conn.execute(statement)
+                return await conn.fetch(sql, *args)
+
+    async def retrieve(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict] = None,
+        filters: Optional[Dict] = None,
+        mode: Optional[str] = None,
+    ) -> List[RetrievedChunk]:
         """
-        Abstract method from RetrievalBackend.
+        Text retrieval (RetrievalBackend contract; RetrieverTool passes `filters`).
+
+        The query is embedded through the backend's QueryEmbedder (cached per normalized
+        query text) and searched in `mode` (default search_mode). Without an embedder, or
+        when embedding fails, this answers from the full-text index.
         """
-        return []
+        embedding = await self._embed_query(query) if mode != "lexical" else None
+        return await self.query(embedding, k=k, filter=filter or filters, text=query, mode=mode)
+
+    async def retrieve_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filter: Optional[Dict] = None,
+        filters: Optional[Dict] = None,
+        mode: Optional[str] = None,
+    ) -> List[List[RetrievedChunk]]:
+        """retrieve() for several queries: one batched embedding call, searches run concurrently."""
+        if not queries:
+            return []
+        embeddings: List[Optional[List[float]]] = [None] * len(queries)
+        if self.embedder and mode != "lexical":
+            try:
+                embeddings = await self.embedder.embed_many(queries)
+            except Exception as e:
+                print(f"⚠️ LocalPgVectorBackend query embedding failed, using full-text search: {e}")
+        return list(await asyncio.gather(*[
+            self.query(embedding, k=k, filter=filter or filters, text=query, mode=mode)
+            for query, embedding in zip(queries, embeddings)
+        ]))
+
+    async def _embed_query(self, query: str) -> Optional[List[float]]:
+        if not self.embedder:
+            return None
+        try:
+            return await self.embedder.embed(query)
+        except Exception as e:
+            print(f"⚠️ LocalPgVectorBackend query embedding failed, using full-text search: {e}")
+            return None
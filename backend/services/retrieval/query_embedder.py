@@ -0,0 +1,120 @@
+"""
+Query embedding with an in-process TTL + LRU cache.
+
+Chat and agent traffic repeats queries ("rent control San Jose", bill lookups), so
+query vectors are cached by (model, normalized query text) in db/cache.py's
+IdentityCache. Concurrent requests for the same uncached query share one provider
+call, and batches send only their distinct misses in a single embed_documents call.
+"""
+
+import asyncio
+import os
+import re
+import unicodedata
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import numpy as np
+
+from db.cache import IdentityCache, MISSING
+
+EmbedQueryFn = Callable[[str], Awaitable[List[float]]]
+EmbedManyFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """Cache key text: NFC, whitespace collapsed, case-folded."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip().casefold()
+
+
+class QueryEmbedder:
+    def __init__(
+        self,
+        embed_fn: EmbedQueryFn,
+        embed_many_fn: Optional[EmbedManyFn] = None,
+        model: str = "default",
+        cache_size: int = 1024,
+        cache_ttl: float = 3600.0,
+    ):
+        """
+        Args:
+            embed_fn: Embeds one query (e.g. EmbeddingService.embed_query)
+            embed_many_fn: Embeds a batch in one provider call (e.g. embed_documents);
+                without it batches fan out over embed_fn
+            model: Part of the cache key, so a model change never serves stale vectors
+        """
+        self.embed_fn = embed_fn
+        self.embed_many_fn = embed_many_fn
+        self.model = model
+        # float32 arrays: 16KB per 4096-dim entry instead of ~100KB as a list of floats
+        self.cache = IdentityCache(maxsize=cache_size, ttl=cache_ttl)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.provider_calls = 0
+
+    @classmethod
+    def from_env(cls, embed_fn: EmbedQueryFn, embed_many_fn: Optional[EmbedManyFn] = None, model: str = "default") -> "QueryEmbedder":
+        """QUERY_EMBEDDING_CACHE_SIZE / QUERY_EMBEDDING_CACHE_TTL (seconds); either set to 0 disables caching."""
+        return cls(
+            embed_fn,
+            embed_many_fn,
+            model=model,
+            cache_size=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024")),
+            cache_ttl=float(os.getenv("QUERY_EMBEDDING_CACHE_TTL", "3600")),
+        )
+
+    async def embed(self, text: str) -> List[float]:
+        key = normalize_query(text)
+        cached = self.cache.get((self.model, key))
+        if cached is not MISSING:
+            return cached.tolist()
+        task = self._inflight.get(key)
+        if task is None:
+            # The provider call runs in its own task: a cancelled caller (client disconnect)
+            # neither cancels it nor fails the other requests waiting on the same query
+            task = asyncio.ensure_future(self._embed_uncached(key, text))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[key] = task
+        return (await asyncio.shield(task)).tolist()
+
+    async def _embed_uncached(self, key: str, text: str) -> np.ndarray:
+        try:
+            self.provider_calls += 1
+            vector = np.asarray(await self.embed_fn(text), dtype=np.float32)
+            self.cache.set((self.model, key), vector)
+            return vector
+        finally:
+            del self._inflight[key]
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts in input order; distinct cache misses go to the provider in one batch."""
+        keys = [normalize_query(text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in found or key in pending:
+                continue
+            cached = self.cache.get((self.model, key))
+            if cached is MISSING:
+                pending[key] = text
+            else:
+                found[key] = cached
+
+        if pending:
+            batch = list(pending.values())
+            if self.embed_many_fn:
+                self.provider_calls += 1
+                vectors = await self.embed_many_fn(batch)
+            else:
+                self.provider_calls += len(batch)
+                vectors = await asyncio.gather(*[self.embed_fn(text) for text in batch])
+            if len(vectors) != len(batch):
+                raise ValueError(f"expected {len(batch)} embeddings, got {len(vectors)}")
+            for key, vector in zip(pending, vectors):
+                found[key] = np.asarray(vector, dtype=np.float32)
+                self.cache.set((self.model, key), found[key])
+
+        return [found[key].tolist() for key in keys]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"model": self.model, "provider_calls": self.provider_calls, **self.cache.stats()}
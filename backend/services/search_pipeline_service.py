@@ -7,6 +7,7 @@ from llm_common import WebSearchResult, LLMClient, LLMMessage, MessageRole
 
 from services.ingestion_service import IngestionService
 from services.discovery.search_discovery import SearchDiscoveryService
+from services.provider_gateway import gate_llm
 from llm_common.retrieval import RetrievalBackend
 
 logger = logging.getLogger(__name__)
@@ -36,7 +37,7 @@ class SearchPipelineService:
         self.discovery = discovery
         self.ingestion = ingestion
         self.retrieval = retrieval
-        self.llm = llm
+        self.llm = gate_llm(llm)
 
     async def search(self, query: str, limit_sources: int = 5) -> SearchResponse:
         """
@@ -97,15 +98,18 @@ class SearchPipelineService:
         
         logger.info("   ↳ Step 3: Retrieval...")
         
-        # Manually embed query since LocalPgVectorBackend doesn't have an internal embedder
-        # and standard RetrievalBackend.retrieve(str) expects the backend to handle it.
-        # For this verification setup, we control the flow.
+        # A LocalPgVectorBackend built with an embedding function embeds the query itself
+        # (RetrievalBackend.retrieve(str)); otherwise embed it manually and call query().
         try:
-            embedding = await self.llm.create_embedding(query)
-            # Call query() which handles vector similarity
-            # Check if retrieval has query method (LocalPgVectorBackend does)
-            if hasattr(self.retrieval, 'query'):
-                chunks = await self.retrieval.query(embedding, k=8)
+            if getattr(self.retrieval, 'embedder', None):
+                # Backend embeds (and caches) the query itself; hybrid ranking uses the text
+                chunks = await self.retrieval.retrieve(query, k=8)
+            elif hasattr(self.retrieval, 'query'):
+                embedding = await self.llm.create_embedding(query)
+                # Call query() which handles vector similarity
+                # Check if retrieval has query method (LocalPgVectorBackend does)
+                # Query text feeds the lexical leg of hybrid retrieval (bill numbers, code sections)
+                chunks = await self.retrieval.query(embedding, k=8, text=query)
             else:
                 chunks = await self.retrieval.retrieve(query, top_k=8)
         except Exception as e:
@@ -1,12 +1,13 @@
 """Service for managing sources."""
 
 from __future__ import annotations
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
+from uuid import UUID
 from pydantic import BaseModel
 from db.postgres_client import PostgresDB
 
 class SourceCreate(BaseModel):
-    jurisdiction_id: str
+    jurisdiction_id: UUID
     url: str
     type: str # 'meeting', 'legislation', etc.
     source_method: str = "scrape"
@@ -23,9 +24,21 @@ class SourceService:
     def __init__(self, db: PostgresDB):
         self.db = db
 
-    async def get_sources(self, jurisdiction_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """List sources, optionally filtered by jurisdiction."""
-        return await self.db.get_sources(jurisdiction_id)
+    async def get_sources(
+        self,
+        jurisdiction_id: Optional[UUID] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """List sources, optionally filtered by jurisdiction (keyset-paginated when limit is set)."""
+        return await self.db.get_sources(jurisdiction_id, limit=limit, cursor=cursor, fields=fields)
+
+    def stream_sources(
+        self, jurisdiction_id: Optional[UUID] = None, cursor: Optional[str] = None, fields: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream every matching source without loading them all into memory."""
+        return self.db.stream_sources(jurisdiction_id, cursor=cursor, fields=fields)
 
     async def get_source(self, source_id: str) -> Optional[Dict[str, Any]]:
         """Get a single source by ID."""
@@ -3,6 +3,7 @@ S3/MinIO Storage Backend for Affordabot.
 Replaces Supabase Storage with S3-compatible MinIO.
 """
 
+import asyncio
 import os
 import logging
 from typing import Optional
@@ -159,6 +160,49 @@ class S3Storage:
             logger.error(f"Failed to download {path}: {e}")
             raise
     
+    async def upload_file(self, path: str, file_path: str, content_type: str = "application/octet-stream") -> str:
+        """
+        Upload a local file to S3 in parts, without reading it into memory.
+        
+        Args:
+            path: Path/key for the file in the bucket
+            file_path: Local file to upload
+            content_type: MIME type of the file
+            
+        Returns:
+            Path of uploaded file
+        """
+        if not self.client:
+            logger.error("MinIO client not initialized")
+            raise RuntimeError("MinIO client not initialized")
+        
+        try:
+            await asyncio.to_thread(self.client.fput_object, self.bucket, path, file_path, content_type=content_type)
+            logger.info(f"Uploaded: {path} (from {file_path})")
+            return path
+        except S3Error as e:
+            logger.error(f"Failed to upload {path}: {e}")
+            raise
+    
+    async def download_file(self, path: str, file_path: str) -> None:
+        """
+        Download file from S3 to a local path, streaming (large PDFs).
+        
+        Args:
+            path: Path/key for the file in the bucket
+            file_path: Local destination
+        """
+        if not self.client:
+            logger.error("MinIO client not initialized")
+            raise RuntimeError("MinIO client not initialized")
+        
+        try:
+            await asyncio.to_thread(self.client.fget_object, self.bucket, path, file_path)
+            logger.info(f"Downloaded: {path} -> {file_path}")
+        except S3Error as e:
+            logger.error(f"Failed to download {path}: {e}")
+            raise
+    
     async def get_url(self, path: str, expiry_seconds: int = 3600) -> str:
         """
         Get presigned URL for file access.
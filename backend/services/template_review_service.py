@@ -5,6 +5,7 @@ from typing import List, Dict, Any
 from db.postgres_client import PostgresDB
 from llm_common import LLMClient, WebSearchClient
 from services.auto_discovery_service import QUERY_TEMPLATES
+from services.provider_gateway import gate_llm
 
 class TemplateReviewService:
     def __init__(
@@ -14,7 +15,7 @@ class TemplateReviewService:
         web_search_client: WebSearchClient
     ):
         self.db = db_client
-        self.llm_client = llm_client
+        self.llm_client = gate_llm(llm_client)
         self.search_client = web_search_client
 
     async def review_templates(self, jurisdiction_type: str = "city") -> List[Dict[str, Any]]:
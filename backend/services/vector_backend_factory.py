@@ -1,5 +1,6 @@
 """Factory for creating vector retrieval backends."""
 
+import os
 from typing import Optional, Callable, Awaitable
 from llm_common.retrieval import RetrievalBackend
 
@@ -7,6 +8,8 @@ from llm_common.retrieval import RetrievalBackend
 def create_vector_backend(
     postgres_client=None, 
     embedding_fn: Optional[Callable[[str], Awaitable[list[float]]]] = None,
+    embed_many_fn: Optional[Callable[[list[str]], Awaitable[list[list[float]]]]] = None,
+    embedding_model: str = "default",
     **kwargs # Swallow legacy args
 ) -> RetrievalBackend:
     """
@@ -14,13 +17,16 @@ def create_vector_backend(
     
     Args:
         postgres_client: PostgresDB instance (required for LocalPgVector)
-        embedding_fn: Async function to generate embeddings
+        embedding_fn: Async function to generate embeddings (query embedding for retrieve())
+        embed_many_fn: Async batch embedding function (one provider call for retrieve_many())
+        embedding_model: Model name, part of the query embedding cache key
         
     Returns:
         RetrievalBackend instance
     """
     # V3: Use LocalPgVectorBackend to fix JSONB encoding issues and control logic
     from services.retrieval.local_pgvector import LocalPgVectorBackend
+    from services.retrieval.query_embedder import QueryEmbedder
     from db.postgres_client import PostgresDB
     
     if not postgres_client:
@@ -34,7 +40,25 @@ def create_vector_backend(
         except Exception:
              pass
 
+    ef_search = os.environ.get("VECTOR_EF_SEARCH")
+    probes = os.environ.get("VECTOR_IVFFLAT_PROBES")
+    dimensions = os.environ.get("VECTOR_DIMENSIONS")
+    rerank_factor = os.environ.get("VECTOR_RERANK_FACTOR")
     return LocalPgVectorBackend(
         table_name="documents",
-        postgres_client=postgres_client
+        postgres_client=postgres_client,
+        # Same metric the ANN index was built with (scripts/db-commands/vector_index.py)
+        metric=os.environ.get("VECTOR_INDEX_METRIC", "cosine").lower(),
+        ef_search=int(ef_search) if ef_search else None,
+        probes=int(probes) if probes else None,
+        # Filtered queries matching at most this many rows skip the ANN index (exact top-k)
+        prefilter_rows=int(os.environ.get("VECTOR_PREFILTER_ROWS", "10000")),
+        # Queries with text fuse full-text and vector rankings (bill numbers, code sections)
+        search_mode=os.environ.get("VECTOR_SEARCH_MODE", "hybrid").lower(),
+        # Repeated chat/agent queries reuse their embeddings (QUERY_EMBEDDING_CACHE_*)
+        embedder=QueryEmbedder.from_env(embedding_fn, embed_many_fn, embedding_model) if embedding_fn else None,
+        # ANN over a halfvec/binary (and/or Matryoshka-truncated) index, re-ranked at full precision
+        quantization=os.environ.get("VECTOR_QUANTIZATION", "none").lower(),
+        dimensions=int(dimensions) if dimensions else None,
+        rerank_factor=int(rerank_factor) if rerank_factor else None,
     )
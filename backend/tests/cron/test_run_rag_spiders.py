@@ -29,6 +29,8 @@ def test_main_runs_spiders(mock_get_settings, mock_crawler_process):
     mock_db_instance.update_admin_task = AsyncMock()
     mock_db_instance.log_scrape_history = AsyncMock()
     mock_db_instance._fetch = AsyncMock(return_value=[]) # Mock fetch for waiting processing loop
+    mock_db_instance.enqueue_unprocessed_scrapes = AsyncMock(return_value=0)
+    mock_db_instance.lease_ingestion_jobs = AsyncMock(return_value=[])
     
     # Mock runtime dependencies
     with patch.dict(sys.modules, {
@@ -40,7 +42,7 @@ def test_main_runs_spiders(mock_get_settings, mock_crawler_process):
         'services.vector_backend_factory': MagicMock(),
         'llm_common.embeddings.openai': MagicMock(),
         'llm_common.embeddings.mock': MagicMock(),
-    }):
+    }), patch.dict(os.environ, {'INGEST_STREAMING': 'false'}):
         main()
     
     # Verify Settings Loaded
@@ -55,3 +57,48 @@ def test_main_runs_spiders(mock_get_settings, mock_crawler_process):
     
     # Verify Start
     mock_process.start.assert_called_once()
+    mock_settings.set.assert_any_call('INGESTION_QUEUE_ENABLED', False)
+
+
+@patch('scripts.cron.run_rag_spiders.CrawlerProcess')
+@patch('scripts.cron.run_rag_spiders.get_project_settings')
+def test_streaming_ingestion_overlaps_crawl(mock_get_settings, mock_crawler_process):
+    """The ingest thread starts before the crawl and is drained after it."""
+    mock_settings = MagicMock()
+    mock_get_settings.return_value = mock_settings
+    events = []
+    mock_process = MagicMock()
+    mock_process.start.side_effect = lambda: events.append('crawl')
+    mock_crawler_process.return_value = mock_process
+
+    mock_db_module = MagicMock()
+    mock_db_instance = mock_db_module.PostgresDB.return_value
+    mock_db_instance.get_or_create_jurisdiction = AsyncMock(return_value="jur-123")
+    mock_db_instance.get_or_create_source = AsyncMock(return_value="source-123")
+    mock_db_instance.create_admin_task = AsyncMock(return_value="task-123")
+    mock_db_instance.update_admin_task = AsyncMock()
+    mock_db_instance.log_scrape_history = AsyncMock()
+    mock_db_instance.enqueue_unprocessed_scrapes = AsyncMock(return_value=0)
+
+    mock_worker_module = MagicMock()
+    thread = MagicMock(cache_stats=None)
+    thread.finish.side_effect = lambda: events.append('ingest-finish') or MagicMock(
+        chunks=3, as_dict=lambda: {"avg_queue_wait_s": 0.5, "max_queue_wait_s": 1.0, "avg_batch_s": 2.0, "max_batch_s": 3.0}
+    )
+    mock_worker_module.IngestionWorkerThread.return_value.start.side_effect = lambda: events.append('ingest-start') or thread
+
+    with patch.dict(sys.modules, {
+        'affordabot_scraper.spiders.sanjose_meetings': MagicMock(),
+        'affordabot_scraper.spiders.sanjose_municode': MagicMock(),
+        'db.postgres_client': mock_db_module,
+        'services.ingestion_worker': mock_worker_module,
+        'services.ingestion_factory': MagicMock(),
+        'llm_common.embeddings.openai': MagicMock(),
+    }), patch.dict(os.environ, {'INGEST_STREAMING': 'true'}):
+        main()
+
+    assert events == ['ingest-start', 'crawl', 'ingest-finish']
+    mock_settings.set.assert_any_call('INGESTION_QUEUE_ENABLED', True)
+    result = mock_db_instance.update_admin_task.call_args.kwargs['result']
+    assert result['timings']['streaming'] is True
+    assert result['timings']['avg_batch_s'] == 2.0
@@ -2,6 +2,7 @@ import pytest
 from unittest.mock import MagicMock, patch, AsyncMock
 import sys
 import os
+import hashlib
 
 # Add backend to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
@@ -18,6 +19,7 @@ async def test_harvester_flow():
     mock_db.update_admin_task = AsyncMock()
     mock_db.create_raw_scrape = AsyncMock(return_value="scrape_123")
     mock_db._fetch = AsyncMock()
+    mock_db.record_harvest = AsyncMock(return_value=True)
     
     # Mock Sources Response
     mock_sources = [
@@ -52,6 +54,8 @@ async def test_harvester_flow():
                 "choices": [{"message": {"content": "# Clean Markdown Content"}}]
             }
             mock_client_instance.post.return_value = mock_response
+            page = MagicMock(status_code=200, content=b"<html>rules</html>", headers={"etag": '"v1"'})
+            mock_client_instance.get.return_value = page
             
             # Run
             runner = UniversalHarvester()
@@ -78,3 +82,49 @@ async def test_harvester_flow():
             
             # 4. Check Ingestion Trigger
             instance.process_raw_scrape.assert_called_with("scrape_123")
+
+            # 5. Change-detection state stored for the next run, per-source latency reported
+            harvest = mock_db.record_harvest.call_args[0][1]
+            assert harvest["etag"] == '"v1"' and harvest["page_hash"]
+            result = mock_db.update_admin_task.call_args.kwargs["result"]
+            assert result["processed"] == 1
+            assert {"fetch_ms", "read_ms", "ingest_ms", "total_ms"} <= set(result["sources"][0])
+
+
+@pytest.mark.asyncio
+async def test_harvester_skips_read_for_unchanged_sources():
+    """304s and identical page hashes skip the Z.ai read; sources run concurrently."""
+    mock_db = MagicMock()
+    mock_db.create_admin_task = AsyncMock()
+    mock_db.update_admin_task = AsyncMock()
+    mock_db.create_raw_scrape = AsyncMock()
+    mock_db.record_harvest = AsyncMock(return_value=True)
+    mock_db._fetch = AsyncMock(return_value=[
+        {"id": "src_1", "name": "ETag", "scrape_url": "http://a.example", "metadata": {"harvest": {"etag": '"v1"'}}},
+        {"id": "src_2", "name": "Hash", "scrape_url": "http://b.example", "metadata": {"harvest": {"page_hash": hashlib.sha256(b"same").hexdigest()}}},
+    ])
+
+    async def get(url, headers=None, timeout=None):
+        if url == "http://a.example":
+            assert headers == {"If-None-Match": '"v1"'}
+            return MagicMock(status_code=304, headers={})
+        return MagicMock(status_code=200, content=b"same", headers={})
+
+    with patch('services.ingestion_service.IngestionService'), \
+         patch('services.vector_backend_factory.create_vector_backend'), \
+         patch.dict(sys.modules, {
+             'llm_common.embeddings.openai': MagicMock(),
+             'services.storage': MagicMock(),
+         }), patch('httpx.AsyncClient') as MockClient:
+        client = AsyncMock()
+        client.get.side_effect = get
+        MockClient.return_value.__aenter__.return_value = client
+
+        runner = UniversalHarvester(concurrency=2)
+        runner.db = mock_db
+        await runner.run()
+
+    client.post.assert_not_called()
+    mock_db.create_raw_scrape.assert_not_called()
+    result = mock_db.update_admin_task.call_args.kwargs["result"]
+    assert (result["unchanged"], result["processed"], result["failed"]) == (2, 0, 0)
@@ -0,0 +1,73 @@
+from db.cache import IdentityCache, MISSING
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_set_and_counters():
+    cache = IdentityCache(maxsize=4, ttl=60)
+    assert cache.get(("jurisdiction", "San Jose")) is MISSING
+    cache.set(("jurisdiction", "San Jose"), {"id": "j-1"})
+    assert cache.get(("jurisdiction", "San Jose")) == {"id": "j-1"}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_none_is_a_cacheable_value():
+    cache = IdentityCache()
+    cache.set(("system_prompt", "missing"), None)
+    assert cache.get(("system_prompt", "missing")) is None
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = IdentityCache(ttl=10, clock=clock)
+    cache.set(("source", "j-1", "Council", "https://x"), "s-1")
+    clock.now = 9.9
+    assert cache.get(("source", "j-1", "Council", "https://x")) == "s-1"
+    clock.now = 10.0
+    assert cache.get(("source", "j-1", "Council", "https://x")) is MISSING
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = IdentityCache(maxsize=2, ttl=60)
+    cache.set(("jurisdiction_id", "a"), "1")
+    cache.set(("jurisdiction_id", "b"), "2")
+    cache.get(("jurisdiction_id", "a"))
+    cache.set(("jurisdiction_id", "c"), "3")
+
+    assert cache.get(("jurisdiction_id", "b")) is MISSING
+    assert cache.get(("jurisdiction_id", "a")) == "1"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalidate_key_and_namespace():
+    cache = IdentityCache()
+    cache.set(("system_prompt", "a"), {"v": 1})
+    cache.set(("system_prompt", "b"), {"v": 1})
+    cache.set(("source", "j-1", "x", "u1"), "s-1")
+    cache.set(("source", "j-2", "y", "u2"), "s-2")
+
+    cache.invalidate("system_prompt", "a")
+    assert cache.get(("system_prompt", "a")) is MISSING
+    assert cache.get(("system_prompt", "b")) == {"v": 1}
+
+    cache.invalidate("source")
+    assert cache.get(("source", "j-1", "x", "u1")) is MISSING
+    assert cache.get(("source", "j-2", "y", "u2")) is MISSING
+
+
+def test_disabled_cache_never_stores():
+    cache = IdentityCache(maxsize=0)
+    cache.set(("jurisdiction", "a"), {"id": 1})
+    assert not cache.enabled
+    assert cache.get(("jurisdiction", "a")) is MISSING
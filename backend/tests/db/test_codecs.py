@@ -0,0 +1,47 @@
+import numpy as np
+from uuid import UUID
+from db.codecs import (
+    decode_halfvec,
+    decode_jsonb,
+    decode_vector,
+    encode_halfvec,
+    encode_jsonb,
+    encode_vector,
+)
+
+
+def test_jsonb_roundtrip_native_values():
+    value = {"a": [1, 2.5, None], "id": UUID("12345678-1234-5678-1234-567812345678")}
+
+    encoded = encode_jsonb(value)
+
+    assert encoded[:1] == b"\x01"
+    assert decode_jsonb(encoded) == {"a": [1, 2.5, None], "id": "12345678-1234-5678-1234-567812345678"}
+
+
+def test_jsonb_encodes_strings_as_json_strings():
+    # A plain message in a jsonb column (task/audit result) must stay valid JSON
+    assert decode_jsonb(encode_jsonb("Scrape failed: timeout")) == "Scrape failed: timeout"
+    assert decode_jsonb(encode_jsonb('{"k": "v"}')) == '{"k": "v"}'
+
+
+def test_vector_binary_roundtrip():
+    encoded = encode_vector([0.5, -1.0, 2.25])
+
+    # dim (uint16) + unused (uint16) + 3 big-endian float32
+    assert len(encoded) == 4 + 3 * 4
+    decoded = decode_vector(encoded)
+    assert decoded.dtype == np.float32
+    assert decoded.tolist() == [0.5, -1.0, 2.25]
+
+
+def test_vector_accepts_numpy_and_legacy_text():
+    assert decode_vector(encode_vector(np.arange(3, dtype=np.float64))).tolist() == [0.0, 1.0, 2.0]
+    assert decode_vector(encode_vector("[0.1, 0.2]")).tolist() == np.asarray([0.1, 0.2], dtype=np.float32).tolist()
+
+
+def test_halfvec_binary_roundtrip():
+    encoded = encode_halfvec([1.0, 0.5])
+
+    assert len(encoded) == 4 + 2 * 2
+    assert decode_halfvec(encoded).tolist() == [1.0, 0.5]
@@ -0,0 +1,54 @@
+"""
+Re-applying migrations: scripts/db-commands/seed_schema.py runs every .sql file in
+order on each deploy, so every migration must succeed on a database that already
+has all of them applied (including the ones after it).
+
+Needs a disposable database with pgvector: MIGRATIONS_TEST_DATABASE_URL.
+"""
+
+import os
+import runpy
+from pathlib import Path
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+TEST_DATABASE_URL = os.environ.get("MIGRATIONS_TEST_DATABASE_URL")
+SEED_SCHEMA = Path(__file__).resolve().parents[2] / "scripts" / "db-commands" / "seed_schema.py"
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="MIGRATIONS_TEST_DATABASE_URL not set")
+
+
+def apply_all(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", TEST_DATABASE_URL)
+    run_migrations = runpy.run_path(str(SEED_SCHEMA))["run_migrations"]
+    try:
+        run_migrations()
+    except SystemExit as e:
+        pytest.fail(f"seed_schema.py exited with {e.code}")
+
+
+def test_migrations_apply_twice(monkeypatch):
+    apply_all(monkeypatch)
+    apply_all(monkeypatch)
+
+    conn = psycopg2.connect(TEST_DATABASE_URL)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT data_type FROM information_schema.columns"
+                " WHERE table_name = 'sources' AND column_name = 'jurisdiction_id'"
+            )
+            assert cur.fetchone()[0] == "uuid"
+
+            # 009's counters: a view over the rollup table and the delta ledger
+            cur.execute("SELECT relkind FROM pg_class WHERE relname = 'jurisdiction_stats'")
+            assert cur.fetchone()[0] == "v"
+            cur.execute(
+                "SELECT (SELECT count(*) FROM jurisdictions) = jurisdiction_count FROM jurisdiction_stats"
+                " WHERE jurisdiction_id = '00000000-0000-0000-0000-000000000000'"
+            )
+            assert cur.fetchone()[0] is True
+    finally:
+        conn.close()
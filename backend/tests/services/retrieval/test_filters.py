@@ -0,0 +1,48 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from services.retrieval.filters import compile_filter
+
+
+def test_empty_filter_matches_everything():
+    assert compile_filter(None) == ("TRUE", [])
+    assert compile_filter({"source_id": None}) == ("TRUE", [])
+
+
+def test_compiles_indexed_predicates_with_numbered_params():
+    sql, params = compile_filter(
+        {"source_id": "s1", "document_id": ["d1", "d2"], "content_type": "application/pdf"}, first_param=3
+    )
+
+    assert sql == (
+        "metadata->>'source_id' = ANY($3::text[]) AND document_id = ANY($4::uuid[]) "
+        "AND metadata->>'content_type' = ANY($5::text[])"
+    )
+    assert params == [["s1"], ["d1", "d2"], ["application/pdf"]]
+
+
+def test_jurisdiction_resolves_through_sources():
+    sql, params = compile_filter({"jurisdiction": "San Jose"})
+
+    assert sql.startswith("metadata->>'source_id' = ANY(ARRAY(SELECT s.id::text FROM sources s")
+    assert "lower(j.name)" in sql and "j.id::text = ANY($1::text[])" in sql
+    assert params == [["San Jose"]]
+
+
+def test_date_ranges_and_containment_fallback():
+    sql, params = compile_filter(
+        {"created_after": "2025-01-01T00:00:00Z", "created_before": date(2025, 6, 1), "bill_number": ["SB 9", "SB 10"]}
+    )
+
+    assert sql == (
+        "created_at >= $1 AND created_at < $2 AND (metadata @> $3::jsonb OR metadata @> $4::jsonb)"
+    )
+    assert params == [
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+        datetime(2025, 6, 1, tzinfo=timezone.utc),
+        {"bill_number": "SB 9"},
+        {"bill_number": "SB 10"},
+    ]
+    with pytest.raises(ValueError):
+        compile_filter({"created_after": 12})
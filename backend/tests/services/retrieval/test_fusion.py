@@ -0,0 +1,37 @@
+from llm_common.retrieval import RetrievedChunk
+
+from services.retrieval.fusion import lexical_query_text, lexical_tsquery, reciprocal_rank_fusion
+
+
+def chunks(*ids):
+    return [RetrievedChunk(chunk_id=i, content=f"content {i}", score=0.9) for i in ids]
+
+
+def test_rrf_rewards_chunks_ranked_by_both_lists():
+    vector = chunks("a", "b", "c")
+    lexical = chunks("c", "d")
+
+    fused = reciprocal_rank_fusion([vector, lexical], k=3, rrf_k=60)
+
+    assert [c.chunk_id for c in fused] == ["c", "a", "b"]  # b and d tie; first list wins
+    assert fused[0].score == 1 / 63 + 1 / 61
+    assert vector[2].score == 0.9  # inputs untouched
+
+
+def test_identifiers_become_phrases():
+    assert lexical_query_text("What does AB 1234 change?") == 'What does "AB 1234" change?'
+    assert lexical_query_text("Int 1234-2025 and § 26-3401") == '"Int 1234-2025" and "26-3401"'
+    assert lexical_query_text('rent "control" in San Jose') == "rent  control  in San Jose"
+
+
+def test_tsquery_ors_terms_but_requires_phrases_and_negations():
+    sql, params = lexical_tsquery("-tenant eviction AB 1234", "english", first_param=2)
+
+    assert params == ["eviction", "-tenant", '"AB 1234"']
+    assert sql == (
+        "(websearch_to_tsquery('english', $2)) && websearch_to_tsquery('english', $3) "
+        "&& websearch_to_tsquery('english', $4)"
+    )
+
+    sql, params = lexical_tsquery("rent control", "english")
+    assert sql == "(websearch_to_tsquery('english', $1) || websearch_to_tsquery('english', $2))"
@@ -0,0 +1,177 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from services.retrieval.index_manager import IndexSpec, VectorIndexManager, default_lists, query_settings
+
+
+@pytest.fixture
+def mock_conn():
+    conn = MagicMock()
+    conn.execute = AsyncMock(return_value="CREATE INDEX")
+    conn.fetchval = AsyncMock(return_value=None)
+    return conn
+
+
+@pytest.fixture
+def mock_db(mock_conn):
+    db = MagicMock()
+    db._acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    db._acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    db._execute = AsyncMock()
+    return db
+
+
+def catalog(dimensions=1536, rows=50_000, indexes=()):
+    """_fetch side effect answering the manager's catalog queries."""
+    async def fetch(sql, *args):
+        if "atttypmod" in sql:
+            return [{"atttypmod": dimensions}]
+        if "reltuples" in sql:
+            return [{"rows": rows}]
+        return [{"name": name} for name in indexes]
+    return AsyncMock(side_effect=fetch)
+
+
+def executed(conn):
+    return [c[0][0] for c in conn.execute.call_args_list]
+
+
+@pytest.mark.asyncio
+async def test_create_builds_hnsw_concurrently_with_matching_opclass(mock_db, mock_conn):
+    mock_db._fetch = catalog()
+    manager = VectorIndexManager(mock_db, table_name="documents")
+
+    name = await manager.create(IndexSpec(metric="ip", m=24, ef_construction=128), maintenance_work_mem="2GB")
+
+    assert name == "idx_documents_embedding_hnsw_ip"
+    create = next(sql for sql in executed(mock_conn) if sql.startswith("CREATE INDEX"))
+    assert "CONCURRENTLY" in create
+    assert "USING hnsw (embedding vector_ip_ops) WITH (m = 24, ef_construction = 128)" in create
+    assert "SET maintenance_work_mem = '2GB'" in executed(mock_conn)
+    assert executed(mock_conn)[-1] == "RESET ALL"
+    # Not the pool's 60s command_timeout
+    assert mock_conn.execute.call_args_list[-2].kwargs["timeout"] == manager.build_timeout == 86400
+
+
+@pytest.mark.asyncio
+async def test_create_ivfflat_derives_lists_and_drops_invalid_leftover(mock_db, mock_conn):
+    mock_db._fetch = catalog(rows=4_000_000)
+    mock_conn.fetchval = AsyncMock(side_effect=[False, True])  # interrupted earlier build, then the new one
+    manager = VectorIndexManager(mock_db)
+
+    await manager.create(IndexSpec(method="ivfflat", metric="l2"))
+
+    statements = executed(mock_conn)
+    assert statements[0].startswith("DROP INDEX CONCURRENTLY IF EXISTS idx_document_chunks_embedding_ivfflat_l2")
+    create = next(sql for sql in statements if sql.startswith("CREATE INDEX"))
+    assert "USING ivfflat (embedding vector_l2_ops) WITH (lists = 2000)" in create
+
+
+@pytest.mark.asyncio
+async def test_create_rejects_unindexable_columns(mock_db):
+    manager = VectorIndexManager(mock_db)
+
+    mock_db._fetch = catalog(dimensions=4096)
+    with pytest.raises(ValueError, match="at most 2000"):
+        await manager.create(IndexSpec())
+
+    mock_db._fetch = catalog(dimensions=-1)
+    with pytest.raises(ValueError, match="no declared dimensions"):
+        await manager.create(IndexSpec())
+
+
+@pytest.mark.asyncio
+async def test_rebuild_builds_new_index_then_swaps(mock_db, mock_conn):
+    mock_db._fetch = catalog(indexes=["idx_old_ivfflat", "idx_documents_embedding_hnsw_cosine_new"])
+    manager = VectorIndexManager(mock_db, table_name="documents")
+
+    name = await manager.rebuild(IndexSpec())
+
+    assert name == "idx_documents_embedding_hnsw_cosine"
+    create = next(sql for sql in executed(mock_conn) if sql.startswith("CREATE INDEX"))
+    assert "idx_documents_embedding_hnsw_cosine_new" in create
+    assert executed(mock_conn)[-2:] == [
+        "DROP INDEX CONCURRENTLY IF EXISTS idx_old_ivfflat",
+        "ALTER INDEX idx_documents_embedding_hnsw_cosine_new RENAME TO idx_documents_embedding_hnsw_cosine",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_build_drops_the_invalid_index_and_is_not_swapped_in(mock_db, mock_conn, monkeypatch):
+    monkeypatch.setenv("VECTOR_INDEX_BUILD_TIMEOUT", "7200")
+    mock_db._fetch = catalog(indexes=["idx_old_ivfflat"])
+
+    async def execute(sql, *args, **kwargs):
+        if sql.startswith("CREATE INDEX"):
+            raise TimeoutError()
+        return "OK"
+
+    mock_conn.execute = AsyncMock(side_effect=execute)
+    mock_conn.fetchval = AsyncMock(side_effect=[None, False])  # no leftover; invalid after the failure
+    manager = VectorIndexManager(mock_db, table_name="documents")
+
+    with pytest.raises(TimeoutError):
+        await manager.rebuild(IndexSpec())
+
+    drop = mock_conn.execute.call_args_list[-2]
+    assert drop[0][0] == "DROP INDEX CONCURRENTLY IF EXISTS idx_documents_embedding_hnsw_cosine_new"
+    assert drop.kwargs["timeout"] == 7200
+    assert executed(mock_conn)[-1] == "RESET ALL"
+    assert not any("idx_old_ivfflat" in sql or "RENAME" in sql for sql in executed(mock_conn))
+
+
+@pytest.mark.asyncio
+async def test_build_that_finishes_invalid_raises(mock_db, mock_conn):
+    mock_db._fetch = catalog()
+    mock_conn.fetchval = AsyncMock(side_effect=[None, False])  # IF NOT EXISTS kept a concurrent session's failed build
+    manager = VectorIndexManager(mock_db, table_name="documents", build_timeout=600)
+
+    with pytest.raises(RuntimeError, match="invalid index"):
+        await manager.create(IndexSpec())
+
+    assert executed(mock_conn)[-1] == "DROP INDEX CONCURRENTLY IF EXISTS idx_documents_embedding_hnsw_cosine"
+
+
+def test_spec_validation_and_query_settings(monkeypatch):
+    with pytest.raises(ValueError):
+        IndexSpec(metric="hamming")
+    monkeypatch.setenv("VECTOR_INDEX_METHOD", "IVFFLAT")
+    monkeypatch.setenv("VECTOR_INDEX_LISTS", "300")
+    assert IndexSpec.from_env(metric="l2") == IndexSpec(method="ivfflat", metric="l2", lists=300)
+
+    assert default_lists(500) == 1
+    assert default_lists(1_000_000) == 1000
+    # ef_search below k would cap the result count
+    assert query_settings(50, ef_search=20, probes=8) == [
+        "SET LOCAL hnsw.ef_search = 50",
+        "SET LOCAL ivfflat.probes = 8",
+    ]
+    assert query_settings(5) == []
+
+
+@pytest.mark.asyncio
+async def test_quantized_index_is_an_expression_over_the_full_precision_column(mock_db, mock_conn):
+    mock_db._fetch = catalog(dimensions=4096)
+    manager = VectorIndexManager(mock_db, table_name="documents")
+
+    name = await manager.create(IndexSpec(quantization="halfvec", dimensions=1024))
+    binary = await manager.create(IndexSpec(quantization="binary"))
+
+    assert name == "idx_documents_embedding_hnsw_cosine_halfvec_1024"
+    assert binary == "idx_documents_embedding_hnsw_cosine_binary_4096"  # width filled from the column
+    halfvec_sql, binary_sql = [sql for sql in executed(mock_conn) if sql.startswith("CREATE INDEX")]
+    assert "USING hnsw (((subvector(embedding, 1, 1024))::halfvec(1024)) halfvec_cosine_ops)" in halfvec_sql
+    assert "USING hnsw ((binary_quantize(subvector(embedding, 1, 4096))::bit(4096)) bit_hamming_ops)" in binary_sql
+
+
+@pytest.mark.asyncio
+async def test_quantized_widths_are_checked_per_storage_type(mock_db):
+    mock_db._fetch = catalog(dimensions=4096)
+    manager = VectorIndexManager(mock_db)
+
+    with pytest.raises(ValueError, match="at most 4000 dimensions as halfvec"):
+        await manager.create(IndexSpec(quantization="halfvec"))
+    with pytest.raises(ValueError, match="Cannot index 8192"):
+        await manager.create(IndexSpec(quantization="binary", dimensions=8192))
+    with pytest.raises(ValueError):
+        IndexSpec(quantization="int8")
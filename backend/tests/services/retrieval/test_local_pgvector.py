@@ -0,0 +1,305 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+from services.retrieval.local_pgvector import LocalPgVectorBackend
+
+
+@pytest.fixture
+def mock_conn():
+    conn = MagicMock()
+    conn.execute = AsyncMock(return_value="INSERT 0 2")
+    conn.copy_records_to_table = AsyncMock()
+    return conn
+
+
+@pytest.fixture
+def mock_db(mock_conn):
+    db = MagicMock()
+    db._acquire.return_value.__aenter__ = AsyncMock(return_value=mock_conn)
+    db._acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    db._execute = AsyncMock()
+    return db
+
+
+def make_chunks(n):
+    doc_id = str(uuid4())
+    return [
+        {
+            "id": str(uuid4()),
+            "content": f"chunk {i}",
+            "embedding": [0.1, 0.2, 0.3],
+            "metadata": {"source_id": uuid4(), "chunk": i},
+            "document_id": doc_id,
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_batches_copy_and_merge(mock_db, mock_conn):
+    backend = LocalPgVectorBackend(table_name="document_chunks", postgres_client=mock_db, upsert_batch_size=2)
+
+    written = await backend.bulk_upsert(make_chunks(5))
+
+    # 5 rows at batch size 2 -> 3 COPY + merge round-trips
+    assert mock_conn.copy_records_to_table.call_count == 3
+    merges = [c for c in mock_conn.execute.call_args_list if "ON CONFLICT (id)" in c[0][0]]
+    assert len(merges) == 3
+    assert written == 6  # 3 merges reporting "INSERT 0 2" each
+    # No per-row round-trips through the helper
+    mock_db._execute.assert_not_called()
+
+    first_batch = mock_conn.copy_records_to_table.call_args_list[0][1]["records"]
+    assert len(first_batch) == 2
+    assert first_batch[0][2] == [0.1, 0.2, 0.3]
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_dedupes_ids(mock_db, mock_conn):
+    backend = LocalPgVectorBackend(postgres_client=mock_db)
+    chunks = make_chunks(2)
+    chunks[1]["id"] = chunks[0]["id"]
+
+    await backend.bulk_upsert(chunks)
+
+    records = mock_conn.copy_records_to_table.call_args[1]["records"]
+    assert len(records) == 1
+    assert records[0][1] == "chunk 1"
+
+
+@pytest.mark.asyncio
+async def test_upsert_returns_false_on_failure(mock_db, mock_conn):
+    mock_conn.copy_records_to_table.side_effect = Exception("copy failed")
+    backend = LocalPgVectorBackend(postgres_client=mock_db)
+
+    assert await backend.upsert(make_chunks(1)) is False
+    assert await backend.upsert([]) is True
+
+
+@pytest.mark.asyncio
+async def test_sync_documents_deletes_stale_and_writes_new_in_one_transaction(mock_db, mock_conn):
+    mock_conn.execute = AsyncMock(side_effect=lambda sql, *args: "DELETE 2" if "DELETE" in sql else "INSERT 0 1")
+    backend = LocalPgVectorBackend(postgres_client=mock_db)
+    chunks = make_chunks(1)
+    doc_id = chunks[0]["document_id"]
+    kept = str(uuid4())
+
+    synced = await backend.sync_documents(chunks, {doc_id: [kept, chunks[0]["id"]]})
+
+    assert synced == {"deleted": 2, "written": 1}
+    mock_conn.transaction.assert_called_once()
+    delete = next(c for c in mock_conn.execute.call_args_list if "DELETE" in c[0][0])
+    assert delete[0][1:] == ([doc_id], [kept, chunks[0]["id"]])
+    records = mock_conn.copy_records_to_table.call_args[1]["records"]
+    assert [r[0] for r in records] == [chunks[0]["id"]]
+
+
+@pytest.mark.asyncio
+async def test_chunk_hashes_groups_by_document(mock_db):
+    doc_id = uuid4()
+    chunk_id = uuid4()
+    mock_db._fetch = AsyncMock(return_value=[{"document_id": doc_id, "id": chunk_id, "content_hash": b"\x01"}])
+    backend = LocalPgVectorBackend(postgres_client=mock_db)
+
+    stored = await backend.chunk_hashes([str(doc_id), "other"])
+
+    assert stored == {str(doc_id): {str(chunk_id): b"\x01"}, "other": {}}
+
+
+@pytest.mark.asyncio
+async def test_query_applies_ef_search_in_transaction(mock_db, mock_conn):
+    mock_conn.fetch = AsyncMock(return_value=[
+        {"id": uuid4(), "content": "c", "metadata": {"url": "u"}, "document_id": None, "similarity": 0.9}
+    ])
+    mock_db._fetch = AsyncMock()
+    backend = LocalPgVectorBackend(postgres_client=mock_db, ef_search=40)
+
+    results = await backend.query([0.1, 0.2], k=5, ef_search=200)
+
+    assert [r.score for r in results] == [0.9]
+    mock_conn.transaction.assert_called_once()
+    assert mock_conn.execute.call_args_list[0][0][0] == "SET LOCAL hnsw.ef_search = 200"
+    sql = mock_conn.fetch.call_args[0][0]
+    assert "ORDER BY embedding <=> $1" in sql
+    mock_db._fetch.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_query_uses_metric_operator_and_pool_helper_without_knobs(mock_db):
+    mock_db._fetch = AsyncMock(return_value=[])
+    backend = LocalPgVectorBackend(postgres_client=mock_db, metric="l2")
+
+    assert await backend.query([0.1], k=3) == []
+
+    sql = mock_db._fetch.call_args[0][0]
+    assert "ORDER BY embedding <-> $1" in sql
+    assert "-(embedding <-> $1) AS similarity" in sql
+    with pytest.raises(ValueError):
+        LocalPgVectorBackend(metric="dot")
+
+
+def chunk_rows(n):
+    return [
+        {"id": uuid4(), "content": f"c{i}", "metadata": {"source_id": "s"}, "document_id": None, "similarity": 0.5}
+        for i in range(n)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_selective_filter_is_answered_exactly(mock_db):
+    mock_db._fetch = AsyncMock(side_effect=[[{"n": 12}], chunk_rows(3)])
+    backend = LocalPgVectorBackend(postgres_client=mock_db, prefilter_rows=100)
+
+    results = await backend.query([0.1], k=3, filter={"document_id": "d1"})
+
+    assert len(results) == 3
+    count_sql, count_args = mock_db._fetch.call_args_list[0][0][0], mock_db._fetch.call_args_list[0][0][1:]
+    assert "LIMIT 101" in count_sql and count_args == (["d1"],)
+    sql, *args = mock_db._fetch.call_args_list[1][0]
+    assert "WITH candidates AS MATERIALIZED" in sql and "document_id = ANY($3::uuid[])" in sql
+    assert args == [[0.1], 3, ["d1"]]
+
+
+@pytest.mark.asyncio
+async def test_broad_filter_post_filters_ann_candidates_and_widens(mock_db, mock_conn):
+    mock_db._fetch = AsyncMock(return_value=[{"n": 101}])
+    mock_conn.fetch = AsyncMock(side_effect=[chunk_rows(1), chunk_rows(2)])
+    backend = LocalPgVectorBackend(postgres_client=mock_db, prefilter_rows=100)
+
+    results = await backend.query([0.1], k=2, filter={"jurisdiction": "San Jose"})
+
+    assert len(results) == 2
+    first, second = mock_conn.fetch.call_args_list
+    assert "WITH nearest AS MATERIALIZED" in first[0][0] and "LIMIT $4" in first[0][0]
+    assert first[0][1:] == ([0.1], 2, ["San Jose"], 20)
+    assert second[0][-1] == 80  # short page: candidate set widened x4
+    settings = [c[0][0] for c in mock_conn.execute.call_args_list]
+    assert settings == ["SET LOCAL hnsw.ef_search = 20", "SET LOCAL hnsw.ef_search = 80"]
+
+
+@pytest.mark.asyncio
+async def test_post_filter_falls_back_to_exact_when_candidates_run_out(mock_db, mock_conn):
+    mock_db._fetch = AsyncMock(side_effect=[[{"n": 101}], chunk_rows(1)])
+    mock_conn.fetch = AsyncMock(return_value=[])
+    backend = LocalPgVectorBackend(postgres_client=mock_db, prefilter_rows=100)
+
+    results = await backend.query([0.1], k=5, filter={"content_type": "text/html"})
+
+    assert len(results) == 1
+    assert [c[0][-1] for c in mock_conn.fetch.call_args_list] == [50, 200, 800, 1000]
+    assert "WITH candidates AS MATERIALIZED" in mock_db._fetch.call_args_list[1][0][0]
+
+
+@pytest.mark.asyncio
+async def test_hybrid_runs_both_legs_and_fuses_ranks(mock_db):
+    shared = chunk_rows(1)[0]
+
+    async def fetch(sql, *args):
+        if "content_tsv @@ q" in sql:
+            return [shared]
+        return chunk_rows(2) + [shared]
+
+    mock_db._fetch = AsyncMock(side_effect=fetch)
+    backend = LocalPgVectorBackend(postgres_client=mock_db, search_mode="hybrid")
+
+    results = await backend.query([0.1], k=2, text="What does AB 1234 change?")
+
+    assert results[0].chunk_id == str(shared["id"])  # ranked by both legs
+    assert len(results) == 2
+    lexical = next(c for c in mock_db._fetch.call_args_list if "content_tsv @@ q" in c[0][0])
+    assert lexical[0][1:] == (8, "What", "does", "change?", '"AB 1234"')
+
+
+@pytest.mark.asyncio
+async def test_hybrid_degrades_to_vector_when_lexical_fails(mock_db):
+    async def fetch(sql, *args):
+        if "content_tsv" in sql:
+            raise Exception('column "content_tsv" does not exist')
+        return chunk_rows(3)
+
+    mock_db._fetch = AsyncMock(side_effect=fetch)
+    backend = LocalPgVectorBackend(postgres_client=mock_db, search_mode="hybrid")
+
+    assert len(await backend.query([0.1], k=2, text="rent control")) == 2
+
+
+@pytest.mark.asyncio
+async def test_retrieve_answers_from_full_text_with_filters(mock_db):
+    mock_db._fetch = AsyncMock(return_value=chunk_rows(1))
+    backend = LocalPgVectorBackend(postgres_client=mock_db)
+
+    results = await backend.retrieve(query="SB 9", k=3, filters={"jurisdiction": "San Jose"})
+
+    assert len(results) == 1
+    sql, *args = mock_db._fetch.call_args[0]
+    assert "websearch_to_tsquery('english', $2)" in sql and "j.id::text = ANY($3::text[])" in sql
+    assert args == [3, '"SB 9"', ["San Jose"]]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_embeds_through_the_cached_embedder(mock_db):
+    from services.retrieval.query_embedder import QueryEmbedder
+
+    mock_db._fetch = AsyncMock(return_value=chunk_rows(1))
+    embed_fn = AsyncMock(return_value=[0.3, 0.4])
+    backend = LocalPgVectorBackend(
+        postgres_client=mock_db, search_mode="vector", embedder=QueryEmbedder(embed_fn)
+    )
+
+    await backend.retrieve("rent control", k=2)
+    results = await backend.retrieve("Rent control", k=2)
+
+    assert len(results) == 1
+    embed_fn.assert_awaited_once()
+    sql, *args = mock_db._fetch.call_args[0]
+    assert "ORDER BY embedding <=> $1" in sql and args == [[pytest.approx(0.3), pytest.approx(0.4)], 2]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_many_batches_embeddings_and_falls_back_to_lexical(mock_db):
+    from services.retrieval.query_embedder import QueryEmbedder
+
+    mock_db._fetch = AsyncMock(side_effect=lambda sql, *args: chunk_rows(1))
+    embed_many_fn = AsyncMock(return_value=[[0.1], [0.2]])
+    backend = LocalPgVectorBackend(
+        postgres_client=mock_db, search_mode="vector", embedder=QueryEmbedder(AsyncMock(), embed_many_fn)
+    )
+
+    results = await backend.retrieve_many(["AB 1234", "SB 9"], k=1)
+
+    assert [len(r) for r in results] == [1, 1]
+    embed_many_fn.assert_awaited_once_with(["AB 1234", "SB 9"])
+
+    embed_many_fn.side_effect = Exception("provider down")
+    await backend.retrieve_many(["new query"], k=1)
+    assert "content_tsv @@ q" in mock_db._fetch.call_args[0][0]
+
+
+@pytest.mark.asyncio
+async def test_quantized_search_reranks_candidates_at_full_precision(mock_db, mock_conn):
+    mock_conn.fetch = AsyncMock(return_value=chunk_rows(2))
+    backend = LocalPgVectorBackend(postgres_client=mock_db, quantization="binary", dimensions=1024)
+
+    assert len(await backend.query([0.1], k=2)) == 2
+
+    sql, *args = mock_conn.fetch.call_args[0]
+    assert "ORDER BY binary_quantize(subvector(embedding, 1, 1024))::bit(1024) <~> " \
+           "binary_quantize(subvector($1::vector, 1, 1024))::bit(1024) LIMIT $3" in sql
+    assert "ORDER BY embedding <=> $1 LIMIT $2" in sql
+    assert args == [[0.1], 2, 20]  # binary: 10 candidates per result
+    assert mock_conn.execute.call_args[0][0] == "SET LOCAL hnsw.ef_search = 20"
+
+
+@pytest.mark.asyncio
+async def test_truncated_postfilter_searches_prefix_and_orders_exactly(mock_db, mock_conn):
+    mock_db._fetch = AsyncMock(return_value=[{"n": 101}])
+    mock_conn.fetch = AsyncMock(return_value=chunk_rows(1))
+    backend = LocalPgVectorBackend(postgres_client=mock_db, metric="ip", dimensions=512, prefilter_rows=100)
+
+    await backend.query([0.1], k=1, filter={"source_id": "s"})
+
+    sql = mock_conn.fetch.call_args[0][0]
+    assert "ORDER BY (l2_normalize(subvector(embedding, 1, 512)))::vector(512) <#> " in sql
+    assert "WHERE metadata->>'source_id' = ANY($3::text[]) ORDER BY embedding <#> $1 LIMIT $2" in sql
+    with pytest.raises(ValueError, match="needs dimensions"):
+        LocalPgVectorBackend(quantization="halfvec")
@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock
+
+from services.retrieval.query_embedder import QueryEmbedder, normalize_query
+
+
+@pytest.mark.asyncio
+async def test_repeated_queries_skip_the_provider():
+    embed_fn = AsyncMock(return_value=[0.5, 0.25])
+    embedder = QueryEmbedder(embed_fn, model="m")
+
+    first = await embedder.embed("Rent control in  San Jose")
+    second = await embedder.embed("rent control in san jose ")
+
+    assert first == second == [0.5, 0.25]
+    embed_fn.assert_awaited_once_with("Rent control in  San Jose")
+    assert embedder.stats()["hits"] == 1
+    assert normalize_query(" AB 1234 ") == "ab 1234"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call():
+    calls = 0
+
+    async def embed_fn(text):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [1.0]
+
+    embedder = QueryEmbedder(embed_fn)
+
+    results = await asyncio.gather(*[embedder.embed("SB 9") for _ in range(5)])
+
+    assert results == [[1.0]] * 5
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_fail_waiters():
+    release = asyncio.Event()
+
+    async def embed_fn(text):
+        await release.wait()
+        return [1.0]
+
+    embedder = QueryEmbedder(embed_fn)
+    leader = asyncio.create_task(embedder.embed("SB 9"))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(embedder.embed("sb 9"))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    release.set()
+
+    assert await follower == [1.0]
+    assert leader.cancelled()
+    assert embedder.provider_calls == 1
+    assert await embedder.embed("SB 9") == [1.0]
+    assert embedder.provider_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_embed_many_batches_distinct_misses():
+    embed_fn = AsyncMock(return_value=[9.0])
+    embed_many_fn = AsyncMock(side_effect=lambda texts: [[float(len(t))] for t in texts])
+    embedder = QueryEmbedder(embed_fn, embed_many_fn)
+    await embedder.embed("cached")
+
+    vectors = await embedder.embed_many(["abc", "Cached", "abc ", "de"])
+
+    assert vectors == [[3.0], [9.0], [3.0], [2.0]]
+    embed_many_fn.assert_awaited_once_with(["abc", "de"])
+
+
+@pytest.mark.asyncio
+async def test_zero_cache_size_disables_caching():
+    embed_fn = AsyncMock(return_value=[1.0])
+    disabled = QueryEmbedder(embed_fn, cache_size=0)
+
+    await disabled.embed("q")
+    await disabled.embed("q")
+
+    assert embed_fn.await_count == 2
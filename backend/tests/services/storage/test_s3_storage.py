@@ -103,3 +103,16 @@ async def test_get_url(mock_minio, s3_env):
         storage.client.presigned_get_object.assert_called_with(
             "test-bucket", "path/to/file", expires=timedelta(seconds=3600)
         )
+
+@pytest.mark.asyncio
+async def test_file_transfers_stream_through_minio(mock_minio, s3_env):
+    with patch.dict(os.environ, s3_env):
+        storage = S3Storage()
+
+        assert await storage.upload_file("src/packet.pdf", "/tmp/packet.pdf", "application/pdf") == "src/packet.pdf"
+        await storage.download_file("src/packet.pdf", "/tmp/copy.pdf")
+
+        storage.client.fput_object.assert_called_once_with(
+            "test-bucket", "src/packet.pdf", "/tmp/packet.pdf", content_type="application/pdf"
+        )
+        storage.client.fget_object.assert_called_once_with("test-bucket", "src/packet.pdf", "/tmp/copy.pdf")
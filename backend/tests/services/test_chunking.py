@@ -0,0 +1,114 @@
+import pickle
+
+import pytest
+from services.chunking import CharacterChunker, StructuredChunker, TokenCounter, detect_strategy
+
+ESTIMATE = TokenCounter(encoding=None)  # ~4 chars/token, no tiktoken download
+
+ORDINANCE = (
+    "ORDINANCE NO. 30123\n"
+    "AN ORDINANCE OF THE CITY OF SAN JOSE AMENDING TITLE 20.\n\n"
+    "SECTION 1. Section 20.10.040 is amended. " + "Inclusionary fees apply to new units. " * 40 + "\n"
+    "SECTION 2. Definitions. As used in § 26-3401, a unit means a dwelling. " + "Each unit counts once. " * 40 + "\n"
+    "SECTION 3. Effective date. This ordinance takes effect thirty days after adoption."
+)
+
+AGENDA = (
+    "CALL TO ORDER AND ROLL CALL\n"
+    "3.1 25-1001 Approval of Minutes. " + "Staff recommends approval. " * 20 + "\n"
+    "3.2 25-1002 Affordable Housing Impact Fee Update. " + "Council discussed the fee schedule. " * 20 + "\n"
+    "ADJOURNMENT\n"
+)
+
+
+def test_character_chunker_matches_legacy_windows_without_dropping_text():
+    assert CharacterChunker(10, 2).split("123456789012345") == ["1234567890", "9012345"]
+
+    # A word break that backs up further than the overlap used to skip text
+    text = "alpha beta gamma delta epsilon zeta eta theta"
+    chunks = list(CharacterChunker(12, 0).chunk(text))
+    assert " ".join(c.text for c in chunks) == text
+    assert all(text[c.char_start:c.char_end] == c.text for c in chunks)
+
+
+def test_detects_strategy_from_headings():
+    assert detect_strategy(ORDINANCE).name == "legislation"
+    assert detect_strategy(AGENDA).name == "agenda"
+    assert detect_strategy("# Title\n\nintro\n\n## Fees\n\ntext\n\n## Exemptions\n\nmore").name == "markdown"
+    assert detect_strategy("Just a paragraph. Another sentence.").name == "plain"
+
+
+def test_legislation_sections_start_new_chunks():
+    chunker = StructuredChunker(strategy="legislation", max_tokens=200, overlap_tokens=0, min_tokens=20, counter=ESTIMATE)
+    chunks = list(chunker.chunk(ORDINANCE))
+
+    sections = [c.section for c in chunks]
+    assert "SECTION 1." in sections and "SECTION 2." in sections
+    # The cross-reference inside SECTION 2 is not a heading
+    assert not any(s and s.startswith("§") for s in sections)
+    assert all(c.tokens <= 200 for c in chunks)
+    # No chunk mixes SECTION 1 and SECTION 2 text
+    assert not any("Inclusionary" in c.text and "Each unit" in c.text for c in chunks)
+    # Offsets point back into the source
+    for chunk in chunks:
+        assert " ".join(ORDINANCE[chunk.char_start:chunk.char_end].split()) == chunk.text
+
+
+def test_agenda_items_become_sections():
+    chunks = list(StructuredChunker(max_tokens=400, min_tokens=10, counter=ESTIMATE).chunk(AGENDA))
+
+    # The roll-call heading is below min_tokens, so it stays with the first item
+    assert chunks[0].section == "CALL TO ORDER AND ROLL CALL"
+    assert "3.1 25-1001 Approval of Minutes." in chunks[0].text
+    assert chunks[1].section.startswith("3.2 25-1002 Affordable Housing")
+    assert AGENDA[chunks[1].section_start:].startswith("3.2 25-1002")
+
+
+def test_streaming_input_matches_whole_text_and_overlap_stays_within_section():
+    chunker = StructuredChunker(strategy="plain", max_tokens=60, overlap_tokens=15, counter=ESTIMATE, max_unit_chars=300)
+    text = " ".join(f"Sentence number {i} describes a housing fee." for i in range(300))
+
+    whole = [(c.text, c.char_start, c.char_end) for c in chunker.chunk(text)]
+    pieces = (text[i:i + 97] for i in range(0, len(text), 97))
+    streamed = [(c.text, c.char_start, c.char_end) for c in chunker.chunk(pieces)]
+
+    assert streamed == whole
+    assert len(whole) > 10
+    # Consecutive chunks share trailing sentences
+    assert whole[1][1] < whole[0][2]
+
+
+def test_oversized_unit_is_split_at_words():
+    chunker = StructuredChunker(strategy="plain", max_tokens=50, counter=ESTIMATE, max_unit_chars=100_000)
+    text = "word " * 2000  # one "sentence", no boundaries
+
+    chunks = list(chunker.chunk(text))
+
+    assert all(0 < c.tokens <= 50 for c in chunks)
+    assert sum(len(c.text.split()) for c in chunks) == 2000
+
+
+def test_carried_overlap_never_pushes_a_chunk_over_max_tokens():
+    chunker = StructuredChunker(strategy="plain", max_tokens=100, overlap_tokens=50, min_tokens=0, counter=ESTIMATE)
+    short = "Short sentence about fees " + "word " * 18 + "end."  # 30 tokens
+    long = "Long sentence about units " + "word " * 70 + "end."  # 95 tokens
+
+    chunks = list(chunker.chunk(f"{short} {long}"))
+
+    assert [c.tokens for c in chunks] == [30, 95]
+    assert chunks[1].text == long
+
+
+def test_chunker_is_picklable_and_metadata_has_offsets():
+    chunker = pickle.loads(pickle.dumps(StructuredChunker(counter=ESTIMATE)))
+    chunk = next(chunker.chunk(ORDINANCE))
+
+    meta = chunk.metadata()
+    assert meta["chunk_index"] == 0
+    assert meta["char_start"] == 0 and meta["char_end"] > 0
+    assert "tokens" in meta
+
+
+def test_unknown_strategy_rejected():
+    with pytest.raises(ValueError):
+        StructuredChunker(strategy="poetry")
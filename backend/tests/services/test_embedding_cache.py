@@ -0,0 +1,95 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from services.embedding_cache import EmbeddingCache, content_hash
+
+
+def fake_embed(dimensions):
+    async def embed(texts):
+        return [[float(len(text))] * dimensions for text in texts]
+    return AsyncMock(side_effect=embed)
+
+
+@pytest.fixture
+def mock_db():
+    db = MagicMock()
+    db.get_cached_embeddings = AsyncMock(return_value={})
+    db.store_cached_embeddings = AsyncMock(return_value=True)
+    db.prune_embedding_cache = AsyncMock(return_value=3)
+    return db
+
+
+def test_content_hash_normalizes_whitespace_and_unicode():
+    assert content_hash("Affordable  housing\n fee") == content_hash(" Affordable housing fee ")
+    assert content_hash("café") == content_hash("café")
+    assert content_hash("fee") != content_hash("fees")
+
+
+@pytest.mark.asyncio
+async def test_only_misses_go_to_provider_and_order_is_preserved(mock_db):
+    cache = EmbeddingCache(mock_db, "qwen/qwen3-embedding-8b", 4)
+    embed = fake_embed(4)
+    mock_db.get_cached_embeddings.return_value = {content_hash("bb"): [9.0] * 4}
+
+    result = await cache.embed_documents(["a", "bb", "ccc", "a"], embed)
+
+    assert result == [[1.0] * 4, [9.0] * 4, [3.0] * 4, [1.0] * 4]
+    embed.assert_awaited_once_with(["a", "ccc"])  # "bb" from the table, "a" deduplicated
+    stored = mock_db.store_cached_embeddings.call_args[0]
+    assert stored[:2] == ("qwen/qwen3-embedding-8b", 4)
+    assert [key for key, _ in stored[2]] == [content_hash("a"), content_hash("ccc")]
+
+    # Second call is served from the in-process layer without touching the table
+    mock_db.get_cached_embeddings.reset_mock()
+    assert await cache.embed_documents(["ccc", "bb"], embed) == [[3.0] * 4, [9.0] * 4]
+    mock_db.get_cached_embeddings.assert_not_awaited()
+    assert embed.await_count == 1
+
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["db_hits"], stats["misses"]) == (2, 1, 2)
+    assert stats["hit_rate"] == 0.6
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_by_model_dimensions(mock_db):
+    small = EmbeddingCache(mock_db, "qwen/qwen3-embedding-8b", 1536)
+    large = EmbeddingCache(mock_db, "qwen/qwen3-embedding-8b", 4096)
+
+    await small.embed_documents(["text"], fake_embed(1536))
+    await large.embed_documents(["text"], fake_embed(4096))
+
+    lookups = [call[0][:2] for call in mock_db.get_cached_embeddings.call_args_list]
+    assert lookups == [("qwen/qwen3-embedding-8b", 1536), ("qwen/qwen3-embedding-8b", 4096)]
+
+
+@pytest.mark.asyncio
+async def test_wrong_dimensions_are_returned_but_not_cached(mock_db):
+    cache = EmbeddingCache(mock_db, "m", 1536)
+
+    result = await cache.embed_documents(["x"], fake_embed(4))
+
+    assert len(result[0]) == 4
+    assert cache.stats()["rejected"] == 1
+    mock_db.store_cached_embeddings.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_memory_ttl_expiry_falls_back_to_table(mock_db):
+    now = [0.0]
+    cache = EmbeddingCache(mock_db, "m", 2, memory_ttl=10)
+    cache.memory._clock = lambda: now[0]
+    embed = fake_embed(2)
+
+    await cache.embed_documents(["x"], embed)
+    now[0] = 11.0
+    mock_db.get_cached_embeddings.return_value = {content_hash("x"): [1.0, 1.0]}
+    await cache.embed_documents(["x"], embed)
+
+    assert embed.await_count == 1
+    assert cache.stats()["db_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_prune_uses_max_age(mock_db):
+    assert await EmbeddingCache(mock_db, "m", 2, max_age_days=30).prune() == 3
+    mock_db.prune_embedding_cache.assert_awaited_once_with(30)
+    assert await EmbeddingCache(mock_db, "m", 2, max_age_days=0).prune() == 0
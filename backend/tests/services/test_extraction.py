@@ -0,0 +1,155 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from services.chunking import StructuredChunker, TokenCounter
+from services.extraction import html_to_text, html_to_text_async, regex_text
+from services.extraction.pdf import chunk_pages, extract_page_range, extract_pdf_pages, is_pdf
+from tests.utils.pdf import make_pdf
+
+LEGISTAR_PAGE = """
+<html>
+<head><title>City of San Jose - File #: 25-1002</title><style>.rgMasterTable { color: red }</style></head>
+<body>
+<form id="aspnetForm">
+  <nav><a href="/">Home</a> <a href="/Calendar.aspx">Calendar</a></nav>
+  <div id="ctl00_ContentPlaceHolder1_pageDetails">
+    <h1>Affordable Housing Impact Fee Update</h1>
+    <p>SECTION 1.   The fee is
+       amended as follows.</p>
+    <!-- tracking pixel -->
+    <script>var _gaq = [];</script>
+    <table class="rgMasterTable">
+      <caption>Fee Schedule</caption>
+      <tr><th>Area</th><th>Fee per sq ft</th></tr>
+      <tr><td>Strong market</td><td>$18.70</td></tr>
+      <tr><td>Moderate&nbsp;market</td><td>$0</td></tr>
+    </table>
+    <ul>
+      <li>Applies to rental projects</li>
+      <li>Applies to for-sale projects</li>
+    </ul>
+  </div>
+  <div role="contentinfo">Copyright 2025</div>
+  <select><option>Page 1</option></select>
+</form>
+</body>
+</html>
+"""
+
+
+def test_fast_mode_drops_non_content_and_keeps_structure():
+    text = html_to_text(LEGISTAR_PAGE)
+
+    assert "_gaq" not in text and "rgMasterTable" not in text and "tracking pixel" not in text
+    assert "Calendar" not in text and "Copyright" not in text and "Page 1" not in text
+    assert "Affordable Housing Impact Fee Update\n\nSECTION 1. The fee is amended as follows." in text
+    assert "Applies to rental projects\nApplies to for-sale projects" in text
+
+
+def test_data_tables_render_as_rows():
+    text = html_to_text(LEGISTAR_PAGE)
+
+    assert "Fee Schedule\nArea | Fee per sq ft\nStrong market | $18.70\nModerate market | $0" in text
+
+
+def test_layout_tables_are_walked_not_flattened():
+    html = "<table><tr><td><p>SECTION 1. Findings.</p></td><td><table><tr><td>a</td><td>b</td></tr></table></td></tr></table>"
+
+    text = html_to_text(html)
+
+    assert "SECTION 1. Findings." in text
+    assert "a | b" in text
+
+
+def test_plain_text_and_empty_input():
+    assert html_to_text("SECTION 1.  Title\n\n\n\nSECTION 2. Body") == "SECTION 1. Title\n\nSECTION 2. Body"
+    assert html_to_text("") == ""
+    assert html_to_text("   \n") == ""
+
+
+def test_regex_mode_is_single_line_without_script_bodies():
+    text = html_to_text(LEGISTAR_PAGE, mode="regex")
+
+    assert "_gaq" not in text
+    assert "\n" not in text
+    assert text == regex_text(LEGISTAR_PAGE)
+
+
+def test_trafilatura_mode_falls_back_to_fast_parser(monkeypatch):
+    import services.extraction.html as html_module
+    monkeypatch.setattr(html_module, "TRAFILATURA_AVAILABLE", False)
+
+    assert html_to_text(LEGISTAR_PAGE, mode="trafilatura") == html_to_text(LEGISTAR_PAGE)
+
+
+def test_deeply_nested_markup_does_not_recurse():
+    depth = sys.getrecursionlimit() * 2
+    html = "<div>" * depth + "deep text" + "</div>" * depth
+
+    assert html_to_text(html) == "deep text"
+
+
+def test_unknown_mode_rejected():
+    with pytest.raises(ValueError):
+        html_to_text("<p>x</p>", mode="bs4")
+
+
+@pytest.mark.asyncio
+async def test_async_extraction_offloads_large_documents():
+    large = "<p>" + "Housing element text. " * 20_000 + "</p>"
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        text = await html_to_text_async(large, executor=executor)
+
+    assert text.startswith("Housing element text.")
+    assert await html_to_text_async("<p>small</p>") == "small"
+
+
+# -- PDF ----------------------------------------------------------------------------------
+
+PACKET = [f"Page {n} of 20\nSECTION {n}. Item {n} staff report.\nThe fee for item {n} is approved." for n in range(1, 21)]
+
+
+@pytest.fixture
+def packet_path(tmp_path):
+    path = tmp_path / "packet.pdf"
+    path.write_bytes(make_pdf(PACKET))
+    return str(path)
+
+
+@pytest.mark.asyncio
+async def test_pdf_pages_extracted_in_order_across_page_ranges(packet_path):
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        pages = await extract_pdf_pages(packet_path, executor, pages_per_task=3, max_in_flight=2)
+
+    assert len(pages) == 20
+    assert pages[0] == "SECTION 1. Item 1 staff report.\nThe fee for item 1 is approved."
+    assert pages[19].startswith("SECTION 20.")
+    # Running "Page N of M" footers are dropped
+    assert not any("of 20" in page for page in pages)
+
+
+def test_page_range_past_the_end_is_truncated(packet_path):
+    assert len(extract_page_range(packet_path, 18, 40)) == 2
+
+
+def test_chunks_record_page_spans():
+    pages = ["SECTION 1. " + "Alpha text. " * 30, "", "SECTION 2. " + "Beta text. " * 30]
+    chunker = StructuredChunker(strategy="legislation", max_tokens=60, overlap_tokens=0, min_tokens=10, counter=TokenCounter(None))
+
+    chunks = chunk_pages(pages, chunker)
+
+    assert chunks[0].page_start == 1
+    assert chunks[-1].page_end == 3
+    for chunk in chunks:
+        assert chunk.page_start <= chunk.page_end
+        expected = 1 if "Alpha" in chunk.text else 3
+        assert chunk.page_start == expected
+        assert chunk.metadata()["page_start"] == expected
+
+
+def test_is_pdf():
+    assert is_pdf("application/pdf")
+    assert is_pdf("Application/PDF; charset=binary")
+    assert not is_pdf("text/html")
+    assert not is_pdf(None)
@@ -0,0 +1,154 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from contracts.ingestion import IngestionBatchResult
+from services.ingestion_worker import IngestionWorker, IngestionWorkerThread
+
+
+def make_worker(result=None, **kwargs):
+    db = MagicMock()
+    db.lease_ingestion_jobs = AsyncMock(return_value=[])
+    db.complete_ingestion_jobs = AsyncMock(side_effect=lambda ids, worker: len(ids))
+    db.fail_ingestion_jobs = AsyncMock(side_effect=lambda errors, *args: {job_id: "queued" for job_id in errors})
+    db.extend_ingestion_leases = AsyncMock(side_effect=lambda ids, *args: len(ids))
+    service = MagicMock()
+    service.process_raw_scrapes = AsyncMock(return_value=result or IngestionBatchResult())
+    return IngestionWorker(db, service, worker_id="worker-a", **kwargs), db, service
+
+
+def jobs(*scrape_ids):
+    return [{"id": index + 1, "scrape_id": scrape_id, "attempts": 1, "max_attempts": 5} for index, scrape_id in enumerate(scrape_ids)]
+
+
+async def test_process_batch_completes_and_retries():
+    result = IngestionBatchResult(chunks=4)
+    result.failed["s-2"] = "Embedding failed: 429"
+    result.skipped["s-3"] = "no text extracted"
+    worker, db, service = make_worker(result)
+
+    await worker.process_batch(jobs("s-1", "s-2", "s-3"))
+
+    service.process_raw_scrapes.assert_awaited_once_with(["s-1", "s-2", "s-3"])
+    db.complete_ingestion_jobs.assert_awaited_once_with([1, 3], "worker-a")
+    assert db.fail_ingestion_jobs.call_args[0][:2] == ({2: "Embedding failed: 429"}, "worker-a")
+    assert (worker.stats.completed, worker.stats.retried, worker.stats.chunks) == (2, 1, 4)
+
+
+async def test_batch_exception_fails_every_job():
+    worker, db, service = make_worker()
+    service.process_raw_scrapes.side_effect = RuntimeError("pool closed")
+    db.fail_ingestion_jobs.side_effect = lambda errors, *args: {1: "queued", 2: "dead"}
+
+    await worker.process_batch(jobs("s-1", "s-2"))
+
+    errors = db.fail_ingestion_jobs.call_args[0][0]
+    assert set(errors) == {1, 2} and "pool closed" in errors[1]
+    assert (worker.stats.retried, worker.stats.dead) == (1, 1)
+
+
+async def test_heartbeat_extends_leases_while_batch_runs():
+    worker, db, service = make_worker(lease_seconds=3)
+
+    async def slow(scrape_ids):
+        await asyncio.sleep(1.2)
+        return IngestionBatchResult()
+
+    service.process_raw_scrapes.side_effect = slow
+    await worker.process_batch(jobs("s-1"))
+
+    db.extend_ingestion_leases.assert_awaited_once_with([1], "worker-a", 3)
+
+
+async def test_heartbeat_survives_transient_db_errors():
+    worker, db, service = make_worker(lease_seconds=3)
+    db.extend_ingestion_leases.side_effect = [ConnectionError("connection reset"), 1]
+
+    async def slow(scrape_ids):
+        await asyncio.sleep(2.2)
+        return IngestionBatchResult()
+
+    service.process_raw_scrapes.side_effect = slow
+    await worker.process_batch(jobs("s-1"))
+
+    assert db.extend_ingestion_leases.await_count == 2
+
+
+async def test_run_logs_batches_that_fail_to_settle(caplog):
+    worker, db, service = make_worker(batch_size=1)
+    db.lease_ingestion_jobs.side_effect = [jobs("s-1"), jobs("s-2"), []]
+    db.complete_ingestion_jobs.side_effect = ConnectionError("connection reset")
+
+    with caplog.at_level("ERROR", logger="services.ingestion_worker"):
+        await worker.run(drain=True)
+
+    failures = [r for r in caplog.records if "could not settle a batch" in r.getMessage()]
+    assert len(failures) == 2 and "connection reset" in failures[0].getMessage()
+
+
+async def test_run_drains_queue_with_bounded_concurrency():
+    worker, db, service = make_worker(batch_size=2, concurrency=2)
+    db.lease_ingestion_jobs.side_effect = [jobs("s-1", "s-2"), jobs("s-3"), [], []]
+    running = 0
+    peak = 0
+
+    async def process(scrape_ids):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return IngestionBatchResult(chunks=len(scrape_ids))
+
+    service.process_raw_scrapes.side_effect = process
+    stats = await worker.run(drain=True)
+
+    assert service.process_raw_scrapes.await_count == 2
+    assert peak == 2
+    assert (stats.batches, stats.completed, stats.chunks) == (2, 3, 3)
+    assert db.lease_ingestion_jobs.call_args[0] == ("worker-a", 2, 600)
+
+
+async def test_stop_ends_idle_worker():
+    worker, db, service = make_worker(poll_interval=30)
+
+    task = asyncio.create_task(worker.run())
+    await asyncio.sleep(0.05)
+    worker.stop()
+    await asyncio.wait_for(task, timeout=1)
+
+    service.process_raw_scrapes.assert_not_called()
+
+
+async def test_notification_wakes_idle_worker_and_drain_returns():
+    worker, db, service = make_worker(poll_interval=30)
+    db.listen_ingestion_jobs = AsyncMock(return_value=True)
+    queued = []
+    db.lease_ingestion_jobs.side_effect = lambda *args: queued.pop(0) if queued else []
+
+    task = asyncio.create_task(worker.run(listen=True))
+    await asyncio.sleep(0.01)
+    queued.append(jobs("s-1"))
+    worker.wake()
+    await asyncio.sleep(0.01)
+    worker.drain()
+    stats = await asyncio.wait_for(task, timeout=1)
+
+    db.listen_ingestion_jobs.assert_awaited_once_with(worker.wake)
+    service.process_raw_scrapes.assert_awaited_once_with(["s-1"])
+    assert stats.completed == 1
+
+
+def test_worker_thread_ingests_beside_blocking_caller():
+    worker, db, service = make_worker()
+    db.connect = AsyncMock()
+    db.close = AsyncMock()
+    db.listen_ingestion_jobs = AsyncMock(return_value=True)
+    queued = [jobs("s-1"), jobs("s-2")]
+    db.lease_ingestion_jobs.side_effect = lambda *args: queued.pop(0) if queued else []
+
+    thread = IngestionWorkerThread(lambda: db, lambda conn: (service, None), poll_interval=0.01).start()
+    stats = thread.finish(timeout=5)
+
+    assert service.process_raw_scrapes.await_count == 2
+    assert stats.completed == 2
+    db.close.assert_awaited_once()
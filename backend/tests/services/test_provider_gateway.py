@@ -0,0 +1,125 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from services.provider_gateway import (
+    AIMDLimiter,
+    GatedEmbeddingService,
+    GatewayConfig,
+    ProviderGateway,
+    TokenBucket,
+    gate_embeddings,
+    gate_llm,
+    get_gateway,
+    provider_name,
+    reset_gateways,
+    retry_after,
+)
+
+
+class ProviderError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = MagicMock(status_code=status_code, headers=headers or {})
+
+
+def make_gateway(**config):
+    config.setdefault("retry_base_seconds", 0.001)
+    return ProviderGateway("test.chat", GatewayConfig(**config))
+
+
+async def test_concurrency_never_exceeds_limit_and_grows_on_success():
+    gateway = make_gateway(initial_concurrency=2, max_concurrency=4)
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.005)
+        running -= 1
+
+    await asyncio.gather(*[gateway.call(call) for _ in range(4)])
+    assert peak == 2
+
+    await asyncio.gather(*[gateway.call(call) for _ in range(40)])
+    assert gateway.limiter.limit == 4
+    assert peak == 4
+    assert gateway.stats()["succeeded"] == 44
+
+
+async def test_throttle_halves_limit_once_per_window_and_retries():
+    gateway = make_gateway(initial_concurrency=8, max_concurrency=8)
+    fn = AsyncMock(side_effect=[ProviderError(429), ProviderError(429), "ok"])
+
+    assert await gateway.call(fn) == "ok"
+
+    assert fn.await_count == 3
+    assert gateway.limiter.limit == 4.25  # two 429s in one window: one decrease, then +1/4
+    stats = gateway.stats()
+    assert (stats["throttled"], stats["retries"], stats["failed"]) == (2, 2, 0)
+
+
+async def test_retry_after_pauses_the_gateway():
+    gateway = make_gateway()
+    fn = AsyncMock(side_effect=[ProviderError(429, {"retry-after": "0.05"}), "ok"])
+
+    started = time.monotonic()
+    assert await gateway.call(fn) == "ok"
+
+    assert time.monotonic() - started >= 0.05
+    assert retry_after(ProviderError(429, {"retry-after-ms": "250"})) == 0.25
+
+
+async def test_non_transient_errors_are_not_retried():
+    gateway = make_gateway()
+    fn = AsyncMock(side_effect=ProviderError(400))
+
+    with pytest.raises(ProviderError):
+        await gateway.call(fn)
+
+    assert fn.await_count == 1
+    assert gateway.limiter.in_flight == 0
+    assert gateway.stats()["failed"] == 1
+
+
+async def test_token_bucket_paces_calls():
+    bucket = TokenBucket(rate=100, burst=1)
+
+    started = time.monotonic()
+    for _ in range(6):
+        await bucket.acquire()
+
+    assert time.monotonic() - started >= 0.045
+
+
+def test_latency_spike_counts_as_congestion():
+    limiter = AIMDLimiter(initial=8, maximum=8, latency_tolerance=3.0)
+    for _ in range(20):
+        limiter.on_success(0.1)
+
+    limiter.on_success(1.0)
+
+    assert limiter.limit == 4
+
+
+def test_gateway_registry_and_wrappers():
+    reset_gateways()
+    client = MagicMock()
+    client.config.provider = "zai"
+    with patch.dict("os.environ", {"PROVIDER_ZAI_CHAT_MAX_CONCURRENCY": "3"}):
+        gated = gate_llm(client)
+
+    assert gated.gateway is get_gateway("zai", "chat")
+    assert gated.gateway.limiter.maximum == 3
+    assert gate_llm(gated) is gated
+    assert gate_llm(None) is None
+
+    embeddings = gate_embeddings(AsyncMock(), "openrouter")
+    assert isinstance(embeddings, GatedEmbeddingService)
+    assert embeddings.gateway.name == "openrouter.embeddings"
+    assert provider_name(MagicMock(spec=["base_url"], base_url="https://openrouter.ai/api/v1")) == "openrouter"
+    reset_gateways()
@@ -125,6 +125,15 @@ def test_extract_text_cleaning():
     assert "Title" in text
     assert "Some text" in text
 
+def test_extract_text_drops_scripts_and_rejects_unknown_mode():
+    service = IngestionService(MagicMock(), MagicMock(), MagicMock())
+
+    text = service._extract_text({"content": "<p>Fee</p><script>track()</script><nav>Menu</nav>"})
+
+    assert text == "Fee"
+    with pytest.raises(ValueError):
+        IngestionService(MagicMock(), html_mode="bs4")
+
 def test_chunk_text_logic():
     """Test text chunking logic."""
     service = IngestionService(MagicMock(), MagicMock(), MagicMock(), chunk_size=10, chunk_overlap=2)
@@ -150,7 +159,7 @@ async def test_ingest_from_search_result_new(mock_postgres, mock_vector_backend,
     
     # Verify calls
     mock_postgres.get_or_create_source.assert_called_once_with(
-        jurisdiction_id="web",
+        jurisdiction_id=None,
         name="Title", 
         type="general",
         url="http://new.com"
@@ -187,3 +196,214 @@ async def test_ingest_from_search_result_existing_source(mock_postgres, mock_vec
     args = mock_postgres.create_raw_scrape.call_args[0][0]
     assert args['source_id'] == "existing-source-id"
 
+
+
+def _scrape_row(scrape_id, content):
+    return {
+        "id": scrape_id,
+        "data": json.dumps({"content": content}),
+        "source_id": "12345678-1234-5678-1234-567812345678",
+        "url": f"http://example.com/{scrape_id}",
+        "content_type": "text/html",
+        "metadata": "{}",
+    }
+
+@pytest.mark.asyncio
+async def test_process_raw_scrapes_batches_embeddings_across_documents(mock_postgres, mock_vector_backend, mock_embedding_service):
+    """Chunks from several scrapes share embedding calls and a single vector upsert."""
+    mock_postgres._fetch = AsyncMock(return_value=[
+        _scrape_row("s1", "a" * 120),
+        _scrape_row("s2", "b" * 120),
+        _scrape_row("s3", "c" * 10),
+    ])
+    mock_embedding_service.embed_documents.side_effect = lambda texts: [[0.1, 0.2, 0.3]] * len(texts)
+    service = IngestionService(
+        postgres_client=mock_postgres,
+        vector_backend=mock_vector_backend,
+        embedding_service=mock_embedding_service,
+        chunk_size=50,
+        chunk_overlap=10,
+    )
+
+    result = await service.process_raw_scrapes(["s1", "s2", "s3", "s1"], embed_batch_size=4)
+
+    mock_postgres._fetch.assert_awaited_once()
+    assert mock_postgres._fetch.call_args[0][1] == ["s1", "s2", "s3"]
+    assert result.processed == ["s1", "s2", "s3"]
+    assert len(mock_vector_backend.upsert.call_args[0][0]) == result.chunks
+    assert result.chunks == 7  # [0:50] [40:90] [80:120] twice, plus one
+    assert mock_embedding_service.embed_documents.await_count == 2  # ceil(7 / 4)
+    mock_vector_backend.upsert.assert_awaited_once()
+
+    # One bulk UPDATE marks every scrape processed with its own document id
+    updates = [c for c in mock_postgres._execute.call_args_list if "processed = true" in c[0][0]]
+    assert len(updates) == 1
+    assert updates[0][0][1] == ["s1", "s2", "s3"]
+    assert len(set(updates[0][0][2])) == 3
+
+@pytest.mark.asyncio
+async def test_process_raw_scrapes_isolates_failures(mock_postgres, mock_vector_backend, mock_embedding_service):
+    """A failed embedding batch only fails the scrapes whose chunks were in it."""
+    mock_postgres._fetch = AsyncMock(return_value=[
+        _scrape_row("good", "fine text"),
+        _scrape_row("bad", "poison text"),
+        _scrape_row("empty", "   "),
+        {"id": "invalid"},
+    ])
+
+    async def embed(texts):
+        if any("poison" in text for text in texts):
+            raise RuntimeError("provider error")
+        return [[0.1, 0.2, 0.3]] * len(texts)
+
+    mock_embedding_service.embed_documents.side_effect = embed
+    service = IngestionService(
+        postgres_client=mock_postgres,
+        vector_backend=mock_vector_backend,
+        embedding_service=mock_embedding_service,
+    )
+
+    result = await service.process_raw_scrapes(["good", "bad", "empty", "invalid", "missing"], embed_batch_size=1)
+
+    assert result.processed == ["good"]
+    assert set(result.failed) == {"bad", "invalid"}
+    assert "provider error" in result.failed["bad"]
+    assert result.skipped == {"empty": "no text extracted", "missing": "not found"}
+
+    failure_updates = [c for c in mock_postgres._execute.call_args_list if "processed = false" in c[0][0]]
+    assert len(failure_updates) == 1
+    assert failure_updates[0][0][1] == ["invalid", "bad"]
+
+@pytest.mark.asyncio
+async def test_process_raw_scrapes_vector_upsert_failure(mock_postgres, mock_vector_backend, mock_embedding_service):
+    """If the bulk upsert fails, every embedded scrape is recorded as failed."""
+    mock_postgres._fetch = AsyncMock(return_value=[_scrape_row("s1", "text")])
+    mock_vector_backend.upsert.return_value = False
+    service = IngestionService(
+        postgres_client=mock_postgres,
+        vector_backend=mock_vector_backend,
+        embedding_service=mock_embedding_service,
+    )
+
+    result = await service.process_raw_scrapes(["s1"])
+
+    assert result.processed == []
+    assert result.failed["s1"].startswith("Vector Upsert Failed")
+    assert not any("processed = true" in c[0][0] for c in mock_postgres._execute.call_args_list)
+
+@pytest.mark.asyncio
+async def test_process_raw_scrape_uses_embedding_cache(mock_postgres, mock_vector_backend, mock_embedding_service):
+    """With an embedding cache configured, cached chunks never reach the provider."""
+    from services.embedding_cache import EmbeddingCache, content_hash
+
+    db = MagicMock()
+    db.get_cached_embeddings = AsyncMock(return_value={content_hash("Title Some text."): [0.4, 0.5, 0.6]})
+    db.store_cached_embeddings = AsyncMock()
+    service = IngestionService(
+        postgres_client=mock_postgres,
+        vector_backend=mock_vector_backend,
+        embedding_service=mock_embedding_service,
+        embedding_cache=EmbeddingCache(db, "test-model", 3),
+    )
+
+    assert await service.process_raw_scrape("test-scrape-123") == 1
+
+    mock_embedding_service.embed_documents.assert_not_awaited()
+    chunk = mock_vector_backend.upsert.call_args[0][0][0]
+    assert chunk["embedding"] == pytest.approx([0.4, 0.5, 0.6])
+
+@pytest.mark.asyncio
+async def test_incremental_reingest_embeds_only_changed_chunks(mock_postgres, mock_embedding_service):
+    """A re-scrape keeps unchanged chunk rows, embeds new ones and drops stale ones."""
+    from services.ingestion_service import chunk_uuids, document_uuid
+    from services.embedding_cache import content_hash
+    from contracts.ingestion import RawScrape
+
+    row = _scrape_row("22222222-0000-0000-0000-000000000001", "a" * 50 + "b" * 50)
+    row["metadata"] = json.dumps({"bill_number": "ORD-1"})
+    mock_postgres._fetch = AsyncMock(return_value=[row])
+    mock_embedding_service.embed_documents.side_effect = lambda texts: [[0.1, 0.2, 0.3]] * len(texts)
+
+    document_id = document_uuid(RawScrape.model_validate(row))
+    unchanged_hash = content_hash("a" * 50)
+    unchanged_id = chunk_uuids(document_id, [unchanged_hash])[0]
+    backend = MagicMock()
+    backend.chunk_hashes = AsyncMock(return_value={
+        document_id: {unchanged_id: unchanged_hash, "stale-chunk": content_hash("old paragraph")}
+    })
+    backend.sync_documents = AsyncMock(return_value={"deleted": 1, "written": 1})
+
+    service = IngestionService(
+        postgres_client=mock_postgres,
+        vector_backend=backend,
+        embedding_service=mock_embedding_service,
+        chunk_size=50,
+        chunk_overlap=10,
+        incremental=True,
+    )
+    result = await service.process_raw_scrapes([row["id"]])
+
+    # Chunks: [0:50] (stored), [40:90] and [80:100] (new)
+    new_texts = ["a" * 10 + "b" * 40, "b" * 20]
+    mock_embedding_service.embed_documents.assert_awaited_once_with(new_texts)
+    records, keep_ids = backend.sync_documents.call_args[0]
+    assert [r["content"] for r in records] == new_texts
+    assert all(r["document_id"] == document_id for r in records)
+    assert keep_ids == {document_id: [unchanged_id] + [r["id"] for r in records]}
+    assert (result.chunks, result.embedded, result.unchanged, result.deleted) == (3, 2, 1, 1)
+
+    processed = [c for c in mock_postgres._execute.call_args_list if "processed = true" in c[0][0]]
+    assert processed[0][0][2] == [document_id]
+
+def test_incremental_ids_are_stable():
+    """Document ids follow the bill number (or URL); chunk ids follow content and occurrence."""
+    from services.ingestion_service import chunk_uuids, document_key
+    from contracts.ingestion import RawScrape
+
+    base = {"id": "s", "source_id": "src", "url": "http://x/1", "data": {}}
+    assert document_key(RawScrape(**base, metadata={"bill_number": "AB-1"})) == "bill:src:AB-1"
+    assert document_key(RawScrape(**base)) == "url:http://x/1"
+
+    doc = "8c2b7a4e-0000-4000-8000-000000000000"
+    ids = chunk_uuids(doc, [b"h1", b"h2", b"h1"])
+    assert ids == chunk_uuids(doc, [b"h1", b"h2", b"h1"])
+    assert len(set(ids)) == 3
+
+@pytest.mark.asyncio
+async def test_process_raw_scrapes_pdf_chunks_carry_page_numbers(mock_postgres, mock_vector_backend, mock_embedding_service, mock_blob_storage):
+    """PDF scrapes are parsed page by page, stored as the real file, and chunked with page spans."""
+    import base64
+    from concurrent.futures import ThreadPoolExecutor
+    from tests.utils.pdf import make_pdf
+
+    pdf = make_pdf(["SECTION 1. Housing fee applies to new units.", "SECTION 2. Exemptions for ADUs."])
+    row = _scrape_row("packet", "")
+    row["data"] = json.dumps({"pdf_base64": base64.b64encode(pdf).decode()})
+    row["content_type"] = "application/pdf"
+    mock_postgres._fetch = AsyncMock(return_value=[row])
+    mock_embedding_service.embed_documents.side_effect = lambda texts: [[0.1, 0.2, 0.3]] * len(texts)
+    mock_blob_storage.upload_file.return_value = "src/2025/1/packet.pdf"
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        service = IngestionService(
+            postgres_client=mock_postgres,
+            vector_backend=mock_vector_backend,
+            embedding_service=mock_embedding_service,
+            storage_backend=mock_blob_storage,
+            chunk_size=40,
+            chunk_overlap=0,
+            executor=executor,
+        )
+        result = await service.process_raw_scrapes(["packet"])
+
+    assert result.processed == ["packet"]
+    records = mock_vector_backend.upsert.call_args[0][0]
+    assert records[0]["content"].startswith("SECTION 1.") and records[0]["metadata"]["page_start"] == 1
+    assert records[-1]["metadata"]["page_end"] == 2
+
+    # The PDF bytes (not str(data)) are uploaded, and the URI is recorded with the batch UPDATE
+    mock_blob_storage.upload.assert_not_called()
+    mock_blob_storage.upload_file.assert_awaited_once()
+    assert mock_blob_storage.upload_file.call_args[0][2] == "application/pdf"
+    uri_updates = [c for c in mock_postgres._execute.call_args_list if "storage_uri" in c[0][0]]
+    assert uri_updates[0][0][2] == ["src/2025/1/packet.pdf"]
@@ -22,21 +22,21 @@ async def test_get_sources(mock_db):
     
     assert len(sources) == 1
     assert sources[0]["url"] == "http://example.com"
-    mock_db.get_sources.assert_called_once_with(None)
+    mock_db.get_sources.assert_called_once_with(None, limit=None, cursor=None, fields=None)
 
 @pytest.mark.asyncio
 async def test_get_sources_filtered(mock_db):
     service = SourceService(mock_db)
     mock_db.get_sources.return_value = []
     
-    await service.get_sources(jurisdiction_id="sanjose")
+    await service.get_sources(jurisdiction_id="11111111-2222-3333-4444-555555555555")
     
-    mock_db.get_sources.assert_called_with("sanjose")
+    mock_db.get_sources.assert_called_with("11111111-2222-3333-4444-555555555555", limit=None, cursor=None, fields=None)
 
 @pytest.mark.asyncio
 async def test_create_source(mock_db):
     service = SourceService(mock_db)
-    new_source = SourceCreate(jurisdiction_id="sanjose", url="http://example.com", type="general")
+    new_source = SourceCreate(jurisdiction_id="11111111-2222-3333-4444-555555555555", url="http://example.com", type="general")
     mock_resp = {"id": "1", **new_source.model_dump()}
     mock_db.create_source.return_value = mock_resp
     
@@ -35,6 +35,7 @@ class ScrapeJob:
         
         # Lazy Import Ingestion Dependencies to avoid circular imports at top level if any
         from services.ingestion_service import IngestionService
+        from services.chunking import chunker_from_env
         from services.vector_backend_factory import create_vector_backend
         from llm_common.embeddings.openai import OpenAIEmbeddingService
         from services.storage.s3_storage import S3Storage
@@ -75,7 +76,10 @@ class ScrapeJob:
             postgres_client=self.db,
             vector_backend=vector_backend,
             embedding_service=embedding_service,
-            storage_backend=s3_storage
+            storage_backend=s3_storage,
+            incremental=os.environ.get("INGEST_INCREMENTAL", "true").lower() == "true",
+            chunker=chunker_from_env(),
+            html_mode=os.environ.get("HTML_EXTRACT_MODE", "fast")
         )
         
         async with SEM:
@@ -106,6 +110,7 @@ class ScrapeJob:
                 new_count = 0
                 updated_count = 0
                 ingested_count = 0
+                scrape_ids = []
                 
                 for bill in bills:
                     # A. Store in SQL (Legislation Table)
@@ -133,14 +138,22 @@ class ScrapeJob:
                     }
                     
                     try:
-                        # RAG: Store Raw Scrape and Trigger Ingestion (v2.1)
+                        # RAG: Store Raw Scrape (v2.1); ingested as one batch below
                         scrape_id = await self.db.create_raw_scrape(scrape_record)
-                        if scrape_id and ingestion_service:
-                             await ingestion_service.process_raw_scrape(scrape_id)
-                             ingested_count += 1
+                        if scrape_id:
+                            scrape_ids.append(scrape_id)
                     except Exception as e:
                         logger.warning(f"Failed to record raw scrape for {bill.bill_number}: {e}")
 
+                if scrape_ids and ingestion_service:
+                    try:
+                        batch = await ingestion_service.process_raw_scrapes(scrape_ids)
+                        ingested_count = len(batch.processed)
+                        for scrape_id, error in batch.failed.items():
+                            logger.warning(f"Failed to ingest raw scrape {scrape_id}: {error}")
+                    except Exception as e:
+                        logger.warning(f"Batch ingestion failed for {slug}: {e}")
+
                 # 4. Log Success
                 logger.info(f"[{slug}] Success: {len(bills)} bills ({new_count} new, {ingested_count} ingested)")
                 